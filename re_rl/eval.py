@@ -0,0 +1,411 @@
+"""
+Офлайн-оценка ответов модели на сгенерированном датасете.
+
+Вход:
+- references: JSONL, сохранённый DatasetGenerator (generate_dataset или
+  generate_sft_dataset). Идентификатор строки — поле "id", а если его нет —
+  номер строки в файле (с нуля).
+- completions: JSONL со строками {"id": ..., "completion": "..."}; необязательное
+  поле "latency" — время генерации ответа в секундах.
+
+Эталоны индексируются во временной sqlite-базе, ответы читаются потоком
+и оцениваются пачками в пуле процессов, поэтому память не растёт с размером
+файлов. Результат — точность, доля ответов в правильном формате и задержки
+в разрезе (task_type, difficulty, language).
+
+Запуск:
+    python -m re_rl.eval --references refs.jsonl --completions outputs.jsonl \\
+        --output report.json --workers 8
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from functools import partial
+from multiprocessing import Array, Pool, TimeoutError as PoolTimeoutError
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from re_rl.rewards import (
+    _call_with_time_budget,
+    _time_budget_available,
+    check_format_compliance,
+    compute_correctness_score,
+)
+
+
+# Ключ группы отчёта: (task_type, difficulty, language)
+GroupKey = Tuple[str, Optional[int], str]
+# Одна оцениваемая запись: (ключ группы, task_type, эталон, ответ модели, задержка генерации)
+EvalItem = Tuple[GroupKey, str, str, str, Optional[float]]
+
+# Сколько секунд можно потратить на оценку одного ответа; не уложившийся
+# ответ получает 0
+ITEM_TIMEOUT = 10.0
+# Сколько id искать в sqlite одним запросом (меньше лимита переменных SQLite)
+LOOKUP_CHUNK = 500
+
+_SFT_ANSWER = re.compile(r"(?:Ответ|Answer):\s*(.*)$", re.DOTALL)
+
+
+def _reference_record(row: Dict[str, Any]) -> Tuple[str, Optional[int], str, str]:
+    """
+    Извлекает (task_type, difficulty, language, эталонный ответ) из строки датасета.
+    Поддерживаются и "сырые" задачи (final_answer), и SFT-формат (metadata + output).
+    """
+    meta = row.get("metadata", {})
+    task_type = row.get("task_type", meta.get("task_type", "unknown"))
+    difficulty = row.get("difficulty", meta.get("difficulty"))
+    language = row.get("language", meta.get("language", "unknown"))
+
+    if "final_answer" in row:
+        answer = row["final_answer"]
+    elif "ref_final_answer" in meta:
+        answer = meta["ref_final_answer"]
+    else:
+        m = _SFT_ANSWER.search(row.get("output", ""))
+        answer = m.group(1).strip() if m else row.get("output", "")
+    return task_type, difficulty, language, str(answer)
+
+
+def build_reference_index(references_path: str, db_path: str, batch_size: int = 10000) -> sqlite3.Connection:
+    """Загружает эталоны в sqlite-таблицу с ключом по id."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS refs ("
+        "id TEXT PRIMARY KEY, task_type TEXT, difficulty INTEGER, language TEXT, answer TEXT)"
+    )
+    batch = []
+    with open(references_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            batch.append((str(row.get("id", line_no)), *_reference_record(row)))
+            if len(batch) >= batch_size:
+                conn.executemany("INSERT OR REPLACE INTO refs VALUES (?, ?, ?, ?, ?)", batch)
+                batch = []
+    if batch:
+        conn.executemany("INSERT OR REPLACE INTO refs VALUES (?, ?, ?, ?, ?)", batch)
+    conn.commit()
+    return conn
+
+
+def _lookup_rows(conn: sqlite3.Connection, rows: List[Dict[str, Any]], stats: Dict[str, int]) -> Iterator[EvalItem]:
+    """Эталоны для пачки ответов одним запросом WHERE id IN (...)."""
+    ids = list({str(row.get("id")) for row in rows})
+    refs = {
+        ref_id: ref
+        for ref_id, *ref in conn.execute(
+            "SELECT id, task_type, difficulty, language, answer FROM refs "
+            f"WHERE id IN ({', '.join('?' * len(ids))})",
+            ids,
+        )
+    }
+    for row in rows:
+        ref = refs.get(str(row.get("id")))
+        if ref is None:
+            stats["unmatched"] += 1
+            continue
+        task_type, difficulty, language, answer = ref
+        yield (task_type, difficulty, language), task_type, answer, row.get("completion", ""), row.get("latency")
+
+
+def iter_eval_items(
+    completions_path: str,
+    conn: sqlite3.Connection,
+    stats: Dict[str, int],
+    chunk_size: int = LOOKUP_CHUNK,
+) -> Iterator[EvalItem]:
+    """Потоково соединяет ответы модели с эталонами по id (пачками по chunk_size)."""
+    rows = []
+    with open(completions_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rows.append(json.loads(line))
+            if len(rows) >= chunk_size:
+                yield from _lookup_rows(conn, rows, stats)
+                rows = []
+    if rows:
+        yield from _lookup_rows(conn, rows, stats)
+
+
+def _score(task_type: str, ref_answer: str, completion: str) -> float:
+    try:
+        return compute_correctness_score(task_type, ref_answer, completion)
+    except Exception:
+        return 0.0
+
+
+def score_item(item: EvalItem, timeout: float = ITEM_TIMEOUT) -> Tuple[GroupKey, float, float, float, Optional[float]]:
+    """
+    Оценивает один ответ: (ключ, корректность, формат 0/1, время оценки, задержка генерации).
+    Оценка ограничена timeout секундами (SIGALRM); не успели — 0.
+    """
+    key, task_type, ref_answer, completion, latency = item
+    start = time.perf_counter()
+    if timeout and timeout > 0 and _time_budget_available():
+        score = _call_with_time_budget(lambda: _score(task_type, ref_answer, completion), timeout) or 0.0
+    else:
+        score = _score(task_type, ref_answer, completion)
+    elapsed = time.perf_counter() - start
+    format_ok = 1.0 if check_format_compliance(completion) > 0 else 0.0
+    return key, score, format_ok, elapsed, latency
+
+
+# Состояние ответов текущей пачки в общей памяти пула: 0 — не начат,
+# > 0 — время начала оценки, -1 — оценён. По нему видно, какой ответ завис.
+_ITEM_STATE = None
+
+
+def _init_worker(state):
+    global _ITEM_STATE
+    _ITEM_STATE = state
+
+
+def _score_chunk(chunk: List[Tuple[int, EvalItem]], timeout: float):
+    """Оценивает кусок пачки [(номер, запись)], отмечая в _ITEM_STATE начало и конец каждой."""
+    results = []
+    for index, item in chunk:
+        if _ITEM_STATE is not None:
+            _ITEM_STATE[index] = time.time()
+        results.append((index, score_item(item, timeout)))
+        if _ITEM_STATE is not None:
+            _ITEM_STATE[index] = -1.0
+    return results
+
+
+class LatencyStats:
+    """
+    Потоковая статистика задержек: среднее, максимум и квантили по
+    логарифмической гистограмме (шаг 10%), без хранения отдельных значений.
+    """
+
+    _MIN = 1e-6
+    _LOG_STEP = math.log(1.1)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        bucket = int(math.log(max(value, self._MIN) / self._MIN) / self._LOG_STEP)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(self.max, self._MIN * math.exp((bucket + 1) * self._LOG_STEP))
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+        }
+
+
+class GroupStats:
+    """Накопитель метрик для одной группы (task_type, difficulty, language)."""
+
+    def __init__(self):
+        self.count = 0
+        self.score_sum = 0.0
+        self.exact = 0
+        self.format_ok = 0.0
+        self.score_latency = LatencyStats()
+        self.generation_latency = LatencyStats()
+
+    def add(self, score: float, format_ok: float, elapsed: float, latency: Optional[float]) -> None:
+        self.count += 1
+        self.score_sum += score
+        self.exact += score >= 1.0
+        self.format_ok += format_ok
+        self.score_latency.add(elapsed)
+        if latency is not None:
+            self.generation_latency.add(float(latency))
+
+    def summary(self) -> Dict[str, Any]:
+        result = {
+            "count": self.count,
+            "accuracy": self.score_sum / self.count if self.count else 0.0,
+            "exact_match": self.exact / self.count if self.count else 0.0,
+            "format_compliance": self.format_ok / self.count if self.count else 0.0,
+            "score_latency_s": self.score_latency.summary(),
+        }
+        if self.generation_latency.count:
+            result["generation_latency_s"] = self.generation_latency.summary()
+        return result
+
+
+def _batches(items: Iterator[EvalItem], batch_size: int) -> Iterator[List[EvalItem]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def evaluate(
+    references_path: str,
+    completions_path: str,
+    workers: Optional[int] = None,
+    batch_size: int = 10000,
+    db_path: Optional[str] = None,
+    item_timeout: float = ITEM_TIMEOUT,
+) -> Dict[str, Any]:
+    """
+    Оценивает ответы модели и возвращает отчёт.
+
+    Args:
+        references_path: JSONL с эталонами (датасет DatasetGenerator)
+        completions_path: JSONL с ответами {"id", "completion"}
+        workers: Число процессов (None = os.cpu_count(), 1 = без пула)
+        batch_size: Сколько ответов держать в памяти одновременно
+        db_path: Путь к sqlite-индексу эталонов (None = временный файл)
+        item_timeout: Лимит на оценку одного ответа, секунды (0 — без лимита)
+    """
+    workers = workers or os.cpu_count() or 1
+    tmp_db = None
+    if db_path is None:
+        fd, tmp_db = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        db_path = tmp_db
+
+    groups: Dict[GroupKey, GroupStats] = {}
+    overall = GroupStats()
+    stats = {"unmatched": 0, "timeouts": 0}
+    start = time.perf_counter()
+    conn = build_reference_index(references_path, db_path)
+    # Сколько ждать ответа, прежде чем считать процесс зависшим там, где
+    # SIGALRM не прерывает (код на C)
+    stall = 2 * item_timeout + 1 if item_timeout and item_timeout > 0 else None
+    state = Array("d", batch_size, lock=False) if workers > 1 else None
+    new_pool = lambda: Pool(workers, initializer=_init_worker, initargs=(state,))
+    pool = new_pool() if workers > 1 else None
+    score = partial(_score_chunk, timeout=item_timeout)
+
+    def record(result):
+        key, score_value, format_ok, elapsed, latency = result
+        if item_timeout and elapsed >= item_timeout:
+            stats["timeouts"] += 1
+        groups.setdefault(key, GroupStats()).add(score_value, format_ok, elapsed, latency)
+        overall.add(score_value, format_ok, elapsed, latency)
+
+    try:
+        for batch in _batches(iter_eval_items(completions_path, conn, stats), batch_size):
+            if pool is None:
+                for item in batch:
+                    record(score_item(item, item_timeout))
+                continue
+            state[:len(batch)] = [0.0] * len(batch)
+            pending = set(range(len(batch)))
+            while pending:
+                todo = sorted(pending)
+                # Куски нарезаются здесь: imap_unordered с chunksize > 1 отдаёт
+                # генератор без next(timeout)
+                size = max(1, len(todo) // (workers * 4))
+                chunks = [[(i, batch[i]) for i in todo[k:k + size]] for k in range(0, len(todo), size)]
+                results = pool.imap_unordered(score, chunks)
+                while pending:
+                    try:
+                        chunk_results = results.next(timeout=stall)
+                    except PoolTimeoutError:
+                        now = time.time()
+                        hung = [i for i in pending if 0 < state[i] and now - state[i] >= stall]
+                        if not hung:
+                            # Процессы заняты, но не зависли — ждём дальше
+                            continue
+                        # Обнуляем только зависшие ответы; остальные (в очереди или
+                        # оценённые, но не доставленные вместе с зависшим куском) —
+                        # заново в новом пуле
+                        for index in hung:
+                            key, _, _, completion, latency = batch[index]
+                            format_ok = 1.0 if check_format_compliance(completion) > 0 else 0.0
+                            record((key, 0.0, format_ok, float(item_timeout), latency))
+                            pending.discard(index)
+                        pool.terminate()
+                        for index in pending:
+                            state[index] = 0.0
+                        pool = new_pool()
+                        break
+                    for index, result in chunk_results:
+                        pending.discard(index)
+                        record(result)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        conn.close()
+        if tmp_db is not None:
+            os.remove(tmp_db)
+
+    return {
+        "summary": {
+            **overall.summary(),
+            "unmatched": stats["unmatched"],
+            "timeouts": stats["timeouts"],
+            "wall_time_s": time.perf_counter() - start,
+        },
+        "groups": [
+            {"task_type": key[0], "difficulty": key[1], "language": key[2], **groups[key].summary()}
+            for key in sorted(groups, key=lambda k: (k[0], k[1] if k[1] is not None else -1, k[2]))
+        ],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Офлайн-оценка ответов модели на датасете re_rl")
+    parser.add_argument("--references", required=True, help="JSONL с эталонами (DatasetGenerator)")
+    parser.add_argument("--completions", required=True, help='JSONL с ответами {"id", "completion"}')
+    parser.add_argument("--output", default=None, help="Куда сохранить JSON-отчёт")
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов (по умолчанию все ядра)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Размер пачки ответов в памяти")
+    parser.add_argument("--db", default=None, help="Путь к sqlite-индексу эталонов (по умолчанию временный)")
+    parser.add_argument("--item-timeout", type=float, default=ITEM_TIMEOUT, help="Лимит на оценку одного ответа, с")
+    args = parser.parse_args(argv)
+
+    report = evaluate(
+        args.references,
+        args.completions,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        db_path=args.db,
+        item_timeout=args.item_timeout,
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    summary = report["summary"]
+    print(f"Оценено: {summary['count']} (без эталона: {summary['unmatched']}), "
+          f"точность: {summary['accuracy']:.4f}, формат: {summary['format_compliance']:.4f}")
+    for group in report["groups"]:
+        print(f"  {group['task_type']:<24} d={group['difficulty']!s:<4} {group['language']:<3} "
+              f"n={group['count']:<8} acc={group['accuracy']:.4f} fmt={group['format_compliance']:.4f}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
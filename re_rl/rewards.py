@@ -1,6 +1,22 @@
 import re
 import math
-from typing import Optional, List, Dict, Union, Any
+import keyword
+import time
+from fractions import Fraction
+import signal
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, List, Dict, Union, Any, Tuple
+
+import numpy as np
+import sympy as sp
+from sympy.parsing.sympy_parser import (
+    parse_expr,
+    standard_transformations,
+    convert_xor,
+    implicit_multiplication_application,
+)
 from rich import print
 ##############################################################################
 # 1) Утилиты для извлечения chain-of-thought (reasoning) и финального ответа #
@@ -44,6 +60,85 @@ def check_format_compliance(full_text: str) -> float:
     else:
         return 0.0
 
+
+class StreamingAnswerDetector:
+    """
+    Инкрементальный детектор структуры <reasoning>...</reasoning><answer>...</answer>
+    для ранней остановки генерации.
+
+    Текст подаётся кусками через feed(); состояние автомата тегов хранится
+    между вызовами, уже просмотренный префикс повторно не сканируется
+    (между вызовами хранится только хвост короче самого длинного тега).
+
+    Пример:
+        detector = StreamingAnswerDetector()
+        for chunk in stream:
+            if detector.feed(chunk):
+                break
+        text = generated[:detector.stop_offset]
+    """
+
+    # Последовательность тегов и что накапливать после каждого из них
+    _TAGS = ("<reasoning>", "</reasoning>", "<answer>", "</answer>")
+    _COLLECT_AFTER = {"<reasoning>": "reasoning", "<answer>": "answer"}
+
+    def __init__(self):
+        self._state = 0              # индекс следующего ожидаемого тега в _TAGS
+        self._tail = ""              # необработанный хвост (возможное начало тега)
+        self._tail_offset = 0        # позиция начала хвоста в общем потоке
+        self._parts: Dict[str, List[str]] = {"reasoning": [], "answer": []}
+        self.stop_offset: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        """Полная структура уже встретилась."""
+        return self._state == len(self._TAGS)
+
+    @property
+    def reasoning_text(self) -> str:
+        return "".join(self._parts["reasoning"]).strip()
+
+    @property
+    def answer_text(self) -> str:
+        return "".join(self._parts["answer"]).strip()
+
+    def _collecting(self) -> Optional[str]:
+        if self._state == 0:
+            return None
+        return self._COLLECT_AFTER.get(self._TAGS[self._state - 1])
+
+    def feed(self, text_chunk: str) -> bool:
+        """
+        Обрабатывает очередной кусок текста.
+        Возвращает True, если после него структура ответа завершена.
+        """
+        if self.done or not text_chunk:
+            return self.done
+
+        buffer = self._tail + text_chunk
+        pos = 0
+        while not self.done:
+            tag = self._TAGS[self._state]
+            idx = buffer.find(tag, pos)
+            target = self._collecting()
+            if idx < 0:
+                # Оставляем хвост, в котором может начинаться тег
+                keep_from = max(pos, len(buffer) - (len(tag) - 1))
+                if target is not None:
+                    self._parts[target].append(buffer[pos:keep_from])
+                self._tail_offset += keep_from
+                self._tail = buffer[keep_from:]
+                return False
+            if target is not None:
+                self._parts[target].append(buffer[pos:idx])
+            pos = idx + len(tag)
+            self._state += 1
+
+        self.stop_offset = self._tail_offset + pos
+        self._tail_offset += len(buffer)
+        self._tail = ""
+        return True
+
 ##############################################################################
 # 2) Парсеры финальных ответов (для разных типов задач)
 ##############################################################################
@@ -87,18 +182,53 @@ def parse_cubic_answer(text: str) -> Optional[List[float]]:
     vals = parse_list_of_floats(text)
     return vals if vals else None
 
-def parse_urn_probability_answer(text: str) -> Optional[float]:
+_URN_NUMBER = re.compile(r"[-+]?\d+(?:\.\d+)?(?:\s*/\s*\d+)?")
+
+
+def _urn_probability_token(text: str) -> Optional[str]:
     """
-    Должно быть число 0..1.
+    Запись вероятности в ответе: последняя дробь p/q, а без дробей —
+    последнее число. Так «P(X≥1) = 25/42» даёт 25/42, а не 1, и
+    «0.5952 (=25/42)» — точную дробь.
     """
-    nums = re.findall(r"[-+]?\d+(?:\.\d+)?", text)
-    if not nums:
+    tokens = [t.replace(" ", "") for t in _URN_NUMBER.findall(text)]
+    fractions = [t for t in tokens if "/" in t]
+    if fractions:
+        return fractions[-1]
+    return tokens[-1] if tokens else None
+
+
+def parse_urn_probability_answer(text: str) -> Optional[Fraction]:
+    """
+    Должно быть число 0..1: дробь p/q (точно) или десятичная запись.
+    """
+    token = _urn_probability_token(text)
+    if token is None:
+        return None
+    try:
+        val = Fraction(token)
+    except (ValueError, ZeroDivisionError):
         return None
-    val = float(nums[0])
     if val<0 or val>1.0001:
         return None
     return val
 
+_SERIES_NUMBER = re.compile(r"[-+]?\d+(?:\.\d+)?(?:\s*/\s*\d+)?")
+
+
+def parse_series_answer(text: str) -> Optional[Fraction]:
+    """
+    Сумма ряда: число после последнего «=» («S_5 = 121/81», «S = 0.75»)
+    или весь ответ. None — ответ не число (например, «converges»).
+    """
+    value = text.rsplit("=", 1)[-1].strip().rstrip(".")
+    if not _SERIES_NUMBER.fullmatch(value):
+        return None
+    try:
+        return Fraction(value.replace(" ", ""))
+    except (ValueError, ZeroDivisionError):
+        return None
+
 def parse_knights_knaves_answer(answer_text: str) -> Optional[Dict[str, str]]:
     """
     Парсит ответ для задачи рыцарей и лжецов.
@@ -161,16 +291,17 @@ def parse_text_stats_answer(text: str) -> Optional[int]:
 def parse_system_linear_answer(text: str) -> Optional[List[float]]:
     """
     "x1=2.00, x2=1.00" => [2.0,1.0]
+    "x1 = 11/5, x2 = 3/5" => [2.2, 0.6]
     Или в тексте 2,1
     """
-    pairs = re.findall(r"x(\d+)\s*=\s*([-+]?\d+(?:\.\d+)?)", text)
+    pairs = re.findall(r"x(\d+)\s*=\s*([-+]?\d+(?:\.\d+)?(?:/\d+)?)", text)
     if not pairs:
         # fallback: ищем float'ы
         floats = parse_list_of_floats(text)
         return floats if floats else None
     # сортируем
     pairs_sorted = sorted(pairs, key=lambda x: int(x[0]))
-    return [float(p[1]) for p in pairs_sorted]
+    return [float(Fraction(p[1])) for p in pairs_sorted]
 
 ##############################################################################
 # 3) Функции сравнения "корректности" финального ответа
@@ -236,13 +367,17 @@ def reward_knights_knaves(ref_answer: str, pred_answer: str) -> float:
     """
     # Извлекаем рассуждения и ответы
     ref_reasoning, ref_answer = extract_reasoning_and_answer(ref_answer)
+    if not ref_answer:
+        return 0.0
+    return _score_knights_knaves_roles(parse_knights_knaves_answer(ref_answer), pred_answer)
+
+def _score_knights_knaves_roles(ref_roles: Optional[Dict[str, str]], pred_answer: str) -> float:
+    """Оценивает ответ модели по уже разобранным ролям эталона."""
     pred_reasoning, pred_answer = extract_reasoning_and_answer(pred_answer)
-    
-    if not ref_answer or not pred_answer:
+    if not pred_answer:
         return 0.0
-        
-    # Парсим роли из ответов
-    ref_roles = parse_knights_knaves_answer(ref_answer)
+
+    # Парсим роли из ответа
     pred_roles = parse_knights_knaves_answer(pred_answer)
     
     if not ref_roles or not pred_roles:
@@ -326,6 +461,623 @@ def reward_default_str(ref_str: str, pred_str: str) -> float:
     return 0.0
 
 
+##############################################################################
+# 3.1) Символьная эквивалентность (integral, calculus, limits, ДУ, неравенства)
+##############################################################################
+
+# Типы задач, ответы которых — выражения или множества, а не одно число
+SYMBOLIC_TASK_TYPES = {"integral", "calculus", "limits", "differential_equation", "inequality"}
+
+# Размер LRU-кэша пар (эталон, предсказание): в GRPO-группах ответы повторяются
+SYMBOLIC_CACHE_SIZE = 65536
+# Сколько секунд можно потратить на sp.simplify, если численная проверка не дала вердикта
+SYMBOLIC_TIME_BUDGET = 1.0
+# Число случайных точек для численной проверки и относительная точность
+# (эталоны часто округлены до 4 знаков, поэтому допуск не слишком строгий)
+SYMBOLIC_NUM_POINTS = 8
+SYMBOLIC_TOL = 1e-3
+# Общий бюджет (секунды) на нормализацию, разбор и сравнение одной пары
+SYMBOLIC_TOTAL_BUDGET = 2.0
+# Ответ модели разбирается parse_expr, а он выполняет код через eval: длинные
+# ответы и огромные числа (10**10**9 считается в C и не прерывается сигналом)
+# отбрасываются до вычисления
+SYMBOLIC_MAX_LENGTH = 500
+SYMBOLIC_MAX_EXPONENT = 1000
+SYMBOLIC_MAX_BITS = 100_000
+
+_SYMPY_TRANSFORMATIONS = standard_transformations + (convert_xor, implicit_multiplication_application)
+# Пространство имён eval: без builtins, только конструкторы, которые вставляют
+# преобразования parse_expr, и элементарные функции. Остальные имена
+# становятся символами (Symbol/Function), а не объектами Python.
+_SYMPY_GLOBALS: Dict[str, Any] = {"__builtins__": {}}
+_SYMPY_GLOBALS.update({
+    name: getattr(sp, name) for name in (
+        "Integer", "Float", "Rational", "Symbol", "Function", "factorial", "factorial2",
+        "Add", "Mul", "Pow", "Or", "And", "Not",
+        "sin", "cos", "tan", "cot", "sec", "csc", "asin", "acos", "atan", "acot",
+        "sinh", "cosh", "tanh", "asinh", "acosh", "atanh",
+        "exp", "log", "sqrt", "root", "Abs", "sign", "floor", "ceiling",
+        "pi", "E", "I", "oo", "zoo", "nan", "Max", "Min",
+    )
+})
+_SYMPY_GLOBALS.update({"abs": sp.Abs, "max": sp.Max, "min": sp.Min})
+_SAFE_EXPRESSION = re.compile(r"[\w\s+\-*/^().,<>=!|&\[\]]*")
+# Двойное подчёркивание и точка не перед цифрой (доступ к атрибутам)
+_UNSAFE_TOKENS = re.compile(r"__|\.(?!\d)")
+_IDENTIFIER = re.compile(r"[^\W\d]\w*")
+_FACTORIALS = (sp.factorial, sp.factorial2)
+_SYMPY_LOCALS = {
+    "e": sp.E, "E": sp.E, "pi": sp.pi, "oo": sp.oo,
+    "ln": sp.log, "lg": lambda arg: sp.log(arg, 10),
+    "tg": sp.tan, "ctg": sp.cot, "cot": sp.cot,
+    "arcsin": sp.asin, "arccos": sp.acos, "arctg": sp.atan, "arctan": sp.atan,
+    "C": sp.Symbol("C"), "C1": sp.Symbol("C1"), "C2": sp.Symbol("C2"),
+}
+
+_UNICODE_REPLACEMENTS = [
+    ("−", "-"), ("⋅", "*"), ("·", "*"), ("×", "*"), ("÷", "/"),
+    ("∞", "oo"), ("π", "pi"), ("√", "sqrt"), ("≤", "<="), ("≥", ">="),
+    ("∪", " U "), ("∩", " & "), ("∈", " in "),
+]
+_SUPERSCRIPT_DIGITS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺", "0123456789-+")
+_SUBSCRIPT_DIGITS = str.maketrans("₀₁₂₃₄₅₆₇₈₉", "0123456789")
+
+_LATEX_FRAC = re.compile(r"\\[dt]?frac\{([^{}]*)\}\{([^{}]*)\}")
+_LATEX_SQRT = re.compile(r"\\sqrt\{([^{}]*)\}")
+_ANSWER_LHS = re.compile(r"^\s*[A-Za-z][\w]*'*(\([A-Za-z]\))?\s*=(?![=<>])")
+_INTERVAL = re.compile(r"^([\[(])\s*([^,]+?)\s*[,;]\s*([^,]+?)\s*([\])])$")
+_SET_SEPARATOR = re.compile(r"\s+(?:U|or|или)\s+")
+_RELATION_OP = re.compile(r"(<=|>=|<|>)")
+
+
+class _TimeBudgetExceeded(BaseException):
+    pass
+
+
+def normalize_math_answer(text: str) -> str:
+    """
+    Приводит ответ к строке, понятной парсеру sympy: убирает LaTeX-обвязку,
+    Unicode-символы, надстрочные степени и левую часть вида "y =" / "f'(x) =".
+
+    Результат используется и для разбора, и как ключ кэша эквивалентности.
+    """
+    s = text.strip().strip("$").strip().rstrip(".")
+
+    # LaTeX
+    s = s.replace(r"\left", "").replace(r"\right", "")
+    s = s.replace(r"\cdot", "*").replace(r"\times", "*").replace(r"\infty", "oo")
+    s = s.replace(r"\cup", " U ").replace(r"\leq", "<=").replace(r"\geq", ">=")
+    s = s.replace(r"\le", "<=").replace(r"\ge", ">=")
+    while True:
+        new_s = _LATEX_SQRT.sub(r"sqrt(\1)", _LATEX_FRAC.sub(r"((\1)/(\2))", s))
+        if new_s == s:
+            break
+        s = new_s
+    s = re.sub(r"\\([A-Za-z]+)", r"\1", s)
+    s = s.replace("{", "(").replace("}", ")")
+
+    # Unicode
+    for src, dst in _UNICODE_REPLACEMENTS:
+        s = s.replace(src, dst)
+    s = re.sub(r"[⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺]+", lambda m: "^(" + m.group(0).translate(_SUPERSCRIPT_DIGITS) + ")", s)
+    s = s.translate(_SUBSCRIPT_DIGITS)
+
+    # "y = ...", "f'(x) = ..." -> правая часть
+    if s.count("=") - len(re.findall(r"[<>]=", s)) == 1 and _ANSWER_LHS.match(s):
+        s = s.split("=", 1)[1]
+
+    # Константы интегрирования: "Ce^(x)", "C1e^(2x)" -> "C*e^(x)", "C1*e^(2x)"
+    s = re.sub(r"\b(C\d?)(?=[A-Za-z(])", r"\1*", s)
+    s = s.replace("+oo", "oo")
+    return " ".join(s.split())
+
+
+def _check_expression_text(text: str):
+    """Пропускает в parse_expr только арифметику: без строк, атрибутов и ключевых слов."""
+    if len(text) > SYMBOLIC_MAX_LENGTH:
+        raise ValueError("Слишком длинное выражение.")
+    if not _SAFE_EXPRESSION.fullmatch(text) or _UNSAFE_TOKENS.search(text):
+        raise ValueError(f"Недопустимые символы в выражении: {text!r}")
+    for name in _IDENTIFIER.findall(text):
+        if keyword.iskeyword(name):
+            raise ValueError(f"Недопустимое имя в выражении: {name}")
+
+
+def _log2_bound(expr: sp.Basic) -> float:
+    """
+    Верхняя оценка log2 |значения| выражения без символов, построенного с
+    evaluate=False. ValueError — если значение заведомо слишком велико.
+    """
+    if expr.is_Rational:
+        return float(max(abs(expr.p).bit_length(), expr.q.bit_length(), 1))
+    if expr.is_Float or expr.is_NumberSymbol or expr.is_Atom:
+        return 2.0
+    if expr.is_Add:
+        return max(_log2_bound(a) for a in expr.args) + math.log2(len(expr.args)) + 1
+    if expr.is_Mul:
+        return sum(_log2_bound(a) for a in expr.args)
+    if expr.is_Pow:
+        base, exponent = expr.args
+        if exponent.is_Number:
+            if abs(exponent) > SYMBOLIC_MAX_EXPONENT:
+                raise ValueError(f"Слишком большая степень: {exponent}")
+            magnitude = float(abs(exponent))
+        else:
+            exp_bits = _log2_bound(exponent)
+            if exp_bits > math.log2(SYMBOLIC_MAX_EXPONENT):
+                raise ValueError("Слишком большая степень.")
+            magnitude = 2.0 ** exp_bits
+        return magnitude * _log2_bound(base)
+    if isinstance(expr, _FACTORIALS):
+        (arg,) = expr.args
+        if not arg.is_Number or abs(arg) > SYMBOLIC_MAX_EXPONENT:
+            raise ValueError("Слишком большой факториал.")
+        return float(abs(arg)) * math.log2(max(float(abs(arg)), 2.0))
+    return max((_log2_bound(a) for a in expr.args), default=2.0)
+
+
+def _check_magnitude(expr: sp.Basic):
+    """Отвергает подвыражения без символов, значение которых не помещается в SYMBOLIC_MAX_BITS."""
+    for node in sp.preorder_traversal(expr):
+        if (node.is_Pow or isinstance(node, _FACTORIALS)) and not node.free_symbols:
+            if _log2_bound(node) > SYMBOLIC_MAX_BITS:
+                raise ValueError("Слишком большое число в выражении.")
+        elif isinstance(node, _FACTORIALS):
+            raise ValueError("Факториал от выражения с переменными.")
+
+
+def _parse_expression(text: str) -> sp.Expr:
+    """
+    parse_expr для ответов модели: текст проверяется по белому списку,
+    eval идёт без builtins, а размер чисел оценивается по дереву,
+    построенному без вычислений, до настоящего разбора.
+    """
+    _check_expression_text(text)
+    unevaluated = parse_expr(
+        text, local_dict=dict(_SYMPY_LOCALS), global_dict=dict(_SYMPY_GLOBALS),
+        transformations=_SYMPY_TRANSFORMATIONS, evaluate=False,
+    )
+    _check_magnitude(unevaluated)
+    return parse_expr(
+        text, local_dict=dict(_SYMPY_LOCALS), global_dict=dict(_SYMPY_GLOBALS),
+        transformations=_SYMPY_TRANSFORMATIONS,
+    )
+
+
+def _looks_like_set(text: str) -> bool:
+    return bool(
+        _RELATION_OP.search(text)
+        or _SET_SEPARATOR.search(text)
+        or _INTERVAL.match(text)
+        or text in ("ℝ", "R", "∅", "{}")
+        or text.startswith("x in ")
+    )
+
+
+def _parse_set_piece(piece: str) -> sp.Set:
+    piece = re.sub(r"^x\s+in\s+", "", piece.strip())
+    if piece in ("ℝ", "R"):
+        return sp.S.Reals
+    if piece in ("∅", "{}"):
+        return sp.S.EmptySet
+
+    m = _INTERVAL.match(piece)
+    if m:
+        left, a, b, right = m.groups()
+        return sp.Interval(
+            _parse_expression(a), _parse_expression(b),
+            left_open=(left == "("), right_open=(right == ")"),
+        )
+
+    m = re.match(r"^x\s*=\s*(.+)$", piece)
+    if m:
+        return sp.FiniteSet(_parse_expression(m.group(1)))
+
+    # Отношения, в том числе двойные: "-1 < x <= 3"
+    tokens = [t.strip() for t in _RELATION_OP.split(piece)]
+    if len(tokens) < 3:
+        raise ValueError(f"Не удалось разобрать множество: {piece}")
+    result = sp.S.Reals
+    for i in range(0, len(tokens) - 2, 2):
+        lhs, op, rhs = tokens[i], tokens[i + 1], tokens[i + 2]
+        rel = sp.Rel(_parse_expression(lhs), _parse_expression(rhs), op)
+        result = result.intersect(rel.as_set())
+    return result
+
+
+def parse_symbolic_answer(text: str) -> Optional[Union[sp.Expr, sp.Set]]:
+    """
+    Разбирает нормализованный ответ в sympy-выражение или множество
+    (для интервалов и неравенств). Возвращает None, если разобрать не удалось.
+    """
+    try:
+        if _looks_like_set(text):
+            result = sp.S.EmptySet
+            for piece in _SET_SEPARATOR.split(text):
+                result = result.union(_parse_set_piece(piece))
+            return result
+        if text.count("=") == 1:
+            # Неявная форма ("y^2 = 2x^2 + C") сравнивается как lhs - rhs
+            lhs, rhs = text.split("=")
+            return _parse_expression(lhs) - _parse_expression(rhs)
+        return _parse_expression(text)
+    except Exception:
+        return None
+
+
+def _set_components(s: sp.Set) -> List[Tuple[float, float, bool, bool]]:
+    """Раскладывает множество на отсортированные (start, end, left_open, right_open)."""
+    if s == sp.S.Reals:
+        return [(-math.inf, math.inf, True, True)]
+    parts = s.args if isinstance(s, sp.Union) else (s,)
+    components = []
+    for part in parts:
+        if isinstance(part, sp.Interval):
+            components.append((float(part.start), float(part.end), bool(part.left_open), bool(part.right_open)))
+        elif isinstance(part, sp.FiniteSet):
+            components.extend((float(p), float(p), False, False) for p in part)
+        elif part != sp.S.EmptySet:
+            raise ValueError(f"Неподдерживаемое множество: {part}")
+    return sorted(components)
+
+
+def _sets_equivalent(ref: sp.Set, pred: sp.Set, tol: float) -> bool:
+    if ref == pred:
+        return True
+    ref_parts = _set_components(ref)
+    pred_parts = _set_components(pred)
+    if len(ref_parts) != len(pred_parts):
+        return False
+    for (r0, r1, rlo, rro), (p0, p1, plo, pro) in zip(ref_parts, pred_parts):
+        if (rlo, rro) != (plo, pro):
+            return False
+        for r, p in ((r0, p0), (r1, p1)):
+            if math.isinf(r) or math.isinf(p):
+                if r != p:
+                    return False
+            elif not math.isclose(r, p, rel_tol=tol, abs_tol=tol):
+                return False
+    return True
+
+
+def _numeric_verdict(ref: sp.Expr, pred: sp.Expr, num_points: int, tol: float) -> Optional[bool]:
+    """
+    Сравнивает выражения в случайных точках.
+    True/False — уверенный вердикт, None — численно решить не удалось.
+    """
+    symbols = sorted(ref.free_symbols | pred.free_symbols, key=str)
+    # Фиксированный seed: вердикт для пары не должен зависеть от порядка вызовов
+    rng = np.random.default_rng(0)
+    points = [rng.uniform(0.5, 2.0, num_points).astype(np.complex128) for _ in symbols]
+    with np.errstate(all="ignore"):
+        ref_vals = np.broadcast_to(sp.lambdify(symbols, ref, "numpy")(*points), (num_points,))
+        pred_vals = np.broadcast_to(sp.lambdify(symbols, pred, "numpy")(*points), (num_points,))
+        ref_vals = ref_vals.astype(np.complex128)
+        pred_vals = pred_vals.astype(np.complex128)
+    ref_ok = np.isfinite(ref_vals)
+    pred_ok = np.isfinite(pred_vals)
+    if not np.array_equal(ref_ok, pred_ok) or ref_ok.sum() < min(2, num_points):
+        return None
+    return bool(np.allclose(ref_vals[ref_ok], pred_vals[ref_ok], rtol=tol, atol=tol))
+
+
+def _time_budget_available() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def _call_with_time_budget(fn, budget: float):
+    """
+    Выполняет fn с ограничением по времени через SIGALRM.
+    Вне главного потока (или без setitimer) прервать sympy нельзя — возвращаем None.
+
+    Вызовы вкладываются: внутренний бюджет не длиннее остатка внешнего,
+    а после выхода внешний таймер взводится на оставшееся время.
+    """
+    if budget <= 0 or not _time_budget_available():
+        return None
+
+    class _Expired(_TimeBudgetExceeded):
+        pass
+
+    def _on_alarm(signum, frame):
+        raise _Expired
+
+    outer_remaining, _ = signal.getitimer(signal.ITIMER_REAL)
+    start = time.monotonic()
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, min(budget, outer_remaining) if outer_remaining else budget)
+    try:
+        return fn()
+    except _Expired:
+        return None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        if outer_remaining:
+            # Внешний бюджет мог уже истечь — тогда он сработает сразу
+            signal.setitimer(signal.ITIMER_REAL, max(outer_remaining - (time.monotonic() - start), 1e-6))
+
+
+def _exprs_equivalent(ref: sp.Expr, pred: sp.Expr, num_points: int, tol: float, time_budget: float) -> bool:
+    if ref == pred:
+        return True
+    if ref.has(sp.oo, -sp.oo, sp.zoo, sp.nan) or pred.has(sp.oo, -sp.oo, sp.zoo, sp.nan):
+        return False
+    verdict = _numeric_verdict(ref, pred, num_points, tol)
+    if verdict is not None:
+        return verdict
+    diff = ref - pred
+    verdict = _call_with_time_budget(lambda: sp.simplify(diff) == 0, time_budget)
+    if verdict is None:
+        # Бюджет недоступен или исчерпан — только дешёвая проверка
+        verdict = sp.expand(diff) == 0
+    return bool(verdict)
+
+
+@dataclass(frozen=True)
+class SymbolicReference:
+    """Эталон, нормализованный и разобранный один раз на группу ответов."""
+    norm: str
+    parsed: Optional[Union[sp.Expr, sp.Set]]
+
+
+def _within_symbolic_budget(fn):
+    """fn под общим бюджетом SYMBOLIC_TOTAL_BUDGET (None — не успели)."""
+    if not _time_budget_available():
+        return fn()
+    return _call_with_time_budget(fn, SYMBOLIC_TOTAL_BUDGET)
+
+
+def prepare_symbolic_reference(ref_answer: str) -> SymbolicReference:
+    norm = normalize_math_answer(str(ref_answer))
+    parsed = _within_symbolic_budget(lambda: parse_symbolic_answer(norm))
+    return SymbolicReference(norm, parsed)
+
+
+@lru_cache(maxsize=SYMBOLIC_CACHE_SIZE)
+def _cached_symbolic_equivalence(ref: SymbolicReference, pred_norm: str) -> bool:
+    if ref.norm == pred_norm:
+        return True
+    pred = parse_symbolic_answer(pred_norm)
+    if ref.parsed is None or pred is None:
+        return False
+    try:
+        if isinstance(ref.parsed, sp.Set) or isinstance(pred, sp.Set):
+            if not (isinstance(ref.parsed, sp.Set) and isinstance(pred, sp.Set)):
+                return False
+            return _sets_equivalent(ref.parsed, pred, SYMBOLIC_TOL)
+        if not (isinstance(ref.parsed, sp.Expr) and isinstance(pred, sp.Expr)):
+            return False
+        return _exprs_equivalent(ref.parsed, pred, SYMBOLIC_NUM_POINTS, SYMBOLIC_TOL, SYMBOLIC_TIME_BUDGET)
+    except Exception:
+        return False
+
+
+def symbolic_equivalent_prepared(ref: SymbolicReference, pred_answer: str) -> bool:
+    """check_symbolic_equivalence для уже подготовленного эталона."""
+    if not pred_answer or len(str(pred_answer)) > SYMBOLIC_MAX_LENGTH:
+        return False
+    # Нормализация, разбор и сравнение — под общим бюджетом; не успели — неверно
+    return bool(_within_symbolic_budget(
+        lambda: _cached_symbolic_equivalence(ref, normalize_math_answer(str(pred_answer)))
+    ))
+
+
+def check_symbolic_equivalence(ref_answer: str, pred_answer: str) -> bool:
+    """
+    Проверяет, что два ответа задают одно и то же выражение или множество:
+    "x^2/2 + C" ~ "0.5*x**2 + C", "(-∞, 2)" ~ "x < 2".
+
+    Сначала численное сравнение в случайных точках, затем (если вердикта нет)
+    sp.simplify с ограничением SYMBOLIC_TIME_BUDGET. Разбор и сравнение
+    ответа ограничены SYMBOLIC_TOTAL_BUDGET. Результаты кэшируются в LRU по
+    паре (эталон, нормализованный ответ).
+    """
+    if not ref_answer or not pred_answer:
+        return False
+    return symbolic_equivalent_prepared(prepare_symbolic_reference(ref_answer), pred_answer)
+
+
+def reward_symbolic(ref_answer: str, pred_answer: str) -> float:
+    return 1.0 if check_symbolic_equivalence(ref_answer, pred_answer) else 0.0
+
+
+@dataclass(frozen=True)
+class InequalityReference:
+    interval_set: Any                 # IntervalSet или None
+    symbolic: SymbolicReference
+
+
+def prepare_inequality_reference(ref_answer: str) -> InequalityReference:
+    # Ленивый импорт: пакет re_rl.tasks при импорте загружает все задачи
+    from re_rl.tasks.math.algebra.interval_set import IntervalSet
+
+    return InequalityReference(IntervalSet.parse(str(ref_answer)), prepare_symbolic_reference(ref_answer))
+
+
+def reward_inequality_prepared(ref: InequalityReference, pred_answer: str) -> float:
+    from re_rl.tasks.math.algebra.interval_set import IntervalSet
+
+    pred_set = IntervalSet.parse(str(pred_answer))
+    if ref.interval_set is not None and pred_set is not None:
+        return 1.0 if ref.interval_set.equivalent(pred_set, SYMBOLIC_TOL) else 0.0
+    return 1.0 if symbolic_equivalent_prepared(ref.symbolic, pred_answer) else 0.0
+
+
+def reward_inequality(ref_answer: str, pred_answer: str) -> float:
+    """
+    Множества решений неравенств: если оба ответа разбираются в
+    IntervalSet, сравнение идёт по концам за O(k); иначе — через sympy.
+    """
+    return reward_inequality_prepared(prepare_inequality_reference(ref_answer), pred_answer)
+
+
+##############################################################################
+# 3.2) Физические ответы: число + единица измерения
+##############################################################################
+
+PHYSICS_TASK_TYPES = {
+    "kinematics", "dynamics", "energy", "momentum",
+    "circuits", "electrostatics", "capacitors",
+    "gas_laws", "heat_transfer", "waves", "optics",
+    "quantum", "nuclear", "magnetism", "relativity",
+    "oscillations", "fluids", "astrophysics",
+}
+
+# Относительный допуск: модель может брать g = 9.8 вместо 9.81 и т.п.
+PHYSICS_RTOL = 1e-2
+PHYSICS_CACHE_SIZE = 65536
+
+_PHYSICS_NUMBER = r"[-+]?\d+(?:[.,]\d+)?(?:[eE][-+]?\d+)?"
+_PHYSICS_QUANTITY = re.compile(
+    rf"({_PHYSICS_NUMBER})"
+    r"(?:\s*[×x*·⋅]\s*10\^\(?([-+]?\d+)\)?)?"
+    r"(?:\s*([^\s\d,;()=<>≤≥+\-][^\s,;()=]*))?"
+)
+_PARENTHESIZED = re.compile(r"\([^()]*\)")
+
+# (тип величины или None, значение в СИ, значение как написано, единица как написана)
+PhysicsQuantity = Tuple[Optional[str], float, float, str]
+
+
+@lru_cache(maxsize=1)
+def _physics_unit_index() -> Dict[str, Tuple[str, float, float]]:
+    # Ленивый импорт: пакет re_rl.tasks при импорте загружает все задачи
+    from re_rl.tasks.physics.units import build_reverse_unit_index
+    return build_reverse_unit_index()
+
+
+def _lookup_unit(unit: str) -> Optional[Tuple[str, float, float]]:
+    index = _physics_unit_index()
+    unit = unit.replace("*", "·").replace("⋅", "·")
+    if unit in index:
+        return index[unit]
+    return index.get(unit.rstrip("."))
+
+
+@lru_cache(maxsize=PHYSICS_CACHE_SIZE)
+def parse_physics_answer(text: str) -> Tuple[PhysicsQuantity, ...]:
+    """
+    Извлекает из ответа все величины вида "число [единица]" (ru и en нотация)
+    и переводит их в СИ: "2140 мэВ" -> ("energy", 3.43e-19, 2140.0, "мэВ").
+
+    Пояснения в скобках ("180806.53 км", "(избыточное)") отбрасываются,
+    если вне скобок есть хотя бы одно число.
+    """
+    # Ленивый импорт: пакет re_rl.tasks при импорте загружает все задачи
+    from re_rl.tasks.physics.units import normalize_multiword_units
+
+    s = normalize_multiword_units(text).replace("−", "-").replace("·10", "×10")
+    s = re.sub(r"[⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺]+", lambda m: "^" + m.group(0).translate(_SUPERSCRIPT_DIGITS), s)
+    outside = _PARENTHESIZED.sub(" ", s)
+    if re.search(r"\d", outside):
+        s = outside
+
+    quantities = []
+    for number, exponent, unit in _PHYSICS_QUANTITY.findall(s):
+        raw = float(number.replace(",", "."))
+        if exponent:
+            raw *= 10.0 ** int(exponent)
+        unit = unit or ""
+        entry = _lookup_unit(unit) if unit else None
+        if entry is None:
+            quantities.append((None, raw, raw, unit))
+        else:
+            unit_type, factor, offset = entry
+            quantities.append((unit_type, raw * factor + offset, raw, unit))
+    return tuple(quantities)
+
+
+def _max_matching(close: np.ndarray) -> int:
+    """Размер наибольшего паросочетания в двудольном графе close[ref, pred] (алгоритм Куна)."""
+    owner = [-1] * close.shape[1]
+
+    def augment(r: int, seen: List[bool]) -> bool:
+        for c in np.flatnonzero(close[r]):
+            if not seen[c]:
+                seen[c] = True
+                if owner[c] < 0 or augment(owner[c], seen):
+                    owner[c] = r
+                    return True
+        return False
+
+    return sum(augment(r, [False] * close.shape[1]) for r in range(close.shape[0]))
+
+
+def reward_physics_batch(
+    ref_answers: List[str],
+    pred_answers: List[str],
+    rtol: float = PHYSICS_RTOL,
+) -> List[float]:
+    """
+    Сравнивает пачку физических ответов с эталонами с учётом единиц.
+
+    Величина эталона и величина ответа совместимы, если они одного типа и
+    близки в СИ. Если у одной из сторон единица не распознана или не указана,
+    сравниваются записанные числа (число без единицы засчитывается и как
+    значение в СИ: "0.4382" для "43.82%"). Каждая величина ответа засчитывается
+    не более чем одной величине эталона (наибольшее паросочетание), а ответ,
+    в котором величин больше, чем в эталоне, получает 0: перечисление многих
+    значений не должно угадывать ответ. Награда — доля найденных величин
+    эталона. Сравнения всех пар батча выполняются одним вызовом numpy.
+    """
+    ref_quantities = [parse_physics_answer(ref or "") for ref in ref_answers]
+    return _physics_batch_scores(ref_answers, ref_quantities, pred_answers, rtol)
+
+
+def _physics_batch_scores(
+    ref_answers: List[str],
+    ref_quantities: List[Tuple[PhysicsQuantity, ...]],
+    pred_answers: List[str],
+    rtol: float = PHYSICS_RTOL,
+) -> List[float]:
+    """reward_physics_batch по уже разобранным величинам эталонов."""
+    n = len(ref_answers)
+    scores = [0.0] * n
+    ref_si, pred_si, ref_raw, pred_raw = [], [], [], []
+    same_type, raw_ok, pred_bare = [], [], []
+    # (номер ответа, число величин эталона, число величин ответа, начало блока пар)
+    blocks = []
+
+    for i, (ref_text, ref_qs, pred_text) in enumerate(zip(ref_answers, ref_quantities, pred_answers)):
+        if not ref_qs:
+            scores[i] = reward_default_str(ref_text or "", pred_text or "") if ref_text else 0.0
+            continue
+        pred_qs = parse_physics_answer(pred_text or "")
+        if not pred_qs or len(pred_qs) > len(ref_qs):
+            continue
+        blocks.append((i, len(ref_qs), len(pred_qs), len(ref_si)))
+        for ref_q in ref_qs:
+            for pred_q in pred_qs:
+                ref_si.append(ref_q[1])
+                pred_si.append(pred_q[1])
+                ref_raw.append(ref_q[2])
+                pred_raw.append(pred_q[2])
+                both_known = ref_q[0] is not None and pred_q[0] is not None
+                same_type.append(both_known and ref_q[0] == pred_q[0])
+                raw_ok.append(not both_known and (not pred_q[3] or not ref_q[3] or pred_q[3] == ref_q[3]))
+                pred_bare.append(not pred_q[3])
+
+    if not blocks:
+        return scores
+
+    close = (
+        np.asarray(same_type) & np.isclose(pred_si, ref_si, rtol=rtol, atol=0.0)
+    ) | (
+        np.asarray(raw_ok) & np.isclose(pred_raw, ref_raw, rtol=rtol, atol=0.0)
+    ) | (
+        np.asarray(pred_bare) & np.isclose(pred_raw, ref_si, rtol=rtol, atol=0.0)
+    )
+    for i, n_ref, n_pred, start in blocks:
+        block = close[start:start + n_ref * n_pred].reshape(n_ref, n_pred)
+        scores[i] = _max_matching(block) / n_ref
+    return scores
+
+
+def reward_physics(ref_answer: str, pred_answer: str) -> float:
+    return reward_physics_batch([ref_answer], [pred_answer])[0]
+
+
 ##############################################################################
 # 4) parse / compare для "Только проверка конечного результата"
 ##############################################################################
@@ -344,6 +1096,8 @@ def parse_ref_answer(task_type: str, text: str):
         return parse_cubic_answer(text)
     elif tt=="urn_probability":
         return parse_urn_probability_answer(text)
+    elif tt=="series":
+        return parse_series_answer(text)
     elif tt=="knights_knaves":
         return parse_knights_knaves_answer(text)
     elif tt=="futoshiki":
@@ -358,13 +1112,98 @@ def parse_ref_answer(task_type: str, text: str):
         return parse_system_linear_answer(text)
     return text.strip()
 
+@dataclass(frozen=True)
+class PreparedReference:
+    """
+    Эталон, извлечённый и разобранный один раз на группу ответов:
+    text — итоговый ответ эталона (для противоречий — весь текст),
+    value — разобранное значение, тип зависит от задачи (None — не разобран).
+    """
+    text: str
+    value: Any
+
+
+def _parse_linear_value(text: str) -> Optional[float]:
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_reference_value(task_type: str, text: str) -> Any:
+    """Разбор итогового ответа эталона в значение для сравнения."""
+    if task_type == "linear":
+        return _parse_linear_value(text)
+    if task_type == "knights_knaves":
+        return parse_knights_knaves_answer(text)
+    if task_type == "urn_probability":
+        return parse_urn_probability_answer(text)
+    if task_type == "series":
+        return parse_series_answer(text)
+    if task_type == "inequality":
+        return prepare_inequality_reference(text)
+    if task_type in SYMBOLIC_TASK_TYPES:
+        return prepare_symbolic_reference(text)
+    if task_type in PHYSICS_TASK_TYPES:
+        return parse_physics_answer(text)
+    if task_type == "contradiction":
+        return text.strip().lower()
+    return text
+
+
+def _compare_prepared(task_type: str, ref: PreparedReference, pred_val: str) -> float:
+    """Сравнение итогового ответа модели с подготовленным эталоном."""
+    if task_type == "linear":
+        pred_num = _parse_linear_value(pred_val)
+        if ref.value is None or pred_num is None:
+            return 0.0
+        return 1.0 if abs(ref.value - pred_num) < 1e-6 else 0.0
+    elif task_type == "knights_knaves":
+        pred_roles = parse_knights_knaves_answer(pred_val)
+        if not ref.value or not pred_roles:
+            return 0.0
+        return 1.0 if ref.value == pred_roles else 0.0
+    elif task_type == "urn_probability":
+        # Эталон — точная дробь: дробь в ответе должна совпасть точно,
+        # десятичная запись сравнивается с допуском на округление
+        pred_num = parse_urn_probability_answer(pred_val)
+        if ref.value is None or pred_num is None:
+            return 0.0
+        if "/" in _urn_probability_token(pred_val):
+            return 1.0 if ref.value == pred_num else 0.0
+        return reward_float(float(ref.value), float(pred_num))
+    elif task_type == "series":
+        # Сумма — точная дробь, как в urn_probability; вывод о сходимости — текстом
+        if ref.value is None:
+            return 1.0 if ref.text.strip().lower() == pred_val.strip().lower() else 0.0
+        pred_num = parse_series_answer(pred_val)
+        if pred_num is None:
+            return 0.0
+        if "." not in pred_val.rsplit("=", 1)[-1]:
+            return 1.0 if ref.value == pred_num else 0.0
+        return 1.0 if math.isclose(ref.value, pred_num, rel_tol=1e-4, abs_tol=1e-4) else 0.0
+    elif task_type == "contradiction":
+        # Для задачи противоречий сравниваем утверждения
+        return 1.0 if ref.value == pred_val.strip().lower() else 0.0
+    elif task_type == "inequality":
+        return reward_inequality_prepared(ref.value, pred_val)
+    elif task_type in SYMBOLIC_TASK_TYPES:
+        # Ответ может быть записан иначе, чем эталон: сравниваем по смыслу
+        return 1.0 if symbolic_equivalent_prepared(ref.value, pred_val) else 0.0
+    elif task_type in PHYSICS_TASK_TYPES:
+        # Значение сравнивается в СИ, единицы могут отличаться от эталона
+        return _physics_batch_scores([ref.text], [ref.value], [pred_val])[0]
+    else:
+        return 1.0 if ref.value == pred_val else 0.0
+
+
 def compare_answers(task_type: str, ref_val: Any, pred_val: Any) -> float:
     """
     Сравнивает ответы в зависимости от типа задачи.
     
     Args:
         task_type: Тип задачи
-        ref_val: Эталонное значение
+        ref_val: Эталонное значение (строка или PreparedReference)
         pred_val: Предсказанное значение
         
     Returns:
@@ -372,27 +1211,41 @@ def compare_answers(task_type: str, ref_val: Any, pred_val: Any) -> float:
     """
     if ref_val is None or pred_val is None:
         return 0.0
-        
-    if task_type == "linear":
-        # Для линейного уравнения сравниваем числа
-        try:
-            ref_num = float(ref_val)
-            pred_num = float(pred_val)
-            return 1.0 if abs(ref_num - pred_num) < 1e-6 else 0.0
-        except:
-            return 0.0
-    elif task_type == "knights_knaves":
-        # Для задачи рыцарей и лжецов сравниваем роли
-        ref_roles = parse_knights_knaves_answer(ref_val)
-        pred_roles = parse_knights_knaves_answer(pred_val)
-        if not ref_roles or not pred_roles:
-            return 0.0
-        return 1.0 if ref_roles == pred_roles else 0.0
-    elif task_type == "contradiction":
-        # Для задачи противоречий сравниваем утверждения
-        return 1.0 if ref_val.strip().lower() == pred_val.strip().lower() else 0.0
-    else:
-        return 1.0 if ref_val == pred_val else 0.0
+    if not isinstance(ref_val, PreparedReference):
+        if isinstance(ref_val, str):
+            ref_val = PreparedReference(ref_val, _parse_reference_value(task_type, ref_val))
+        else:
+            # Уже разобранное значение (число, дробь, роли)
+            ref_val = PreparedReference(str(ref_val), ref_val)
+    return _compare_prepared(task_type, ref_val, str(pred_val))
+
+
+def _extract_final_answer(text: str) -> str:
+    """Ответ из <answer>...</answer>, а если тегов нет — весь текст."""
+    _, final = extract_reasoning_and_answer(text)
+    return final if final else text
+
+
+def prepare_reference(task_type: str, ref_answer: str) -> PreparedReference:
+    """
+    Извлекает и разбирает эталон один раз, чтобы переиспользовать его
+    для всех ответов группы (см. score_prepared_answer): числа, дроби,
+    роли, sympy-выражения, множества и физические величины.
+    """
+    if task_type == "knights_knaves":
+        _, ref_final = extract_reasoning_and_answer(ref_answer)
+        ref_final = ref_final or ""
+        return PreparedReference(ref_final, parse_knights_knaves_answer(ref_final) if ref_final else None)
+    # Для противоречий используем весь текст ответа
+    text = ref_answer if task_type == "contradiction" else _extract_final_answer(ref_answer)
+    return PreparedReference(text, _parse_reference_value(task_type, text))
+
+
+def score_prepared_answer(task_type: str, prepared_ref: PreparedReference, pred_answer: str) -> float:
+    """Оценивает ответ модели против эталона, подготовленного prepare_reference."""
+    if task_type == "knights_knaves":
+        return _score_knights_knaves_roles(prepared_ref.value, pred_answer)
+    return _compare_prepared(task_type, prepared_ref, _extract_final_answer(pred_answer))
 
 
 def compute_correctness_score(task_type: str, ref_answer: str, pred_answer: str) -> float:
@@ -407,24 +1260,31 @@ def compute_correctness_score(task_type: str, ref_answer: str, pred_answer: str)
     Returns:
         float: Оценка корректности от 0 до 1
     """
-    if task_type == "knights_knaves":
-        return reward_knights_knaves(ref_answer, pred_answer)
-        
-    # Извлекаем ответ из предсказания, если он в формате с reasoning
-    _, pred_final = extract_reasoning_and_answer(pred_answer)
-    if not pred_final:  # Если не нашли в формате reasoning, используем как есть
-        pred_final = pred_answer
-        
-    # Для противоречий используем весь текст ответа
-    if task_type == "contradiction":
-        ref_final = ref_answer
+    return score_prepared_answer(task_type, prepare_reference(task_type, ref_answer), pred_answer)
+
+
+def score_group(task_type: str, ref_answer: str, pred_answers: List[str]) -> List[float]:
+    """
+    Оценивает все ответы одной группы (num_generations на один промпт).
+
+    Эталон разбирается один раз, одинаковые ответы оцениваются один раз
+    и затем раздаются по своим позициям. Физические ответы группы
+    сравниваются одним батчем.
+    """
+    prepared_ref = prepare_reference(task_type, ref_answer)
+    unique_answers = list(dict.fromkeys(pred_answers))
+
+    if task_type in PHYSICS_TASK_TYPES:
+        unique_scores = _physics_batch_scores(
+            [prepared_ref.text] * len(unique_answers),
+            [prepared_ref.value] * len(unique_answers),
+            [_extract_final_answer(a) for a in unique_answers],
+        )
     else:
-        # Для остальных задач пытаемся извлечь ответ из формата с reasoning
-        _, ref_final = extract_reasoning_and_answer(ref_answer)
-        if not ref_final:  # Если не нашли, используем как есть
-            ref_final = ref_answer
-            
-    return compare_answers(task_type, ref_final, pred_final)
+        unique_scores = [score_prepared_answer(task_type, prepared_ref, a) for a in unique_answers]
+
+    score_by_answer = dict(zip(unique_answers, unique_scores))
+    return [score_by_answer[a] for a in pred_answers]
 
 def extract_answer_value(task_type: str, answer: str) -> Any:
     """
@@ -531,11 +1391,6 @@ def reward_correctness(prompts, completions, answer, **kwargs) -> List[float]:
             # if extracted_ans:
             #     print(f"\nExtracted answer:\n{extracted_ans}")
             print("-"*20)
-            model_output = c["content"]
-            sc = compute_correctness_score(
-                task_type,
-                ref_answer,
-                model_output
-            )
-            rewards.append(sc)
+        # Эталон разбирается один раз на группу, дубликаты ответов не пересчитываются
+        rewards.extend(score_group(task_type, ref_answer, [c["content"] for c in gen_list]))
     return rewards
@@ -267,19 +267,19 @@ class BaseMathTask(BaseTask):
         return ""
 
     def generate_latex_solution(self) -> str:
-        import sympy as sp
+        """
+        Решение в виде align*. Формулы берутся из структурированных шагов
+        (formatting.Step) через кэшированный sp.latex; обычный текст
+        выводится в \\text{...} без попыток разобрать его как выражение.
+        """
+        from re_rl.tasks.formatting import step_to_latex
         latex_steps = []
         for i, step in enumerate(self.solution_steps):
-            try:
-                expr = sp.sympify(step)
-                latex_steps.append(sp.latex(expr))
-                if self.get_step_explanation(i):
-                    latex_steps.append(r"\text{" + self.get_step_explanation(i) + "}")
-                if self.get_step_validation(i):
-                    latex_steps.append(r"\text{" + self.get_step_validation(i) + "}")
-            except Exception:
-                safe_step = step.replace("_", r"\_").replace("%", r"\%")
-                latex_steps.append(r"\text{" + safe_step + "}")
+            latex_steps.append(step_to_latex(step))
+            if self.get_step_explanation(i):
+                latex_steps.append(step_to_latex(self.get_step_explanation(i)))
+            if self.get_step_validation(i):
+                latex_steps.append(step_to_latex(self.get_step_validation(i)))
         return r"\begin{align*}" + " \\\\\n".join(latex_steps) + r"\end{align*}"
 
     # ------------------------------------------------------------------
@@ -6,11 +6,20 @@
 - "text": обычный текстовый формат (x² + 2x - 3)
 - "latex": LaTeX формат ($x^{2} + 2x - 3$)
 - "unicode": Unicode символы (x² + 2x − 3)
+
+Шаги решения со структурой (Step, Math, format_step) хранят формулы
+отдельно от текста: генератор LaTeX берёт их через cached_latex и никогда
+не разбирает свободный текст.
 """
 
-from typing import Union, Any, Literal
+import re
+import string
+from dataclasses import dataclass
+from typing import Union, Any, Literal, Optional, Tuple
 import sympy as sp
 
+from re_rl.tasks.sympy_cache import cached_latex
+
 FormatType = Literal["text", "latex", "unicode"]
 
 
@@ -63,7 +72,7 @@ class MathFormatter:
                 return expr
         
         try:
-            return sp.latex(expr)
+            return cached_latex(expr)
         except:
             return str(expr)
     
@@ -403,3 +412,137 @@ def format_math(
 def format_value(value, unit: str, format_type: str = "text", precision: int = 4) -> str:
     """Форматирует физическую величину."""
     return MathFormatter.format_physics_value(value, unit, format_type, precision)
+
+
+# ---------------------------------------------------------------------------
+# Структурированные шаги решения
+# ---------------------------------------------------------------------------
+
+# Спецсимволы LaTeX в обычном тексте
+_LATEX_ESCAPES = {
+    "\\": r"\textbackslash{}", "{": r"\{", "}": r"\}", "_": r"\_", "%": r"\%",
+    "&": r"\&", "#": r"\#", "^": r"\^{}", "~": r"\~{}",
+}
+_LATEX_ESCAPE_RE = re.compile("|".join(re.escape(c) for c in _LATEX_ESCAPES))
+# Фрагменты $...$, которые задачи в режиме latex уже вставили в текст
+_INLINE_MATH_RE = re.compile(r"\$([^$]+)\$")
+
+
+def escape_latex_text(text: str) -> str:
+    """Экранирует спецсимволы LaTeX в тексте для \\text{...}."""
+    return _LATEX_ESCAPE_RE.sub(lambda m: _LATEX_ESCAPES[m.group(0)], text)
+
+
+def text_to_latex(text: str) -> str:
+    """
+    Свободный текст шага → LaTeX без разбора выражений: текст уходит в
+    \\text{...}, готовые фрагменты $...$ переносятся как есть.
+    """
+    parts = []
+    pos = 0
+    for match in _INLINE_MATH_RE.finditer(text):
+        if match.start() > pos:
+            parts.append(r"\text{" + escape_latex_text(text[pos:match.start()]) + "}")
+        parts.append(match.group(1))
+        pos = match.end()
+    if pos < len(text) or not parts:
+        parts.append(r"\text{" + escape_latex_text(text[pos:]) + "}")
+    return " ".join(parts)
+
+
+@dataclass(frozen=True)
+class Math:
+    """
+    Формула внутри шага: sympy-объект или готовые text/latex-представления
+    (для формул, которые задача форматирует сама, без sympy).
+    """
+
+    expr: Any = None
+    text: Optional[str] = None
+    latex: Optional[str] = None
+
+    def as_text(self) -> str:
+        if self.text is not None:
+            return self.text
+        return to_text(self.expr)
+
+    def as_latex(self) -> str:
+        if self.latex is not None:
+            return self.latex
+        if isinstance(self.expr, sp.Basic):
+            return cached_latex(self.expr)
+        return escape_latex_text(str(self.expr))
+
+
+class Step(str):
+    """
+    Шаг решения из сегментов: строк текста и формул Math.
+
+    Значение строки — текстовое представление шага, поэтому код, который
+    работает с solution_steps как со списком строк, не меняется.
+    """
+
+    segments: Tuple[Union[str, Math], ...]
+
+    def __new__(cls, *segments: Union[str, Math]) -> "Step":
+        text = "".join(seg.as_text() if isinstance(seg, Math) else seg for seg in segments)
+        step = super().__new__(cls, text)
+        merged = []
+        for seg in segments:
+            if merged and isinstance(seg, str) and isinstance(merged[-1], str):
+                merged[-1] += seg
+            else:
+                merged.append(seg)
+        step.segments = tuple(merged)
+        return step
+
+    def to_latex(self) -> str:
+        parts = []
+        for seg in self.segments:
+            if isinstance(seg, Math):
+                parts.append(seg.as_latex())
+            elif seg:
+                parts.append(text_to_latex(seg))
+        return " ".join(parts)
+
+
+def format_step(template: str, **fields: Any) -> Step:
+    """
+    str.format для шаблонов шагов: поля-Math (и sympy-выражения, кроме чисел) становятся
+    отдельными сегментами, сегменты вложенного Step сохраняются, остальные
+    поля подставляются в текст.
+    """
+    segments = []
+    buffer = ""
+    for literal, name, spec, conversion in string.Formatter().parse(template):
+        buffer += literal
+        if name is None:
+            continue
+        value = fields[name]
+        if isinstance(value, sp.Basic) and not value.is_Number:
+            value = Math(value)
+        if isinstance(value, Step):
+            if buffer:
+                segments.append(buffer)
+            segments.extend(value.segments)
+            buffer = ""
+        elif isinstance(value, Math):
+            if buffer:
+                segments.append(buffer)
+            segments.append(value)
+            buffer = ""
+        else:
+            if conversion:
+                value = {"r": repr, "s": str, "a": ascii}[conversion](value)
+            buffer += format(value, spec or "")
+    if buffer or not segments:
+        segments.append(buffer)
+    return Step(*segments)
+
+
+def step_to_latex(step: str) -> str:
+    """LaTeX для шага решения: Step — по сегментам, строка — как текст."""
+    if isinstance(step, Step):
+        return step.to_latex()
+    return text_to_latex(step)
+
@@ -335,20 +335,10 @@ def generate_random_system_linear_task(
     """
     Генерируем систему линейных уравнений размером size x size.
     Матрица shape = (size, size+1).
-    Метод Крамера, a!=0 => суммарный дет!=0 (не всегда гарантирован).
-    """
-    import numpy as np
-
-    while True:
-        # Генерируем случайную матрицу (size x (size+1))
-        # Например, коэф из -5..5, ensure not all zero
-        mat = np.random.randint(-5, 6, size=(size, size+1))
-        # Проверим, что A есть invertible
-        A = mat[:, :-1]
-        detA = round(np.linalg.det(A), 5)
-        if abs(detA) < 1e-3:
-            continue
-        return SystemLinearTask(mat.tolist(), language=language, detail_level=detail_level)
+    Система строится от целого решения и матрицы с ненулевым определителем,
+    поэтому она всегда невырождена.
+    """
+    return SystemLinearTask(size=size, max_coef=5, language=language, detail_level=detail_level)
 
 
 ##################################################
@@ -10,11 +10,12 @@ GroupTheoryTask — задачи по теории групп.
 """
 
 import random
-from sympy import mod_inverse, gcd, randprime, totient, factorint
+from sympy import mod_inverse, gcd
 from sympy.combinatorics import Permutation
 from sympy.combinatorics.permutations import Cycle
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.discrete.number_tables import random_prime
 from typing import Optional, Dict, Any
 
 
@@ -63,7 +64,7 @@ class GroupTheoryTask(BaseMathTask):
         """Генерирует данные группы."""
         if self.group_type == "cyclic":
             if not self.modulus:
-                self.modulus = randprime(5, 20) if self.task_type == "inverse_element" else random.randint(5, 15)
+                self.modulus = random_prime(5, 20) if self.task_type == "inverse_element" else random.randint(5, 15)
             
             if self.element is None:
                 if self.task_type == "inverse_element":
@@ -1,23 +1,30 @@
 # re_rl/tasks/cubic_task.py
 
 import random
-import sympy as sp
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.algebra.polynomials import (
+    expand_roots, format_polynomial, format_root, normalize, sample_root, solve_cubic,
+)
 from typing import Dict, Any, ClassVar
 
 
 class CubicTask(BaseMathTask):
     """
     Решает кубическое уравнение: a*x³ + b*x² + c*x + d = 0.
+    
+    При генерации по difficulty уравнение строится от корней (root_kind:
+    integer — три целых, rational — один рациональный, surd — пара p ± q√r),
+    поэтому корни известны точно. Для заданных коэффициентов корни ищутся
+    по теореме о рациональных корнях; sympy нужен, только если их нет.
     """
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
-        1: {"max_coef": 3},
-        3: {"max_coef": 5},
-        5: {"max_coef": 10},
-        7: {"max_coef": 15},
-        10: {"max_coef": 20},
+        1: {"max_coef": 3, "root_kind": "integer"},
+        3: {"max_coef": 5, "root_kind": "integer"},
+        5: {"max_coef": 10, "root_kind": "rational"},
+        7: {"max_coef": 15, "root_kind": "rational"},
+        10: {"max_coef": 20, "root_kind": "surd"},
     }
     
     def __init__(
@@ -31,9 +38,11 @@ class CubicTask(BaseMathTask):
         difficulty: int = None,
         output_format: OutputFormat = "text"
     ):
-        if difficulty is not None:
+        if difficulty is not None and None in (a, b, c, d):
             preset = self._interpolate_difficulty(difficulty)
             max_coef = preset.get("max_coef", 10)
+            if (a, b, c, d) == (None, None, None, None):
+                a, b, c, d = self._generate_coefficients(max_coef, preset.get("root_kind", "integer"))
             if a is None:
                 a = random.randint(1, max_coef)
                 if random.random() < 0.3:
@@ -59,21 +68,40 @@ class CubicTask(BaseMathTask):
         
         super().__init__(description, language, detail_level, output_format)
     
+    @staticmethod
+    def _generate_coefficients(max_coef: int, root_kind: str) -> tuple:
+        """Выбирает корни и раскрывает (x - x1)(x - x2)(x - x3) в целых числах."""
+        bound = max(2, max_coef // 3)
+        if root_kind == "surd":
+            roots = [sample_root(random, "integer", bound), sample_root(random, "surd", max(1, bound // 2))]
+        elif root_kind == "rational":
+            roots = [sample_root(random, "rational", bound)] + [sample_root(random, "integer", bound) for _ in range(2)]
+        else:
+            roots = [sample_root(random, "integer", bound) for _ in range(3)]
+        coeffs = normalize(expand_roots(roots))
+        if random.random() < 0.3:
+            coeffs = [-k for k in coeffs]
+        return tuple(coeffs)
+    
     @staticmethod
     def _format_equation(a, b, c, d, output_format: OutputFormat = "text") -> str:
         """Форматирует кубическое уравнение."""
-        x = sp.Symbol('x')
-        expr = a*x**3 + b*x**2 + c*x + d
-        
         if output_format == "latex":
-            return f"${sp.latex(expr)} = 0$"
+            return f"${format_polynomial([a, b, c, d], 'latex')} = 0$"
         else:
-            return sp.pretty(expr)
+            return f"{format_polynomial([a, b, c, d])} = 0"
+    
+    def _roots_strings(self, style: str) -> list:
+        """Корни в виде строк; sympy — только если рациональных корней нет."""
+        roots = solve_cubic(self.a, self.b, self.c, self.d)
+        if roots:
+            return [format_root(r, style) for r in roots]
+        import sympy as sp
+        x = sp.Symbol('x')
+        sympy_roots = sp.solve(self.a*x**3 + self.b*x**2 + self.c*x + self.d, x)
+        return [sp.latex(r) if style == "latex" else str(r) for r in sympy_roots]
 
     def solve(self):
-        x = sp.symbols('x')
-        eq = sp.Eq(self.a*x**3 + self.b*x**2 + self.c*x + self.d, 0)
-        roots = sp.solve(eq, x)
         
         is_latex = self._output_format == "latex"
         step_tmpl = PROMPT_TEMPLATES["default"]["step"][self.language]
@@ -87,12 +115,13 @@ class CubicTask(BaseMathTask):
         
         # Шаг 2: Корни
         if is_latex:
-            roots_latex = ", ".join(sp.latex(r) for r in roots)
+            roots_latex = ", ".join(self._roots_strings("latex"))
             text = f"{roots_label}: ${roots_latex}$"
             self.final_answer = f"${roots_latex}$"
         else:
-            text = f"{roots_label}: {roots}"
-            self.final_answer = str(roots)
+            roots_text = f"[{', '.join(self._roots_strings('text'))}]"
+            text = f"{roots_label}: {roots_text}"
+            self.final_answer = roots_text
         self.solution_steps.append(step_tmpl.format(n=2, text=text))
 
     def get_task_type(self):
@@ -0,0 +1,129 @@
+# re_rl/tasks/math/algebra/exact_linear.py
+
+"""
+Точные системы линейных уравнений.
+
+- gauss_solve: метод Гаусса в Fraction — точный определитель и решение
+  без погрешностей float;
+- construct_system: построение «от решения». Выбирается целый вектор x и
+  целая матрица с заданным определителем: диагональ (det, 1, ..., 1)
+  перемешивается случайными элементарными преобразованиями строк и
+  столбцов (прибавление кратного, перестановка), которые не меняют |det|.
+  Правая часть b = A·x, поэтому система всегда невырождена, а ответ целый;
+  отбраковки вырожденных матриц нет, и 8×8 строится за миллисекунды.
+"""
+
+import random
+from fractions import Fraction
+from typing import List, Optional, Sequence, Tuple
+
+Matrix = List[List[int]]
+
+
+def gauss_solve(
+    A: Sequence[Sequence], b: Sequence
+) -> Tuple[Fraction, Optional[List[Fraction]]]:
+    """
+    Решает A·x = b методом Гаусса в рациональных числах.
+
+    Returns:
+        (det(A), x) — при det(A) = 0 вместо x возвращается None
+    """
+    n = len(A)
+    rows = [[Fraction(v) for v in A[i]] + [Fraction(b[i])] for i in range(n)]
+    det = Fraction(1)
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if rows[r][col] != 0), None)
+        if pivot is None:
+            return Fraction(0), None
+        if pivot != col:
+            rows[col], rows[pivot] = rows[pivot], rows[col]
+            det = -det
+        pivot_row = rows[col]
+        det *= pivot_row[col]
+        for r in range(col + 1, n):
+            factor = rows[r][col] / pivot_row[col]
+            if factor:
+                row = rows[r]
+                for k in range(col, n + 1):
+                    row[k] -= factor * pivot_row[k]
+
+    x = [Fraction(0)] * n
+    for i in range(n - 1, -1, -1):
+        s = rows[i][n] - sum(rows[i][k] * x[k] for k in range(i + 1, n))
+        x[i] = s / rows[i][i]
+    return det, x
+
+
+def _max_abs(M: Matrix) -> int:
+    return max(abs(v) for row in M for v in row)
+
+
+def random_matrix_with_det(
+    n: int,
+    det: int = 1,
+    max_coef: int = 10,
+    steps: Optional[int] = None,
+    rng=random,
+) -> Matrix:
+    """
+    Целая матрица n×n с определителем det.
+
+    Начинаем с diag(det, 1, ..., 1) и применяем случайные преобразования
+    row_i += k·row_j и col_i += k·col_j (det не меняется) и перестановки
+    строк с одновременной сменой знака строки (det тоже не меняется).
+    Преобразование отменяется, если элемент выходит за max_coef.
+    """
+    M = [[0] * n for _ in range(n)]
+    for i in range(n):
+        M[i][i] = 1
+    M[0][0] = det
+    if n == 1:
+        return M
+    steps = steps if steps is not None else 4 * n * n
+    bound = max(max_coef, abs(det))
+    k_max = max(1, min(3, max_coef // 2))
+
+    for _ in range(steps):
+        i, j = rng.sample(range(n), 2)
+        op = rng.random()
+        if op < 0.1:
+            # Перестановка строк меняет знак det, поэтому одна строка ещё и умножается на -1
+            M[i], M[j] = M[j], [-v for v in M[i]]
+            continue
+        k = rng.choice([-1, 1]) * rng.randint(1, k_max)
+        if op < 0.55:
+            new_row = [a + k * b for a, b in zip(M[i], M[j])]
+            if max(abs(v) for v in new_row) <= bound:
+                M[i] = new_row
+        else:
+            new_col = [M[r][i] + k * M[r][j] for r in range(n)]
+            if max(abs(v) for v in new_col) <= bound:
+                for r in range(n):
+                    M[r][i] = new_col[r]
+    return M
+
+
+def construct_system(
+    n: int,
+    max_coef: int = 10,
+    det: Optional[int] = None,
+    rng=random,
+) -> Tuple[Matrix, List[int], List[int]]:
+    """
+    Строит систему A·x = b с целым решением x.
+
+    Args:
+        n: Число уравнений и неизвестных
+        max_coef: Ограничение на коэффициенты матрицы и компоненты решения
+        det: Определитель A (по умолчанию случайный из ±1..±3)
+
+    Returns:
+        (A, x, b)
+    """
+    if det is None:
+        det = rng.choice([-1, 1]) * rng.randint(1, 3)
+    A = random_matrix_with_det(n, det, max_coef, rng=rng)
+    x = [rng.randint(-max_coef, max_coef) for _ in range(n)]
+    b = [sum(a * v for a, v in zip(row, x)) for row in A]
+    return A, x, b
@@ -9,15 +9,23 @@ InequalityTask — задачи на неравенства.
 - rational: дробно-рациональные неравенства
 - absolute: неравенства с модулем
 - system: системы неравенств
+
+Все виды решаются общим методом интервалов над точными множествами
+(см. interval_set); ответ — каноническая интервальная запись.
 """
 
 import random
-import math
+from fractions import Fraction
+from functools import reduce
 from typing import List, Dict, Any, Optional, Tuple, ClassVar
 from dataclasses import dataclass
 
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.algebra.polynomials import (
+    expand_roots, format_number, sample_root, solve_quadratic,
+)
+from re_rl.tasks.math.algebra.interval_set import FLIP, IntervalSet, solve_sign
 
 
 class InequalityTask(BaseMathTask):
@@ -86,14 +94,13 @@ class InequalityTask(BaseMathTask):
             self.c = self._rand_coef()
         
         elif self.task_type == "quadratic":
-            self.a = self._rand_coef(exclude_zero=True)
-            self.b = self._rand_coef()
-            self.c = self._rand_coef()
-            # Гарантируем действительные корни для интересного решения
-            discriminant = self.b ** 2 - 4 * self.a * self.c
-            while discriminant < 0:
-                self.c = self._rand_coef()
-                discriminant = self.b ** 2 - 4 * self.a * self.c
+            # От корней: целые (рациональные при complexity ≥ 3), иногда кратный корень
+            kind = "rational" if self.complexity >= 3 else "integer"
+            max_root = max(2, min(10, self.max_coef // 3))
+            r1 = sample_root(random, kind, max_root)
+            r2 = r1 if self.complexity >= 2 and random.random() < 0.15 else sample_root(random, kind, max_root)
+            leading = random.choice([-1, 1]) * random.randint(1, 2)
+            self.a, self.b, self.c = expand_roots([r1, r2], leading)
         
         elif self.task_type == "rational":
             # (ax + b) / (cx + d) > 0
@@ -111,16 +118,13 @@ class InequalityTask(BaseMathTask):
             self.value = abs(self._rand_coef()) + 1  # Положительное значение
         
         elif self.task_type == "system":
-            # Система двух линейных неравенств
-            self.a1 = self._rand_coef(exclude_zero=True)
-            self.b1 = self._rand_coef()
-            self.c1 = self._rand_coef()
-            self.sign1 = random.choice(self.SIGNS)
-            
-            self.a2 = self._rand_coef(exclude_zero=True)
-            self.b2 = self._rand_coef()
-            self.c2 = self._rand_coef()
-            self.sign2 = random.choice(self.SIGNS)
+            # Система линейных неравенств: 2 при complexity 1-2, до 4 при complexity 5
+            count = 2 + (self.complexity - 1) // 2
+            self.system = [
+                (self._rand_coef(exclude_zero=True), self._rand_coef(), random.choice(self.SIGNS), self._rand_coef())
+                for _ in range(count)
+            ]
+            (self.a1, self.b1, self.sign1, self.c1), (self.a2, self.b2, self.sign2, self.c2) = self.system[:2]
     
     def _format_sign(self, sign: str) -> str:
         """Форматирует знак неравенства."""
@@ -167,9 +171,8 @@ class InequalityTask(BaseMathTask):
         
         elif self.task_type == "system":
             template = templates.get("system", {}).get(self.language, "")
-            ineq1 = f"{self.a1}x + {self.b1} {self.sign1} {self.c1}"
-            ineq2 = f"{self.a2}x + {self.b2} {self.sign2} {self.c2}"
-            return template.format(inequalities=f"{ineq1}\n{ineq2}")
+            inequalities = [f"{self._format_linear_expr(a, b)} {sign} {c}" for a, b, sign, c in self.system]
+            return template.format(inequalities="\n".join(inequalities))
         
         return ""
     
@@ -195,8 +198,14 @@ class InequalityTask(BaseMathTask):
     
     def _flip_sign(self, sign: str) -> str:
         """Меняет направление неравенства."""
-        flip_map = {"<": ">", ">": "<", "≤": "≥", "≥": "≤"}
-        return flip_map.get(sign, sign)
+        return FLIP.get(sign, sign)
+    
+    def _linear_solution(self, a: int, b: int, sign: str, c: int) -> Tuple[IntervalSet, str, Fraction]:
+        """ax + b sign c → (множество решений, итоговый знак, граница)."""
+        boundary = Fraction(c - b, a)
+        solution, _ = solve_sign(lambda x: a * x + b - c, sign, zeros=[boundary])
+        final_sign = sign if a > 0 else self._flip_sign(sign)
+        return solution, final_sign, boundary
     
     def _solve_linear(self, templates):
         """Решение линейного неравенства ax + b < c."""
@@ -205,178 +214,93 @@ class InequalityTask(BaseMathTask):
         template1 = templates.get("linear_solve", {}).get(self.language, "")
         self.solution_steps.append(template1.format(step=1, a=self.a, sign=self.sign, c=self.c, b=self.b, rhs=rhs))
         
-        result = rhs / self.a
+        solution, final_sign, boundary = self._linear_solution(self.a, self.b, self.sign, self.c)
+        result = format_number(boundary)
         
         if self.a > 0:
             template2 = templates.get("divide_positive", {}).get(self.language, "")
-            self.solution_steps.append(template2.format(step=2, a=self.a, sign=self.sign, result=f"{result:.4f}"))
-            final_sign = self.sign
+            self.solution_steps.append(template2.format(step=2, a=self.a, sign=final_sign, result=result))
         else:
             template2 = templates.get("divide_negative", {}).get(self.language, "")
-            final_sign = self._flip_sign(self.sign)
-            self.solution_steps.append(template2.format(step=2, a=self.a, new_sign=final_sign, result=f"{result:.4f}"))
-        
-        # Формируем ответ в интервальной записи
-        result_val = result
-        if final_sign == "<":
-            answer = f"(-∞, {result_val:.4f})"
-        elif final_sign == "≤":
-            answer = f"(-∞, {result_val:.4f}]"
-        elif final_sign == ">":
-            answer = f"({result_val:.4f}, +∞)"
-        else:  # ≥
-            answer = f"[{result_val:.4f}, +∞)"
+            self.solution_steps.append(template2.format(step=2, a=self.a, new_sign=final_sign, result=result))
         
-        self.final_answer = answer
+        # Ответ в интервальной записи
+        self.final_answer = solution.format()
     
     def _solve_quadratic(self, templates):
-        """Решение квадратного неравенства."""
-        discriminant = self.b ** 2 - 4 * self.a * self.c
-        
-        if discriminant > 0:
-            x1 = (-self.b - math.sqrt(discriminant)) / (2 * self.a)
-            x2 = (-self.b + math.sqrt(discriminant)) / (2 * self.a)
-            if x1 > x2:
-                x1, x2 = x2, x1
-            
-            template = templates.get("quadratic_roots", {}).get(self.language, "")
-            self.solution_steps.append(template.format(step=1, x1=f"{x1:.4f}", x2=f"{x2:.4f}"))
-            
-            # Анализ знаков
-            if self.a > 0:
-                if self.sign in ["<", "≤"]:
-                    bracket_left = "[" if self.sign == "≤" else "("
-                    bracket_right = "]" if self.sign == "≤" else ")"
-                    answer = f"{bracket_left}{x1:.4f}, {x2:.4f}{bracket_right}"
-                else:
-                    bracket_left = "[" if self.sign == "≥" else "("
-                    bracket_right = "]" if self.sign == "≥" else ")"
-                    answer = f"(-∞, {x1:.4f}{bracket_right} ∪ {bracket_left}{x2:.4f}, +∞)"
-            else:
-                if self.sign in ["<", "≤"]:
-                    answer = f"(-∞, {x1:.4f}) ∪ ({x2:.4f}, +∞)"
-                else:
-                    answer = f"[{x1:.4f}, {x2:.4f}]"
-        
-        elif discriminant == 0:
-            x = -self.b / (2 * self.a)
-            answer = f"x = {x:.4f}" if self.sign in ["≤", "≥"] else "∅"
+        """Решение квадратного неравенства методом интервалов."""
+        roots = [r.p for r in solve_quadratic(self.a, self.b, self.c) if r.is_rational]
         
-        else:
-            if (self.a > 0 and self.sign in [">", "≥"]) or (self.a < 0 and self.sign in ["<", "≤"]):
-                answer = "ℝ"
-            else:
-                answer = "∅"
+        if roots:
+            x1, x2 = roots[0], roots[-1]
+            template = templates.get("quadratic_roots", {}).get(self.language, "")
+            self.solution_steps.append(template.format(step=1, x1=format_number(x1), x2=format_number(x2)))
         
+        solution, chart = solve_sign(
+            lambda x: (self.a * x + self.b) * x + self.c, self.sign, zeros=roots
+        )
         template2 = templates.get("sign_analysis", {}).get(self.language, "")
-        self.solution_steps.append(template2.format(step=2, intervals=answer))
+        self.solution_steps.append(template2.format(step=2, intervals=chart.format()))
         
-        self.final_answer = answer
+        self.final_answer = solution.format()
     
     def _solve_rational(self, templates):
-        """Решение дробно-рационального неравенства."""
-        # Корни числителя и знаменателя
-        x_num = -self.b / self.a if self.a != 0 else None
-        x_den = -self.d / self.c if self.c != 0 else None
+        """Решение дробно-рационального неравенства методом интервалов."""
+        # Нуль числителя входит в ответ при нестрогом знаке, нуль знаменателя — никогда
+        x_num = Fraction(-self.b, self.a)
+        x_den = Fraction(-self.d, self.c)
         
         template = templates.get("critical_points", {}).get(self.language, "")
-        points_str = f"x = {x_num:.4f}, x = {x_den:.4f}" if x_num and x_den else "точки не определены"
-        self.solution_steps.append(template.format(step=1, points=points_str))
-        
-        # Упрощённый анализ знаков
-        if x_num and x_den:
-            x_min, x_max = sorted([x_num, x_den])
-            
-            if self.sign in [">", "≥"]:
-                # Положительное значение
-                if (self.a > 0 and self.c > 0) or (self.a < 0 and self.c < 0):
-                    answer = f"(-∞, {x_min:.4f}) ∪ ({x_max:.4f}, +∞)"
-                else:
-                    answer = f"({x_min:.4f}, {x_max:.4f})"
-            else:
-                if (self.a > 0 and self.c > 0) or (self.a < 0 and self.c < 0):
-                    answer = f"({x_min:.4f}, {x_max:.4f})"
-                else:
-                    answer = f"(-∞, {x_min:.4f}) ∪ ({x_max:.4f}, +∞)"
-        else:
-            answer = "требуется дополнительный анализ"
+        self.solution_steps.append(template.format(
+            step=1, points=f"x = {format_number(x_num)}, x = {format_number(x_den)}"
+        ))
         
-        self.final_answer = answer
+        solution, chart = solve_sign(
+            lambda x: Fraction(self.a * x + self.b) / (self.c * x + self.d),
+            self.sign, zeros=[x_num], poles=[x_den],
+        )
+        template2 = templates.get("sign_analysis", {}).get(self.language, "")
+        self.solution_steps.append(template2.format(step=2, intervals=chart.format()))
+        
+        self.final_answer = solution.format()
     
     def _solve_absolute(self, templates):
-        """Решение неравенства с модулем."""
+        """Решение неравенства с модулем: |ax + b| - value меняет знак при ax + b = ±value."""
         expression = self._format_linear_expr(self.a, self.b)
         
         template = templates.get("absolute_split", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, expression=expression))
         
-        # |ax + b| < c эквивалентно -c < ax + b < c
-        # |ax + b| > c эквивалентно ax + b < -c или ax + b > c
-        
-        if self.sign in ["<", "≤"]:
-            # -value < ax + b < value
-            x1 = (-self.value - self.b) / self.a
-            x2 = (self.value - self.b) / self.a
-            if x1 > x2:
-                x1, x2 = x2, x1
-            
-            bracket = "[]" if self.sign == "≤" else "()"
-            answer = f"({x1:.4f}, {x2:.4f})" if self.sign == "<" else f"[{x1:.4f}, {x2:.4f}]"
-        else:
-            # ax + b < -value или ax + b > value
-            x1 = (-self.value - self.b) / self.a
-            x2 = (self.value - self.b) / self.a
-            if x1 > x2:
-                x1, x2 = x2, x1
-            
-            if self.sign == ">":
-                answer = f"(-∞, {x1:.4f}) ∪ ({x2:.4f}, +∞)"
-            else:
-                answer = f"(-∞, {x1:.4f}] ∪ [{x2:.4f}, +∞)"
+        zeros = sorted({Fraction(-self.value - self.b, self.a), Fraction(self.value - self.b, self.a)})
+        template2 = templates.get("critical_points", {}).get(self.language, "")
+        self.solution_steps.append(template2.format(
+            step=2, points=", ".join(f"x = {format_number(z)}" for z in zeros)
+        ))
         
-        self.final_answer = answer
+        solution, chart = solve_sign(lambda x: abs(self.a * x + self.b) - self.value, self.sign, zeros=zeros)
+        template3 = templates.get("sign_analysis", {}).get(self.language, "")
+        self.solution_steps.append(template3.format(step=3, intervals=chart.format()))
+        
+        self.final_answer = solution.format()
     
     def _solve_system(self, templates):
-        """Решение системы неравенств."""
-        # Решаем каждое неравенство отдельно
-        rhs1 = self.c1 - self.b1
-        result1 = rhs1 / self.a1
-        sign1 = self.sign1 if self.a1 > 0 else self._flip_sign(self.sign1)
-        
-        rhs2 = self.c2 - self.b2
-        result2 = rhs2 / self.a2
-        sign2 = self.sign2 if self.a2 > 0 else self._flip_sign(self.sign2)
-        
+        """Решение системы: пересечение множеств решений всех неравенств."""
         misc = PROMPT_TEMPLATES.get("inequality", {}).get("misc", {})
-        
-        step1 = misc.get("system_first_ineq", {}).get(self.language, "")
-        self.solution_steps.append(step1.format(sign=sign1, value=f"{result1:.4f}"))
-        
-        step2 = misc.get("system_second_ineq", {}).get(self.language, "")
-        self.solution_steps.append(step2.format(sign=sign2, value=f"{result2:.4f}"))
-        
-        # Находим пересечение
-        # Упрощённая логика
+        keys = ["system_first_ineq", "system_second_ineq"]
+        
+        solutions = []
+        for i, (a, b, sign, c) in enumerate(self.system):
+            solution, final_sign, boundary = self._linear_solution(a, b, sign, c)
+            solutions.append(solution)
+            key = keys[i] if i < len(keys) else "system_nth_ineq"
+            step = misc.get(key, {}).get(self.language, "")
+            self.solution_steps.append(step.format(
+                step=i + 1, index=i + 1, sign=final_sign, value=format_number(boundary)
+            ))
+        
+        answer = reduce(IntervalSet.intersection, solutions).format()
         template = templates.get("system_intersection", {}).get(self.language, "")
-        
-        # Определяем границы
-        left_bound = max(
-            result1 if sign1 in [">", "≥"] else float("-inf"),
-            result2 if sign2 in [">", "≥"] else float("-inf")
-        )
-        right_bound = min(
-            result1 if sign1 in ["<", "≤"] else float("inf"),
-            result2 if sign2 in ["<", "≤"] else float("inf")
-        )
-        
-        if left_bound < right_bound:
-            answer = f"({left_bound:.4f}, {right_bound:.4f})"
-        elif left_bound == right_bound:
-            answer = f"x = {left_bound:.4f}"
-        else:
-            answer = "∅"
-        
-        self.solution_steps.append(template.format(step=3, intersection=answer))
+        self.solution_steps.append(template.format(step=len(self.system) + 1, intersection=answer))
         
         self.final_answer = answer
     
@@ -0,0 +1,353 @@
+# re_rl/tasks/math/algebra/interval_set.py
+
+"""
+Множества на числовой прямой: объединения непересекающихся промежутков.
+
+IntervalSet хранит отсортированный кортеж Interval (концы — Fraction или
+±inf, у каждого конца флаг «включён») в каноническом виде: промежутки не
+пересекаются и не касаются. Поэтому объединение, пересечение и дополнение —
+линейные проходы слиянием, а сравнение двух множеств — сравнение кортежей.
+
+solve_sign — общий метод интервалов для всех видов неравенств: функция
+вычисляется в пробной точке каждого промежутка между критическими точками
+(нули и точки разрыва), нули включаются при нестрогом знаке, разрывы — никогда.
+
+format / parse — каноническая запись ответа "(-∞, 2) ∪ [3, +∞)" и её разбор
+(также "x ≤ 3", "-1 < x < 2", "x = 3", "ℝ", "∅"); по ней ответы сравниваются
+без sympy.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from re_rl.tasks.math.algebra.polynomials import format_number
+
+Endpoint = Union[Fraction, float]   # float — только ±inf или иррациональный конец
+
+INF = math.inf
+STRICT = {"<": True, ">": True, "≤": False, "≥": False, "<=": False, ">=": False}
+FLIP = {"<": ">", ">": "<", "≤": "≥", "≥": "≤"}
+
+
+@dataclass(frozen=True, order=True)
+class Interval:
+    lo: Endpoint
+    hi: Endpoint
+    lo_closed: bool = False
+    hi_closed: bool = False
+
+    def is_empty(self) -> bool:
+        return self.lo > self.hi or (self.lo == self.hi and not (self.lo_closed and self.hi_closed))
+
+
+def _touches(left: Interval, right: Interval) -> bool:
+    """Промежутки (left.lo ≤ right.lo) пересекаются или касаются без зазора."""
+    return left.hi > right.lo or (left.hi == right.lo and (left.hi_closed or right.lo_closed))
+
+
+class IntervalSet:
+    """Объединение промежутков в каноническом виде (неизменяемое)."""
+
+    __slots__ = ("intervals",)
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        merged: List[Interval] = []
+        for iv in sorted(iv for iv in intervals if not iv.is_empty()):
+            if merged and _touches(merged[-1], iv):
+                last = merged[-1]
+                if iv.hi > last.hi or (iv.hi == last.hi and iv.hi_closed):
+                    hi, hi_closed = iv.hi, iv.hi_closed or (iv.hi == last.hi and last.hi_closed)
+                else:
+                    hi, hi_closed = last.hi, last.hi_closed
+                lo_closed = last.lo_closed or (iv.lo == last.lo and iv.lo_closed)
+                merged[-1] = Interval(last.lo, hi, lo_closed, hi_closed)
+            else:
+                merged.append(iv)
+        self.intervals: Tuple[Interval, ...] = tuple(merged)
+
+    # ---------------------------------------------------------- конструкторы
+
+    @classmethod
+    def empty(cls) -> "IntervalSet":
+        return cls()
+
+    @classmethod
+    def reals(cls) -> "IntervalSet":
+        return cls([Interval(-INF, INF)])
+
+    @classmethod
+    def point(cls, x: Endpoint) -> "IntervalSet":
+        return cls([Interval(x, x, True, True)])
+
+    @classmethod
+    def from_relation(cls, sign: str, value: Endpoint) -> "IntervalSet":
+        """Множество {x : x sign value}."""
+        closed = not STRICT[sign]
+        if sign in ("<", "≤", "<="):
+            return cls([Interval(-INF, value, False, closed)])
+        return cls([Interval(value, INF, closed, False)])
+
+    # -------------------------------------------------------------- операции
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet(self.intervals + other.intervals)
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        """Пересечение слиянием двух отсортированных списков, O(k + m)."""
+        result = []
+        a, b = self.intervals, other.intervals
+        i = j = 0
+        while i < len(a) and j < len(b):
+            x, y = a[i], b[j]
+            if x.lo > y.lo or (x.lo == y.lo and not x.lo_closed):
+                lo, lo_closed = x.lo, x.lo_closed
+            else:
+                lo, lo_closed = y.lo, y.lo_closed
+            if x.hi < y.hi or (x.hi == y.hi and not x.hi_closed):
+                hi, hi_closed = x.hi, x.hi_closed
+            else:
+                hi, hi_closed = y.hi, y.hi_closed
+            result.append(Interval(lo, hi, lo_closed, hi_closed))
+            if x.hi < y.hi or (x.hi == y.hi and not x.hi_closed):
+                i += 1
+            else:
+                j += 1
+        return IntervalSet(result)
+
+    def complement(self) -> "IntervalSet":
+        result = []
+        lo, lo_closed = -INF, False
+        for iv in self.intervals:
+            result.append(Interval(lo, iv.lo, lo_closed, not iv.lo_closed))
+            lo, lo_closed = iv.hi, not iv.hi_closed
+        result.append(Interval(lo, INF, lo_closed, False))
+        return IntervalSet(iv for iv in result if not (iv.lo == iv.hi and math.isinf(iv.lo)))
+
+    __or__ = union
+    __and__ = intersection
+
+    def __invert__(self) -> "IntervalSet":
+        return self.complement()
+
+    def contains(self, x: Endpoint) -> bool:
+        for iv in self.intervals:
+            if (iv.lo < x or (iv.lo == x and iv.lo_closed)) and (x < iv.hi or (x == iv.hi and iv.hi_closed)):
+                return True
+        return False
+
+    __contains__ = contains
+
+    def is_empty(self) -> bool:
+        return not self.intervals
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self.intervals == other.intervals
+
+    def __hash__(self) -> int:
+        return hash(self.intervals)
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({self.format()})"
+
+    def equivalent(self, other: "IntervalSet", tol: float = 1e-3) -> bool:
+        """
+        Совпадение по концам за O(k). Рациональные концы сравниваются точно
+        ((-∞, 2.001) ≠ (-∞, 2)); с точностью tol — только пара приближённых
+        (float) концов, например 1.4142 и 1.41421 для √2.
+        """
+        if len(self.intervals) != len(other.intervals):
+            return False
+        for x, y in zip(self.intervals, other.intervals):
+            if (x.lo_closed, x.hi_closed) != (y.lo_closed, y.hi_closed):
+                return False
+            for p, q in ((x.lo, y.lo), (x.hi, y.hi)):
+                if math.isinf(p) or math.isinf(q):
+                    if p != q:
+                        return False
+                elif isinstance(p, float) and isinstance(q, float):
+                    if not math.isclose(p, q, rel_tol=tol, abs_tol=tol):
+                        return False
+                elif p != q:
+                    return False
+        return True
+
+    # ------------------------------------------------------------------ запись
+
+    def format(self) -> str:
+        """Каноническая запись: "(-∞, 2) ∪ [3, +∞)", "x = 3", "ℝ", "∅"."""
+        if not self.intervals:
+            return "∅"
+        if self.intervals == (Interval(-INF, INF),):
+            return "ℝ"
+        if len(self.intervals) == 1 and self.intervals[0].lo == self.intervals[0].hi:
+            return f"x = {format_endpoint(self.intervals[0].lo)}"
+        parts = []
+        for iv in self.intervals:
+            if iv.lo == iv.hi:
+                parts.append(f"{{{format_endpoint(iv.lo)}}}")
+            else:
+                parts.append(
+                    f"{'[' if iv.lo_closed else '('}{format_endpoint(iv.lo)}, "
+                    f"{format_endpoint(iv.hi)}{']' if iv.hi_closed else ')'}"
+                )
+        return " ∪ ".join(parts)
+
+    @classmethod
+    def parse(cls, text: str) -> Optional["IntervalSet"]:
+        """Разбирает ответ в интервальной записи или в виде неравенств; None — не удалось."""
+        text = text.strip().strip("$").strip().rstrip(".")
+        for src, dst in _REPLACEMENTS:
+            text = text.replace(src, dst)
+        if not text:
+            return None
+        result = cls.empty()
+        for piece in _SEPARATOR.split(text):
+            parsed = _parse_piece(piece.strip())
+            if parsed is None:
+                return None
+            result = result | parsed
+        return result
+
+
+def format_endpoint(x: Endpoint) -> str:
+    if x == INF:
+        return "+∞"
+    if x == -INF:
+        return "-∞"
+    if isinstance(x, float):
+        return f"{x:.4f}"
+    return format_number(x)
+
+
+# --------------------------------------------------------------------- разбор
+
+# Замены по порядку: \left и \leq раньше \le, иначе «\left(» станет «≤ft(»
+_REPLACEMENTS = [
+    ("\\left", ""), ("\\right", ""), ("\\leq", "≤"), ("\\geq", "≥"), ("\\le", "≤"), ("\\ge", "≥"),
+    ("\\infty", "∞"), ("\\cup", "∪"), ("\\emptyset", "∅"), ("\\mathbb{R}", "ℝ"),
+    ("<=", "≤"), (">=", "≥"), ("−", "-"), ("oo", "∞"), ("inf", "∞"),
+]
+_SEPARATOR = re.compile(r"\s*(?:∪|\bU\b|\bor\b|\bили\b)\s*")
+_INTERVAL = re.compile(r"^([\[(])\s*([^,;]+?)\s*[,;]\s*([^,;]+?)\s*([\])])$")
+_RELATION = re.compile(r"(≤|≥|<|>)")
+
+
+def _parse_number(text: str) -> Optional[Endpoint]:
+    text = text.replace(" ", "").lstrip("+")
+    if text in ("∞", "+∞"):
+        return INF
+    if text == "-∞":
+        return -INF
+    try:
+        value = Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+    # Десятичная запись — приближение (так печатаются иррациональные концы), её конец — float
+    if "." in text and "/" not in text:
+        return float(value)
+    return value
+
+
+def _parse_piece(piece: str) -> Optional[IntervalSet]:
+    piece = re.sub(r"^x\s*(?:∈|in)\s*", "", piece)
+    if piece in ("ℝ", "R", "(-∞, +∞)"):
+        return IntervalSet.reals()
+    if piece in ("∅", "{}"):
+        return IntervalSet.empty()
+
+    m = _INTERVAL.match(piece)
+    if m:
+        left, a, b, right = m.groups()
+        lo, hi = _parse_number(a), _parse_number(b)
+        if lo is None or hi is None:
+            return None
+        return IntervalSet([Interval(lo, hi, left == "[", right == "]")])
+
+    m = re.match(r"^(?:x\s*=\s*|\{)\s*([^{}=]+?)\s*\}?$", piece)
+    if m and not _RELATION.search(piece):
+        value = _parse_number(m.group(1))
+        return IntervalSet.point(value) if value is not None else None
+
+    # Цепочка отношений: "x < 2", "-1 < x ≤ 3", "2 > x"
+    tokens = [t.strip() for t in _RELATION.split(piece)]
+    if len(tokens) < 3 or "x" not in tokens[::2]:
+        return None
+    result = IntervalSet.reals()
+    for i in range(0, len(tokens) - 2, 2):
+        lhs, op, rhs = tokens[i], tokens[i + 1], tokens[i + 2]
+        if lhs == "x":
+            value = _parse_number(rhs)
+        elif rhs == "x":
+            value, op = _parse_number(lhs), FLIP[op]
+        else:
+            return None
+        if value is None:
+            return None
+        result = result & IntervalSet.from_relation(op, value)
+    return result
+
+
+# ---------------------------------------------------------- метод интервалов
+
+@dataclass
+class SignChart:
+    """Таблица знаков: критические точки и знак функции на промежутках между ними."""
+
+    points: List[Endpoint]
+    signs: List[int]          # len(points) + 1 значений: -1, 0, +1
+
+    def format(self) -> str:
+        bounds = [-INF] + list(self.points) + [INF]
+        symbol = {1: "+", -1: "-", 0: "0"}
+        return ", ".join(
+            f"({format_endpoint(a)}, {format_endpoint(b)}): {symbol[s]}"
+            for a, b, s in zip(bounds, bounds[1:], self.signs)
+        )
+
+
+def _test_point(a: Endpoint, b: Endpoint) -> Endpoint:
+    if math.isinf(a) and math.isinf(b):
+        return Fraction(0)
+    if math.isinf(a):
+        return b - 1 if isinstance(b, Fraction) else math.floor(b) - 1
+    if math.isinf(b):
+        return a + 1 if isinstance(a, Fraction) else math.ceil(a) + 1
+    return (a + b) / 2
+
+
+def _sign(value) -> int:
+    return (value > 0) - (value < 0)
+
+
+def solve_sign(
+    f: Callable[[Endpoint], Union[Fraction, float]],
+    sign: str,
+    zeros: Sequence[Endpoint] = (),
+    poles: Sequence[Endpoint] = (),
+) -> Tuple[IntervalSet, SignChart]:
+    """
+    Метод интервалов для f(x) sign 0.
+
+    Args:
+        f: Функция, непрерывная вне poles и меняющая знак только в zeros и poles
+        sign: "<", ">", "≤" или "≥"
+        zeros: Нули f
+        poles: Точки, где f не определена
+
+    Returns:
+        (множество решений, таблица знаков)
+    """
+    points = sorted(set(zeros) | set(poles))
+    bounds = [-INF] + points + [INF]
+    signs = [_sign(f(_test_point(a, b))) for a, b in zip(bounds, bounds[1:])]
+    wanted = 1 if sign in (">", "≥", ">=") else -1
+
+    pieces = [
+        Interval(a, b) for a, b, s in zip(bounds, bounds[1:], signs) if s == wanted
+    ]
+    if not STRICT[sign]:
+        pieces += [Interval(z, z, True, True) for z in set(zeros) - set(poles)]
+    return IntervalSet(pieces), SignChart(points, signs)
@@ -1,9 +1,9 @@
 # re_rl/tasks/linear_task.py
 
 import random
-import sympy as sp
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.algebra.polynomials import format_number, solve_linear, to_fraction
 from typing import Dict, Any, Optional, ClassVar
 
 class LinearTask(BaseMathTask):
@@ -118,10 +118,9 @@ class LinearTask(BaseMathTask):
         super().add_solution_step(step, explanation, validation)
 
     def solve(self):
-        x = sp.symbols('x')
-        eq = sp.Eq(self.a * x + self.b, self.c)
-        solution = sp.solve(eq, x)[0]
-        right_side = self.c - self.b
+        # a*x + (b - c) = 0, точный корень в Fraction (дробные коэффициенты — по десятичной записи)
+        right_side = to_fraction(self.c) - to_fraction(self.b)
+        solution = solve_linear(self.a, -right_side)
         
         is_latex = self._output_format == "latex"
         step_tmpl = PROMPT_TEMPLATES["default"]["step"][self.language]
@@ -139,25 +138,28 @@ class LinearTask(BaseMathTask):
         # Шаг 2: Переносим b в правую часть
         if self.detail_level >= 2:
             if is_latex:
-                text = f"{move_label} {self.b}: ${self.a}x = {self.c} - ({self.b}) = {right_side}$"
+                text = f"{move_label} {self.b}: ${self.a}x = {self.c} - ({self.b}) = {format_number(right_side, 'latex')}$"
             else:
-                text = f"{self.a}x = {self.c} - {self.b} = {right_side}"
+                text = f"{self.a}x = {self.c} - {self.b} = {format_number(right_side)}"
             self.solution_steps.append(step_tmpl.format(n=2, text=text))
         
         # Шаг 3: Делим на коэффициент
         if self.detail_level >= 3:
             if is_latex:
-                sol_latex = sp.latex(solution)
-                text = f"$x = \\frac{{{right_side}}}{{{self.a}}} = {sol_latex}$"
+                sol_latex = format_number(solution, "latex")
+                text = f"$x = \\frac{{{format_number(right_side, 'latex')}}}{{{self.a}}} = {sol_latex}$"
             else:
-                text = f"x = {right_side} / {self.a} = {solution}"
+                numerator = format_number(right_side)
+                if "/" in numerator:
+                    numerator = f"({numerator})"
+                text = f"x = {numerator} / {self.a} = {format_number(solution)}"
             self.solution_steps.append(step_tmpl.format(n=3, text=text))
         
         # Финальный ответ
         if is_latex:
-            self.final_answer = f"$x = {sp.latex(solution)}$"
+            self.final_answer = f"$x = {format_number(solution, 'latex')}$"
         else:
-            self.final_answer = str(solution)
+            self.final_answer = format_number(solution)
 
     def get_task_type(self):
         return "linear"
@@ -0,0 +1,310 @@
+# re_rl/tasks/math/algebra/polynomials.py
+
+"""
+Точная арифметика многочленов для линейных, квадратных и кубических уравнений.
+
+Генерация идёт «от корней»: сначала выбираются корни (целые, рациональные
+или пары p ± q√r), затем многочлен раскрывается в целых числах. Для
+уравнений с заданными коэффициентами корни ищутся по теореме о рациональных
+корнях и формуле дискриминанта. Печать многочленов и корней — собственная,
+без sympy; sympy нужен только для verify_roots и для кубических уравнений
+без рациональных корней.
+
+Коэффициенты хранятся от старшего к младшему: [a, b, c] для ax² + bx + c.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import List, Sequence, Tuple, Union
+
+Number = Union[int, Fraction, float]
+
+ROOT_KINDS = ("integer", "rational", "surd")
+
+_SUPERSCRIPTS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+@dataclass(frozen=True)
+class Root:
+    """
+    Корень вида p + q·√r (при imaginary — p + q·√r·i).
+    Рациональный корень: q = 0.
+    """
+
+    p: Fraction
+    q: Fraction = Fraction(0)
+    r: int = 1
+    imaginary: bool = False
+
+    @property
+    def is_rational(self) -> bool:
+        return self.q == 0
+
+    def sort_key(self) -> Tuple[float, float]:
+        if self.imaginary:
+            return (float(self.p), float(self.q))
+        return (float(self.p) + float(self.q) * math.sqrt(self.r), 0.0)
+
+    def to_complex(self) -> complex:
+        radical = float(self.q) * math.sqrt(self.r)
+        return complex(float(self.p), radical) if self.imaginary else complex(float(self.p) + radical, 0.0)
+
+
+# ----------------------------------------------------------------- раскрытие
+
+def poly_mul(p: Sequence[int], q: Sequence[int]) -> List[int]:
+    """Произведение многочленов с целыми коэффициентами."""
+    result = [0] * (len(p) + len(q) - 1)
+    for i, a in enumerate(p):
+        for j, b in enumerate(q):
+            result[i + j] += a * b
+    return result
+
+
+def normalize(coeffs: Sequence[int]) -> List[int]:
+    """Делит коэффициенты на их НОД и делает старший положительным."""
+    g = 0
+    for c in coeffs:
+        g = math.gcd(g, c)
+    g = g or 1
+    sign = -1 if coeffs[0] < 0 else 1
+    return [sign * c // g for c in coeffs]
+
+
+def factor_for_root(root: Root) -> List[int]:
+    """Минимальный целочисленный множитель для корня (линейный или квадратный)."""
+    if root.is_rational:
+        return [root.p.denominator, -root.p.numerator]
+    # (x - p)² - q²r (или + q²r для мнимых), домноженный до целых коэффициентов
+    b = -2 * root.p
+    c = root.p ** 2 + (1 if root.imaginary else -1) * root.q ** 2 * root.r
+    den = math.lcm(b.denominator, c.denominator)
+    return [den, int(b * den), int(c * den)]
+
+
+def expand_roots(roots: Sequence[Root], leading: int = 1) -> List[int]:
+    """
+    Многочлен с целыми коэффициентами и заданными корнями.
+    Пару p ± q√r достаточно передать один раз (второй корень — сопряжённый).
+    """
+    coeffs = [leading]
+    for root in roots:
+        coeffs = poly_mul(coeffs, factor_for_root(root))
+    return coeffs
+
+
+# ------------------------------------------------------------------- корни
+
+def _squarefree(n: int) -> Tuple[int, int]:
+    """n = k²·m, m свободно от квадратов; возвращает (k, m)."""
+    k, m = 1, n
+    d = 2
+    while d * d <= m:
+        while m % (d * d) == 0:
+            m //= d * d
+            k *= d
+        d += 1
+    return k, m
+
+
+def sample_root(rng=random, kind: str = "integer", max_value: int = 10) -> Root:
+    """Случайный корень: integer, rational (знаменатель 2-4) или surd (p ± q√r)."""
+    if kind == "integer":
+        return Root(Fraction(rng.randint(-max_value, max_value)))
+    if kind == "rational":
+        den = rng.randint(2, 4)
+        num = rng.randint(-max_value, max_value)
+        while num % den == 0:
+            num = rng.randint(-max_value, max_value)
+        return Root(Fraction(num, den))
+    if kind == "surd":
+        r = rng.choice([2, 3, 5, 6, 7, 10, 11])
+        den = rng.choice([1, 1, 2])
+        return Root(Fraction(rng.randint(-max_value, max_value), den), Fraction(rng.randint(1, 3), den), r)
+    raise ValueError(f"Неизвестный вид корня: {kind}. Доступные: {ROOT_KINDS}")
+
+
+def conjugates(root: Root) -> List[Root]:
+    """Все корни множителя: сам корень и, для иррационального, сопряжённый."""
+    if root.is_rational:
+        return [root]
+    return [Root(root.p, -root.q, root.r, root.imaginary), root]
+
+
+def to_fraction(value: Number) -> Fraction:
+    """
+    Точное значение коэффициента. float берётся по десятичной записи:
+    0.1 — это 1/10, а не 3602879701896397/36028797018963968.
+    """
+    if isinstance(value, float):
+        return Fraction(repr(value))
+    return Fraction(value)
+
+
+def solve_linear(a: Number, b: Number) -> Fraction:
+    """Корень a·x + b = 0."""
+    return -to_fraction(b) / to_fraction(a)
+
+
+def solve_quadratic(a: Number, b: Number, c: Number) -> List[Root]:
+    """Корни a·x² + b·x + c = 0 (a ≠ 0), без повторов, в порядке возрастания."""
+    a, b, c = to_fraction(a), to_fraction(b), to_fraction(c)
+    disc = b * b - 4 * a * c
+    p = -b / (2 * a)
+    if disc == 0:
+        return [Root(p)]
+    # √(n/d) = √(n·d)/d
+    k, r = _squarefree(abs(disc.numerator) * disc.denominator)
+    q = Fraction(k, disc.denominator) / (2 * abs(a))
+    if r == 1 and disc > 0:
+        return sorted([Root(p - q), Root(p + q)], key=Root.sort_key)
+    return [Root(p, -q, r, disc < 0), Root(p, q, r, disc < 0)]
+
+
+def _divisors(n: int) -> List[int]:
+    n = abs(n)
+    small = [d for d in range(1, math.isqrt(n) + 1) if n % d == 0]
+    return sorted(set(small + [n // d for d in small]))
+
+
+def poly_value(coeffs: Sequence[Number], x: Fraction) -> Fraction:
+    """Значение многочлена в точке по схеме Горнера."""
+    result = Fraction(0)
+    for c in coeffs:
+        result = result * x + c
+    return result
+
+
+def rational_roots(coeffs: Sequence[int]) -> List[Fraction]:
+    """Рациональные корни многочлена с целыми коэффициентами (без повторов)."""
+    coeffs = list(coeffs)
+    roots = []
+    while coeffs and coeffs[-1] == 0:
+        coeffs.pop()
+        if Fraction(0) not in roots:
+            roots.append(Fraction(0))
+    if len(coeffs) <= 1:
+        return roots
+    for num in _divisors(coeffs[-1]):
+        for den in _divisors(coeffs[0]):
+            for candidate in (Fraction(num, den), Fraction(-num, den)):
+                if candidate not in roots and poly_value(coeffs, candidate) == 0:
+                    roots.append(candidate)
+    return sorted(roots)
+
+
+def deflate(coeffs: Sequence[Number], root: Fraction) -> List[Fraction]:
+    """Деление многочлена на (x - root) по схеме Горнера."""
+    result = [Fraction(coeffs[0])]
+    for c in coeffs[1:-1]:
+        result.append(result[-1] * root + c)
+    return result
+
+
+def solve_cubic(a: int, b: int, c: int, d: int) -> List[Root]:
+    """
+    Корни кубического уравнения с рациональным корнем (без повторов).
+    Если рациональных корней нет, возвращает пустой список.
+    """
+    found = rational_roots([a, b, c, d])
+    if not found:
+        return []
+    rest = solve_quadratic(*deflate([a, b, c, d], found[0]))
+    real = {Root(r) for r in found} | {r for r in rest if not r.imaginary}
+    return sorted(real, key=Root.sort_key) + [r for r in rest if r.imaginary]
+
+
+# ------------------------------------------------------------------ печать
+
+def format_number(value: Number, style: str = "text") -> str:
+    """Рациональное число: "7/3" (text) или "\\frac{7}{3}" (latex)."""
+    value = to_fraction(value)
+    if value.denominator == 1:
+        return str(value.numerator)
+    if style == "latex":
+        sign = "-" if value < 0 else ""
+        return f"{sign}\\frac{{{abs(value.numerator)}}}{{{value.denominator}}}"
+    return str(value)
+
+
+def format_root(root: Root, style: str = "text") -> str:
+    """
+    Запись корня: "1/2 + sqrt(5)/2", "-1 - 2*I" (text, как str(sympy))
+    или "\\frac{1}{2} + \\frac{\\sqrt{5}}{2}" (latex).
+    """
+    if root.is_rational:
+        return format_number(root.p, style)
+
+    q = abs(root.q)
+    if style == "latex":
+        base = f"\\sqrt{{{root.r}}}" if root.r != 1 else ""
+        if root.imaginary:
+            base = f"{base} i" if base else "i"
+        body = base if q.numerator == 1 else f"{q.numerator} {base}"
+        radical = f"\\frac{{{body}}}{{{q.denominator}}}" if q.denominator != 1 else body
+    else:
+        base = f"sqrt({root.r})" if root.r != 1 else ""
+        if root.imaginary:
+            base = f"{base}*I" if base else "I"
+        radical = base if q.numerator == 1 else f"{q.numerator}*{base}"
+        if q.denominator != 1:
+            radical += f"/{q.denominator}"
+
+    if root.p == 0:
+        return radical if root.q > 0 else f"-{radical}"
+    sign = "+" if root.q > 0 else "-"
+    return f"{format_number(root.p, style)} {sign} {radical}"
+
+
+def format_polynomial(coeffs: Sequence[Number], style: str = "text", var: str = "x") -> str:
+    """
+    Многочлен по коэффициентам от старшего к младшему:
+    "2x² - 3x + 1" (text) или "2 x^{2} - 3 x + 1" (latex).
+    """
+    degree = len(coeffs) - 1
+    parts: List[str] = []
+    for i, coef in enumerate(coeffs):
+        if coef == 0:
+            continue
+        power = degree - i
+        magnitude = abs(coef)
+        if power == 0:
+            term = format_number(magnitude, style)
+        else:
+            if power == 1:
+                var_part = var
+            elif style == "latex":
+                var_part = f"{var}^{{{power}}}"
+            else:
+                var_part = var + str(power).translate(_SUPERSCRIPTS)
+            if magnitude == 1:
+                term = var_part
+            else:
+                sep = " " if style == "latex" else ""
+                term = f"{format_number(magnitude, style)}{sep}{var_part}"
+        if not parts:
+            parts.append(f"-{term}" if coef < 0 else term)
+        else:
+            parts.append(f" - {term}" if coef < 0 else f" + {term}")
+    return "".join(parts) if parts else "0"
+
+
+def verify_roots(coeffs: Sequence[Number], roots: Sequence[Root]) -> bool:
+    """Проверка через sympy: множество корней совпадает с sp.solve (медленно)."""
+    import sympy as sp
+
+    x = sp.Symbol("x")
+    poly = sum(sp.nsimplify(c) * x ** (len(coeffs) - 1 - i) for i, c in enumerate(coeffs))
+    expected = set(sp.solve(poly, x))
+
+    def to_sympy(root: Root):
+        value = sp.Rational(root.p.numerator, root.p.denominator)
+        radical = sp.Rational(root.q.numerator, root.q.denominator) * sp.sqrt(root.r)
+        return sp.nsimplify(value + (sp.I * radical if root.imaginary else radical))
+
+    actual = {to_sympy(r) for r in roots}
+    return len(actual) == len(expected) and all(
+        any(sp.simplify(a - e) == 0 for e in expected) for a in actual
+    )
@@ -1,10 +1,11 @@
 # re_rl/tasks/quadratic_task.py
 
 import random
-import sympy as sp
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
-from re_rl.tasks.formatting import MathFormatter
+from re_rl.tasks.math.algebra.polynomials import (
+    expand_roots, format_polynomial, format_root, normalize, sample_root, solve_quadratic,
+)
 from typing import Dict, Any, ClassVar
 
 class QuadraticTask(BaseMathTask):
@@ -17,19 +18,22 @@ class QuadraticTask(BaseMathTask):
       - difficulty 5-6: коэффициенты 1-10
       - difficulty 7-8: коэффициенты 1-20
       - difficulty 9-10: коэффициенты до 50, иррациональные корни
+    
+    Задачи строятся от корней (root_kind: integer, rational, surd), корни
+    и запись уравнения получаются точной арифметикой без sympy.
     """
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
-        1: {"max_coef": 3, "ensure_integer_roots": True},
-        2: {"max_coef": 3, "ensure_integer_roots": True},
-        3: {"max_coef": 5, "ensure_integer_roots": True},
-        4: {"max_coef": 5, "ensure_integer_roots": True},
-        5: {"max_coef": 10, "ensure_integer_roots": True},
-        6: {"max_coef": 10, "ensure_integer_roots": False},
-        7: {"max_coef": 20, "ensure_integer_roots": False},
-        8: {"max_coef": 20, "ensure_integer_roots": False},
-        9: {"max_coef": 50, "ensure_integer_roots": False},
-        10: {"max_coef": 50, "ensure_integer_roots": False},
+        1: {"max_coef": 3, "ensure_integer_roots": True, "root_kind": "integer"},
+        2: {"max_coef": 3, "ensure_integer_roots": True, "root_kind": "integer"},
+        3: {"max_coef": 5, "ensure_integer_roots": True, "root_kind": "integer"},
+        4: {"max_coef": 5, "ensure_integer_roots": True, "root_kind": "integer"},
+        5: {"max_coef": 10, "ensure_integer_roots": True, "root_kind": "integer"},
+        6: {"max_coef": 10, "ensure_integer_roots": False, "root_kind": "rational"},
+        7: {"max_coef": 20, "ensure_integer_roots": False, "root_kind": "rational"},
+        8: {"max_coef": 20, "ensure_integer_roots": False, "root_kind": "rational"},
+        9: {"max_coef": 50, "ensure_integer_roots": False, "root_kind": "surd"},
+        10: {"max_coef": 50, "ensure_integer_roots": False, "root_kind": "surd"},
     }
     
     def __init__(
@@ -42,17 +46,19 @@ class QuadraticTask(BaseMathTask):
         difficulty: int = None,
         max_coef: int = 5,
         ensure_integer_roots: bool = True,
-        output_format: OutputFormat = "text"
+        output_format: OutputFormat = "text",
+        root_kind: str = None
     ):
         # Если указан difficulty, берём параметры из пресета
         if difficulty is not None:
             preset = self._interpolate_difficulty(difficulty)
             max_coef = preset.get("max_coef", max_coef)
             ensure_integer_roots = preset.get("ensure_integer_roots", ensure_integer_roots)
+            root_kind = root_kind or preset.get("root_kind")
         
         # Генерируем коэффициенты, если не заданы
         if a is None or b is None or c is None:
-            a, b, c = self._generate_coefficients(max_coef, ensure_integer_roots)
+            a, b, c = self._generate_coefficients(max_coef, ensure_integer_roots, root_kind)
         
         self.a = a
         self.b = b
@@ -78,72 +84,36 @@ class QuadraticTask(BaseMathTask):
             output_format: "text" или "latex"
             include_equals_zero: Включать "= 0" в формулу
         """
-        if output_format == "latex":
-            # Используем sympy для LaTeX
-            x = sp.Symbol('x')
-            expr = a*x**2 + b*x + c
-            latex_str = sp.latex(expr)
-            if include_equals_zero:
-                return f"${latex_str} = 0$"
-            return f"${latex_str}$"
-        
-        # Text формат
-        parts = []
-        
-        # Член с x²
-        if a == 1:
-            parts.append("x²")
-        elif a == -1:
-            parts.append("-x²")
-        else:
-            parts.append(f"{a}x²")
-        
-        # Член с x
-        if b > 0:
-            if b == 1:
-                parts.append(" + x")
-            else:
-                parts.append(f" + {b}x")
-        elif b < 0:
-            if b == -1:
-                parts.append(" - x")
-            else:
-                parts.append(f" - {abs(b)}x")
-        
-        # Свободный член
-        if c > 0:
-            parts.append(f" + {c}")
-        elif c < 0:
-            parts.append(f" - {abs(c)}")
-        
-        result = "".join(parts)
+        result = format_polynomial([a, b, c], "latex" if output_format == "latex" else "text")
         if include_equals_zero:
             result += " = 0"
-        return result
+        return f"${result}$" if output_format == "latex" else result
     
     @staticmethod
-    def _generate_coefficients(max_coef: int, ensure_integer_roots: bool) -> tuple:
-        """Генерирует коэффициенты для квадратного уравнения."""
-        if ensure_integer_roots:
-            # Генерируем целые корни x1, x2 и вычисляем коэффициенты
+    def _generate_coefficients(max_coef: int, ensure_integer_roots: bool, root_kind: str = None) -> tuple:
+        """
+        Генерирует коэффициенты «от корней»: сначала выбираются корни
+        (целые, рациональные или пара p ± q√r), затем многочлен раскрывается
+        в целых числах.
+        """
+        if root_kind is None:
+            root_kind = "integer" if ensure_integer_roots else "rational"
+        
+        if root_kind == "integer":
             # (x - x1)(x - x2) = x² - (x1+x2)x + x1*x2
-            x1 = random.randint(-max_coef, max_coef)
-            x2 = random.randint(-max_coef, max_coef)
-            a = 1
-            b = -(x1 + x2)
-            c = x1 * x2
+            roots = [sample_root(random, "integer", max_coef) for _ in range(2)]
+        elif root_kind == "surd":
+            roots = [sample_root(random, "surd", max(2, max_coef // 10))]
         else:
-            a = random.randint(1, max_coef)
-            if random.random() < 0.3:
-                a = -a
-            b = random.randint(-max_coef, max_coef)
-            c = random.randint(-max_coef, max_coef)
+            bound = max(2, max_coef // 2)
+            roots = [sample_root(random, "rational", bound), sample_root(random, random.choice(["integer", "rational"]), bound)]
         
-        return a, b, c
+        coeffs = normalize(expand_roots(roots))
+        if root_kind != "integer" and random.random() < 0.3:
+            coeffs = [-k for k in coeffs]
+        return tuple(coeffs)
 
     def solve(self):
-        x = sp.symbols('x')
-        eq = sp.Eq(self.a*x**2 + self.b*x + self.c, 0)
         equation_str = self._format_equation(self.a, self.b, self.c, self._output_format, include_equals_zero=True)
         
         steps = []
@@ -173,17 +143,17 @@ class QuadraticTask(BaseMathTask):
                 a=self.a, b=self.b, c=self.c, discriminant=discriminant
             ))
         
-        roots = sp.solve(eq, x)
+        roots = solve_quadratic(self.a, self.b, self.c)
         
         # Шаг 3: Корни
         if self._output_format == "latex":
-            roots_latex = [sp.latex(r) for r in roots]
+            roots_latex = [format_root(r, "latex") for r in roots]
             if len(roots) == 1:
                 roots_display = f"$x = {roots_latex[0]}$"
             else:
                 roots_display = f"$x_1 = {roots_latex[0]}, x_2 = {roots_latex[1]}$"
         else:
-            roots_str = ", ".join(str(r) for r in roots)
+            roots_str = ", ".join(format_root(r) for r in roots)
             roots_display = roots_str
             
         if self._output_format == "latex":
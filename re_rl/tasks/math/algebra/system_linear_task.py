@@ -1,9 +1,12 @@
 # re_rl/tasks/system_linear_task.py
 
 import random
+from fractions import Fraction
 import numpy as np
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.algebra.exact_linear import construct_system, gauss_solve
+from re_rl.tasks.math.algebra.polynomials import format_number
 from typing import Dict, Any, ClassVar, Optional, List
 
 class SystemLinearTask(BaseMathTask):
@@ -16,6 +19,12 @@ class SystemLinearTask(BaseMathTask):
       - difficulty 7-8: система 4x4
       - difficulty 9-10: система 5x5
       
+    mode="construct" (по умолчанию): сначала выбирается целое решение и
+    матрица с заданным определителем det (можно передать явно), затем
+    вычисляется правая часть; mode="random" — случайная матрица с отбраковкой
+    вырожденных. Решение считается точно (метод Гаусса в Fraction),
+    поэтому size до 8 генерируется без потерь скорости и точности.
+    
     detail_level определяет количество шагов решения.
     """
     
@@ -40,7 +49,9 @@ class SystemLinearTask(BaseMathTask):
         difficulty: int = None,
         size: int = 2,
         max_coef: int = 10,
-        output_format: OutputFormat = "text"
+        output_format: OutputFormat = "text",
+        mode: str = "construct",
+        det: Optional[int] = None
     ):
         self._output_format = output_format
         
@@ -52,8 +63,14 @@ class SystemLinearTask(BaseMathTask):
         
         # Генерируем матрицу, если не задана
         if matrix is None:
-            matrix = self._generate_matrix(size, max_coef)
+            if mode == "construct":
+                A, _, b = construct_system(size, max_coef, det)
+                matrix = [row + [b_i] for row, b_i in zip(A, b)]
+            else:
+                matrix = self._generate_matrix(size, max_coef)
         
+        # Точная копия для решения и float-матрица для совместимости
+        self.exact_matrix = [[Fraction(v) for v in row] for row in matrix]
         self.matrix = np.array(matrix, dtype=float)
         self.difficulty = difficulty
         self.detail_level = detail_level
@@ -92,16 +109,19 @@ class SystemLinearTask(BaseMathTask):
         n = self.matrix.shape[0]
         variables = [f"x{i+1}" for i in range(n)]
         equations = []
-        for row in self.matrix:
+        for row in self.exact_matrix:
             terms = []
             for i in range(n):
                 coeff = row[i]
                 var = variables[i]
-                sign = "" if i == 0 else (" + " if coeff >= 0 else " - ")
+                if i == 0:
+                    sign = "-" if coeff < 0 else ""
+                else:
+                    sign = " + " if coeff >= 0 else " - "
                 coeff_abs = abs(coeff)
-                term = f"{'' if coeff_abs==1 else coeff_abs}{var}"
+                term = f"{'' if coeff_abs==1 else format_number(coeff_abs)}{var}"
                 terms.append(sign + term)
-            eq = "".join(terms) + f" = {row[-1]}"
+            eq = "".join(terms) + f" = {format_number(row[-1])}"
             equations.append(eq)
         joined = "\n".join(equations)
         if language.lower() == "ru":
@@ -109,13 +129,16 @@ class SystemLinearTask(BaseMathTask):
         else:
             return PROMPT_TEMPLATES["system_linear"]["problem"]["en"].format(equations=joined)
 
+    @staticmethod
+    def _format_value(value: Fraction) -> str:
+        """Целые значения — в прежнем виде "2.00", остальные — точной дробью."""
+        return f"{value.numerator:.2f}" if value.denominator == 1 else format_number(value)
+
     def solve(self):
-        matrix = self.matrix
-        A = matrix[:, :-1]
-        B = matrix[:, -1]
-        n = A.shape[0]
+        rows = self.exact_matrix
+        n = len(rows)
         
-        if A.shape[0] != A.shape[1]:
+        if any(len(row) != n + 1 for row in rows):
             error_str = PROMPT_TEMPLATES["default"]["error"][self.language].format(
                 error="Матрица коэффициентов должна быть квадратной" if self.language == "ru" 
                 else "Coefficient matrix must be square"
@@ -124,13 +147,13 @@ class SystemLinearTask(BaseMathTask):
         
         steps = []
         steps_templates = PROMPT_TEMPLATES.get("system_linear", {}).get("steps", {})
-        det_A = np.linalg.det(A)
+        det_A, X = gauss_solve([row[:-1] for row in rows], [row[-1] for row in rows])
         
         if self.detail_level >= 2:
             template = steps_templates.get("compute_det", {}).get(self.language, "")
-            steps.append(template.format(det=f"{det_A:.2f}"))
+            steps.append(template.format(det=format_number(det_A)))
         
-        if abs(det_A) < 1e-6:
+        if X is None:
             no_unique = PROMPT_TEMPLATES["system_linear"]["no_unique_solution"].get(
                 self.language, 
                 PROMPT_TEMPLATES["system_linear"]["no_unique_solution"]["en"]
@@ -140,25 +163,21 @@ class SystemLinearTask(BaseMathTask):
             self.final_answer = no_unique
             return
         
-        X = []
-        for i in range(n):
-            A_i = A.copy()
-            A_i[:, i] = B
-            det_Ai = np.linalg.det(A_i)
-            x_i = det_Ai / det_A
-            X.append(x_i)
+        for i, x_i in enumerate(X):
+            # По правилу Крамера det(A_i) = x_i · det(A)
+            det_Ai = x_i * det_A
             
             if self.detail_level >= 3:
                 step_num = i * 2 + 2
                 
                 template1 = steps_templates.get("replace_column", {}).get(self.language, "")
-                steps.append(template1.format(step_num=step_num, col=i+1, det=f"{det_Ai:.2f}"))
+                steps.append(template1.format(step_num=step_num, col=i+1, det=format_number(det_Ai)))
                 
                 template2 = steps_templates.get("compute_variable", {}).get(self.language, "")
-                steps.append(template2.format(step_num=step_num+1, var=i+1, value=f"{x_i:.2f}"))
+                steps.append(template2.format(step_num=step_num+1, var=i+1, value=format_number(x_i)))
         
         self.solution_steps.extend(steps)
-        self.final_answer = ", ".join([f"x{i+1} = {x:.2f}" for i, x in enumerate(X)])
+        self.final_answer = ", ".join([f"x{i+1} = {self._format_value(x)}" for i, x in enumerate(X)])
 
     def get_task_type(self):
         return "system_linear"
@@ -0,0 +1,210 @@
+# re_rl/tasks/math/analysis/antiderivatives.py
+
+"""
+Обратное построение задач на интегрирование.
+
+Вместо того чтобы интегрировать случайную функцию (sp.integrate медленный и
+иногда возвращает невычисленный Integral), сначала выбирается первообразная F
+из типизированной грамматики, а подынтегральная функция получается как f = F'.
+Каждая задача решаема по построению, а генерация сводится к sp.diff.
+
+Грамматика (глубина растёт со сложностью):
+- depth 1: многочлены, c·e^(ax), c·sin(ax), c·cos(ax), c·ln(x)
+- depth 2: + композиции c·g(u) с линейным или квадратичным u (замена)
+           и произведения x^k·h(ax), x^k·ln(x) (по частям)
+- depth 3: + вложенные композиции g(h(ax + b)) и произведения e^(ax)·sin(bx)
+
+Для интегрирования по частям подынтегральная функция берётся в классическом
+виде u·dv, а первообразная выписывается табличным методом.
+"""
+
+import random
+from dataclasses import dataclass
+from math import factorial
+from typing import List, Optional
+
+import sympy as sp
+
+
+x = sp.Symbol("x")
+
+METHODS = ("elementary", "substitution", "by_parts")
+
+
+@dataclass
+class ConstructedIntegral:
+    """Задача на интегрирование с известной первообразной."""
+
+    integrand: sp.Expr
+    antiderivative: sp.Expr
+    method: str                       # "elementary", "substitution", "by_parts" или "mixed"
+    u: Optional[sp.Expr] = None       # замена u (substitution) или множитель u (by_parts)
+    dv: Optional[sp.Expr] = None      # dv для интегрирования по частям (без dx)
+
+
+def depth_for_difficulty(difficulty: int) -> int:
+    """Глубина грамматики для уровня сложности 1-10."""
+    if difficulty <= 3:
+        return 1
+    if difficulty <= 6:
+        return 2
+    return 3
+
+
+def expr_to_text(expr: sp.Expr) -> str:
+    """Текстовая запись в стиле остальных задач на интегрирование (x^n вместо x**n)."""
+    return str(expr).replace("**", "^")
+
+
+def _nonzero(rng, max_coef: int) -> int:
+    return rng.choice([-1, 1]) * rng.randint(1, max_coef)
+
+
+def sample_elementary(rng=random, max_coef: int = 5, degree: int = 3) -> ConstructedIntegral:
+    """Табличная первообразная: c·x^k, c·e^(ax), c·sin(ax), c·cos(ax), c·ln(x)."""
+    kind = rng.choice(["poly", "exp", "sin", "cos", "log"])
+    c = _nonzero(rng, max_coef)
+    a = rng.randint(1, 3)
+    if kind == "poly":
+        F = c * x ** rng.randint(1, max(1, degree))
+    elif kind == "exp":
+        F = c * sp.exp(a * x)
+    elif kind == "sin":
+        F = c * sp.sin(a * x)
+    elif kind == "cos":
+        F = c * sp.cos(a * x)
+    else:
+        F = c * sp.log(x)
+    return ConstructedIntegral(sp.diff(F, x), F, "elementary")
+
+
+def _inner_function(rng, depth: int) -> sp.Expr:
+    """Внутренняя функция u(x) для композиции."""
+    a = rng.randint(1, 4)
+    b = rng.randint(-5, 5)
+    options = [a * x + b, x ** 2 + rng.randint(1, 5), a * x ** 2 + b * x]
+    if depth >= 3:
+        options += [sp.sin(a * x + b), sp.cos(a * x), sp.exp(a * x) + rng.randint(1, 3)]
+    return rng.choice(options)
+
+
+def sample_substitution(rng=random, max_coef: int = 5, depth: int = 2) -> ConstructedIntegral:
+    """F = c·g(u(x)), f = c·g'(u)·u' — интеграл на замену переменной."""
+    c = _nonzero(rng, max_coef)
+    outer = rng.choice(["exp", "sin", "cos", "pow", "log"])
+    if outer == "log":
+        # ln(u) только от положительного u
+        u = rng.choice([x ** 2 + rng.randint(1, 5), sp.exp(x) + rng.randint(1, 3)])
+        F = c * sp.log(u)
+    else:
+        u = _inner_function(rng, depth)
+        if outer == "exp":
+            F = c * sp.exp(u)
+        elif outer == "sin":
+            F = c * sp.sin(u)
+        elif outer == "cos":
+            F = c * sp.cos(u)
+        else:
+            F = c * u ** rng.randint(2, 4)
+    return ConstructedIntegral(sp.diff(F, x), F, "substitution", u=u)
+
+
+def _tabular_antiderivative(k: int, kind: str, a: int) -> sp.Expr:
+    """
+    ∫x^k·h(ax) dx табличным методом: Σ (-1)^j (x^k)^(j) · V_{j+1},
+    где V_j — j-я первообразная h(ax).
+    """
+    def repeated_integral(j: int) -> sp.Expr:
+        if kind == "exp":
+            return sp.exp(a * x) / a ** j
+        # Первообразные sin/cos повторяются с периодом 4
+        cycle = {
+            "sin": [-sp.cos(a * x), -sp.sin(a * x), sp.cos(a * x), sp.sin(a * x)],
+            "cos": [sp.sin(a * x), -sp.cos(a * x), -sp.sin(a * x), sp.cos(a * x)],
+        }[kind]
+        return cycle[(j - 1) % 4] / a ** j
+
+    return sp.Add(*[
+        (-1) ** j * sp.Integer(factorial(k) // factorial(k - j)) * x ** (k - j) * repeated_integral(j + 1)
+        for j in range(k + 1)
+    ])
+
+
+def sample_by_parts(rng=random, max_coef: int = 5, depth: int = 2) -> ConstructedIntegral:
+    """Подынтегральная функция вида u·dv с первообразной, выписанной по формуле."""
+    c = _nonzero(rng, max_coef)
+    kinds = ["exp", "sin", "cos", "log"]
+    if depth >= 3:
+        kinds.append("exp_trig")
+    kind = rng.choice(kinds)
+    k = rng.randint(1, 2 if depth < 3 else 3)
+    a = rng.randint(1, 3)
+
+    if kind == "log":
+        u, dv = sp.log(x), x ** k
+        F = x ** (k + 1) * sp.log(x) / (k + 1) - x ** (k + 1) / (k + 1) ** 2
+    elif kind == "exp_trig":
+        b = rng.randint(1, 3)
+        trig = rng.choice(["sin", "cos"])
+        u = sp.sin(b * x) if trig == "sin" else sp.cos(b * x)
+        dv = sp.exp(a * x)
+        # Циклический интеграл: ∫e^(ax)sin(bx) и ∫e^(ax)cos(bx)
+        if trig == "sin":
+            F = sp.exp(a * x) * (a * sp.sin(b * x) - b * sp.cos(b * x)) / (a ** 2 + b ** 2)
+        else:
+            F = sp.exp(a * x) * (a * sp.cos(b * x) + b * sp.sin(b * x)) / (a ** 2 + b ** 2)
+    else:
+        u = x ** k
+        dv = {"exp": sp.exp(a * x), "sin": sp.sin(a * x), "cos": sp.cos(a * x)}[kind]
+        F = _tabular_antiderivative(k, kind, a)
+
+    return ConstructedIntegral(c * u * dv, sp.expand(c * F), "by_parts", u=u, dv=dv)
+
+
+def construct_integral(
+    depth: int = 1,
+    max_coef: int = 5,
+    degree: int = 3,
+    method: Optional[str] = None,
+    rng=random,
+) -> ConstructedIntegral:
+    """
+    Строит задачу на интегрирование заданной глубины.
+
+    Args:
+        depth: Глубина грамматики (1-3), см. depth_for_difficulty
+        max_coef: Максимальный модуль коэффициентов
+        degree: Максимальная степень многочленов
+        method: "elementary", "substitution", "by_parts" или None — сумма
+            из 1..depth+1 слагаемых разных видов, доступных на этой глубине
+        rng: Источник случайности (модуль random или random.Random)
+    """
+    depth = max(1, min(3, depth))
+    samplers = {
+        "elementary": lambda: sample_elementary(rng, max_coef, degree),
+        "substitution": lambda: sample_substitution(rng, max_coef, max(2, depth)),
+        "by_parts": lambda: sample_by_parts(rng, max_coef, max(2, depth)),
+    }
+    if method is not None and method not in samplers:
+        raise ValueError(f"Неизвестный метод: {method}. Доступные: {METHODS}")
+    # Слагаемые могут сократиться («∫0 dx»), а c·x даёт постоянную
+    # подынтегральную функцию — такие задачи вырождены, строим заново
+    while True:
+        construction = _sample_integral(samplers, depth, method, rng)
+        if sp.expand(construction.integrand).has(x):
+            return construction
+
+
+def _sample_integral(samplers, depth: int, method: Optional[str], rng) -> ConstructedIntegral:
+    if method is not None:
+        return samplers[method]()
+    allowed = ["elementary"] if depth == 1 else list(METHODS)
+    parts: List[ConstructedIntegral] = [samplers[rng.choice(allowed)]() for _ in range(rng.randint(1, depth + 1))]
+    if len(parts) == 1:
+        return parts[0]
+    methods = {p.method for p in parts}
+    return ConstructedIntegral(
+        integrand=sp.Add(*[p.integrand for p in parts]),
+        antiderivative=sp.Add(*[p.antiderivative for p in parts]),
+        method=methods.pop() if len(methods) == 1 else "mixed",
+    )
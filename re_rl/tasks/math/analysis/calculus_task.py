@@ -4,6 +4,9 @@ import random
 import sympy as sp
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.formatting import Math, Step, format_step
+from re_rl.tasks.sympy_cache import cached_integrate, cached_latex, cached_pretty
+from re_rl.tasks.math.analysis.antiderivatives import construct_integral, depth_for_difficulty, expr_to_text
 from typing import Optional, Dict, Any, ClassVar
 
 class CalculusTask(BaseMathTask):
@@ -11,6 +14,8 @@ class CalculusTask(BaseMathTask):
     Задачи по анализу: дифференцирование или интегрирование полиномиальных функций.
     task_type: "differentiation" или "integration".
     detail_level контролирует степень детализации.
+    integration_mode: "construct" — первообразная выбирается заранее, f = F'
+    (без sp.integrate); "symbolic" — случайный многочлен и sp.integrate.
     """
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
@@ -29,7 +34,8 @@ class CalculusTask(BaseMathTask):
         language: str = "ru", 
         detail_level: int = 3,
         difficulty: int = None,
-        output_format: OutputFormat = "text"
+        output_format: OutputFormat = "text",
+        integration_mode: str = "construct"
     ):
         if difficulty is not None:
             preset = self._interpolate_difficulty(difficulty)
@@ -39,10 +45,19 @@ class CalculusTask(BaseMathTask):
         self.degree = degree
         self.function = function
         self._output_format = output_format
+        self.integration_mode = integration_mode
+        # Глубина грамматики первообразных: по сложности, иначе по степени
+        self.depth = depth_for_difficulty(difficulty) if difficulty is not None else min(3, (degree + 1) // 2)
+        self.antiderivative = None
         super().__init__("", language, detail_level, output_format)
 
     def generate_function(self):
         if self.function is None:
+            if self.task_type == "integration" and self.integration_mode == "construct":
+                construction = construct_integral(depth=self.depth, max_coef=5, degree=self.degree)
+                self.function = construction.integrand
+                self.antiderivative = construction.antiderivative
+                return
             x = sp.symbols('x')
             coeffs = [random.randint(-5, 5) for _ in range(self.degree+1)]
             while coeffs[-1] == 0:
@@ -57,7 +72,7 @@ class CalculusTask(BaseMathTask):
         
         # Форматируем функцию
         if is_latex:
-            func_latex = sp.latex(self.function)
+            func_latex = cached_latex(self.function)
             if self.task_type == "differentiation":
                 expression = f"$\\frac{{d}}{{dx}}\\left({func_latex}\\right)$"
                 return templates["problem_derivative"][self.language].format(expression=expression)
@@ -65,7 +80,7 @@ class CalculusTask(BaseMathTask):
                 expression = f"$\\int {func_latex} \\, dx$"
                 return templates["problem_integral"][self.language].format(expression=expression)
         else:
-            func_str = sp.pretty(self.function)
+            func_str = cached_pretty(self.function)
             task_type_text = templates["task_type_derivative" if self.task_type == "differentiation" else "task_type_integral"][self.language]
             return templates["problem"][self.language].format(task_type=task_type_text, function_pretty=func_str)
 
@@ -80,35 +95,41 @@ class CalculusTask(BaseMathTask):
         
         # Шаг 1
         if is_latex:
-            func_latex = sp.latex(self.function)
+            func_latex = cached_latex(self.function)
             text = f"{func_label}: $f(x) = {func_latex}$"
         else:
-            text = f"{func_label}: f(x) = {sp.pretty(self.function)}"
-        steps.append(step_tmpl.format(n=1, text=text))
+            text = Step(f"{func_label}: f(x) = ", Math(self.function, text=cached_pretty(self.function)))
+        steps.append(format_step(step_tmpl, n=1, text=text))
         
         if self.task_type == "differentiation":
             result_expr = sp.diff(self.function, x)
             
             if is_latex:
-                result_latex = sp.latex(result_expr)
+                result_latex = cached_latex(result_expr)
                 text = f"$f'(x) = {result_latex}$"
                 self.final_answer = f"$f'(x) = {result_latex}$"
             else:
-                text = f"f'(x) = {sp.pretty(result_expr)}"
-                self.final_answer = sp.pretty(result_expr)
-            steps.append(step_tmpl.format(n=2, text=text))
+                text = Step("f'(x) = ", Math(result_expr, text=cached_pretty(result_expr)))
+                # Ответ — в одну строку: многострочный pretty-вывод не разбирается при проверке
+                self.final_answer = expr_to_text(result_expr)
+            steps.append(format_step(step_tmpl, n=2, text=text))
                 
         elif self.task_type == "integration":
-            result_expr = sp.integrate(self.function, x)
+            if self.antiderivative is not None:
+                result_expr = self.antiderivative
+            else:
+                result_expr = cached_integrate(self.function, x)
             
             if is_latex:
-                result_latex = sp.latex(result_expr)
+                result_latex = cached_latex(result_expr)
                 text = f"$\\int f(x) \\, dx = {result_latex} + C$"
                 self.final_answer = f"${result_latex} + C$"
             else:
-                text = f"∫f(x)dx = {sp.pretty(result_expr)} + C"
-                self.final_answer = sp.pretty(result_expr) + " + C"
-            steps.append(step_tmpl.format(n=2, text=text))
+                text = Step("∫f(x)dx = ", Math(
+                    result_expr, text=f"{cached_pretty(result_expr)} + C", latex=f"{cached_latex(result_expr)} + C"
+                ))
+                self.final_answer = expr_to_text(result_expr) + " + C"
+            steps.append(format_step(step_tmpl, n=2, text=text))
         else:
             error_msg = PROMPT_TEMPLATES["default"]["no_solution"].get(self.language, "No solution")
             steps.append(error_msg)
@@ -127,7 +148,8 @@ class CalculusTask(BaseMathTask):
         language: str = "ru", 
         detail_level: int = 3,
         difficulty: int = 5,
-        output_format: OutputFormat = "text"
+        output_format: OutputFormat = "text",
+        integration_mode: str = "construct"
     ):
         if degree is None:
             degree = random.randint(1, 3)
@@ -137,7 +159,8 @@ class CalculusTask(BaseMathTask):
             language=language, 
             detail_level=detail_level,
             difficulty=difficulty,
-            output_format=output_format
+            output_format=output_format,
+            integration_mode=integration_mode
         )
         task.solve()
         return task
@@ -9,6 +9,8 @@ IntegralTask — задачи на интегрирование.
 - indefinite_trig: неопределённый интеграл от тригонометрии
 - definite_trig: определённый интеграл от тригонометрии
 - area: площадь под кривой
+- substitution: интеграл на замену переменной (строится от первообразной)
+- by_parts: интегрирование по частям (строится от первообразной)
 """
 
 import random
@@ -16,6 +18,13 @@ import math
 from typing import List, Dict, Any, ClassVar, Tuple
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.formatting import Math, format_step
+from re_rl.tasks.sympy_cache import cached_latex
+from re_rl.tasks.math.analysis.antiderivatives import (
+    construct_integral,
+    depth_for_difficulty,
+    expr_to_text,
+)
 
 try:
     import sympy as sp
@@ -31,8 +40,12 @@ class IntegralTask(BaseMathTask):
     
     TASK_TYPES = [
         "indefinite_polynomial", "definite_polynomial",
-        "indefinite_trig", "definite_trig", "area"
+        "indefinite_trig", "definite_trig", "area",
+        "substitution", "by_parts"
     ]
+
+    # Типы, для которых первообразная выбирается заранее, а f = F'
+    CONSTRUCTED_TYPES = ("substitution", "by_parts")
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
         1: {"degree": 1, "max_coef": 5, "terms": 2},
@@ -81,6 +94,16 @@ class IntegralTask(BaseMathTask):
         self.trig_type = trig_type or random.choice(["sin", "cos"])
         self.trig_coef = random.randint(1, 3)
         
+        # Для замены и интегрирования по частям задача строится от ответа
+        self.construction = None
+        if self.task_type in self.CONSTRUCTED_TYPES:
+            self.construction = construct_integral(
+                depth=max(2, depth_for_difficulty(difficulty)),
+                max_coef=min(self.max_coef, 5),
+                degree=self.degree,
+                method=self.task_type,
+            )
+        
         description = self._create_problem_description()
         super().__init__(description, language, detail_level, output_format)
     
@@ -172,6 +195,13 @@ class IntegralTask(BaseMathTask):
                 expr = f"{self.trig_coef}{self.trig_type}(x)" if self.trig_coef != 1 else f"{self.trig_type}(x)"
                 integral_expr = f"∫[0,π] {expr} dx"
         
+        elif self.task_type in self.CONSTRUCTED_TYPES:
+            integrand = self.construction.integrand
+            if is_latex:
+                integral_expr = f"$\\int {sp.latex(integrand)} \\, dx$"
+            else:
+                integral_expr = f"∫{expr_to_text(integrand)} dx"
+        
         elif self.task_type == "area":
             poly_str = format_poly(self.coefficients)
             if is_latex:
@@ -200,6 +230,8 @@ class IntegralTask(BaseMathTask):
             self._solve_definite_trig(templates)
         elif self.task_type == "area":
             self._solve_area(templates)
+        elif self.task_type in self.CONSTRUCTED_TYPES:
+            self._solve_constructed(templates)
         
         # Ограничиваем по detail_level
         if len(self.solution_steps) > self.detail_level:
@@ -320,6 +352,41 @@ class IntegralTask(BaseMathTask):
         except:
             pass
     
+    def _solve_constructed(self, templates):
+        """Замена или интегрирование по частям: первообразная известна по построению."""
+        c = self.construction
+        is_latex = self._output_format == "latex"
+        
+        def fmt(expr, with_dx: bool = False) -> Math:
+            latex = cached_latex(expr)
+            body = latex if is_latex else expr_to_text(expr)
+            if with_dx:
+                wrap = "({}) dx" if isinstance(expr, sp.Add) else "{} dx"
+                body, latex = wrap.format(body), wrap.format(latex).replace(" dx", r" \, dx")
+            return Math(expr, text=f"${body}$" if is_latex else body, latex=latex)
+        
+        step = 1
+        if c.method == "substitution":
+            step_template = templates.get("substitution_let", {}).get(self.language, "")
+            du = sp.diff(c.u, sp.Symbol("x"))
+            self.solution_steps.append(format_step(step_template, step=step, u=fmt(c.u), du=fmt(du, with_dx=True)))
+            step += 1
+        elif c.method == "by_parts":
+            step_template = templates.get("by_parts_formula", {}).get(self.language, "")
+            self.solution_steps.append(format_step(step_template, step=step, u=fmt(c.u), dv=fmt(c.dv, with_dx=True)))
+            step += 1
+        
+        result_latex = cached_latex(c.antiderivative)
+        result = result_latex if is_latex else expr_to_text(c.antiderivative)
+        answer = f"${result} + C$" if is_latex else f"{result} + C"
+        step_template = templates.get("trig_integral", {}).get(self.language, "")
+        self.solution_steps.append(format_step(
+            step_template, step=step, func=fmt(c.integrand),
+            result=Math(c.antiderivative, text=answer, latex=f"{result_latex} + C"),
+        ))
+        
+        self.final_answer = answer
+    
     def _format_integrated_result(self, terms: List[Tuple[float, int]]) -> str:
         """Форматирует результат интегрирования."""
         parts = []
@@ -0,0 +1,251 @@
+# re_rl/tasks/math/analysis/limit_construction.py
+
+"""
+Построение задач на пределы с заранее известным значением.
+
+Вместо вызова sp.limit (медленного и возвращающего oo, zoo, AccumBounds и т.п.)
+выражение собирается из шаблонов с известным предельным поведением:
+- многочлены и рациональные функции — значение считается точно по
+  коэффициентам (схема Горнера в Fraction);
+- пределы на бесконечности — по выбранным старшим членам;
+- неопределённости 0/0 — общий множитель (x - a)^k или частное, готовое
+  для правила Лопиталя;
+- последовательности — отношения многочленов и (1 + a/n)^(bn) → e^(ab);
+- замечательные пределы sin(ax)/(bx), (e^(ax) - 1)/(bx), ln(1 + ax)/(bx),
+  (1 - cos(ax))/x², (1 + a/x)^(bx).
+
+sympy используется только для записи выражений; sp.limit вызывается лишь
+в verify_limit (необязательная проверка).
+"""
+
+import random
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Any, List, Optional, Tuple
+
+import sympy as sp
+
+from re_rl.tasks.sympy_cache import cached_limit
+
+x = sp.Symbol("x")
+n = sp.Symbol("n")
+
+LIMIT_KINDS = ("polynomial", "rational", "infinity", "indeterminate", "sequence", "special")
+
+
+@dataclass
+class ConstructedLimit:
+    """Предел с известным точным значением."""
+
+    expression: sp.Expr
+    point: Any                            # целое число или sp.oo
+    value: sp.Expr                        # Rational, oo, -oo или exp(q)
+    kind: str                             # вид шаблона (см. construct_*)
+    variable: sp.Symbol = x
+    numerator: Optional[sp.Expr] = None
+    denominator: Optional[sp.Expr] = None
+    factored: Optional[Tuple[sp.Expr, sp.Expr]] = None  # 0/0: числитель и знаменатель с общим множителем
+    reduced: Optional[sp.Expr] = None     # 0/0: выражение после сокращения или f'/g'
+    formula: Optional[str] = None         # ключ замечательного предела в PROMPT_TEMPLATES
+
+
+def _nonzero(rng, max_coef: int) -> int:
+    return rng.choice([-1, 1]) * rng.randint(1, max_coef)
+
+
+def random_coeffs(rng, degree: int, max_coef: int) -> List[int]:
+    """Коэффициенты c0..c_degree с ненулевым старшим."""
+    coeffs = [rng.randint(-max_coef, max_coef) for _ in range(degree)]
+    return coeffs + [_nonzero(rng, max_coef)]
+
+
+def poly_expr(coeffs: List[int], var: sp.Symbol = x) -> sp.Expr:
+    return sp.Add(*[c * var ** i for i, c in enumerate(coeffs)])
+
+
+def poly_value(coeffs: List[int], point: int) -> Fraction:
+    """Значение многочлена в точке по схеме Горнера."""
+    result = Fraction(0)
+    for c in reversed(coeffs):
+        result = result * point + c
+    return result
+
+
+def _rational(value: Fraction) -> sp.Rational:
+    return sp.Rational(value.numerator, value.denominator)
+
+
+def construct_polynomial(rng=random, max_degree: int = 4, max_coef: int = 15) -> ConstructedLimit:
+    """lim(x→a) P(x) = P(a)."""
+    point = rng.randint(-max_coef, max_coef)
+    coeffs = random_coeffs(rng, rng.randint(1, max_degree), max_coef)
+    return ConstructedLimit(poly_expr(coeffs), point, _rational(poly_value(coeffs, point)), "polynomial")
+
+
+def construct_rational(rng=random, max_degree: int = 4, max_coef: int = 15) -> ConstructedLimit:
+    """lim(x→a) P(x)/Q(x) = P(a)/Q(a) при Q(a) ≠ 0."""
+    point = rng.choice([0, 1, 2, -1, -2])
+    num = random_coeffs(rng, rng.randint(1, max_degree), max_coef)
+    den_degree = rng.randint(1, max_degree)
+    den = random_coeffs(rng, den_degree, max_coef)
+    while poly_value(den, point) == 0:
+        den = random_coeffs(rng, den_degree, max_coef)
+    numerator, denominator = poly_expr(num), poly_expr(den)
+    return ConstructedLimit(
+        numerator / denominator, point, _rational(poly_value(num, point) / poly_value(den, point)),
+        "rational", numerator=numerator, denominator=denominator,
+    )
+
+
+def construct_infinity(rng=random, max_degree: int = 4, max_coef: int = 15) -> ConstructedLimit:
+    """lim(x→∞) P(x)/Q(x) по старшим членам: 0, отношение коэффициентов или ±∞."""
+    relation = rng.choice(["less", "equal", "greater"])
+    den_degree = rng.randint(1, max_degree)
+    if relation == "equal":
+        num_degree = den_degree
+    elif relation == "less":
+        den_degree = max(2, den_degree)
+        num_degree = rng.randint(1, den_degree - 1)
+    else:
+        num_degree = rng.randint(den_degree + 1, max_degree + 1)
+    num = random_coeffs(rng, num_degree, max_coef)
+    den = random_coeffs(rng, den_degree, max_coef)
+
+    if relation == "less":
+        value = sp.Integer(0)
+    elif relation == "equal":
+        value = _rational(Fraction(num[-1], den[-1]))
+    else:
+        value = sp.oo if (num[-1] > 0) == (den[-1] > 0) else -sp.oo
+    numerator, denominator = poly_expr(num), poly_expr(den)
+    return ConstructedLimit(
+        numerator / denominator, sp.oo, value, "infinity",
+        numerator=numerator, denominator=denominator,
+    )
+
+
+def construct_indeterminate(rng=random, max_coef: int = 15, multiplicity: int = 1) -> ConstructedLimit:
+    """
+    Неопределённость 0/0: либо (x - a)^k·P(x) / ((x - a)^k·Q(x)) → P(a)/Q(a),
+    либо частное для правила Лопиталя f(x)/(x·(b + cx)) в нуле → f'(0)/b.
+    """
+    if rng.random() < 0.5:
+        point = rng.choice([0, 1, -1, 2])
+        k = rng.randint(1, max(1, multiplicity))
+        common = (x - point) ** k
+        extras = []
+        for _ in range(2):
+            degree = rng.randint(1, 2)
+            coeffs = random_coeffs(rng, degree, max_coef)
+            while poly_value(coeffs, point) == 0:
+                coeffs = random_coeffs(rng, degree, max_coef)
+            extras.append(coeffs)
+        num_extra, den_extra = poly_expr(extras[0]), poly_expr(extras[1])
+        numerator = sp.expand(common * num_extra)
+        denominator = sp.expand(common * den_extra)
+        return ConstructedLimit(
+            numerator / denominator, point,
+            _rational(poly_value(extras[0], point) / poly_value(extras[1], point)),
+            "factor", numerator=numerator, denominator=denominator,
+            factored=(sp.Mul(common, num_extra, evaluate=False), sp.Mul(common, den_extra, evaluate=False)),
+            reduced=num_extra / den_extra,
+        )
+
+    a = _nonzero(rng, min(max_coef, 5))
+    b = _nonzero(rng, min(max_coef, 5))
+    c = rng.randint(-min(max_coef, 5), min(max_coef, 5))
+    # f(0) = 0, f'(0) = a
+    numerator, derivative = rng.choice([
+        (sp.sin(a * x), a * sp.cos(a * x)),
+        (sp.exp(a * x) - 1, a * sp.exp(a * x)),
+        (sp.log(1 + a * x), a / (1 + a * x)),
+        (sp.tan(a * x), a / sp.cos(a * x) ** 2),
+    ])
+    denominator = b * x + c * x ** 2
+    return ConstructedLimit(
+        numerator / denominator, 0, sp.Rational(a, b), "lhopital",
+        numerator=numerator, denominator=denominator,
+        reduced=derivative / (b + 2 * c * x),
+    )
+
+
+def construct_sequence(rng=random, max_degree: int = 4, max_coef: int = 15) -> ConstructedLimit:
+    """Пределы последовательностей: отношения многочленов от n и (1 + a/n)^(bn)."""
+    kind = rng.choice(["ratio", "ratio", "vanishing", "exp_power"])
+    if kind == "exp_power":
+        a = _nonzero(rng, 3)
+        b = rng.randint(1, 3)
+        return ConstructedLimit((1 + sp.Rational(a) / n) ** (b * n), sp.oo, sp.exp(a * b), kind, variable=n)
+
+    den_degree = rng.randint(1, max(1, min(max_degree, 3)))
+    num_degree = den_degree if kind == "ratio" else rng.randint(0, den_degree - 1)
+    num = random_coeffs(rng, num_degree, max_coef)
+    den = [abs(c) for c in random_coeffs(rng, den_degree, max_coef)]
+    value = _rational(Fraction(num[-1], den[-1])) if kind == "ratio" else sp.Integer(0)
+    numerator, denominator = poly_expr(num, n), poly_expr(den, n)
+    return ConstructedLimit(
+        numerator / denominator, sp.oo, value, kind, variable=n,
+        numerator=numerator, denominator=denominator,
+    )
+
+
+def construct_special(rng=random, max_coef: int = 15) -> ConstructedLimit:
+    """Замечательные пределы с масштабированием аргумента."""
+    a = rng.randint(1, min(max_coef, 5))
+    b = rng.randint(1, min(max_coef, 5))
+    kind = rng.choice(["sin", "tan", "exp", "log", "cos", "e_power"])
+    if kind == "sin":
+        return ConstructedLimit(sp.sin(a * x) / (b * x), 0, sp.Rational(a, b), kind, formula="sin_x_over_x")
+    if kind == "tan":
+        return ConstructedLimit(sp.tan(a * x) / (b * x), 0, sp.Rational(a, b), kind, formula="sin_x_over_x")
+    if kind == "exp":
+        return ConstructedLimit((sp.exp(a * x) - 1) / (b * x), 0, sp.Rational(a, b), kind, formula="e_x_minus_one")
+    if kind == "log":
+        return ConstructedLimit(sp.log(1 + a * x) / (b * x), 0, sp.Rational(a, b), kind, formula="ln_one_plus_x")
+    if kind == "cos":
+        return ConstructedLimit((1 - sp.cos(a * x)) / x ** 2, 0, sp.Rational(a * a, 2), kind, formula="sin_x_over_x")
+    return ConstructedLimit(
+        (1 + sp.Rational(a) / x) ** (b * x), sp.oo, sp.exp(a * b), kind, formula="one_plus_one_over_x",
+    )
+
+
+def construct_limit(
+    kind: str,
+    max_degree: int = 4,
+    max_coef: int = 15,
+    multiplicity: int = 1,
+    rng=random,
+) -> ConstructedLimit:
+    """
+    Строит предел заданного типа.
+
+    Args:
+        kind: Один из LIMIT_KINDS
+        max_degree: Максимальная степень многочленов
+        max_coef: Максимальный модуль коэффициентов
+        multiplicity: Максимальная кратность общего множителя в 0/0
+        rng: Источник случайности (модуль random или random.Random)
+    """
+    if kind == "polynomial":
+        return construct_polynomial(rng, max_degree, max_coef)
+    if kind == "rational":
+        return construct_rational(rng, max_degree, max_coef)
+    if kind == "infinity":
+        return construct_infinity(rng, max_degree, max_coef)
+    if kind == "indeterminate":
+        return construct_indeterminate(rng, max_coef, multiplicity)
+    if kind == "sequence":
+        return construct_sequence(rng, max_degree, max_coef)
+    if kind == "special":
+        return construct_special(rng, max_coef)
+    raise ValueError(f"Неизвестный тип предела: {kind}. Доступные: {LIMIT_KINDS}")
+
+
+def verify_limit(construction: ConstructedLimit) -> bool:
+    """Проверка через sp.limit (медленно; только для отладки и тестов)."""
+    actual = cached_limit(construction.expression, construction.variable, construction.point)
+    if actual == construction.value:
+        return True
+    if not actual.is_finite or not construction.value.is_finite:
+        return False
+    return sp.simplify(actual - construction.value) == 0
@@ -10,6 +10,9 @@ LimitsTask — задачи на пределы.
 - indeterminate: неопределённости (0/0, ∞/∞)
 - sequence: пределы последовательностей
 - special: замечательные пределы
+
+Выражения строятся из шаблонов с известным значением предела
+(см. limit_construction); sp.limit вызывается только при verify=True.
 """
 
 import random
@@ -20,6 +23,9 @@ import sympy as sp
 
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.formatting import Math, Step, format_step
+from re_rl.tasks.sympy_cache import cached_latex, cached_pretty
+from re_rl.tasks.math.analysis.limit_construction import construct_limit, verify_limit
 
 
 class LimitsTask(BaseMathTask):
@@ -60,6 +66,8 @@ class LimitsTask(BaseMathTask):
         preset = self._interpolate_difficulty(difficulty)
         self.max_degree = kwargs.get("max_degree", preset.get("max_degree", 4))
         self.max_coef = kwargs.get("max_coef", preset.get("max_coef", 15))
+        # Проверка построенного значения через sp.limit (медленно)
+        self.verify = kwargs.get("verify", False)
         
         # Символ x
         self.x = sp.Symbol('x')
@@ -71,103 +79,29 @@ class LimitsTask(BaseMathTask):
         description = self._create_problem_description()
         super().__init__(description, language, detail_level, output_format)
     
-    def _rand_coef(self) -> int:
-        """Генерирует случайный коэффициент."""
-        return random.randint(-self.max_coef, self.max_coef)
-    
-    def _generate_polynomial(self, degree: int) -> sp.Expr:
-        """Генерирует случайный полином."""
-        coeffs = [self._rand_coef() for _ in range(degree + 1)]
-        # Гарантируем ненулевой старший коэффициент
-        while coeffs[-1] == 0:
-            coeffs[-1] = random.choice([-1, 1]) * random.randint(1, self.max_coef)
-        
-        return sum(c * self.x**i for i, c in enumerate(coeffs))
-    
     def _generate_task_params(self):
-        """Генерирует параметры задачи."""
-        if self.task_type == "polynomial":
-            self.point = self._rand_coef()
-            degree = random.randint(1, self.max_degree)
-            self.expression = self._generate_polynomial(degree)
-        
-        elif self.task_type == "rational":
-            self.point = random.choice([0, 1, 2, -1, -2])
-            deg_num = random.randint(1, self.max_degree)
-            deg_den = random.randint(1, self.max_degree)
-            self.numerator = self._generate_polynomial(deg_num)
-            self.denominator = self._generate_polynomial(deg_den)
-            # Убеждаемся, что знаменатель не 0 в точке
-            while self.denominator.subs(self.x, self.point) == 0:
-                self.denominator = self._generate_polynomial(deg_den)
-            self.expression = self.numerator / self.denominator
-        
-        elif self.task_type == "infinity":
-            deg_num = random.randint(1, self.max_degree)
-            deg_den = random.randint(1, self.max_degree)
-            self.numerator = self._generate_polynomial(deg_num)
-            self.denominator = self._generate_polynomial(deg_den)
-            self.expression = self.numerator / self.denominator
-        
-        elif self.task_type == "indeterminate":
-            self._generate_indeterminate()
-        
-        elif self.task_type == "sequence":
-            self._generate_sequence()
-        
-        elif self.task_type == "special":
-            self._generate_special()
-    
-    def _generate_indeterminate(self):
-        """Генерирует неопределённость 0/0."""
-        self.point = random.choice([0, 1, -1, 2])
-        # Создаём функцию с общим множителем (x - point)
-        factor = self.x - self.point
-        
-        # Числитель и знаменатель с общим множителем
-        num_extra = self._generate_polynomial(random.randint(1, 2))
-        den_extra = self._generate_polynomial(random.randint(1, 2))
-        
-        # Убеждаемся, что дополнительные части не обнуляются в точке
-        while num_extra.subs(self.x, self.point) == 0:
-            num_extra = self._generate_polynomial(random.randint(1, 2))
-        while den_extra.subs(self.x, self.point) == 0:
-            den_extra = self._generate_polynomial(random.randint(1, 2))
-        
-        self.numerator = sp.expand(factor * num_extra)
-        self.denominator = sp.expand(factor * den_extra)
-        self.expression = self.numerator / self.denominator
+        """Строит выражение с заранее известным пределом (без sp.limit)."""
+        self.construction = construct_limit(
+            self.task_type,
+            max_degree=self.max_degree,
+            max_coef=self.max_coef,
+            multiplicity=1 if self.difficulty <= 5 else 2,
+        )
+        if self.verify and not verify_limit(self.construction):
+            raise ValueError(f"Построенный предел не совпал с sp.limit: {self.construction}")
+
+        c = self.construction
+        self.expression = c.expression
+        self.point = c.point
+        self.numerator = c.numerator
+        self.denominator = c.denominator
         self.indeterminate_type = "0/0"
-    
-    def _generate_sequence(self):
-        """Генерирует предел последовательности."""
-        n = sp.Symbol('n')
-        self.n_symbol = n
-        
-        sequence_types = [
-            (n + 1) / n,  # -> 1
-            (n**2 + n) / (n**2),  # -> 1
-            (2*n + 1) / (3*n + 2),  # -> 2/3
-            n / (n + 1),  # -> 1
-            (1 + 1/n)**n,  # -> e (но сложно вычислить символьно)
-        ]
-        
-        self.sequence_expr = random.choice(sequence_types[:3])
-        self.expression = self.sequence_expr
-    
-    def _generate_special(self):
-        """Генерирует замечательный предел."""
-        special_limits = [
-            ("sin(x)/x", 0, 1),
-            ("(1 - cos(x))/x²", 0, sp.Rational(1, 2)),
-            ("tan(x)/x", 0, 1),
-            ("(e^x - 1)/x", 0, 1),
-            ("ln(1 + x)/x", 0, 1),
-        ]
-        
-        self.special_type, self.point, self.expected_result = random.choice(special_limits)
-        self.expression = sp.sympify(self.special_type)
-    
+        if self.task_type == "sequence":
+            self.n_symbol = c.variable
+
+    def _point_text(self) -> str:
+        return "∞" if self.point == sp.oo else str(self.point)
+
     def _create_problem_description(self) -> str:
         """Создаёт текст задачи."""
         is_latex = self._output_format == "latex"
@@ -175,21 +109,15 @@ class LimitsTask(BaseMathTask):
         
         # Форматируем выражение предела
         if is_latex:
-            expr_latex = sp.latex(self.expression)
-            if self.task_type == "infinity":
-                limit_expr = f"$\\lim_{{x \\to \\infty}} {expr_latex}$"
-            elif self.task_type == "sequence":
-                limit_expr = f"$\\lim_{{n \\to \\infty}} {expr_latex}$"
-            else:
-                limit_expr = f"$\\lim_{{x \\to {self.point}}} {expr_latex}$"
+            expr_latex = cached_latex(self.expression)
+            point_latex = "\\infty" if self.point == sp.oo else self.point
+            limit_expr = f"$\\lim_{{{self.construction.variable} \\to {point_latex}}} {expr_latex}$"
         else:
-            expr_str = sp.pretty(self.expression)
-            if self.task_type == "infinity":
-                limit_expr = f"lim(x→∞) ({expr_str})"
-            elif self.task_type == "sequence":
+            expr_str = cached_pretty(self.expression)
+            if self.task_type == "sequence":
                 limit_expr = f"lim(n→∞) {expr_str}"
             else:
-                limit_expr = f"lim(x→{self.point}) ({expr_str})"
+                limit_expr = f"lim(x→{self._point_text()}) ({expr_str})"
         
         # Используем шаблоны
         template = templates.get(self.task_type, {}).get(self.language, "")
@@ -221,102 +149,89 @@ class LimitsTask(BaseMathTask):
         if len(self.solution_steps) > self.detail_level:
             self.solution_steps = self.solution_steps[:self.detail_level]
     
+    def _math(self, expr) -> Math:
+        """Формула для шага: текст — как раньше, LaTeX — из выражения."""
+        return Math(sp.sympify(expr), text=str(expr) if not isinstance(expr, sp.Basic) else cached_pretty(expr))
+    
     def _solve_polynomial(self, templates):
         """Предел полинома - прямая подстановка."""
-        result = self.expression.subs(self.x, self.point)
+        result = self.construction.value
         
         template = templates.get("direct_substitution", {}).get(self.language, "")
-        self.solution_steps.append(template.format(
-            step=1, point=self.point, expression=sp.pretty(self.expression), result=result
+        self.solution_steps.append(format_step(
+            template, step=1, point=self.point, expression=self._math(self.expression), result=result
         ))
         
         self.final_answer = str(result)
     
     def _solve_rational(self, templates):
-        """Предел рациональной функции."""
-        result = sp.limit(self.expression, self.x, self.point)
-        
-        template = templates.get("direct_substitution", {}).get(self.language, "")
-        self.solution_steps.append(template.format(
-            step=1, point=self.point, expression=sp.pretty(self.expression), result=result
-        ))
-        
-        self.final_answer = str(result)
+        """Предел рациональной функции: знаменатель не обращается в ноль."""
+        self._solve_polynomial(templates)
     
     def _solve_infinity(self, templates):
         """Предел на бесконечности."""
-        result = sp.limit(self.expression, self.x, sp.oo)
-        
-        # Определяем степени
         num_degree = sp.degree(self.numerator, self.x)
         den_degree = sp.degree(self.denominator, self.x)
         
         template = templates.get("divide_highest_power", {}).get(self.language, "")
-        self.solution_steps.append(template.format(
-            step=1, power=max(num_degree, den_degree), expression=sp.pretty(self.expression)
+        self.solution_steps.append(format_step(
+            template, step=1, power=max(num_degree, den_degree), expression=self._math(self.expression)
         ))
         
-        if num_degree > den_degree:
-            limit_result = "±∞"
-        elif num_degree < den_degree:
-            limit_result = "0"
-        else:
-            # Отношение старших коэффициентов
-            limit_result = str(result)
-        
-        self.final_answer = str(result)
+        self.final_answer = str(self.construction.value)
     
     def _solve_indeterminate(self, templates):
-        """Раскрытие неопределённости."""
+        """Раскрытие неопределённости: сокращение общего множителя или правило Лопиталя."""
+        c = self.construction
         template1 = templates.get("indeterminate_found", {}).get(self.language, "")
         self.solution_steps.append(template1.format(step=1, type=self.indeterminate_type))
         
-        # Факторизуем и сокращаем
-        template2 = templates.get("factorize", {}).get(self.language, "")
-        factored_num = sp.factor(self.numerator)
-        factored_den = sp.factor(self.denominator)
-        self.solution_steps.append(template2.format(
-            step=2, factorization=f"({sp.pretty(factored_num)}) / ({sp.pretty(factored_den)})"
-        ))
-        
-        # Вычисляем предел
-        result = sp.limit(self.expression, self.x, self.point)
-        
-        template3 = templates.get("simplify", {}).get(self.language, "")
-        self.solution_steps.append(template3.format(step=3, simplified=str(result)))
+        if c.factored is not None:
+            template2 = templates.get("factorize", {}).get(self.language, "")
+            factored_num, factored_den = c.factored
+            factorization = Math(
+                sp.Mul(factored_num, sp.Pow(factored_den, -1, evaluate=False), evaluate=False),
+                text=f"({cached_pretty(factored_num)}) / ({cached_pretty(factored_den)})",
+            )
+            self.solution_steps.append(format_step(template2, step=2, factorization=factorization))
+            template3 = templates.get("simplify", {}).get(self.language, "")
+            simplified = Step(self._math(c.reduced), Math(latex=r"\to", text=" → "), self._math(c.value))
+            self.solution_steps.append(format_step(template3, step=3, simplified=simplified))
+        else:
+            template2 = templates.get("lhopital", {}).get(self.language, "")
+            self.solution_steps.append(format_step(template2, step=2, derivative=self._math(c.reduced)))
+            template3 = templates.get("simplify", {}).get(self.language, "")
+            self.solution_steps.append(template3.format(step=3, simplified=str(c.value)))
         
-        self.final_answer = str(result)
+        self.final_answer = str(c.value)
     
     def _solve_sequence(self, templates):
         """Предел последовательности."""
-        n = self.n_symbol
-        result = sp.limit(self.expression, n, sp.oo)
-        
-        template = templates.get("divide_highest_power", {}).get(self.language, "")
-        self.solution_steps.append(template.format(
-            step=1, power="n", expression=sp.pretty(self.expression)
-        ))
+        c = self.construction
+        if c.kind == "exp_power":
+            template = templates.get("remarkable_limit", {}).get(self.language, "")
+            formula = PROMPT_TEMPLATES.get("limits", {}).get("remarkable_limits", {}).get(
+                self.language, {}
+            ).get("one_plus_one_over_x", "lim(x→∞) (1 + 1/x)^x = e")
+            self.solution_steps.append(template.format(step=1, limit_formula=formula))
+        else:
+            template = templates.get("divide_highest_power", {}).get(self.language, "")
+            self.solution_steps.append(format_step(
+                template, step=1, power="n", expression=self._math(self.expression)
+            ))
         
-        self.final_answer = str(result)
+        self.final_answer = str(c.value)
     
     def _solve_special(self, templates):
         """Замечательный предел."""
         template = templates.get("remarkable_limit", {}).get(self.language, "")
         
         remarkable_limits = PROMPT_TEMPLATES.get("limits", {}).get("remarkable_limits", {}).get(self.language, {})
-        
-        if "sin" in self.special_type:
-            formula = remarkable_limits.get("sin_x_over_x", "lim sin(x)/x = 1")
-        elif "e^" in self.special_type:
-            formula = remarkable_limits.get("e_x_minus_one", "lim (e^x - 1)/x = 1")
-        elif "ln" in self.special_type:
-            formula = remarkable_limits.get("ln_one_plus_x", "lim ln(1+x)/x = 1")
-        else:
-            formula = "Замечательный предел"
+        formula = remarkable_limits.get(self.construction.formula, "lim sin(x)/x = 1")
         
         self.solution_steps.append(template.format(step=1, limit_formula=formula))
         
-        self.final_answer = str(self.expected_result)
+        self.final_answer = str(self.construction.value)
     
     def get_task_type(self) -> str:
         return "limits"
@@ -0,0 +1,346 @@
+# re_rl/tasks/math/analysis/ode_construction.py
+
+"""
+Построение дифференциальных уравнений «от решения».
+
+Для каждого семейства сначала выбирается решение в замкнутой форме, а
+уравнение и начальные условия выводятся из него:
+- separable: b·y² = a·x² + C  →  dy/dx = a·x / (b·y)
+- linear_first_order: y = y_p(x) + C·e^(-px), y_p — константа, линейная
+  функция или γ·e^(mx)  →  y' + p·y = y_p' + p·y_p
+- homogeneous_second_order: корни характеристического уравнения (различные,
+  кратный или комплексные α ± βi)  →  y'' + a·y' + b·y = 0
+- exponential_growth: y = C·e^(kx)  →  dy/dx = k·y
+- cauchy_problem: y = y0·e^(a(x - x0))  →  dy/dx = a·y, y(x0) = y0
+
+verify_ode подставляет решение в уравнение на сетке точек (numpy, центральные
+разности) — без dsolve.
+"""
+
+import random
+import re
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from re_rl.tasks.math.algebra.polynomials import format_number, format_polynomial
+
+
+ODE_FAMILIES = (
+    "separable", "linear_first_order", "homogeneous_second_order",
+    "exponential_growth", "cauchy_problem",
+)
+
+# Шаг центральных разностей и относительный допуск невязки
+FD_STEP = 1e-4
+RESIDUAL_TOL = 1e-5
+
+
+@dataclass
+class ODEConstruction:
+    """ДУ с известным решением."""
+
+    family: str
+    coefficients: Dict[str, Any]
+    equation: str                       # текстовая запись уравнения
+    equation_latex: str                 # то же в LaTeX (без $)
+    solution: str                       # ответ: общее или частное решение
+    # y(x, constants) — решение как функция numpy; constants — массив констант
+    solution_fn: Callable[[np.ndarray, np.ndarray], np.ndarray]
+    # Слагаемые уравнения F(x, y, y', y'') = Σ terms = 0
+    terms_fn: Callable[..., List[np.ndarray]]
+    n_constants: int = 1
+    initial_conditions: Optional[Dict[str, Any]] = None
+    details: Dict[str, Any] = field(default_factory=dict)  # промежуточные результаты для шагов решения
+
+
+# ------------------------------------------------------------------ печать
+
+def exp_text(k: Any, var: str = "x") -> str:
+    """e^(kx): e^(x), e^(-x), e^(3x), e^(0.5x)."""
+    if k == 1:
+        return f"e^({var})"
+    if k == -1:
+        return f"e^(-{var})"
+    if isinstance(k, (int, Fraction)) and Fraction(k).denominator == 1:
+        return f"e^({int(k)}{var})"
+    return f"e^({float(k):.4g}{var})"
+
+
+def _exact(v: Any) -> Any:
+    """Целое значение — int, иначе без изменений (Fraction или float)."""
+    if isinstance(v, Fraction) and v.denominator == 1:
+        return int(v)
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def _num(v: Any) -> str:
+    return format_number(v) if isinstance(v, (int, Fraction)) else f"{v:.4g}"
+
+
+def to_latex(text: str) -> str:
+    """Текстовая запись уравнения → LaTeX: e^(…) → e^{…}, ² → ^{2}."""
+    return re.sub(r"e\^\(([^)]*)\)", r"e^{\1}", text).replace("²", "^{2}")
+
+
+def _coef_text(c: Any, body: str, first: bool = False) -> str:
+    """Слагаемое c·body со знаком (для сумм)."""
+    c = Fraction(c)
+    magnitude = "" if abs(c) == 1 and body else format_number(abs(c))
+    if body and c.denominator != 1:
+        magnitude = f"({magnitude})"
+    if first:
+        return f"{'-' if c < 0 else ''}{magnitude}{body}"
+    return f" {'-' if c < 0 else '+'} {magnitude}{body}"
+
+
+def _sum_text(terms: List[tuple]) -> str:
+    """Сумма слагаемых [(коэффициент, тело)], нулевые пропускаются."""
+    parts = [(c, body) for c, body in terms if c != 0]
+    if not parts:
+        return "0"
+    return "".join(_coef_text(c, body, i == 0) for i, (c, body) in enumerate(parts))
+
+
+# ------------------------------------------------------------- семейства
+
+def construct_separable(rng=random, max_coef: int = 5, a: int = None, b: int = None) -> ODEConstruction:
+    a = a if a is not None else rng.randint(1, max_coef)
+    b = b if b is not None else rng.randint(1, max_coef)
+    ratio = Fraction(a, b)
+    equation = f"dy/dx = {a}x / {b}y" if b != 1 else f"dy/dx = {a}x / y"
+    solution = f"y² = {_coef_text(ratio, 'x²', first=True)} + C"
+    return ODEConstruction(
+        family="separable",
+        coefficients={"a": a, "b": b},
+        equation=equation,
+        equation_latex=f"\\frac{{dy}}{{dx}} = \\frac{{{a}x}}{{{b}y}}",
+        solution=solution,
+        # Ветвь y > 0 при C > 0
+        solution_fn=lambda x, C: np.sqrt(float(ratio) * x ** 2 + C[0]),
+        terms_fn=lambda x, y, dy, d2y: [dy, -a * x / (b * y)],
+        details={"separated": f"{b}y dy = {a}x dx", "left": f"{b}y dy", "right": f"{a}x dx"},
+    )
+
+
+def construct_linear_first_order(
+    rng=random, max_coef: int = 5, simple: bool = True, p: int = None, q: int = None,
+) -> ODEConstruction:
+    """y' + p·y = q(x) с решением y = y_p + C·e^(-px)."""
+    p = p if p is not None else rng.randint(1, min(5, max_coef))
+    if q is not None or simple:
+        kind = "constant"
+    else:
+        kind = rng.choice(["constant", "linear", "exponential"])
+
+    if kind == "constant":
+        # q = p·c, y_p = c (для заданного q — y_p = q/p)
+        y_p = Fraction(q, p) if q is not None else Fraction(rng.randint(-max_coef, max_coef) or 1)
+        q = q if q is not None else int(p * y_p)
+        rhs_text = format_number(q)
+        y_p_text = format_number(y_p)
+        y_p_fn = lambda x: float(y_p) + 0 * x
+        q_fn = lambda x: q + 0 * x
+        coefficients = {"p": p, "q": q}
+    elif kind == "linear":
+        alpha = rng.choice([-1, 1]) * rng.randint(1, max_coef)
+        beta = rng.randint(-max_coef, max_coef)
+        # (αx + β)' + p(αx + β) = pαx + (pβ + α)
+        rhs_text = _sum_text([(p * alpha, "x"), (p * beta + alpha, "")])
+        y_p_text = _sum_text([(alpha, "x"), (beta, "")])
+        y_p_fn = lambda x: alpha * x + beta
+        q_fn = lambda x: p * alpha * x + p * beta + alpha
+        coefficients = {"p": p, "alpha": alpha, "beta": beta}
+    else:
+        gamma = rng.choice([-1, 1]) * rng.randint(1, max_coef)
+        m = rng.choice([k for k in range(-3, 4) if k not in (0, -p)])
+        # (γe^(mx))' + pγe^(mx) = γ(m + p)e^(mx)
+        rhs_text = _coef_text(gamma * (m + p), exp_text(m), first=True)
+        y_p_text = _coef_text(gamma, exp_text(m), first=True)
+        y_p_fn = lambda x: gamma * np.exp(m * x)
+        q_fn = lambda x: gamma * (m + p) * np.exp(m * x)
+        coefficients = {"p": p, "gamma": gamma, "m": m}
+
+    equation = f"y' + {p}y = {rhs_text}" if p != 1 else f"y' + y = {rhs_text}"
+    solution = f"y = {y_p_text} + C{exp_text(-p)}" if y_p_text != "0" else f"y = C{exp_text(-p)}"
+    return ODEConstruction(
+        family="linear_first_order",
+        coefficients=coefficients,
+        equation=equation,
+        equation_latex=to_latex(equation),
+        solution=solution,
+        solution_fn=lambda x, C: y_p_fn(x) + C[0] * np.exp(-p * x),
+        terms_fn=lambda x, y, dy, d2y: [dy, p * y, -q_fn(x)],
+        details={"kind": kind},
+    )
+
+
+def construct_homogeneous_second_order(
+    rng=random, simple: bool = True, a: int = None, b: int = None,
+) -> ODEConstruction:
+    """y'' + a·y' + b·y = 0 по корням характеристического уравнения."""
+    if a is not None and b is not None:
+        disc = a * a - 4 * b
+        if disc < 0:
+            kind, alpha, beta = "complex", _exact(Fraction(-a, 2)), _exact(np.sqrt(-disc) / 2)
+        elif disc == 0:
+            kind, r1 = "repeated", _exact(Fraction(-a, 2))
+        else:
+            kind = "distinct"
+            root = np.sqrt(disc)
+            r1, r2 = _exact((-a - root) / 2), _exact((-a + root) / 2)
+    else:
+        kind = "distinct" if simple else rng.choice(["distinct", "repeated", "complex"])
+        if kind == "distinct":
+            r1, r2 = sorted(rng.sample(range(-3, 4), 2))
+            a, b = -(r1 + r2), r1 * r2
+        elif kind == "repeated":
+            r1 = rng.choice([k for k in range(-3, 4) if k != 0])
+            a, b = -2 * r1, r1 * r1
+        else:
+            alpha, beta = rng.randint(-2, 2), rng.randint(1, 3)
+            a, b = -2 * alpha, alpha * alpha + beta * beta
+
+    equation = "y''" + "".join(_coef_text(c, body) for c, body in [(a, "y'"), (b, "y")] if c != 0) + " = 0"
+    char_eq = format_polynomial([1, a, b], var="r") + " = 0"
+
+    if kind == "distinct":
+        roots_text = f"r₁ = {_num(r1)}, r₂ = {_num(r2)}"
+        # Нулевой корень даёт постоянное слагаемое
+        solution = "y = " + " + ".join(
+            name if r == 0 else f"{name}{exp_text(r)}" for name, r in (("C₁", r1), ("C₂", r2))
+        )
+        fr1, fr2 = float(r1), float(r2)
+        solution_fn = lambda x, C: C[0] * np.exp(fr1 * x) + C[1] * np.exp(fr2 * x)
+    elif kind == "repeated":
+        roots_text = f"r₁ = r₂ = {_num(r1)}"
+        solution = f"y = (C₁ + C₂x){exp_text(r1)}"
+        fr1 = float(r1)
+        solution_fn = lambda x, C: (C[0] + C[1] * x) * np.exp(fr1 * x)
+    else:
+        beta_body = "" if beta == 1 else _num(beta)
+        roots_text = f"r = {_num(alpha)} ± {beta_body or '1'}i"
+        trig = f"C₁cos({beta_body}x) + C₂sin({beta_body}x)"
+        solution = f"y = {trig}" if alpha == 0 else f"y = {exp_text(alpha)}({trig})"
+        fa, fb = float(alpha), float(beta)
+        solution_fn = lambda x, C: np.exp(fa * x) * (C[0] * np.cos(fb * x) + C[1] * np.sin(fb * x))
+
+    return ODEConstruction(
+        family="homogeneous_second_order",
+        coefficients={"a": a, "b": b},
+        equation=equation,
+        equation_latex=to_latex(equation),
+        solution=solution,
+        solution_fn=solution_fn,
+        terms_fn=lambda x, y, dy, d2y: [d2y, a * dy, b * y],
+        n_constants=2,
+        details={"kind": kind, "char_eq": char_eq, "roots": roots_text},
+    )
+
+
+def construct_exponential_growth(rng=random, k: int = None) -> ODEConstruction:
+    k = k if k is not None else rng.choice([1, 2, 3, -1, -2, -3])
+    return ODEConstruction(
+        family="exponential_growth",
+        coefficients={"k": k},
+        equation=f"dy/dx = {k}y",
+        equation_latex=f"\\frac{{dy}}{{dx}} = {k}y",
+        solution=f"y = C{exp_text(k)}",
+        solution_fn=lambda x, C: C[0] * np.exp(k * x),
+        terms_fn=lambda x, y, dy, d2y: [dy, -k * y],
+    )
+
+
+def construct_cauchy(
+    rng=random, max_coef: int = 5, simple: bool = True, a: int = None,
+    initial_conditions: Optional[Dict[str, Any]] = None,
+) -> ODEConstruction:
+    """dy/dx = a·y, y(x0) = y0 с решением y = y0·e^(a(x - x0))."""
+    a = a if a is not None else rng.randint(1, max_coef)
+    if initial_conditions is None:
+        x0 = 0 if simple else rng.choice([0, 0, 1, -1])
+        initial_conditions = {"y0": rng.randint(1, 5), "x0": x0}
+    x0, y0 = initial_conditions["x0"], initial_conditions["y0"]
+
+    exponent = _sum_text([(a, "x"), (-a * x0, "")])
+    y0_text = format_number(Fraction(y0)) if Fraction(y0).denominator < 100 else f"{y0:.4g}"
+    coefficient = "" if y0 == 1 else y0_text
+    solution = f"y = {coefficient}{exp_text(a) if x0 == 0 else f'e^({exponent})'}"
+    return ODEConstruction(
+        family="cauchy_problem",
+        coefficients={"a": a, "b": 0},
+        equation=f"dy/dx = {a}y",
+        equation_latex=f"\\frac{{dy}}{{dx}} = {a}y",
+        solution=solution,
+        solution_fn=lambda x, C: y0 * np.exp(a * (x - x0)) + 0 * C[0],
+        terms_fn=lambda x, y, dy, d2y: [dy, -a * y],
+        n_constants=0,
+        initial_conditions=initial_conditions,
+        details={"general": f"y = C{exp_text(a)}", "C": y0 * np.exp(-a * x0)},
+    )
+
+
+def construct_ode(
+    family: str,
+    max_coef: int = 5,
+    simple: bool = True,
+    coefficients: Optional[Dict[str, Any]] = None,
+    initial_conditions: Optional[Dict[str, Any]] = None,
+    rng=random,
+) -> ODEConstruction:
+    """
+    Строит ДУ заданного семейства; заданные coefficients (как в
+    DifferentialEquationTask) используются вместо случайных.
+    """
+    coefficients = coefficients or {}
+    if family == "separable":
+        return construct_separable(rng, max_coef, coefficients.get("a"), coefficients.get("b"))
+    if family == "linear_first_order":
+        return construct_linear_first_order(rng, max_coef, simple, coefficients.get("p"), coefficients.get("q"))
+    if family == "homogeneous_second_order":
+        return construct_homogeneous_second_order(rng, simple, coefficients.get("a"), coefficients.get("b"))
+    if family == "exponential_growth":
+        return construct_exponential_growth(rng, coefficients.get("k"))
+    if family == "cauchy_problem":
+        return construct_cauchy(rng, max_coef, simple, coefficients.get("a"), initial_conditions)
+    raise ValueError(f"Неизвестный тип ДУ: {family}. Доступные: {ODE_FAMILIES}")
+
+
+def verify_ode(
+    construction: ODEConstruction,
+    num_points: int = 33,
+    num_constants: int = 3,
+    rng: Optional[np.random.Generator] = None,
+) -> bool:
+    """
+    Проверяет, что решение удовлетворяет уравнению (и начальному условию):
+    невязка считается на сетке x ∈ [-1, 1] сразу для num_constants наборов
+    констант (массив num_constants × num_points), производные — центральными
+    разностями.
+    """
+    rng = rng or np.random.default_rng(0)
+    x = np.linspace(-1.0, 1.0, num_points)
+    h = FD_STEP
+    # C[i] — столбец (num_constants, 1): решение вычисляется для всех наборов одной операцией
+    C = rng.uniform(0.5, 2.0, size=(max(1, construction.n_constants), num_constants, 1))
+    f = lambda t: construction.solution_fn(t, C)
+    with np.errstate(all="ignore"):
+        y, y_plus, y_minus = f(x), f(x + h), f(x - h)
+        dy = (y_plus - y_minus) / (2 * h)
+        d2y = (y_plus - 2 * y + y_minus) / (h * h)
+        terms = construction.terms_fn(x, y, dy, d2y)
+        residual = np.abs(sum(terms))
+        scale = sum(np.abs(t) for t in terms) + 1.0
+    if not np.all(residual <= RESIDUAL_TOL * scale):
+        return False
+
+    ic = construction.initial_conditions
+    if ic is not None:
+        y_at_x0 = construction.solution_fn(np.array([float(ic["x0"])]), np.zeros(1))[0]
+        if not np.isclose(y_at_x0, ic["y0"], rtol=1e-9):
+            return False
+    return True
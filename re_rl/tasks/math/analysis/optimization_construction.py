@@ -0,0 +1,307 @@
+# re_rl/tasks/math/analysis/optimization_construction.py
+
+"""
+Задачи на экстремумы, построенные «от ответа».
+
+- construct_objective: сначала выбираются критические точки cᵢ (целые,
+  кратность 1 — экстремум, 2 — точка перегиба), затем
+  f'(x) = s·Π(x - cᵢ)^mᵢ, f = ∫f' с множителем s, при котором все
+  коэффициенты f целые. Тип точки определяется по смене знака f';
+- critical_points: то же для заданного многочлена — рациональные корни f'
+  ищутся точно (polynomials.rational_roots), остальные — np.roots;
+- construct_interval / interval_extrema: отрезок вокруг критических точек и
+  точные max/min среди концов и критических точек;
+- construct_constrained: f(x, y) = p·x² + q·y² - 2p·x₀·x - 2q·y₀·y при
+  ограничении αx + βy = γ; оптимум (x*, y*) и множитель λ выбираются
+  заранее, x₀ и y₀ выводятся из условий Лагранжа;
+- grid_extremum: проверка глобального оптимума на сетке numpy с
+  уточнением вокруг лучшего узла — без символьного решения.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from re_rl.tasks.math.algebra.polynomials import deflate, poly_value, rational_roots
+
+
+# Число узлов сетки и раундов уточнения при проверке
+GRID_POINTS = 2049
+REFINE_ROUNDS = 4
+
+
+@dataclass
+class CriticalPoint:
+    x: Fraction                 # float, если корень f' иррационален
+    value: Fraction
+    kind: str                   # minimum, maximum, saddle
+
+
+@dataclass
+class ConstructedObjective:
+    """Многочлен с известными критическими точками."""
+
+    coefficients: List[int]            # от старшего к младшему
+    derivative: List[int]
+    critical: List[CriticalPoint]
+
+    @property
+    def extrema(self) -> List[CriticalPoint]:
+        return [p for p in self.critical if p.kind != "saddle"]
+
+
+@dataclass
+class ConstructedConstrained:
+    """min f(x, y) = p·x² + q·y² + bx·x + by·y при αx + βy = γ."""
+
+    p: int
+    q: int
+    bx: int
+    by: int
+    constraint: Tuple[int, int, int]   # (α, β, γ)
+    optimum: Tuple[int, int]
+    multiplier: int                    # λ
+    value: int
+
+    def objective(self, x, y):
+        return self.p * x * x + self.q * y * y + self.bx * x + self.by * y
+
+
+# --------------------------------------------------------- многочлены
+
+def derivative(coeffs: Sequence) -> List:
+    n = len(coeffs) - 1
+    return [c * (n - i) for i, c in enumerate(coeffs[:-1])] or [0]
+
+
+def integrate(coeffs: Sequence[Fraction]) -> List[Fraction]:
+    """Первообразная с нулевой константой."""
+    n = len(coeffs)
+    return [Fraction(c) / (n - i) for i, c in enumerate(coeffs)] + [Fraction(0)]
+
+
+def _expand(roots: Sequence[Tuple[int, int]]) -> List[int]:
+    coeffs = [1]
+    for root, mult in roots:
+        for _ in range(mult):
+            coeffs = [a - root * b for a, b in zip(coeffs + [0], [0] + coeffs)]
+    return coeffs
+
+
+def _sign_near(deriv: Sequence, x: float, side: int, gap: float) -> int:
+    value = float(np.polyval([float(c) for c in deriv], x + side * gap))
+    return 1 if value > 0 else -1
+
+
+def _classify(deriv: Sequence, xs: List, multiplicities: List[int]) -> List[str]:
+    """Тип критической точки по знакам f' слева и справа."""
+    kinds = []
+    sorted_xs = sorted(float(x) for x in xs)
+    gaps = [b - a for a, b in zip(sorted_xs, sorted_xs[1:])]
+    gap = min(gaps) / 4 if gaps else 0.5
+    for x, mult in zip(xs, multiplicities):
+        if mult % 2 == 0:
+            kinds.append("saddle")
+            continue
+        left = _sign_near(deriv, float(x), -1, gap)
+        kinds.append("minimum" if left < 0 else "maximum")
+    return kinds
+
+
+def construct_objective(
+    degree: int,
+    max_point: int = 3,
+    allow_saddle: bool = False,
+    rng=random,
+) -> ConstructedObjective:
+    """
+    Многочлен степени degree с целыми коэффициентами и заданными критическими
+    точками (их degree - 1 с учётом кратности, хотя бы один экстремум).
+    """
+    n_roots = degree - 1
+    roots: List[Tuple[int, int]] = []
+    candidates = list(range(-max_point, max_point + 1))
+    rng.shuffle(candidates)
+    remaining = n_roots
+    while remaining > 0:
+        mult = 2 if allow_saddle and remaining >= 2 and roots and rng.random() < 0.4 else 1
+        roots.append((candidates.pop(), mult))
+        remaining -= mult
+
+    sign = rng.choice([-1, 1])
+    deriv_monic = _expand(roots)
+    antiderivative = integrate([Fraction(c) for c in deriv_monic])
+    den = 1
+    for c in antiderivative:
+        den = math.lcm(den, c.denominator)
+    scale = sign * den * rng.randint(1, 2)
+    coeffs = [int(c * scale) for c in antiderivative]
+    coeffs[-1] = rng.randint(-10, 10)
+    deriv = derivative(coeffs)
+
+    xs = [Fraction(r) for r, _ in roots]
+    kinds = _classify(deriv, xs, [m for _, m in roots])
+    critical = sorted(
+        (CriticalPoint(x, poly_value(coeffs, x), kind) for x, kind in zip(xs, kinds)),
+        key=lambda p: p.x,
+    )
+    return ConstructedObjective(coeffs, deriv, critical)
+
+
+def critical_points(coeffs: Sequence[int]) -> List[CriticalPoint]:
+    """
+    Критические точки заданного многочлена: рациональные корни f' — точно,
+    остальные вещественные — через np.roots.
+    """
+    deriv = derivative(list(coeffs))
+    if len(deriv) <= 1:
+        return []
+    rest: List = [Fraction(c) for c in deriv]
+    xs: List = []
+    mults: List[int] = []
+    for root in rational_roots([int(c) for c in deriv]):
+        mult = 0
+        while len(rest) > 1 and poly_value(rest, root) == 0:
+            rest = deflate(rest, root)
+            mult += 1
+        xs.append(root)
+        mults.append(mult)
+    if len(rest) > 1:
+        for r in np.roots([float(c) for c in rest]):
+            if abs(r.imag) < 1e-12:
+                xs.append(float(r.real))
+                mults.append(1)
+    kinds = _classify(deriv, xs, mults)
+    points = []
+    for x, kind in zip(xs, kinds):
+        value = poly_value(coeffs, x) if isinstance(x, Fraction) else float(np.polyval([float(c) for c in coeffs], x))
+        points.append(CriticalPoint(x, value, kind))
+    return sorted(points, key=lambda p: float(p.x))
+
+
+# ----------------------------------------------------------- отрезок
+
+def construct_interval(critical: Sequence[CriticalPoint], rng=random) -> Tuple[int, int]:
+    """Целый отрезок, содержащий хотя бы одну критическую точку."""
+    inner = [math.floor(p.x) for p in critical] or [0]
+    lo, hi = min(inner), max(inner)
+    a = rng.randint(lo - 2, lo)
+    b = rng.randint(max(hi, a) + 1, max(hi, a) + 3)
+    return a, b
+
+
+def interval_extrema(
+    coeffs: Sequence[int], critical: Sequence[CriticalPoint], a, b,
+) -> Tuple[Tuple, Tuple, List[Tuple]]:
+    """
+    Точные max и min на [a, b] среди концов и внутренних критических точек.
+
+    Returns:
+        ((x_max, f_max), (x_min, f_min), кандидаты [(x, f(x))])
+    """
+    candidates = [(Fraction(a), poly_value(coeffs, Fraction(a)))]
+    candidates += [(p.x, p.value) for p in critical if a < p.x < b]
+    candidates.append((Fraction(b), poly_value(coeffs, Fraction(b))))
+    best_max = max(candidates, key=lambda c: c[1])
+    best_min = min(candidates, key=lambda c: c[1])
+    return best_max, best_min, candidates
+
+
+# -------------------------------------------------------- с ограничением
+
+def construct_constrained(max_coef: int = 5, rng=random) -> ConstructedConstrained:
+    """
+    Условный минимум с целыми оптимумом и множителем Лагранжа.
+
+    Из ∂L/∂x = 2p(x - x₀) - λα = 0 и ∂L/∂y = 2q(y - y₀) - λβ = 0 при
+    λ = 2pq·t получаем целые x₀ = x* - qtα и y₀ = y* - ptβ.
+    """
+    p, q = rng.randint(1, 3), rng.randint(1, 3)
+    alpha = rng.choice([-1, 1]) * rng.randint(1, 3)
+    beta = rng.choice([-1, 1]) * rng.randint(1, 3)
+    t = rng.choice([-1, 1]) * rng.randint(1, 2)
+    x_opt, y_opt = rng.randint(-max_coef, max_coef), rng.randint(-max_coef, max_coef)
+    x0, y0 = x_opt - q * t * alpha, y_opt - p * t * beta
+    gamma = alpha * x_opt + beta * y_opt
+    c = ConstructedConstrained(
+        p=p, q=q, bx=-2 * p * x0, by=-2 * q * y0,
+        constraint=(alpha, beta, gamma), optimum=(x_opt, y_opt),
+        multiplier=2 * p * q * t, value=0,
+    )
+    c.value = c.objective(x_opt, y_opt)
+    return c
+
+
+# ------------------------------------------------------- проверка (numpy)
+
+def grid_extremum(
+    f: Callable[[np.ndarray], np.ndarray],
+    a: float,
+    b: float,
+    kind: str = "max",
+    num: int = GRID_POINTS,
+    rounds: int = REFINE_ROUNDS,
+) -> Tuple[float, float]:
+    """
+    Глобальный max/min функции на [a, b]: сетка numpy, затем несколько
+    раундов сгущения сетки вокруг лучшего узла.
+    """
+    pick = np.argmax if kind == "max" else np.argmin
+    lo, hi = float(a), float(b)
+    for _ in range(rounds + 1):
+        xs = np.linspace(lo, hi, num)
+        ys = f(xs)
+        i = int(pick(ys))
+        step = (hi - lo) / (num - 1)
+        lo, hi = max(float(a), xs[i] - step), min(float(b), xs[i] + step)
+    return float(xs[i]), float(ys[i])
+
+
+def _close(actual: float, expected, scale: float) -> bool:
+    return abs(actual - float(expected)) <= 1e-6 * max(1.0, scale)
+
+
+def verify_objective(objective: ConstructedObjective, interval: Optional[Tuple] = None) -> bool:
+    """
+    Проверяет построение на сетке: каждый экстремум — локальный оптимум в
+    своей окрестности, а на отрезке — глобальные max и min.
+    """
+    coeffs = [float(c) for c in objective.coefficients]
+    f = lambda xs: np.polyval(coeffs, xs)
+    xs = sorted(float(p.x) for p in objective.critical)
+    gaps = [b - a for a, b in zip(xs, xs[1:])]
+    radius = min(gaps) / 2 if gaps else 1.0
+    for point in objective.extrema:
+        x = float(point.x)
+        kind = "max" if point.kind == "maximum" else "min"
+        _, value = grid_extremum(f, x - radius, x + radius, kind)
+        if not _close(value, point.value, abs(float(point.value))):
+            return False
+
+    if interval is not None:
+        a, b = interval
+        (_, f_max), (_, f_min), _ = interval_extrema(objective.coefficients, objective.critical, a, b)
+        scale = max(abs(float(f_max)), abs(float(f_min)))
+        if not _close(grid_extremum(f, a, b, "max")[1], f_max, scale):
+            return False
+        if not _close(grid_extremum(f, a, b, "min")[1], f_min, scale):
+            return False
+    return True
+
+
+def verify_constrained(c: ConstructedConstrained, radius: float = 20.0) -> bool:
+    """Минимум f вдоль прямой αx + βy = γ (параметризация по x или y)."""
+    alpha, beta, gamma = c.constraint
+    x_opt, y_opt = c.optimum
+    if beta != 0:
+        g = lambda xs: c.objective(xs, (gamma - alpha * xs) / beta)
+        center = x_opt
+    else:
+        g = lambda ys: c.objective((gamma - beta * ys) / alpha, ys)
+        center = y_opt
+    _, value = grid_extremum(g, center - radius, center + radius, "min")
+    return _close(value, c.value, abs(c.value))
@@ -7,22 +7,50 @@ OptimizationTask — задачи на оптимизацию.
 - find_extremum: поиск экстремумов функции
 - max_min_interval: max/min на отрезке
 - linear_programming: линейное программирование
+- constrained: условный экстремум (метод Лагранжа)
 - word_problem: текстовые задачи на оптимизацию
+
+В режиме mode="construct" (по умолчанию) сначала выбираются критические
+точки и концы отрезка, а функция строится по ним (см.
+optimization_construction); символьного решения нет, verify=True
+проверяет оптимум на сетке numpy.
 """
 
 import random
 import math
-import sympy as sp
+from fractions import Fraction
 from typing import List, Dict, Any, ClassVar, Tuple, Optional
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.algebra.polynomials import format_number, format_polynomial, poly_value
+from re_rl.tasks.math.analysis.optimization_construction import (
+    ConstructedObjective, construct_constrained, construct_interval, construct_objective,
+    critical_points, derivative, interval_extrema, verify_constrained, verify_objective,
+)
+
+
+def _num(value) -> str:
+    """Точное значение — дробью, приближённое (иррациональная точка) — с 4 знаками."""
+    return format_number(value) if isinstance(value, (int, Fraction)) else f"{value:.4f}"
+
+
+def _terms_text(pairs: List[Tuple[int, str]]) -> str:
+    """Сумма слагаемых [(коэффициент, переменная)]: "2x² - 3y + 1"."""
+    parts = []
+    for coef, body in pairs:
+        if coef == 0:
+            continue
+        magnitude = "" if abs(coef) == 1 and body else str(abs(coef))
+        sign = ("-" if coef < 0 else "") if not parts else (" - " if coef < 0 else " + ")
+        parts.append(f"{sign}{magnitude}{body}")
+    return "".join(parts) or "0"
 
 
 class OptimizationTask(BaseMathTask):
     """Генератор задач на оптимизацию."""
     
     TASK_TYPES = [
-        "find_extremum", "max_min_interval", "linear_programming"
+        "find_extremum", "max_min_interval", "linear_programming", "constrained"
     ]
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
@@ -61,10 +89,34 @@ class OptimizationTask(BaseMathTask):
         self.max_coef = preset.get("max_coef", 15)
         self.lp_vars = preset.get("lp_vars", 2)
         self.lp_constraints_count = preset.get("lp_constraints", 3)
+        # construct — от критических точек, random — случайные коэффициенты
+        self.mode = kwargs.get("mode", "construct")
+        # Проверка оптимума на сетке numpy
+        self.verify = kwargs.get("verify", False)
         
         # Генерируем данные
-        self.coefficients = coefficients if coefficients else self._generate_poly_coefficients()
-        self.interval = interval if interval else self._generate_interval()
+        if coefficients:
+            self.coefficients = list(coefficients)
+            self.objective = self._objective_from_coefficients()
+        elif self.mode == "construct":
+            self.objective = construct_objective(self.degree, allow_saddle=difficulty >= 8)
+            self.coefficients = self.objective.coefficients
+        else:
+            self.coefficients = self._generate_poly_coefficients()
+            self.objective = self._objective_from_coefficients()
+        
+        if interval:
+            self.interval = interval
+        elif self.mode == "construct":
+            self.interval = construct_interval(self.objective.critical)
+        else:
+            self.interval = self._generate_interval()
+        
+        if self.task_type == "constrained":
+            self.constrained = construct_constrained(min(self.max_coef, 5))
+        
+        if self.verify:
+            self._verify()
         
         # Для линейного программирования
         self.lp_objective = lp_objective
@@ -75,6 +127,25 @@ class OptimizationTask(BaseMathTask):
         description = self._create_problem_description()
         super().__init__(description, language, detail_level, output_format)
     
+    def _objective_from_coefficients(self) -> ConstructedObjective:
+        """Критические точки заданного многочлена (рациональные — точно)."""
+        return ConstructedObjective(
+            self.coefficients, derivative(self.coefficients), critical_points(self.coefficients)
+        )
+    
+    def _verify(self):
+        """Сверяет построенный ответ с поиском оптимума на сетке."""
+        if self.task_type == "constrained":
+            ok = verify_constrained(self.constrained)
+        elif self.task_type == "max_min_interval":
+            ok = verify_objective(self.objective, self.interval)
+        elif self.task_type == "find_extremum":
+            ok = verify_objective(self.objective)
+        else:
+            ok = True
+        if not ok:
+            raise ValueError(f"Оптимум не подтверждён на сетке: {self._poly_to_str(self.coefficients)}")
+    
     def _generate_poly_coefficients(self) -> List[float]:
         """Генерирует коэффициенты многочлена с хорошими экстремумами."""
         if self.degree == 2:
@@ -143,10 +214,7 @@ class OptimizationTask(BaseMathTask):
     
     def _poly_to_latex(self, coeffs: List[float]) -> str:
         """Преобразует коэффициенты в LaTeX строку."""
-        x = sp.Symbol('x')
-        n = len(coeffs) - 1
-        poly = sum(c * x**(n-i) for i, c in enumerate(coeffs))
-        return sp.latex(poly)
+        return format_polynomial(coeffs, style="latex")
     
     def _create_problem_description(self) -> str:
         """Создаёт текст задачи."""
@@ -202,6 +270,13 @@ class OptimizationTask(BaseMathTask):
             template = templates.get("linear_programming", {}).get(self.language, "")
             return template.format(lp_expression=lp_expr)
         
+        elif self.task_type == "constrained":
+            objective, constraint = self._constrained_strings()
+            if is_latex:
+                objective, constraint = f"${objective}$", f"${constraint}$"
+            template = templates.get("constrained", {}).get(self.language, "")
+            return template.format(objective=objective, constraint=constraint)
+        
         return ""
     
     def solve(self):
@@ -216,101 +291,99 @@ class OptimizationTask(BaseMathTask):
             self._solve_max_min_interval(templates, types)
         elif self.task_type == "linear_programming":
             self._solve_linear_programming(templates)
+        elif self.task_type == "constrained":
+            self._solve_constrained(templates)
         
         # Ограничиваем по detail_level
         if len(self.solution_steps) > self.detail_level:
             self.solution_steps = self.solution_steps[:self.detail_level]
     
-    def _derivative(self, coeffs: List[float]) -> List[float]:
-        """Вычисляет производную многочлена."""
-        n = len(coeffs) - 1
-        if n == 0:
-            return [0]
-        return [coeffs[i] * (n - i) for i in range(n)]
-    
-    def _eval_poly(self, coeffs: List[float], x: float) -> float:
-        """Вычисляет значение многочлена."""
-        result = 0
-        n = len(coeffs) - 1
-        for i, c in enumerate(coeffs):
-            result += c * (x ** (n - i))
-        return result
+    def _constrained_strings(self) -> Tuple[str, str]:
+        """Целевая функция и ограничение задачи на условный экстремум."""
+        c = self.constrained
+        alpha, beta, gamma = c.constraint
+        objective = _terms_text([(c.p, "x²"), (c.q, "y²"), (c.bx, "x"), (c.by, "y")])
+        return objective, f"{_terms_text([(alpha, 'x'), (beta, 'y')])} = {gamma}"
     
     def _solve_find_extremum(self, templates, types):
-        """Поиск экстремумов."""
-        # Находим производную
-        deriv = self._derivative(self.coefficients)
-        deriv_str = self._poly_to_str(deriv)
-        
+        """Поиск экстремумов: критические точки известны из построения."""
+        deriv = derivative(self.coefficients)
         step1 = templates.get("find_derivative", {}).get(self.language, "")
-        self.solution_steps.append(step1.format(derivative=deriv_str))
+        self.solution_steps.append(step1.format(derivative=self._poly_to_str(deriv)))
         
-        # Для квадратного многочлена: критическая точка x = -b/(2a)
-        if len(self.coefficients) == 3:
-            a, b, c = self.coefficients
-            critical_x = -b / (2 * a)
-            
-            step2 = templates.get("critical_points", {}).get(self.language, "")
-            self.solution_steps.append(step2.format(points=f"x = {critical_x:.4f}"))
-            
-            # Вторая производная = 2a
-            second_deriv = 2 * a
-            step3 = templates.get("second_derivative", {}).get(self.language, "")
-            self.solution_steps.append(step3.format(second_deriv=f"{second_deriv}"))
-            
-            # Классификация
-            if second_deriv > 0:
-                ext_type = types.get("minimum", {}).get(self.language, "minimum")
+        critical = self.objective.critical
+        step2 = templates.get("critical_points", {}).get(self.language, "")
+        points = ", ".join(f"x = {_num(p.x)}" for p in critical) or "—"
+        self.solution_steps.append(step2.format(points=points))
+        
+        second = derivative(deriv)
+        step3 = templates.get("second_derivative", {}).get(self.language, "")
+        self.solution_steps.append(step3.format(second_deriv=self._poly_to_str(second)))
+        
+        # Классификация: по f'' (при f'' = 0 — по смене знака f')
+        step4 = templates.get("classify_point", {}).get(self.language, "")
+        for i, p in enumerate(critical):
+            # В рациональной точке f'' считается точно, в иррациональной — приближённо
+            if isinstance(p.x, (int, Fraction)):
+                f2 = poly_value(second, Fraction(p.x))
             else:
-                ext_type = types.get("maximum", {}).get(self.language, "maximum")
-            
-            step4 = templates.get("classify_point", {}).get(self.language, "")
-            self.solution_steps.append(step4.format(
-                step=4, x=f"{critical_x:.4f}", value=second_deriv, type=ext_type
-            ))
-            
-            critical_y = self._eval_poly(self.coefficients, critical_x)
-            self.final_answer = f"x = {critical_x:.4f}, f(x) = {critical_y:.4f} ({ext_type})"
+                f2 = sum(float(c) * float(p.x) ** (len(second) - 1 - k) for k, c in enumerate(second))
+            f2_value = _num(f2)
+            ext_type = types.get(p.kind, {}).get(self.language, p.kind)
+            self.solution_steps.append(step4.format(step=4 + i, x=_num(p.x), value=f2_value, type=ext_type))
+        
+        extrema = self.objective.extrema
+        if extrema:
+            self.final_answer = "; ".join(
+                f"x = {_num(p.x)}, f(x) = {_num(p.value)} ({types.get(p.kind, {}).get(self.language, p.kind)})"
+                for p in extrema
+            )
         else:
-            # Упрощённое решение для более высоких степеней
-            self.final_answer = "Требуется численное решение"
+            self.final_answer = "экстремумов нет" if self.language == "ru" else "no extrema"
     
     def _solve_max_min_interval(self, templates, types):
-        """Max/min на отрезке."""
+        """Max/min на отрезке: сравниваем концы и внутренние критические точки."""
         a, b = self.interval
+        (x_max, f_max), (x_min, f_min), candidates = interval_extrema(
+            self.coefficients, self.objective.critical, a, b
+        )
         
-        # Находим производную и критические точки
-        deriv = self._derivative(self.coefficients)
+        step1 = templates.get("find_derivative", {}).get(self.language, "")
+        self.solution_steps.append(step1.format(derivative=self._poly_to_str(derivative(self.coefficients))))
         
-        # Для квадратного многочлена
-        if len(self.coefficients) == 3:
-            coef_a, coef_b, coef_c = self.coefficients
-            critical_x = -coef_b / (2 * coef_a)
-            
-            # Собираем точки для проверки
-            points = [a, b]
-            if a < critical_x < b:
-                points.append(critical_x)
-            
-            # Вычисляем значения
-            values = [(x, self._eval_poly(self.coefficients, x)) for x in points]
-            
-            max_point = max(values, key=lambda p: p[1])
-            min_point = min(values, key=lambda p: p[1])
-            
-            step = templates.get("check_endpoints", {}).get(self.language, "")
-            self.solution_steps.append(step.format(
-                step=1, a=a, b=b, 
-                fa=f"{self._eval_poly(self.coefficients, a):.4f}",
-                fb=f"{self._eval_poly(self.coefficients, b):.4f}"
-            ))
-            
-            self.final_answer = (
-                f"max: f({max_point[0]:.4f}) = {max_point[1]:.4f}, "
-                f"min: f({min_point[0]:.4f}) = {min_point[1]:.4f}"
-            )
-        else:
-            self.final_answer = "Требуется численное решение"
+        inner = candidates[1:-1]
+        step2 = templates.get("critical_points", {}).get(self.language, "")
+        points = ", ".join(f"f({_num(x)}) = {_num(v)}" for x, v in inner) or "—"
+        self.solution_steps.append(step2.format(points=points))
+        
+        step = templates.get("check_endpoints", {}).get(self.language, "")
+        self.solution_steps.append(step.format(
+            step=3, a=a, b=b, fa=_num(candidates[0][1]), fb=_num(candidates[-1][1])
+        ))
+        
+        self.final_answer = (
+            f"max: f({_num(x_max)}) = {_num(f_max)}, "
+            f"min: f({_num(x_min)}) = {_num(f_min)}"
+        )
+    
+    def _solve_constrained(self, templates):
+        """Условный минимум методом множителей Лагранжа."""
+        c = self.constrained
+        objective, constraint = self._constrained_strings()
+        alpha, beta, gamma = c.constraint
+        
+        step1 = templates.get("lagrange_setup", {}).get(self.language, "")
+        g = _terms_text([(alpha, "x"), (beta, "y"), (-gamma, "")])
+        self.solution_steps.append(step1.format(lagrangian=f"{objective} - λ({g})"))
+        
+        self.solution_steps.append(
+            f"∂L/∂x = {_terms_text([(2 * c.p, 'x'), (c.bx, ''), (-alpha, 'λ')])} = 0, "
+            f"∂L/∂y = {_terms_text([(2 * c.q, 'y'), (c.by, ''), (-beta, 'λ')])} = 0, {constraint}"
+        )
+        x_opt, y_opt = c.optimum
+        self.solution_steps.append(f"λ = {c.multiplier}, x = {x_opt}, y = {y_opt}")
+        
+        self.final_answer = f"min = {c.value} at ({x_opt}, {y_opt})"
     
     def _solve_linear_programming(self, templates):
         """Линейное программирование (2D симплекс)."""
@@ -0,0 +1,314 @@
+# re_rl/tasks/math/analysis/series_engine.py
+
+"""
+Точный движок для рядов.
+
+- Суммы и частичные суммы считаются в Fraction по замкнутым формулам:
+  геометрический ряд a·rᵏ⁻¹ и телескопический ряд c/(n(n+k)), у которого
+  S_N = (c/k)·(H_k - Σⱼ 1/(N+j)) — цепочка любой длины за O(k);
+- признаки сходимости описаны таблицей CONVERGENCE_RULES: для каждого вида
+  ряда — признак, точное значение статистики (r, p или L) и порог;
+- batch_* считают частичные суммы многих рядов сразу в numpy (float),
+  когда точность float достаточна.
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from re_rl.tasks.math.algebra.polynomials import format_number
+
+
+Statistic = Union[Fraction, float]   # float только для math.inf
+
+CDOT = "\\cdot "
+
+SERIES_KINDS = (
+    "geometric", "p_series", "harmonic", "factorial", "power_exponential",
+    "root", "comparison", "telescoping",
+)
+
+
+@dataclass
+class Series:
+    """Ряд Σ aₙ, n = 1..∞, заданный видом и параметрами."""
+
+    kind: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def text(self) -> str:
+        """Общий член в текстовой записи."""
+        p = self.params
+        if self.kind == "geometric":
+            return f"{_factor(p['a'])}({format_number(p['r'])})^(n-1)"
+        if self.kind == "p_series":
+            return f"1/{_n_power(p['p'])}"
+        if self.kind == "harmonic":
+            return "1/n"
+        if self.kind == "factorial":
+            return f"n!/{p['b']}^n"
+        if self.kind == "power_exponential":
+            return f"{_n_power(p['k'])}/{p['b']}^n"
+        if self.kind == "root":
+            return f"(({_linear(p['a'], p['c'])})/({_linear(p['b'], p['d'])}))^n"
+        if self.kind == "comparison":
+            return f"1/({_n_power(p['p'])} + {p['c']})"
+        if self.kind == "telescoping":
+            den = "n(n+1)" if p["k"] == 1 else f"n(n+{p['k']})"
+            return f"{p['c']}/({den})"
+        raise ValueError(f"Неизвестный вид ряда: {self.kind}. Доступные: {SERIES_KINDS}")
+
+    def latex(self) -> str:
+        """Общий член в LaTeX."""
+        p = self.params
+        if self.kind == "geometric":
+            return f"{_factor(p['a'], CDOT)}\\left({format_number(p['r'], 'latex')}\\right)^{{n-1}}"
+        if self.kind == "p_series":
+            return f"\\frac{{1}}{{{_n_power(p['p'], 'latex')}}}"
+        if self.kind == "harmonic":
+            return "\\frac{1}{n}"
+        if self.kind == "factorial":
+            return f"\\frac{{n!}}{{{p['b']}^n}}"
+        if self.kind == "power_exponential":
+            return f"\\frac{{{_n_power(p['k'], 'latex')}}}{{{p['b']}^n}}"
+        if self.kind == "root":
+            return f"\\left(\\frac{{{_linear(p['a'], p['c'])}}}{{{_linear(p['b'], p['d'])}}}\\right)^n"
+        if self.kind == "comparison":
+            return f"\\frac{{1}}{{{_n_power(p['p'], 'latex')} + {p['c']}}}"
+        if self.kind == "telescoping":
+            return f"\\frac{{{p['c']}}}{{n(n+{p['k']})}}"
+        raise ValueError(f"Неизвестный вид ряда: {self.kind}. Доступные: {SERIES_KINDS}")
+
+
+def _factor(a: Any, sep: str = "·") -> str:
+    return "" if a == 1 else f"{format_number(a)}{sep}"
+
+
+def _n_power(p: Fraction, style: str = "text") -> str:
+    """nᵖ: "n", "n^2", "n^(1/2)" (text) или "n^{\\frac{1}{2}}" (latex)."""
+    p = Fraction(p)
+    if p == 1:
+        return "n"
+    if style == "latex":
+        return f"n^{{{format_number(p, 'latex')}}}"
+    return f"n^{format_number(p)}" if p.denominator == 1 else f"n^({format_number(p)})"
+
+
+def _linear(a: int, c: int) -> str:
+    return f"{'' if a == 1 else a}n + {c}"
+
+
+# ------------------------------------------------------------ точные суммы
+
+def harmonic(k: int) -> Fraction:
+    """H_k = 1 + 1/2 + ... + 1/k."""
+    return sum((Fraction(1, j) for j in range(1, k + 1)), Fraction(0))
+
+
+def geometric_sum(a: Fraction, r: Fraction) -> Optional[Fraction]:
+    """Σ a·rⁿ⁻¹ = a / (1 - r) при |r| < 1, иначе None (ряд расходится)."""
+    a, r = Fraction(a), Fraction(r)
+    if abs(r) >= 1:
+        return None
+    return a / (1 - r)
+
+
+def geometric_partial_sum(a: Fraction, r: Fraction, n: int) -> Fraction:
+    """S_n = a(1 - rⁿ) / (1 - r), при r = 1 — a·n."""
+    a, r = Fraction(a), Fraction(r)
+    if r == 1:
+        return a * n
+    return a * (1 - r ** n) / (1 - r)
+
+
+def telescoping_sum(c: int, k: int) -> Fraction:
+    """Σ c/(n(n+k)) = (c/k)·H_k."""
+    return Fraction(c, k) * harmonic(k)
+
+
+def telescoping_partial_sum(c: int, k: int, n: int) -> Fraction:
+    """S_N = (c/k)·(H_k - Σⱼ₌₁ᵏ 1/(N+j)) — без суммирования N слагаемых."""
+    tail = sum((Fraction(1, n + j) for j in range(1, k + 1)), Fraction(0))
+    return Fraction(c, k) * (harmonic(k) - tail)
+
+
+def exact_term(series: Series, n: int) -> Fraction:
+    """Точное значение aₙ (для рядов с рациональными членами)."""
+    p = series.params
+    if series.kind == "geometric":
+        return Fraction(p["a"]) * Fraction(p["r"]) ** (n - 1)
+    if series.kind == "telescoping":
+        return Fraction(p["c"], n * (n + p["k"]))
+    if series.kind == "harmonic":
+        return Fraction(1, n)
+    if series.kind == "factorial":
+        return Fraction(math.factorial(n), p["b"] ** n)
+    if series.kind == "power_exponential":
+        return Fraction(n ** p["k"], p["b"] ** n)
+    if series.kind == "root":
+        return Fraction(p["a"] * n + p["c"], p["b"] * n + p["d"]) ** n
+    if series.kind in ("p_series", "comparison") and Fraction(p["p"]).denominator == 1:
+        power = int(p["p"])
+        return Fraction(1, n ** power + p.get("c", 0))
+    raise ValueError(f"Члены ряда {series.kind} с параметрами {p} не рациональны")
+
+
+def partial_sum(series: Series, n: int) -> Fraction:
+    """Частичная сумма: по замкнутой формуле, если она есть, иначе прямым сложением."""
+    p = series.params
+    if series.kind == "geometric":
+        return geometric_partial_sum(p["a"], p["r"], n)
+    if series.kind == "telescoping":
+        return telescoping_partial_sum(p["c"], p["k"], n)
+    return sum((exact_term(series, i) for i in range(1, n + 1)), Fraction(0))
+
+
+def series_sum(series: Series) -> Optional[Fraction]:
+    """Точная сумма ряда (None — расходится или замкнутой формы нет)."""
+    p = series.params
+    if series.kind == "geometric":
+        return geometric_sum(p["a"], p["r"])
+    if series.kind == "telescoping":
+        return telescoping_sum(p["c"], p["k"])
+    return None
+
+
+# ------------------------------------------------------- признаки сходимости
+
+@dataclass(frozen=True)
+class ConvergenceRule:
+    """Признак сходимости: статистика ряда и условие сходимости по ней."""
+
+    test: str                                   # geometric, p_series, ratio, root, comparison
+    statistic: Callable[[Series], Statistic]    # |r|, p или L
+    converges: Callable[[Statistic], bool]
+    threshold: int = 1
+
+
+def _ratio_limit(series: Series) -> Statistic:
+    # n!/bⁿ: aₙ₊₁/aₙ = (n+1)/b → ∞;  nᵏ/bⁿ: ((n+1)/n)ᵏ/b → 1/b
+    if series.kind == "factorial":
+        return math.inf
+    return Fraction(1, series.params["b"])
+
+
+CONVERGENCE_RULES: Dict[str, ConvergenceRule] = {
+    "geometric": ConvergenceRule("geometric", lambda s: abs(Fraction(s.params["r"])), lambda r: r < 1),
+    "p_series": ConvergenceRule("p_series", lambda s: Fraction(s.params["p"]), lambda p: p > 1),
+    "harmonic": ConvergenceRule("p_series", lambda s: Fraction(1), lambda p: p > 1),
+    "factorial": ConvergenceRule("ratio", _ratio_limit, lambda L: L < 1),
+    "power_exponential": ConvergenceRule("ratio", _ratio_limit, lambda L: L < 1),
+    # ((an + c)/(bn + d))ⁿ: ⁿ√aₙ → a/b
+    "root": ConvergenceRule("root", lambda s: Fraction(s.params["a"], s.params["b"]), lambda L: L < 1),
+    # 1/(nᵖ + c) ~ 1/nᵖ: сходится вместе с p-рядом
+    "comparison": ConvergenceRule("comparison", lambda s: Fraction(s.params["p"]), lambda p: p > 1),
+    "telescoping": ConvergenceRule("comparison", lambda s: Fraction(2), lambda p: p > 1),
+}
+
+
+@dataclass(frozen=True)
+class ConvergenceResult:
+    test: str
+    statistic: Statistic
+    comparison: str          # ">", "=", "<" относительно порога
+    converges: bool
+
+
+def check_convergence(series: Series) -> ConvergenceResult:
+    """Применяет признак из таблицы CONVERGENCE_RULES."""
+    rule = CONVERGENCE_RULES.get(series.kind)
+    if rule is None:
+        raise ValueError(f"Нет признака сходимости для ряда {series.kind}")
+    value = rule.statistic(series)
+    comparison = ">" if value > rule.threshold else ("=" if value == rule.threshold else "<")
+    return ConvergenceResult(rule.test, value, comparison, rule.converges(value))
+
+
+def format_statistic(value: Statistic) -> str:
+    return "∞" if value == math.inf else format_number(value)
+
+
+# --------------------------------------------------------------- генерация
+
+def sample_ratio(
+    rng=random, simple: bool = True, max_den: int = 9, allow_divergent: bool = False,
+) -> Fraction:
+    """
+    Знаменатель геометрической прогрессии: |r| < 1, а при allow_divergent
+    примерно в половине случаев — обратная величина (|r| > 1).
+    """
+    if simple:
+        r = rng.choice([Fraction(1, 2), Fraction(1, 4), Fraction(1, 3), Fraction(2, 3)])
+    else:
+        den = rng.randint(2, max_den)
+        r = rng.choice([-1, 1]) * Fraction(rng.randint(1, den - 1), den)
+    if allow_divergent and rng.random() < 0.5:
+        r = 1 / r
+    return r
+
+
+def sample_convergence_series(kind: str, rng=random, simple: bool = True) -> Series:
+    """Случайный ряд заданного вида для задачи на сходимость."""
+    if kind == "geometric":
+        return Series(kind, {"a": 1, "r": sample_ratio(rng, simple, allow_divergent=True)})
+    if kind == "p_series":
+        return Series(kind, {"p": rng.choice([Fraction(1, 2), Fraction(1), Fraction(3, 2), Fraction(2), Fraction(3)])})
+    if kind == "harmonic":
+        return Series(kind)
+    if kind == "factorial":
+        return Series(kind, {"b": rng.randint(2, 5)})
+    if kind == "power_exponential":
+        return Series(kind, {"k": rng.randint(1, 4), "b": rng.randint(2, 5)})
+    if kind == "root":
+        a, b = rng.sample(range(1, 6), 2)
+        return Series(kind, {"a": a, "b": b, "c": rng.randint(1, 5), "d": rng.randint(1, 5)})
+    if kind == "comparison":
+        return Series(kind, {"p": rng.choice([Fraction(1, 2), Fraction(1), Fraction(2), Fraction(3)]),
+                             "c": rng.randint(1, 9)})
+    if kind == "telescoping":
+        return Series(kind, {"c": 1, "k": 1})
+    raise ValueError(f"Неизвестный вид ряда: {kind}. Доступные: {SERIES_KINDS}")
+
+
+# ------------------------------------------------------ пакетный расчёт (numpy)
+
+def batch_geometric_partial_sums(a: Sequence[float], r: Sequence[float], n: Sequence[int]) -> np.ndarray:
+    """S_n = a(1 - rⁿ)/(1 - r) для массивов параметров (float64)."""
+    a, r, n = np.asarray(a, float), np.asarray(r, float), np.asarray(n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sums = a * (1 - r ** n) / (1 - r)
+    return np.where(r == 1, a * n, sums)
+
+
+def batch_terms(series: Series, n: np.ndarray) -> np.ndarray:
+    """Члены aₙ для массива номеров n (float64)."""
+    p = series.params
+    n = np.asarray(n, float)
+    if series.kind == "geometric":
+        return float(p["a"]) * float(p["r"]) ** (n - 1)
+    if series.kind in ("p_series", "harmonic"):
+        return 1.0 / n ** float(p.get("p", 1))
+    if series.kind == "factorial":
+        # lgamma вместо n! — без переполнения при больших n
+        log_factorial = np.array([math.lgamma(v + 1) for v in n])
+        return np.exp(log_factorial - n * math.log(p["b"]))
+    if series.kind == "power_exponential":
+        return np.exp(p["k"] * np.log(n) - n * math.log(p["b"]))
+    if series.kind == "root":
+        return ((p["a"] * n + p["c"]) / (p["b"] * n + p["d"])) ** n
+    if series.kind == "comparison":
+        return 1.0 / (n ** float(p["p"]) + p["c"])
+    if series.kind == "telescoping":
+        return p["c"] / (n * (n + p["k"]))
+    raise ValueError(f"Неизвестный вид ряда: {series.kind}. Доступные: {SERIES_KINDS}")
+
+
+def batch_partial_sums(series_list: List[Series], n: int) -> np.ndarray:
+    """Матрица частичных сумм S_1..S_n для списка рядов, форма (len(series_list), n)."""
+    idx = np.arange(1, n + 1)
+    terms = np.vstack([batch_terms(s, idx) for s in series_list])
+    return np.cumsum(terms, axis=1)
@@ -9,13 +9,59 @@ SeriesTask — задачи на ряды и сходимость.
 - partial_sum: частичная сумма
 - taylor_series: ряд Тейлора
 - telescoping: телескопический ряд
+
+Суммы считаются точно (Fraction) в series_engine, признаки сходимости —
+по таблице правил CONVERGENCE_RULES.
 """
 
-import random
 import math
+import random
+from fractions import Fraction
 from typing import List, Dict, Any, ClassVar
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.algebra.polynomials import format_number
+from re_rl.tasks.math.analysis.series_engine import (
+    Series, check_convergence, format_statistic, geometric_partial_sum,
+    sample_convergence_series, sample_ratio, series_sum,
+)
+
+
+# Тип ряда в задаче на сходимость → вид ряда в series_engine
+CONVERGENCE_SERIES = {
+    "p_series": ["p_series"],
+    "harmonic": ["harmonic"],
+    "geometric": ["geometric"],
+    "ratio_test": ["factorial", "power_exponential"],
+    "root_test": ["root"],
+    "comparison": ["comparison"],
+}
+
+
+# Сколько десятичных цифр допускается у r^(n-1) в частичной сумме: при
+# r = 2/3 и n = 100 ответ S_n был бы дробью в сотню цифр
+MAX_POWER_DIGITS = 10
+
+
+def _max_terms(ratio: Fraction) -> int:
+    """Наибольшее n, при котором числитель и знаменатель r^(n-1) не длиннее MAX_POWER_DIGITS."""
+    base = max(abs(ratio.numerator), ratio.denominator)
+    if base <= 1:
+        return 10 ** 6
+    return 1 + int(MAX_POWER_DIGITS / math.log10(base))
+
+
+def _to_fraction(value) -> Fraction:
+    """Число из аргументов конструктора (в том числе float вроде 1/3) → Fraction."""
+    if isinstance(value, float):
+        return Fraction(value).limit_denominator(1000)
+    return Fraction(value)
+
+
+def _paren(value: Fraction) -> str:
+    """Число в скобках, если это дробь или отрицательное."""
+    text = format_number(value)
+    return f"({text})" if "/" in text or value < 0 else text
 
 
 class SeriesTask(BaseMathTask):
@@ -25,17 +71,19 @@ class SeriesTask(BaseMathTask):
         "geometric_sum", "convergence_test", "partial_sum", "telescoping"
     ]
     
+    # max_n — наибольшее число членов частичной суммы, max_gap — наибольший
+    # сдвиг k в телескопическом ряде Σ c/(n(n+k))
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
-        1: {"max_first_term": 5, "simple_ratio": True, "max_n": 5},
-        2: {"max_first_term": 10, "simple_ratio": True, "max_n": 10},
-        3: {"max_first_term": 10, "simple_ratio": False, "max_n": 15},
-        4: {"max_first_term": 20, "simple_ratio": False, "max_n": 20},
-        5: {"max_first_term": 20, "simple_ratio": False, "max_n": 25},
-        6: {"max_first_term": 50, "simple_ratio": False, "max_n": 30},
-        7: {"max_first_term": 50, "simple_ratio": False, "max_n": 40},
-        8: {"max_first_term": 100, "simple_ratio": False, "max_n": 50},
-        9: {"max_first_term": 100, "simple_ratio": False, "max_n": 75},
-        10: {"max_first_term": 100, "simple_ratio": False, "max_n": 100},
+        1: {"max_first_term": 5, "simple_ratio": True, "max_n": 5, "max_gap": 1},
+        2: {"max_first_term": 10, "simple_ratio": True, "max_n": 10, "max_gap": 1},
+        3: {"max_first_term": 10, "simple_ratio": False, "max_n": 15, "max_gap": 2},
+        4: {"max_first_term": 20, "simple_ratio": False, "max_n": 20, "max_gap": 2},
+        5: {"max_first_term": 20, "simple_ratio": False, "max_n": 25, "max_gap": 3},
+        6: {"max_first_term": 50, "simple_ratio": False, "max_n": 30, "max_gap": 3},
+        7: {"max_first_term": 50, "simple_ratio": False, "max_n": 40, "max_gap": 4},
+        8: {"max_first_term": 100, "simple_ratio": False, "max_n": 50, "max_gap": 5},
+        9: {"max_first_term": 100, "simple_ratio": False, "max_n": 75, "max_gap": 7},
+        10: {"max_first_term": 100, "simple_ratio": False, "max_n": 100, "max_gap": 10},
     }
     
     def __init__(
@@ -60,12 +108,16 @@ class SeriesTask(BaseMathTask):
         self.max_first_term = preset.get("max_first_term", 20)
         self.simple_ratio = preset.get("simple_ratio", False)
         self.max_n = preset.get("max_n", 25)
+        self.max_gap = preset.get("max_gap", max(1, self.max_n // 10))
         
-        # Генерируем параметры
-        self.first_term = first_term if first_term is not None else random.randint(1, self.max_first_term)
-        self.ratio = ratio if ratio is not None else self._generate_ratio()
-        self.n_terms = n_terms if n_terms is not None else random.randint(5, min(20, self.max_n))
-        self.series_type = series_type or random.choice(["p_series", "harmonic", "geometric", "ratio_test"])
+        # Генерируем параметры (точные: Fraction)
+        self.first_term = _to_fraction(first_term) if first_term is not None else Fraction(random.randint(1, self.max_first_term))
+        self.ratio = _to_fraction(ratio) if ratio is not None else self._generate_ratio()
+        if n_terms is None:
+            max_terms = min(self.max_n, _max_terms(self.ratio))
+            n_terms = random.randint(min(5, max_terms), max_terms)
+        self.n_terms = n_terms
+        self.series_type = series_type or random.choice(list(CONVERGENCE_SERIES))
         
         # Параметры для разных типов рядов
         self._generate_series_params()
@@ -73,20 +125,26 @@ class SeriesTask(BaseMathTask):
         description = self._create_problem_description()
         super().__init__(description, language, detail_level, output_format)
     
-    def _generate_ratio(self) -> float:
+    def _generate_ratio(self) -> Fraction:
         """Генерирует отношение для геометрического ряда."""
-        if self.simple_ratio:
-            return random.choice([0.5, 0.25, 1/3, 2/3])
-        else:
-            # Генерируем |r| < 1 для сходимости
-            return round(random.uniform(0.1, 0.9), 2)
+        if self.task_type == "partial_sum":
+            # Для конечной суммы годится любое r; малые знаменатели — чтобы ответ был обозримым
+            return sample_ratio(simple=self.simple_ratio, max_den=3, allow_divergent=not self.simple_ratio)
+        # |r| < 1 для сходимости
+        return sample_ratio(simple=self.simple_ratio)
     
     def _generate_series_params(self):
-        """Генерирует параметры для разных типов рядов."""
+        """Строит ряд задачи (см. series_engine)."""
         if self.task_type == "convergence_test":
-            # Генерируем ряд для проверки сходимости
-            self.p = random.choice([0.5, 1, 1.5, 2, 3])  # для p-ряда
-            self.base = random.randint(2, 5)  # для геометрического
+            kind = random.choice(CONVERGENCE_SERIES.get(self.series_type, ["p_series"]))
+            self.series = sample_convergence_series(kind, simple=self.simple_ratio)
+        elif self.task_type == "telescoping":
+            # Σ c/(n(n+k)); длина «цепочки» k растёт со сложностью
+            k = 1 if self.simple_ratio else random.randint(1, self.max_gap)
+            c = 1 if self.simple_ratio else k * random.randint(1, 3)
+            self.series = Series("telescoping", {"c": c, "k": k})
+        else:
+            self.series = Series("geometric", {"a": self.first_term, "r": self.ratio})
     
     def _create_problem_description(self) -> str:
         """Создаёт текст задачи."""
@@ -95,47 +153,26 @@ class SeriesTask(BaseMathTask):
         
         # Форматируем выражение ряда
         if self.task_type == "geometric_sum":
-            second_term = self.first_term * self.ratio
+            first = format_number(self.first_term)
+            second = format_number(self.first_term * self.ratio)
+            sep = " - " if self.ratio < 0 else " + "
+            series_expr = f"{first}{sep}{second.lstrip('-')} + ..."
             if is_latex:
-                series_expr = f"${self.first_term} + {second_term:.4g} + ...$"
-            else:
-                series_expr = f"{self.first_term} + {second_term:.4g} + ..."
-        
-        elif self.task_type == "convergence_test":
-            if self.series_type == "p_series":
-                if is_latex:
-                    series_expr = f"$\\sum_{{n=1}}^{{\\infty}} \\frac{{1}}{{n^{{{self.p}}}}}$"
-                else:
-                    series_expr = f"Σ(1/n^{self.p}), n = 1, 2, 3, ..."
-            elif self.series_type == "harmonic":
-                if is_latex:
-                    series_expr = f"$\\sum_{{n=1}}^{{\\infty}} \\frac{{1}}{{n}}$"
-                else:
-                    series_expr = f"Σ(1/n), n = 1, 2, 3, ..."
-            elif self.series_type == "geometric":
-                if is_latex:
-                    series_expr = f"$\\sum_{{n=1}}^{{\\infty}} \\left({self.ratio}\\right)^n$"
-                else:
-                    series_expr = f"Σ(({self.ratio})^n), n = 1, 2, 3, ..."
-            else:  # ratio_test
-                if is_latex:
-                    series_expr = f"$\\sum_{{n=1}}^{{\\infty}} \\frac{{n!}}{{{self.base}^n}}$"
-                else:
-                    series_expr = f"Σ(n!/{self.base}^n), n = 1, 2, 3, ..."
+                series_expr = f"${series_expr}$"
         
         elif self.task_type == "partial_sum":
+            a, r, n = format_number(self.first_term), _paren(self.ratio), self.n_terms
             if is_latex:
-                series_expr = f"$S_{{{self.n_terms}}} = \\sum_{{k=1}}^{{{self.n_terms}}} {self.first_term} \\cdot {self.ratio}^{{k-1}}$"
+                r_latex = format_number(self.ratio, "latex")
+                series_expr = f"$S_{{{n}}} = \\sum_{{k=1}}^{{{n}}} {a} \\cdot \\left({r_latex}\\right)^{{k-1}}$"
             else:
-                series_expr = f"S_{self.n_terms} = Σ({self.first_term}·{self.ratio}^(k-1)), k = 1..{self.n_terms}"
+                series_expr = f"S_{n} = Σ({a}·{r}^(k-1)), k = 1..{n}"
         
-        elif self.task_type == "telescoping":
+        else:
             if is_latex:
-                series_expr = f"$\\sum_{{n=1}}^{{\\infty}} \\frac{{1}}{{n(n+1)}}$"
+                series_expr = f"$\\sum_{{n=1}}^{{\\infty}} {self.series.latex()}$"
             else:
-                series_expr = f"Σ(1/(n(n+1))), n = 1 до ∞"
-        else:
-            series_expr = ""
+                series_expr = f"Σ({self.series.text()}), n = 1, 2, 3, ..."
         
         # Используем шаблоны
         template = templates.get(self.task_type, {}).get(self.language, "")
@@ -171,102 +208,103 @@ class SeriesTask(BaseMathTask):
         self.solution_steps.append(step1.format(type=type_name))
         
         # Шаг 2: Находим отношение
-        second_term = a * r
         step2 = templates.get("geometric_ratio", {}).get(self.language, "")
-        self.solution_steps.append(step2.format(step=2, second=second_term, first=a, ratio=r))
+        self.solution_steps.append(step2.format(
+            step=2, second=_paren(a * r), first=format_number(a), ratio=format_number(r)
+        ))
         
-        # Шаг 3: Применяем формулу суммы
-        if abs(r) < 1:
-            sum_value = a / (1 - r)
+        # Шаг 3: Применяем формулу суммы (точно, в дробях)
+        sum_value = series_sum(self.series)
+        if sum_value is not None:
             step3 = templates.get("geometric_sum_formula", {}).get(self.language, "")
-            self.solution_steps.append(step3.format(step=3, a=a, r=r, sum=f"{sum_value:.4f}"))
-            self.final_answer = f"S = {sum_value:.4f}"
+            self.solution_steps.append(step3.format(
+                step=3, a=format_number(a), r=_paren(r), sum=format_number(sum_value)
+            ))
+            self.final_answer = f"S = {format_number(sum_value)}"
         else:
             self.final_answer = "Ряд расходится (|r| ≥ 1)" if self.language == "ru" else "Series diverges (|r| ≥ 1)"
     
     def _solve_convergence_test(self, templates, conclusions):
-        """Исследование сходимости."""
-        if self.series_type == "p_series":
+        """Исследование сходимости по признаку из таблицы CONVERGENCE_RULES."""
+        result = check_convergence(self.series)
+        limit = format_statistic(result.statistic)
+        conclusion = conclusions.get("converges" if result.converges else "diverges", {}).get(self.language, "")
+        identify = templates.get("identify_type", {}).get(self.language, "")
+        ratio_conclusion = templates.get("ratio_conclusion", {}).get(self.language, "")
+        
+        if result.test == "p_series":
             # p-ряд сходится при p > 1
-            converges = self.p > 1
-            
-            step = templates.get("identify_type", {}).get(self.language, "")
-            self.solution_steps.append(step.format(type=f"p-series (p = {self.p})"))
-            
-            comparison = ">" if self.p > 1 else ("=" if self.p == 1 else "<")
-            conclusion = conclusions.get("converges" if converges else "diverges", {}).get(self.language, "")
-            
-            step2 = templates.get("ratio_conclusion", {}).get(self.language, "")
-            self.solution_steps.append(step2.format(step=2, limit=self.p, comparison=comparison, conclusion=conclusion))
-            
-        elif self.series_type == "harmonic":
-            # Гармонический ряд расходится
-            step = templates.get("identify_type", {}).get(self.language, "")
-            self.solution_steps.append(step.format(type="harmonic"))
-            
-            conclusion = conclusions.get("diverges", {}).get(self.language, "")
-            self.solution_steps.append(f"p = 1: {conclusion}")
-            converges = False
-            
-        elif self.series_type == "geometric":
-            # Геометрический ряд
-            converges = abs(self.ratio) < 1
-            
-            step = templates.get("identify_type", {}).get(self.language, "")
-            self.solution_steps.append(step.format(type="geometric"))
-            
-            conclusion = conclusions.get("converges" if converges else "diverges", {}).get(self.language, "")
-            self.solution_steps.append(f"|r| = {abs(self.ratio)}: {conclusion}")
-            
-        else:  # ratio_test
-            # Признак Даламбера для n!/base^n
-            # lim |a_{n+1}/a_n| = lim |(n+1)!/base^{n+1} * base^n/n!| = lim (n+1)/base = ∞
-            
-            step = templates.get("ratio_test", {}).get(self.language, "")
-            self.solution_steps.append(step.format(step=1, limit="∞"))
-            
-            conclusion = conclusions.get("diverges", {}).get(self.language, "")
-            step2 = templates.get("ratio_conclusion", {}).get(self.language, "")
-            self.solution_steps.append(step2.format(step=2, limit="∞", comparison=">", conclusion=conclusion))
-            converges = False
+            type_name = "harmonic" if self.series.kind == "harmonic" else f"p-series (p = {limit})"
+            self.solution_steps.append(identify.format(type=type_name))
+            self.solution_steps.append(ratio_conclusion.format(
+                step=2, limit=limit, comparison=result.comparison, conclusion=conclusion
+            ))
+        
+        elif result.test == "geometric":
+            self.solution_steps.append(identify.format(type="geometric"))
+            self.solution_steps.append(f"|r| = {limit}: {conclusion}")
         
-        conv_str = conclusions.get("converges" if converges else "diverges", {}).get(self.language, "")
-        self.final_answer = conv_str
+        elif result.test == "comparison":
+            # 1/(nᵖ + c) ≤ 1/nᵖ и эквивалентен ему при n → ∞
+            step = templates.get("comparison_test", {}).get(self.language, "")
+            self.solution_steps.append(step.format(step=1, comparison_series=f"Σ({Series('p_series', {'p': result.statistic}).text()})"))
+            self.solution_steps.append(ratio_conclusion.format(
+                step=2, limit=limit, comparison=result.comparison, conclusion=conclusion
+            ))
+        
+        else:  # ratio / root
+            # Даламбер: n!/bⁿ → L = ∞, nᵏ/bⁿ → L = 1/b; Коши: ((an+c)/(bn+d))ⁿ → L = a/b
+            step = templates.get(f"{result.test}_test", {}).get(self.language, "")
+            self.solution_steps.append(step.format(step=1, limit=limit))
+            self.solution_steps.append(ratio_conclusion.format(
+                step=2, limit=limit, comparison=result.comparison, conclusion=conclusion
+            ))
+        
+        self.final_answer = conclusion
     
     def _solve_partial_sum(self, templates):
-        """Частичная сумма геометрического ряда."""
+        """Частичная сумма геометрического ряда (точно, в дробях)."""
         a = self.first_term
         r = self.ratio
         n = self.n_terms
         
         # S_n = a(1 - r^n) / (1 - r)
-        if r != 1:
-            partial_sum = a * (1 - r ** n) / (1 - r)
-        else:
-            partial_sum = a * n
+        partial_sum = format_number(geometric_partial_sum(a, r, n))
         
         step = templates.get("identify_type", {}).get(self.language, "")
         self.solution_steps.append(step.format(type="geometric"))
         
-        self.solution_steps.append(f"S_{n} = {a}(1 - {r}^{n}) / (1 - {r}) = {partial_sum:.4f}")
+        if r != 1:
+            self.solution_steps.append(
+                f"S_{n} = {format_number(a)}(1 - {_paren(r)}^{n}) / (1 - {_paren(r)}) = {partial_sum}"
+            )
+        else:
+            self.solution_steps.append(f"S_{n} = {format_number(a)}·{n} = {partial_sum}")
         
-        self.final_answer = f"S_{n} = {partial_sum:.4f}"
+        self.final_answer = f"S_{n} = {partial_sum}"
     
     def _solve_telescoping(self, templates):
-        """Телескопический ряд Σ 1/(n(n+1))."""
-        # 1/(n(n+1)) = 1/n - 1/(n+1)
-        # Сумма = (1 - 1/2) + (1/2 - 1/3) + ... = 1 - lim 1/(n+1) = 1
+        """Телескопический ряд Σ c/(n(n+k))."""
+        # c/(n(n+k)) = (c/k)(1/n - 1/(n+k)); слагаемые сокращаются,
+        # остаются первые k: S = (c/k)(1 + 1/2 + ... + 1/k)
+        c, k = self.series.params["c"], self.series.params["k"]
+        total = format_number(series_sum(self.series))
         
         step = templates.get("identify_type", {}).get(self.language, "")
         type_name = "телескопический" if self.language == "ru" else "telescoping"
         self.solution_steps.append(step.format(type=type_name))
         
-        decomposition = "1/(n(n+1)) = 1/n - 1/(n+1)"
+        factor = "" if c == k else f"{_paren(Fraction(c, k))}·"
+        decomposition = f"{self.series.text()} = {factor}(1/n - 1/(n+{k}))"
         self.solution_steps.append(f"Partial fractions: {decomposition}")
         
-        self.solution_steps.append("S = (1 - 1/2) + (1/2 - 1/3) + ... = 1 - lim(1/(n+1)) = 1")
+        if k == 1:
+            self.solution_steps.append(f"S = {factor}((1 - 1/2) + (1/2 - 1/3) + ...) = {factor}(1 - lim(1/(n+1))) = {total}")
+        else:
+            head = " + ".join(["1"] + [f"1/{j}" for j in range(2, k + 1)])
+            self.solution_steps.append(f"S = {factor}({head}) = {total}")
         
-        self.final_answer = "S = 1"
+        self.final_answer = f"S = {total}"
     
     def get_task_type(self) -> str:
         return "series"
@@ -24,6 +24,9 @@ from dataclasses import dataclass
 
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.discrete.exact_combinatorics import (
+    binomial, derangements, factorial, multinomial, permutations,
+)
 
 
 class CombinatoricsTask(BaseMathTask):
@@ -210,7 +213,7 @@ class CombinatoricsTask(BaseMathTask):
     
     def _solve_permutations(self, templates):
         """P(n) = n!"""
-        result = math.factorial(self.n)
+        result = factorial(self.n)
         
         template = templates.get("factorial", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, n=self.n, result=result))
@@ -219,7 +222,7 @@ class CombinatoricsTask(BaseMathTask):
     
     def _solve_permutations_k(self, templates):
         """P(n, k) = n! / (n-k)!"""
-        result = math.perm(self.n, self.k)
+        result = permutations(self.n, self.k)
         
         template = templates.get("permutation_formula", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, n=self.n, k=self.k, result=result))
@@ -228,7 +231,7 @@ class CombinatoricsTask(BaseMathTask):
     
     def _solve_combinations(self, templates):
         """C(n, k) = n! / (k! * (n-k)!)"""
-        result = math.comb(self.n, self.k)
+        result = binomial(self.n, self.k)
         
         template = templates.get("combination_formula", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, n=self.n, k=self.k, result=result))
@@ -238,7 +241,7 @@ class CombinatoricsTask(BaseMathTask):
     def _solve_combinations_repetition(self, templates):
         """C(n+k-1, k)"""
         n_plus_k_minus_1 = self.n + self.k - 1
-        result = math.comb(n_plus_k_minus_1, self.k)
+        result = binomial(n_plus_k_minus_1, self.k)
         
         template = templates.get("combination_rep_formula", {}).get(self.language, "")
         self.solution_steps.append(template.format(
@@ -250,7 +253,7 @@ class CombinatoricsTask(BaseMathTask):
     
     def _solve_binomial(self, templates):
         """C(n, k)"""
-        result = math.comb(self.n, self.k)
+        result = binomial(self.n, self.k)
         
         template = templates.get("combination_formula", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, n=self.n, k=self.k, result=result))
@@ -259,11 +262,7 @@ class CombinatoricsTask(BaseMathTask):
     
     def _solve_multinomial(self, templates):
         """n! / (k1! * k2! * ... * km!)"""
-        numerator = math.factorial(self.n)
-        denominator = 1
-        for g in self.groups:
-            denominator *= math.factorial(g)
-        result = numerator // denominator
+        result = multinomial(self.groups)
         
         factorials_str = " × ".join(f"{g}!" for g in self.groups)
         template = templates.get("multinomial_formula", {}).get(self.language, "")
@@ -309,11 +308,7 @@ class CombinatoricsTask(BaseMathTask):
     
     def _solve_derangements(self, templates):
         """D(n) = n! * sum((-1)^k / k!) для k от 0 до n"""
-        result = 0
-        factorial_n = math.factorial(self.n)
-        
-        for k in range(self.n + 1):
-            result += ((-1) ** k) * factorial_n // math.factorial(k)
+        result = derangements(self.n)
         
         template = templates.get("derangement_formula", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, n=self.n, result=result))
@@ -322,7 +317,7 @@ class CombinatoricsTask(BaseMathTask):
     
     def _solve_stars_and_bars(self, templates):
         """C(n + k - 1, k - 1)"""
-        result = math.comb(self.n + self.k - 1, self.k - 1)
+        result = binomial(self.n + self.k - 1, self.k - 1)
         
         template = templates.get("combination_rep_formula", {}).get(self.language, "")
         self.solution_steps.append(template.format(
@@ -334,7 +329,7 @@ class CombinatoricsTask(BaseMathTask):
     
     def _solve_circular_permutation(self, templates):
         """(n-1)!"""
-        result = math.factorial(self.n - 1)
+        result = factorial(self.n - 1)
         
         template = templates.get("circular_formula", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, n=self.n, result=result))
@@ -0,0 +1,169 @@
+# re_rl/tasks/math/discrete/exact_combinatorics.py
+
+"""
+Точная комбинаторика для CombinatoricsTask и UrnProbabilityTask.
+
+Факториалы и числа беспорядков — общие на процесс таблицы Python-целых,
+растущие по мере надобности до TABLE_LIMIT. Для больших n используются
+math.factorial / math.comb: таблица всех факториалов до 10^5 заняла бы
+гигабайты. Биномиальные коэффициенты кэшируются (lru_cache): в задачах
+про урны знаменатель C(N, n) один на все вопросы к контейнеру.
+
+Вероятности — fractions.Fraction, без округлений:
+- hypergeom_pmf(K, N, n, k) = C(K, k)·C(N − K, n − k) / C(N, n);
+- multivariate_hypergeom_pmf — то же для нескольких цветов;
+- multinomial_pmf — n! / ∏ k_i! · ∏ p_i^k_i.
+
+hypergeom_pmf_batch считает сразу много наборов (K, N, n, k). Строки
+группируются по (N, n), и каждый знаменатель считается один раз; числители
+одинаковых наборов — тоже.
+"""
+
+import math
+import threading
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Граница таблиц: 1000! — около 8500 бит, вся таблица — порядка мегабайта
+TABLE_LIMIT = 1000
+
+_factorials: List[int] = [1]
+_derangements: List[int] = [1, 0]
+_lock = threading.Lock()
+
+
+def factorial(n: int) -> int:
+    """n! (из таблицы при n ≤ TABLE_LIMIT)."""
+    if n < 0:
+        raise ValueError(f"Факториал отрицательного числа: {n}")
+    if n > TABLE_LIMIT:
+        return math.factorial(n)
+    if n >= len(_factorials):
+        with _lock:
+            for i in range(len(_factorials), n + 1):
+                _factorials.append(_factorials[-1] * i)
+    return _factorials[n]
+
+
+@lru_cache(maxsize=65536)
+def binomial(n: int, k: int) -> int:
+    """C(n, k); 0 при k < 0 или k > n."""
+    if k < 0 or k > n or n < 0:
+        return 0
+    if n > TABLE_LIMIT:
+        return math.comb(n, k)
+    return factorial(n) // (factorial(k) * factorial(n - k))
+
+
+def permutations(n: int, k: int) -> int:
+    """Размещения P(n, k) = n! / (n − k)!."""
+    if k < 0 or k > n:
+        return 0
+    if n > TABLE_LIMIT:
+        return math.perm(n, k)
+    return factorial(n) // factorial(n - k)
+
+
+def multinomial(groups: Sequence[int]) -> int:
+    """(k_1 + … + k_m)! / (k_1!·…·k_m!) — произведение биномиальных коэффициентов."""
+    result, total = 1, 0
+    for g in groups:
+        total += g
+        result *= binomial(total, g)
+    return result
+
+
+def derangements(n: int) -> int:
+    """Число беспорядков: D(n) = (n − 1)·(D(n − 1) + D(n − 2))."""
+    if n < 0:
+        raise ValueError(f"Число беспорядков для отрицательного n: {n}")
+    if n < len(_derangements):
+        return _derangements[n]
+    if n > TABLE_LIMIT:
+        a, b = _derangements[-2], _derangements[-1]
+        for i in range(len(_derangements), n + 1):
+            a, b = b, (i - 1) * (a + b)
+        return b
+    with _lock:
+        for i in range(len(_derangements), n + 1):
+            _derangements.append((i - 1) * (_derangements[-1] + _derangements[-2]))
+    return _derangements[n]
+
+
+# ---------------------------------------------------------------------------
+# Точные вероятности
+# ---------------------------------------------------------------------------
+
+def hypergeom_pmf(successes: int, total: int, draws: int, k: int) -> Fraction:
+    """P(X = k): из total предметов, среди которых successes «успехов», берут draws без возвращения."""
+    if draws > total:
+        return Fraction(0)
+    return Fraction(
+        binomial(successes, k) * binomial(total - successes, draws - k),
+        binomial(total, draws),
+    )
+
+
+def hypergeom_sf(successes: int, total: int, draws: int, k: int) -> Fraction:
+    """P(X ≥ k)."""
+    if k <= 0:
+        return Fraction(1) if draws <= total else Fraction(0)
+    upper = min(successes, draws)
+    if k > upper:
+        return Fraction(0)
+    # Короткая сторона суммы: дополнение, если членов ниже k меньше
+    if k <= upper - k:
+        return 1 - sum((hypergeom_pmf(successes, total, draws, i) for i in range(k)), Fraction(0))
+    return sum((hypergeom_pmf(successes, total, draws, i) for i in range(k, upper + 1)), Fraction(0))
+
+
+def multivariate_hypergeom_pmf(counts: Sequence[int], picks: Sequence[int]) -> Fraction:
+    """P(из i-го цвета взято ровно picks[i]), цветов в урне counts[i]."""
+    if len(counts) != len(picks):
+        raise ValueError("counts и picks должны быть одной длины.")
+    numerator = 1
+    for c, x in zip(counts, picks):
+        numerator *= binomial(c, x)
+    total, draws = sum(counts), sum(picks)
+    if draws > total:
+        return Fraction(0)
+    return Fraction(numerator, binomial(total, draws))
+
+
+def multinomial_pmf(counts: Sequence[int], probs: Sequence) -> Fraction:
+    """P(исходы i выпали counts[i] раз) при вероятностях исходов probs (приводятся к Fraction)."""
+    if len(counts) != len(probs):
+        raise ValueError("counts и probs должны быть одной длины.")
+    result = Fraction(multinomial(counts))
+    for k, p in zip(counts, probs):
+        result *= Fraction(p) ** k
+    return result
+
+
+def hypergeom_pmf_batch(rows: Iterable[Tuple[int, int, int, int]]) -> List[Fraction]:
+    """
+    hypergeom_pmf для каждой строки (successes, total, draws, k). Строки
+    группируются по (total, draws), и общий знаменатель считается один раз.
+    """
+    numerators: Dict[Tuple[int, int, int, int], int] = {}
+    denominators: Dict[Tuple[int, int], int] = {}
+    result = []
+    for row in rows:
+        successes, total, draws, k = row
+        if draws > total:
+            result.append(Fraction(0))
+            continue
+        if row not in numerators:
+            numerators[row] = binomial(successes, k) * binomial(total - successes, draws - k)
+        if (total, draws) not in denominators:
+            denominators[total, draws] = binomial(total, draws)
+        result.append(Fraction(numerators[row], denominators[total, draws]))
+    return result
+
+
+def format_fraction(value: Fraction, digits: int = 4) -> str:
+    """«p/q ≈ 0.xxxx» для дробей, целое — как есть."""
+    if value.denominator == 1:
+        return str(value.numerator)
+    return f"{value.numerator}/{value.denominator} ≈ {float(value):.{digits}f}"
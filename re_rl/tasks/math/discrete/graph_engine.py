@@ -0,0 +1,244 @@
+# re_rl/tasks/math/discrete/graph_engine.py
+
+"""
+Компактный неориентированный граф в формате CSR (numpy) и алгоритмы для
+GraphTask без networkx.
+
+Соседи вершины u — indices[indptr[u]:indptr[u + 1]], веса рёбер —
+weights в тех же позициях; каждое ребро хранится в обе стороны.
+
+- Dijkstra — на двоичной куче (heapq), O((V + E) log V);
+- Kruskal — сортировка рёбер numpy + система непересекающихся множеств;
+- BFS идёт уровнями: соседи всего фронта собираются одним gather'ом по
+  CSR; для диаметра BFS запускается сразу из всех вершин, уровень —
+  одно матричное произведение фронтов на матрицу смежности;
+- коэффициенты кластеризации — число треугольников через (A·A)∘A на
+  плотной матрице смежности (графы задач — сотни вершин).
+
+Случайный граф G(n, p) строится из numpy-генератора, который задача
+засевает из random, — графов столько, сколько зёрен, а не 1000.
+"""
+
+import heapq
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+Edge = Tuple[int, int, int]
+
+
+@dataclass
+class CSRGraph:
+    n: int
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def from_edges(cls, n: int, u: np.ndarray, v: np.ndarray, w: Optional[np.ndarray] = None) -> "CSRGraph":
+        """Граф на вершинах 0..n-1 по рёбрам (u[i], v[i]) с весами w (по умолчанию 1)."""
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        w = np.ones(len(u), dtype=np.int64) if w is None else np.asarray(w, dtype=np.int64)
+        src = np.concatenate([u, v])
+        dst = np.concatenate([v, u])
+        order = np.lexsort((dst, src))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return cls(n, indptr, dst[order], np.concatenate([w, w])[order])
+
+    @property
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def neighbors(self, u: int) -> np.ndarray:
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+    def edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Рёбра (u < v) и их веса."""
+        src = np.repeat(np.arange(self.n), self.degrees)
+        keep = src < self.indices
+        return src[keep], self.indices[keep], self.weights[keep]
+
+    def subgraph(self, nodes: np.ndarray) -> "CSRGraph":
+        """Подграф на nodes с перенумерацией вершин в 0..len(nodes)-1."""
+        relabel = np.full(self.n, -1, dtype=np.int64)
+        relabel[nodes] = np.arange(len(nodes))
+        u, v, w = self.edges()
+        keep = (relabel[u] >= 0) & (relabel[v] >= 0)
+        return CSRGraph.from_edges(len(nodes), relabel[u[keep]], relabel[v[keep]], w[keep])
+
+    def adjacency(self) -> np.ndarray:
+        """Плотная матрица смежности (float32, для матричных произведений)."""
+        a = np.zeros((self.n, self.n), dtype=np.float32)
+        a[np.repeat(np.arange(self.n), self.degrees), self.indices] = 1
+        return a
+
+
+def random_gnp(n: int, p: float, rng: np.random.Generator, weights: Optional[Tuple[int, int]] = None) -> CSRGraph:
+    """G(n, p): каждая из n(n-1)/2 пар — ребро с вероятностью p; веса — целые из [lo, hi]."""
+    u, v = np.triu_indices(n, k=1)
+    keep = rng.random(len(u)) < p
+    u, v = u[keep], v[keep]
+    w = None if weights is None else rng.integers(weights[0], weights[1] + 1, size=len(u))
+    return CSRGraph.from_edges(n, u, v, w)
+
+
+def _gather_neighbors(g: CSRGraph, frontier: np.ndarray) -> np.ndarray:
+    """Соседи всех вершин фронта одним массивом (с повторами)."""
+    starts = g.indptr[frontier]
+    lengths = g.indptr[frontier + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return g.indices[offsets + np.arange(total)]
+
+
+def bfs_distances(g: CSRGraph, source: int) -> np.ndarray:
+    """Число рёбер до каждой вершины (-1 — недостижима)."""
+    dist = np.full(g.n, -1, dtype=np.int64)
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    level = 0
+    while len(frontier):
+        level += 1
+        nbrs = _gather_neighbors(g, frontier)
+        nbrs = np.unique(nbrs[dist[nbrs] < 0])
+        dist[nbrs] = level
+        frontier = nbrs
+    return dist
+
+
+def components(g: CSRGraph) -> List[np.ndarray]:
+    """Компоненты связности (массивы вершин по возрастанию)."""
+    seen = np.zeros(g.n, dtype=bool)
+    result = []
+    for s in range(g.n):
+        if not seen[s]:
+            comp = np.flatnonzero(bfs_distances(g, s) >= 0)
+            seen[comp] = True
+            result.append(comp)
+    return result
+
+
+def largest_component(g: CSRGraph) -> CSRGraph:
+    return g.subgraph(max(components(g), key=len))
+
+
+@dataclass
+class DijkstraTrace:
+    dist: np.ndarray                              # inf — недостижима
+    prev: np.ndarray                              # -1 — нет предшественника
+    # (вершина, её расстояние, [(сосед, старое, новое)]) в порядке извлечения
+    settled: List[Tuple[int, float, List[Tuple[int, float, float]]]]
+
+    def path(self, target: int) -> List[int]:
+        if not np.isfinite(self.dist[target]):
+            return []
+        path = [target]
+        while self.prev[path[-1]] >= 0:
+            path.append(int(self.prev[path[-1]]))
+        return path[::-1]
+
+
+def dijkstra(g: CSRGraph, source: int, target: Optional[int] = None) -> DijkstraTrace:
+    """Дейкстра на куче; останавливается, когда извлечена target."""
+    dist = np.full(g.n, np.inf)
+    prev = np.full(g.n, -1, dtype=np.int64)
+    done = np.zeros(g.n, dtype=bool)
+    dist[source] = 0
+    heap = [(0, source)]
+    settled = []
+    indptr, indices, weights = g.indptr, g.indices, g.weights
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        updates = []
+        for k in range(indptr[u], indptr[u + 1]):
+            v = int(indices[k])
+            nd = d + int(weights[k])
+            if not done[v] and nd < dist[v]:
+                updates.append((v, dist[v], nd))
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(heap, (nd, v))
+        settled.append((u, d, updates))
+        if u == target:
+            break
+    return DijkstraTrace(dist, prev, settled)
+
+
+def kruskal(g: CSRGraph) -> List[Edge]:
+    """Минимальный остовный лес: рёбра (u, v, w) в порядке добавления."""
+    u, v, w = g.edges()
+    parent = list(range(g.n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    tree = []
+    for k in np.argsort(w, kind="stable"):
+        a, b = find(int(u[k])), find(int(v[k]))
+        if a != b:
+            parent[a] = b
+            tree.append((int(u[k]), int(v[k]), int(w[k])))
+            if len(tree) == g.n - 1:
+                break
+    return tree
+
+
+def eccentricities(g: CSRGraph) -> np.ndarray:
+    """
+    Эксцентриситет каждой вершины (граф должен быть связным): BFS сразу из
+    всех вершин — строка i матрицы фронта F — фронт поиска из i, следующий
+    уровень — непосещённые вершины с (F·A) > 0.
+    """
+    a = g.adjacency()
+    visited = np.eye(g.n, dtype=bool)
+    frontier = visited.astype(np.float32)
+    ecc = np.zeros(g.n, dtype=np.int64)
+    level = 0
+    while frontier.any():
+        level += 1
+        reached = ((frontier @ a) > 0) & ~visited
+        ecc[reached.any(axis=1)] = level
+        visited |= reached
+        frontier = reached.astype(np.float32)
+    return ecc
+
+
+def diameter(g: CSRGraph) -> int:
+    return int(eccentricities(g).max()) if g.n else 0
+
+
+def clustering_coefficients(g: CSRGraph) -> np.ndarray:
+    """
+    C(u) = 2·T(u) / (deg(u)·(deg(u) − 1)), T(u) — треугольники через u;
+    T(u) = ((A·A)∘A)[u].sum() / 2. Для deg < 2 коэффициент 0.
+    """
+    a = g.adjacency()
+    triangles = ((a @ a) * a).sum(axis=1) / 2
+    deg = g.degrees.astype(np.float64)
+    pairs = deg * (deg - 1) / 2
+    return np.divide(triangles, pairs, out=np.zeros(g.n), where=pairs > 0)
+
+
+def average_clustering(g: CSRGraph) -> float:
+    return float(clustering_coefficients(g).mean()) if g.n else 0.0
+
+
+def task_rng() -> np.random.Generator:
+    """numpy-генератор, засеянный из random (воспроизводимость через random.seed)."""
+    return np.random.default_rng(random.getrandbits(64))
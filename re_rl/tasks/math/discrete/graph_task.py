@@ -1,11 +1,25 @@
 # re_rl/tasks/graph_task.py
 
 import random
-import networkx as nx
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.discrete.graph_engine import (
+    average_clustering,
+    diameter,
+    dijkstra,
+    kruskal,
+    largest_component,
+    random_gnp,
+    task_rng,
+)
 from typing import Dict, Any, ClassVar
 
+# Веса рёбер для задач с весами
+WEIGHT_RANGE = (1, 10)
+WEIGHTED_TYPES = {"shortest_path", "minimum_spanning_tree"}
+# Сколько итераций Дейкстры выписывать по шагам
+MAX_TRACE_STEPS = 20
+
 class GraphTask(BaseMathTask):
     """
     Генерирует и решает графовые задачи.
@@ -13,26 +27,33 @@ class GraphTask(BaseMathTask):
     Поддерживаемые типы: "shortest_path", "minimum_spanning_tree", "diameter", "clustering_coefficient".
     
     Параметры сложности:
-      - difficulty 1-2: 4-5 узлов, разреженный граф
+      - difficulty 1-2: 4-5 узлов
       - difficulty 3-4: 6-8 узлов
-      - difficulty 5-6: 8-12 узлов
-      - difficulty 7-8: 12-16 узлов
-      - difficulty 9-10: 16-25 узлов, плотный граф
+      - difficulty 5-6: 10-15 узлов
+      - difficulty 7-8: 30-60 узлов
+      - difficulty 9-10: 150-300 узлов, разреженный граф (средняя степень ~6-7)
+      
+    Граф G(n, p) строится в graph_engine (CSR на numpy) из генератора,
+    засеянного из random; задача ставится на наибольшей компоненте
+    связности с вершинами, перенумерованными в 0..n-1, и список рёбер
+    входит в условие. Для кратчайшего пути и MST у рёбер веса 1..10;
+    ответ — длина пути и вес дерева (сами путь и дерево могут быть не
+    единственными, они выписываются в шагах решения).
       
     detail_level управляет количеством шагов решения.
     """
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
-        1: {"num_nodes": 4, "edge_prob": 0.4},
-        2: {"num_nodes": 5, "edge_prob": 0.4},
+        1: {"num_nodes": 4, "edge_prob": 0.5},
+        2: {"num_nodes": 5, "edge_prob": 0.5},
         3: {"num_nodes": 6, "edge_prob": 0.45},
         4: {"num_nodes": 8, "edge_prob": 0.45},
-        5: {"num_nodes": 10, "edge_prob": 0.5},
-        6: {"num_nodes": 12, "edge_prob": 0.5},
-        7: {"num_nodes": 14, "edge_prob": 0.55},
-        8: {"num_nodes": 16, "edge_prob": 0.55},
-        9: {"num_nodes": 20, "edge_prob": 0.6},
-        10: {"num_nodes": 25, "edge_prob": 0.6},
+        5: {"num_nodes": 10, "edge_prob": 0.4},
+        6: {"num_nodes": 15, "edge_prob": 0.3},
+        7: {"num_nodes": 30, "edge_prob": 0.15},
+        8: {"num_nodes": 60, "edge_prob": 0.08},
+        9: {"num_nodes": 150, "edge_prob": 0.04},
+        10: {"num_nodes": 300, "edge_prob": 0.025},
     }
     
     def __init__(
@@ -58,127 +79,106 @@ class GraphTask(BaseMathTask):
             num_nodes = num_nodes or 10
             edge_prob = edge_prob or 0.5
         self.task_type = task_type.lower()
+        self.language = language
         self.num_nodes = num_nodes
         self.edge_prob = edge_prob
         self.graph = None
         self.start = None
         self.end = None
-        super().__init__("", language, detail_level, output_format)
+        description = self._create_problem_description()
+        super().__init__(description, language, detail_level, output_format)
 
     def generate_graph(self):
-        self.graph = nx.gnp_random_graph(self.num_nodes, self.edge_prob, seed=random.randint(1, 1000), directed=False)
-        if not nx.is_connected(self.graph):
-            largest_cc = max(nx.connected_components(self.graph), key=len)
-            self.graph = self.graph.subgraph(largest_cc).copy()
+        """G(n, p), оставляем наибольшую компоненту (не меньше двух узлов)."""
+        if self.num_nodes < 2:
+            raise ValueError("В графе должно быть не меньше двух узлов.")
+        rng = task_rng()
+        weights = WEIGHT_RANGE if self.task_type in WEIGHTED_TYPES else None
+        while True:
+            self.graph = largest_component(random_gnp(self.num_nodes, self.edge_prob, rng, weights))
+            if self.graph.n >= 2:
+                return
+
+    def _edges_text(self) -> str:
+        u, v, w = self.graph.edges()
+        weighted = self.task_type in WEIGHTED_TYPES
+        edges = ", ".join(
+            f"{a}-{b} ({c})" if weighted else f"{a}-{b}"
+            for a, b, c in zip(u.tolist(), v.tolist(), w.tolist())
+        )
+        template = PROMPT_TEMPLATES["graph"]["graph_edges"].get(self.language, PROMPT_TEMPLATES["graph"]["graph_edges"]["en"])
+        suffix = PROMPT_TEMPLATES["graph"]["weighted_suffix"].get(self.language, PROMPT_TEMPLATES["graph"]["weighted_suffix"]["en"])
+        return template.format(
+            num_nodes=self.graph.n,
+            last=self.graph.n - 1,
+            num_edges=self.graph.num_edges,
+            weighted=suffix if weighted else "",
+            edges=edges,
+        )
 
     def _create_problem_description(self):
+        descriptions = PROMPT_TEMPLATES["graph"]["task_descriptions"]
+        if self.task_type not in descriptions:
+            return PROMPT_TEMPLATES["default"]["no_solution"].get(self.language, PROMPT_TEMPLATES["default"]["no_solution"]["en"])
         self.generate_graph()
         if self.task_type == "shortest_path":
-            nodes = list(self.graph.nodes())
-            self.start = random.choice(nodes)
-            self.end = random.choice(nodes)
-            while self.end == self.start:
-                self.end = random.choice(nodes)
-            task_description = f"кратчайший путь между узлами {self.start} и {self.end}"
-            return PROMPT_TEMPLATES["graph"]["problem"][self.language].format(task_description=task_description)
-        # Остальные типы остаются без изменений
-        elif self.task_type == "minimum_spanning_tree":
-            for (u, v) in self.graph.edges():
-                self.graph[u][v]['weight'] = random.randint(1, 10)
-            task_description = "минимальное остовное дерево данного графа"
-            return PROMPT_TEMPLATES["graph"]["problem"][self.language].format(task_description=task_description)
-        elif self.task_type == "diameter":
-            task_description = "диаметр данного графа"
-            return PROMPT_TEMPLATES["graph"]["problem"][self.language].format(task_description=task_description)
-        elif self.task_type == "clustering_coefficient":
-            task_description = "средний коэффициент кластеризации данного графа"
-            return PROMPT_TEMPLATES["graph"]["problem"][self.language].format(task_description=task_description)
-        else:
-            return PROMPT_TEMPLATES["default"]["no_solution"].get(self.language, PROMPT_TEMPLATES["default"]["no_solution"]["en"])
+            self.start, self.end = random.sample(range(self.graph.n), 2)
+        task_description = descriptions[self.task_type].get(self.language, descriptions[self.task_type]["en"]).format(
+            start=self.start, end=self.end
+        )
+        problem = PROMPT_TEMPLATES["graph"]["problem"].get(self.language, PROMPT_TEMPLATES["graph"]["problem"]["en"])
+        return problem.format(task_description=task_description) + "\n" + self._edges_text()
+
+    @staticmethod
+    def _fmt_dist(d) -> str:
+        return "∞" if d == float("inf") else str(int(d))
 
     def solve(self):
-        self.description = self._create_problem_description()
         steps = []
+        templates = PROMPT_TEMPLATES["graph"]
         if self.task_type == "shortest_path":
-            try:
-                # Реализуем простой алгоритм Дейкстры
-                nodes = list(self.graph.nodes())
-                dist = {v: float('inf') for v in nodes}
-                prev = {v: None for v in nodes}
-                dist[self.start] = 0
-                Q = set(nodes)
-                iteration = 1
-                while Q:
-                    u = min(Q, key=lambda v: dist[v])
-                    # Записываем шаг итерации
-                    updates = []
-                    for v in self.graph.neighbors(u):
-                        if v in Q:
-                            weight = self.graph[u][v].get('weight', 1)
-                            if dist[u] + weight < dist[v]:
-                                old_val = dist[v]
-                                dist[v] = dist[u] + weight
-                                prev[v] = u
-                                updates.append(f"{v}: {old_val}→{dist[v]}")
-                    iter_template = PROMPT_TEMPLATES["graph"]["shortest_path_iter"].get(self.language, "Step {iter}: Selected {u} with distance {d}. Updates: {updates}.")
-                    steps.append(iter_template.format(iter=iteration, u=u, d=dist[u], updates=", ".join(updates) if updates else "None"))
-                    Q.remove(u)
-                    if u == self.end:
-                        break
-                    iteration += 1
-                # Восстанавливаем путь
-                path = []
-                u = self.end
-                while u is not None:
-                    path.insert(0, u)
-                    u = prev[u]
-                final_template = PROMPT_TEMPLATES["graph"]["shortest_path_final"].get(self.language, "Final path: {path}.")
-                steps.append(final_template.format(path=path))
-                self.solution_steps.extend(steps)
-                self.final_answer = str(path)
-            except Exception as e:
-                error_msg = PROMPT_TEMPLATES["default"]["error"].get(self.language, PROMPT_TEMPLATES["default"]["error"]["en"]).format(error=str(e))
-                steps.append(error_msg)
-                self.solution_steps.extend(steps)
-                self.final_answer = error_msg
+            # Дейкстра на куче до извлечения конечного узла
+            trace = dijkstra(self.graph, self.start, self.end)
+            iter_template = templates["shortest_path_iter"].get(self.language, templates["shortest_path_iter"]["en"])
+            for iteration, (u, d, updates) in enumerate(trace.settled[:MAX_TRACE_STEPS], start=1):
+                changes = ", ".join(f"{v}: {self._fmt_dist(old)}→{new}" for v, old, new in updates)
+                steps.append(iter_template.format(iter=iteration, u=u, d=d, updates=changes or "None"))
+            if len(trace.settled) > MAX_TRACE_STEPS:
+                skipped = templates["shortest_path_skipped"].get(self.language, templates["shortest_path_skipped"]["en"])
+                steps.append(skipped.format(
+                    count=len(trace.settled) - MAX_TRACE_STEPS, end=self.end, d=self._fmt_dist(trace.dist[self.end])
+                ))
+            path = trace.path(self.end)
+            final_template = templates["shortest_path_final"].get(self.language, templates["shortest_path_final"]["en"])
+            # Кратчайших путей может быть несколько, а длина у всех одна — она и ответ
+            distance = self._fmt_dist(trace.dist[self.end])
+            steps.append(final_template.format(path=path, d=distance))
+            self.final_answer = distance
+        elif self.task_type == "minimum_spanning_tree":
+            # Краскал: рёбра по возрастанию веса, union-find отсекает циклы
+            edges = kruskal(self.graph)
+            step_template = templates["mst_step"].get(self.language, templates["mst_step"]["en"])
+            steps.append(step_template.format(edges=edges))
+            # Остовных деревьев минимального веса может быть несколько — ответ их общий вес
+            total = sum(w for _, _, w in edges)
+            weight_template = templates["mst_weight"].get(self.language, templates["mst_weight"]["en"])
+            steps.append(weight_template.format(total=total))
+            self.final_answer = str(total)
+        elif self.task_type == "diameter":
+            diam = diameter(self.graph)
+            step_template = templates["diameter_step"].get(self.language, templates["diameter_step"]["en"])
+            steps.append(step_template.format(diameter=diam))
+            self.final_answer = str(diam)
+        elif self.task_type == "clustering_coefficient":
+            avg_coeff = average_clustering(self.graph)
+            step_template = templates["clustering_step"].get(self.language, templates["clustering_step"]["en"])
+            steps.append(step_template.format(avg_coeff=avg_coeff))
+            self.final_answer = str(avg_coeff)
         else:
-            # Остальные типы остаются как раньше
-            if self.task_type == "minimum_spanning_tree":
-                try:
-                    mst = nx.minimum_spanning_tree(self.graph)
-                    edges = list(mst.edges(data=True))
-                    step_template = PROMPT_TEMPLATES["graph"]["mst_step"].get(self.language, "Step: {edges}")
-                    steps.append(step_template.format(edges=edges))
-                    self.final_answer = str(edges)
-                except Exception as e:
-                    error_msg = PROMPT_TEMPLATES["default"]["error"].get(self.language, PROMPT_TEMPLATES["default"]["error"]["en"]).format(error=str(e))
-                    steps.append(error_msg)
-                    self.final_answer = error_msg
-            elif self.task_type == "diameter":
-                try:
-                    diam = nx.diameter(self.graph)
-                    step_template = PROMPT_TEMPLATES["graph"]["diameter_step"].get(self.language, "Step: {diameter}")
-                    steps.append(step_template.format(diameter=diam))
-                    self.final_answer = str(diam)
-                except Exception as e:
-                    error_msg = PROMPT_TEMPLATES["default"]["error"].get(self.language, PROMPT_TEMPLATES["default"]["error"]["en"]).format(error=str(e))
-                    steps.append(error_msg)
-                    self.final_answer = error_msg
-            elif self.task_type == "clustering_coefficient":
-                try:
-                    avg_coeff = nx.average_clustering(self.graph)
-                    step_template = PROMPT_TEMPLATES["graph"]["clustering_step"].get(self.language, "Step: {avg_coeff}")
-                    steps.append(step_template.format(avg_coeff=avg_coeff))
-                    self.final_answer = str(avg_coeff)
-                except Exception as e:
-                    error_msg = PROMPT_TEMPLATES["default"]["error"].get(self.language, PROMPT_TEMPLATES["default"]["error"]["en"]).format(error=str(e))
-                    steps.append(error_msg)
-                    self.final_answer = error_msg
-            else:
-                error_msg = PROMPT_TEMPLATES["default"]["no_solution"].get(self.language, PROMPT_TEMPLATES["default"]["no_solution"]["en"])
-                steps.append(error_msg)
-                self.final_answer = error_msg
-            self.solution_steps.extend(steps)
+            error_msg = PROMPT_TEMPLATES["default"]["no_solution"].get(self.language, PROMPT_TEMPLATES["default"]["no_solution"]["en"])
+            steps.append(error_msg)
+            self.final_answer = error_msg
+        self.solution_steps.extend(steps)
 
     def get_task_type(self):
         return "graph"
@@ -0,0 +1,228 @@
+# re_rl/tasks/math/discrete/number_tables.py
+
+"""
+Общие на процесс таблицы теории чисел: наименьший простой делитель (SPF),
+функция Эйлера и список простых.
+
+Таблицы — массивы numpy до limit и растут лениво, удвоением, до
+MAX_LIMIT = 10^7 (около 120 МБ). С ними разложение стоит O(log n)
+делений по цепочке n → n / spf(n), а проверка на простоту и φ(n) — O(1).
+Числа от MAX_LIMIT раскладываются пробным делением на простые из
+таблицы (точно до MAX_LIMIT²).
+
+- SPF строится решетом: для каждого простого p ≤ √N среди кратных p,
+  начиная с p², ещё не размеченным проставляется p.
+- φ строится блоками [2^k, 2^(k+1)). Для n = p·m, где p = spf(n),
+  φ(n) = φ(m)·p, если p | m, иначе φ(m)·(p − 1). Так как m ≤ n / 2,
+  весь блок вычисляется одной векторной операцией.
+
+Если задана переменная окружения RE_RL_NUMBER_TABLES (каталог), таблицы
+берутся оттуда через np.load(mmap_mode="r"), когда их хватает, —
+процессы генерации делят одни страницы памяти. save() пишет такой каталог.
+"""
+
+import math
+import os
+import random
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+MAX_LIMIT = 10 ** 7
+MIN_LIMIT = 1 << 16
+TABLES_ENV = "RE_RL_NUMBER_TABLES"
+
+
+def _build_spf(limit: int) -> np.ndarray:
+    spf = np.zeros(limit, dtype=np.int32)
+    for p in range(2, int(limit ** 0.5) + 1):
+        if spf[p] == 0:
+            multiples = spf[p * p::p]
+            multiples[multiples == 0] = p
+    idx = np.arange(limit, dtype=np.int32)
+    primes = (spf == 0) & (idx >= 2)
+    spf[primes] = idx[primes]
+    return spf
+
+
+def _build_phi(spf: np.ndarray) -> np.ndarray:
+    limit = len(spf)
+    phi = np.zeros(limit, dtype=np.int64)
+    phi[1:2] = 1
+    lo = 2
+    while lo < limit:
+        hi = min(2 * lo, limit)
+        n = np.arange(lo, hi, dtype=np.int64)
+        p = spf[lo:hi].astype(np.int64)
+        m = n // p
+        phi[lo:hi] = phi[m] * np.where(m % p == 0, p, p - 1)
+        lo = hi
+    return phi
+
+
+class NumberTables:
+    """SPF, φ и простые до limit (не включительно)."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.limit = 0
+        self.spf = np.zeros(0, dtype=np.int32)
+        self.phi = np.zeros(0, dtype=np.int64)
+        self.primes = np.zeros(0, dtype=np.int64)
+        self._lock = threading.Lock()
+        if directory:
+            self._load(directory)
+
+    # ------------------------------------------------------------------
+    # Рост и файлы
+    # ------------------------------------------------------------------
+
+    def _load(self, directory: str):
+        spf_path = os.path.join(directory, "spf.npy")
+        phi_path = os.path.join(directory, "phi.npy")
+        if os.path.exists(spf_path) and os.path.exists(phi_path):
+            self.spf = np.load(spf_path, mmap_mode="r")
+            self.phi = np.load(phi_path, mmap_mode="r")
+            self.limit = len(self.spf)
+            self.primes = self._primes_from_spf()
+
+    def _primes_from_spf(self) -> np.ndarray:
+        idx = np.arange(self.limit)
+        return np.flatnonzero((self.spf == idx) & (idx >= 2))
+
+    def save(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "spf.npy"), np.asarray(self.spf))
+        np.save(os.path.join(directory, "phi.npy"), np.asarray(self.phi))
+
+    def ensure(self, n: int) -> bool:
+        """Дорастить таблицы до n включительно; False — n больше MAX_LIMIT."""
+        if n < self.limit:
+            return True
+        if n >= MAX_LIMIT:
+            return False
+        with self._lock:
+            if n >= self.limit:
+                limit = min(max(MIN_LIMIT, 1 << n.bit_length()), MAX_LIMIT)
+                spf = _build_spf(limit)
+                self.phi = _build_phi(spf)
+                self.spf = spf
+                self.limit = limit
+                self.primes = self._primes_from_spf()
+        return True
+
+    # ------------------------------------------------------------------
+    # Запросы
+    # ------------------------------------------------------------------
+
+    def is_prime(self, n: int) -> bool:
+        if n < 2:
+            return False
+        if self.ensure(n):
+            return int(self.spf[n]) == n
+        return self._trial_division(n) == [n]
+
+    def _trial_division(self, n: int) -> List[int]:
+        """Множители n за пределами таблицы: пробное деление на простые ≤ √n."""
+        self.ensure(min(math.isqrt(n), MAX_LIMIT - 1))
+        chain = []
+        for p in self.primes.tolist():
+            if p * p > n:
+                break
+            while n % p == 0:
+                chain.append(p)
+                n //= p
+        if n > 1:
+            chain.append(n)
+        return chain
+
+    def factorize(self, n: int) -> Dict[int, int]:
+        """Разложение {p: e} по возрастанию p."""
+        factors: Dict[int, int] = {}
+        for p in self.factor_chain(n):
+            factors[p] = factors.get(p, 0) + 1
+        return factors
+
+    def factor_chain(self, n: int) -> List[int]:
+        """Простые множители n с повторениями в порядке возрастания."""
+        chain = []
+        if n < 2:
+            return chain
+        if not self.ensure(n):
+            return self._trial_division(n)
+        spf = self.spf
+        while n > 1:
+            p = int(spf[n])
+            chain.append(p)
+            n //= p
+        return chain
+
+    def totient(self, n: int) -> int:
+        if n < 1:
+            return 0
+        if self.ensure(n):
+            return int(self.phi[n])
+        result = n
+        for p in self.factorize(n):
+            result = result // p * (p - 1)
+        return result
+
+    def primes_below(self, n: int) -> np.ndarray:
+        """Простые < n (срез общего массива, без копирования)."""
+        self.ensure(min(n, MAX_LIMIT - 1))
+        return self.primes[:int(np.searchsorted(self.primes, n))]
+
+    def first_primes(self, count: int) -> List[int]:
+        """Первые count простых."""
+        limit = MIN_LIMIT
+        while len(self.primes) < count and self.limit < MAX_LIMIT:
+            self.ensure(limit)
+            limit *= 2
+        return self.primes[:count].tolist()
+
+    def random_prime(self, lo: int, hi: int, rng=random) -> int:
+        """Случайное простое из [lo, hi), как sympy.randprime."""
+        primes = self.primes_below(hi)
+        start = int(np.searchsorted(primes, lo))
+        if start >= len(primes):
+            raise ValueError(f"Нет простых чисел в [{lo}, {hi}).")
+        return int(primes[rng.randrange(start, len(primes))])
+
+
+_tables: Optional[NumberTables] = None
+
+
+def get_tables() -> NumberTables:
+    """Таблицы процесса (из каталога RE_RL_NUMBER_TABLES, если он задан)."""
+    global _tables
+    if _tables is None:
+        _tables = NumberTables(os.environ.get(TABLES_ENV))
+    return _tables
+
+
+def is_prime(n: int) -> bool:
+    return get_tables().is_prime(n)
+
+
+def factorize(n: int) -> Dict[int, int]:
+    return get_tables().factorize(n)
+
+
+def factor_chain(n: int) -> List[int]:
+    return get_tables().factor_chain(n)
+
+
+def totient(n: int) -> int:
+    return get_tables().totient(n)
+
+
+def primes_below(n: int) -> np.ndarray:
+    return get_tables().primes_below(n)
+
+
+def first_primes(count: int) -> List[int]:
+    return get_tables().first_primes(count)
+
+
+def random_prime(lo: int, hi: int, rng=random) -> int:
+    return get_tables().random_prime(lo, hi, rng)
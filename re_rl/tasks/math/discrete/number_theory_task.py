@@ -20,6 +20,7 @@ from dataclasses import dataclass
 
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.discrete.number_tables import factor_chain, factorize, totient
 
 
 class NumberTheoryTask(BaseMathTask):
@@ -94,7 +95,7 @@ class NumberTheoryTask(BaseMathTask):
             self._generate_diophantine_params()
         
         elif self.task_type == "euler_totient":
-            self.n = self.kwargs.get("n", random.randint(2, min(1000, self.max_value)))
+            self.n = self.kwargs.get("n", random.randint(2, self.max_value))
     
     def _generate_crt_params(self):
         """Генерирует параметры для китайской теоремы об остатках."""
@@ -209,24 +210,13 @@ class NumberTheoryTask(BaseMathTask):
         """Разложение на простые множители."""
         n = self.n
         original_n = n
-        factors = []
-        d = 2
-        step = 1
-        
-        while d * d <= n:
-            while n % d == 0:
-                factors.append(d)
-                quotient = n // d
-                step_template = templates.get("factor_found", {}).get(self.language, "")
-                self.solution_steps.append(step_template.format(step=step, n=n, factor=d, quotient=quotient))
-                n = quotient
-                step += 1
-            d += 1
-        
-        if n > 1:
-            factors.append(n)
-            step_template = templates.get("factor_found", {}).get(self.language, "")
-            self.solution_steps.append(step_template.format(step=step, n=n, factor=n, quotient=1))
+        # Множители по возрастанию — по цепочке наименьших простых делителей
+        factors = factor_chain(n)
+        step_template = templates.get("factor_found", {}).get(self.language, "")
+        for step, d in enumerate(factors, 1):
+            quotient = n // d
+            self.solution_steps.append(step_template.format(step=step, n=n, factor=d, quotient=quotient))
+            n = quotient
         
         # Формируем строку разложения
         factor_counts = {}
@@ -362,16 +352,7 @@ class NumberTheoryTask(BaseMathTask):
         n = self.n
         original_n = n
         
-        # Разложение на простые множители
-        factors = {}
-        d = 2
-        while d * d <= n:
-            while n % d == 0:
-                factors[d] = factors.get(d, 0) + 1
-                n //= d
-            d += 1
-        if n > 1:
-            factors[n] = factors.get(n, 0) + 1
+        factors = factorize(n)
         
         # Шаг 1: Разложение
         factorization_str = " × ".join(
@@ -382,11 +363,8 @@ class NumberTheoryTask(BaseMathTask):
         self.solution_steps.append(factor_template.format(n=original_n, factorization=factorization_str))
         
         # Шаг 2: Вычисление φ(n) = n × ∏(1 - 1/p)
-        result = original_n
-        product_terms = []
-        for p in factors:
-            result = result * (p - 1) // p
-            product_terms.append(f"(1 - 1/{p})")
+        result = totient(original_n)
+        product_terms = [f"(1 - 1/{p})" for p in factors]
         
         formula_template = templates.get("euler_formula", {}).get(self.language, "")
         self.solution_steps.append(formula_template.format(
@@ -21,6 +21,7 @@ from dataclasses import dataclass
 
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.discrete.number_tables import first_primes
 
 
 class SequenceTask(BaseMathTask):
@@ -131,30 +132,14 @@ class SequenceTask(BaseMathTask):
         
         if pattern_name == "primes":
             # Генерируем простые числа
-            self.sequence = self._get_primes(10)[:6]
-            self.next_term = self._get_primes(10)[6]
+            primes = first_primes(7)
+            self.sequence = primes[:6]
+            self.next_term = primes[6]
         else:
             self.pattern_func = pattern_func
             self.sequence = [pattern_func(i) for i in range(1, 7)]
             self.next_term = pattern_func(7)
     
-    def _get_primes(self, count: int) -> List[int]:
-        """Возвращает первые count простых чисел."""
-        primes = []
-        n = 2
-        while len(primes) < count:
-            is_prime = True
-            for p in primes:
-                if p * p > n:
-                    break
-                if n % p == 0:
-                    is_prime = False
-                    break
-            if is_prime:
-                primes.append(n)
-            n += 1
-        return primes
-    
     def _generate_series_params(self):
         """Генерирует параметры для суммы ряда."""
         # Простые ряды
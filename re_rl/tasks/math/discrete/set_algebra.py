@@ -0,0 +1,173 @@
+# re_rl/tasks/math/discrete/set_algebra.py
+
+"""
+Множества как битовые маски и векторные таблицы истинности.
+
+Множество элементов ограниченного универсума — целое число, бит x которого
+означает x ∈ A. Объединение, пересечение, разность и симметрическая
+разность — одна операция над int (|, &, & ~, ^), мощность — bit_count().
+Python-целые неограниченны, так что универсум может быть любым.
+
+Логическое выражение от k переменных вычисляется сразу на всех 2^k
+наборах: столбец переменной — булев вектор numpy длины 2^k, связки —
+поэлементные операции. Строки идут в стандартном порядке: набор с номером
+r, A — старший бит.
+
+Области диаграммы Венна для k множеств считаются делением универсума:
+каждая маска области на шаге i распадается на часть внутри i-го множества
+и часть вне его, размер области — popcount.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+VAR_NAMES = "ABCDEFGHIJKLMNOP"
+
+NOT = "¬"
+BINARY_OPS = ["∧", "∨", "→", "↔", "⊕"]
+
+
+# ---------------------------------------------------------------------------
+# Множества
+# ---------------------------------------------------------------------------
+
+def to_mask(elements: Iterable[int]) -> int:
+    mask = 0
+    for x in elements:
+        mask |= 1 << x
+    return mask
+
+
+def from_mask(mask: int) -> List[int]:
+    """Элементы маски по возрастанию."""
+    elements = []
+    while mask:
+        low = mask & -mask
+        elements.append(low.bit_length() - 1)
+        mask ^= low
+    return elements
+
+
+def random_mask(universe: int, size: int, rng=random) -> int:
+    """size случайных элементов из 1..universe."""
+    return to_mask(rng.sample(range(1, universe + 1), size))
+
+
+def mask_to_str(mask: int) -> str:
+    return "{" + ", ".join(map(str, from_mask(mask))) + "}"
+
+
+def bools_to_mask(bits: np.ndarray) -> int:
+    """Булев вектор (элемент i ↔ bits[i]) в маску."""
+    packed = np.packbits(np.asarray(bits, dtype=bool), bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def venn_regions(masks: Sequence[int], universe: int) -> np.ndarray:
+    """
+    Размеры 2^k областей диаграммы Венна: область r содержит элементы,
+    лежащие ровно в множествах i с битом i в r.
+    """
+    regions = [universe]
+    for mask in masks:
+        # После i-го множества номер области получает бит i: 0 — вне, 1 — внутри
+        regions = [r & ~mask for r in regions] + [r & mask for r in regions]
+    return np.array([r.bit_count() for r in regions], dtype=np.int64)
+
+
+def intersection_sizes(regions: np.ndarray) -> np.ndarray:
+    """
+    |∩_{i ∈ S} A_i| для всех подмножеств S (по номеру S), из размеров
+    областей: сумма по надмножествам (преобразование Мёбиуса «вверх»).
+    """
+    sizes = regions.copy()
+    k = (len(sizes) - 1).bit_length()
+    idx = np.arange(len(sizes))
+    for i in range(k):
+        without = (idx >> i) & 1 == 0
+        sizes[without] += sizes[idx[without] | (1 << i)]
+    return sizes
+
+
+# ---------------------------------------------------------------------------
+# Логические выражения
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Expr:
+    op: str                        # "var", NOT или одна из BINARY_OPS
+    args: Tuple["Expr", ...] = ()
+    var: int = -1
+
+    def __str__(self) -> str:
+        if self.op == "var":
+            return VAR_NAMES[self.var]
+        if self.op == NOT:
+            inner = str(self.args[0])
+            return NOT + (inner if self.args[0].op in ("var", NOT) else f"({inner})")
+        left, right = (str(a) if a.op in ("var", NOT) else f"({a})" for a in self.args)
+        return f"{left} {self.op} {right}"
+
+
+def variable_columns(k: int) -> np.ndarray:
+    """Матрица k×2^k: строка i — значения i-й переменной во всех наборах."""
+    rows = np.arange(1 << k)
+    shifts = np.arange(k - 1, -1, -1)[:, None]
+    return ((rows[None, :] >> shifts) & 1).astype(bool)
+
+
+def evaluate(expr: Expr, columns: np.ndarray) -> np.ndarray:
+    """Значения expr на всех наборах (columns — из variable_columns)."""
+    if expr.op == "var":
+        return columns[expr.var]
+    if expr.op == NOT:
+        return ~evaluate(expr.args[0], columns)
+    a, b = (evaluate(arg, columns) for arg in expr.args)
+    if expr.op == "∧":
+        return a & b
+    if expr.op == "∨":
+        return a | b
+    if expr.op == "→":
+        return ~a | b
+    if expr.op == "↔":
+        return a == b
+    return a ^ b                                            # ⊕
+
+
+def truth_vector(expr: Expr, k: int) -> np.ndarray:
+    return evaluate(expr, variable_columns(k))
+
+
+def random_expression(
+    k: int,
+    rng=random,
+    ops: Sequence[str] = BINARY_OPS,
+    negation: float = 0.3,
+) -> Expr:
+    """
+    Случайное выражение, в котором каждая из k переменных встречается
+    хотя бы раз: листья — перестановка переменных (плюс повтор для k = 1),
+    соседние поддеревья сливаются случайной связкой.
+    """
+    def leaf(i: int) -> Expr:
+        node = Expr("var", var=i)
+        return Expr(NOT, (node,)) if rng.random() < negation else node
+
+    nodes = [leaf(i) for i in rng.sample(range(k), k)]
+    if k == 1:
+        nodes.append(leaf(0))
+    while len(nodes) > 1:
+        i = rng.randrange(len(nodes) - 1)
+        node = Expr(rng.choice(list(ops)), (nodes[i], nodes[i + 1]))
+        if rng.random() < negation / 2:
+            node = Expr(NOT, (node,))
+        nodes[i:i + 2] = [node]
+    return nodes[0]
+
+
+def vector_to_str(values: np.ndarray) -> str:
+    """Булев вектор как строка из 0 и 1."""
+    return (np.asarray(values, dtype=np.uint8) + ord("0")).tobytes().decode("ascii")
@@ -15,15 +15,38 @@ SetLogicTask — задачи на множества и логику.
 - boolean_simplify: упрощение логических выражений
 - truth_table: таблица истинности
 - venn_problem: задачи на диаграммы Венна
+
+Множества хранятся как битовые маски над универсумом 1..max_element,
+таблицы истинности и области Венна считаются векторно (set_algebra).
 """
 
 import random
-from typing import List, Dict, Any, Optional, Set, FrozenSet, ClassVar
-from dataclasses import dataclass
-from itertools import product as iter_product
+from typing import List, Dict, Any, Optional, ClassVar
+
+import numpy as np
 
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.discrete.set_algebra import (
+    VAR_NAMES,
+    bools_to_mask,
+    from_mask,
+    intersection_sizes,
+    mask_to_str,
+    random_expression,
+    random_mask,
+    truth_vector,
+    vector_to_str,
+    venn_regions,
+)
+
+# Языки для задач на диаграммы Венна (по одному на множество)
+VENN_LANGUAGES = {
+    "ru": ["английский", "французский", "немецкий", "испанский"],
+    "en": ["English", "French", "German", "Spanish"],
+}
+# Таблица выводится построчно, пока в ней не больше стольких переменных
+MAX_TABLE_VARS = 4
 
 
 class SetLogicTask(BaseMathTask):
@@ -36,16 +59,16 @@ class SetLogicTask(BaseMathTask):
     ]
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
-        1: {"max_set_size": 5, "max_element": 10},
-        2: {"max_set_size": 6, "max_element": 15},
-        3: {"max_set_size": 7, "max_element": 20},
-        4: {"max_set_size": 8, "max_element": 25},
-        5: {"max_set_size": 9, "max_element": 30},
-        6: {"max_set_size": 10, "max_element": 40},
-        7: {"max_set_size": 12, "max_element": 50},
-        8: {"max_set_size": 14, "max_element": 75},
-        9: {"max_set_size": 16, "max_element": 100},
-        10: {"max_set_size": 20, "max_element": 150},
+        1: {"max_set_size": 5, "max_element": 10, "num_vars": 2, "venn_sets": 2},
+        2: {"max_set_size": 6, "max_element": 15, "num_vars": 2, "venn_sets": 2},
+        3: {"max_set_size": 7, "max_element": 20, "num_vars": 3, "venn_sets": 2},
+        4: {"max_set_size": 8, "max_element": 25, "num_vars": 3, "venn_sets": 2},
+        5: {"max_set_size": 9, "max_element": 30, "num_vars": 4, "venn_sets": 3},
+        6: {"max_set_size": 10, "max_element": 40, "num_vars": 5, "venn_sets": 3},
+        7: {"max_set_size": 12, "max_element": 50, "num_vars": 6, "venn_sets": 3},
+        8: {"max_set_size": 14, "max_element": 100, "num_vars": 7, "venn_sets": 3},
+        9: {"max_set_size": 16, "max_element": 250, "num_vars": 8, "venn_sets": 4},
+        10: {"max_set_size": 20, "max_element": 1000, "num_vars": 10, "venn_sets": 4},
     }
     
     def __init__(
@@ -58,6 +81,7 @@ class SetLogicTask(BaseMathTask):
         **kwargs
     ):
         self.task_type = task_type.lower()
+        self.language = language
         self.difficulty = difficulty
         self._output_format = output_format
         self.kwargs = kwargs
@@ -66,6 +90,8 @@ class SetLogicTask(BaseMathTask):
         preset = self._interpolate_difficulty(difficulty)
         self.max_set_size = kwargs.get("max_set_size", preset.get("max_set_size", 9))
         self.max_element = kwargs.get("max_element", preset.get("max_element", 30))
+        self.num_vars = kwargs.get("num_vars", preset.get("num_vars", 2))
+        self.venn_sets = kwargs.get("venn_sets", preset.get("venn_sets", 2))
         
         # Генерируем параметры задачи
         self._generate_task_params()
@@ -74,14 +100,14 @@ class SetLogicTask(BaseMathTask):
         description = self._create_problem_description()
         super().__init__(description, language, detail_level, output_format)
     
-    def _generate_random_set(self, min_size: int = 2) -> Set[int]:
-        """Генерирует случайное множество."""
+    def _generate_random_set(self, min_size: int = 2) -> int:
+        """Генерирует случайное множество (битовую маску)."""
         size = random.randint(min_size, self.max_set_size)
-        return set(random.sample(range(1, self.max_element + 1), size))
+        return random_mask(self.max_element, size)
     
-    def _set_to_str(self, s: Set) -> str:
-        """Преобразует множество в строку."""
-        return "{" + ", ".join(map(str, sorted(s))) + "}"
+    def _set_to_str(self, s: int) -> str:
+        """Преобразует множество-маску в строку."""
+        return mask_to_str(s)
     
     def _generate_task_params(self):
         """Генерирует параметры задачи."""
@@ -90,17 +116,18 @@ class SetLogicTask(BaseMathTask):
             self.set_b = self._generate_random_set()
             # Для интересных задач добавляем пересечение
             if self.task_type in ["intersection", "difference", "symmetric_difference"]:
-                common = set(random.sample(list(self.set_a), min(2, len(self.set_a))))
-                self.set_b = self.set_b.union(common)
+                members = from_mask(self.set_a)
+                for x in random.sample(members, min(2, len(members))):
+                    self.set_b |= 1 << x
         
         elif self.task_type == "complement":
             self.set_a = self._generate_random_set()
             # Универсальное множество включает A и ещё элементы
-            extra = set(random.sample(
-                [x for x in range(1, self.max_element + 1) if x not in self.set_a],
-                min(5, self.max_element - len(self.set_a))
-            ))
-            self.universal = self.set_a.union(extra)
+            outside = [x for x in range(1, self.max_element + 1) if not self.set_a >> x & 1]
+            extra = random.sample(outside, min(5, len(outside)))
+            self.universal = self.set_a
+            for x in extra:
+                self.universal |= 1 << x
         
         elif self.task_type == "cardinality":
             self.card_a = random.randint(10, 50)
@@ -137,43 +164,47 @@ class SetLogicTask(BaseMathTask):
         self.expression, self.simplified, self.law_name = random.choice(expressions)
     
     def _generate_truth_table_expression(self):
-        """Генерирует выражение для таблицы истинности."""
-        expressions = [
-            "A ∧ B",
-            "A ∨ B",
-            "A → B",
-            "A ↔ B",
-            "¬A ∨ B",
-            "(A ∧ B) ∨ C",
-        ]
-        
-        self.expression = random.choice(expressions[:4])  # Простые выражения
-        self.num_vars = 2 if "C" not in self.expression else 3
+        """Генерирует выражение от num_vars переменных для таблицы истинности."""
+        self.expr = random_expression(self.num_vars)
+        self.expression = str(self.expr)
+        self.truth_values = truth_vector(self.expr, self.num_vars)
     
     def _generate_venn_problem(self):
-        """Генерирует задачу на диаграмму Венна."""
+        """
+        Генерирует задачу на диаграмму Венна для venn_sets языков: каждый
+        опрошенный — бит универсума, знание языка — маска. Даны мощности
+        всех пересечений, спрашивается число не знающих ни одного языка.
+        """
+        k = self.venn_sets
         self.total = random.randint(50, 200)
-        
-        # Генерируем количества для двух множеств
-        self.only_a = random.randint(10, self.total // 3)
-        self.only_b = random.randint(10, self.total // 3)
-        self.both = random.randint(5, min(self.only_a, self.only_b))
-        self.neither = self.total - self.only_a - self.only_b - self.both
-        
-        if self.neither < 0:
-            self.neither = 0
-            self.total = self.only_a + self.only_b + self.both
-        
+        # Доля знающих каждый язык — чтобы пересечения были непустыми
+        gen = np.random.default_rng(random.getrandbits(64))
+        known = gen.random((k, self.total)) < gen.uniform(0.25, 0.55, size=(k, 1))
+        self.venn_masks = [bools_to_mask(row) for row in known]
+        self.regions = venn_regions(self.venn_masks, (1 << self.total) - 1)
+        self.intersections = intersection_sizes(self.regions)
+        self.neither = int(self.regions[0])
+        # Для совместимости: двух-множественные величины
+        self.both = int(self.intersections[3]) if k >= 2 else 0
+        self.only_a = int(self.intersections[1]) - self.both
+        self.only_b = int(self.intersections[2]) - self.both
+        
+        names = VENN_LANGUAGES.get(self.language, VENN_LANGUAGES["en"])[:k]
+        parts = []
+        for subset in range(1, 1 << k):
+            langs = [names[i] for i in range(k) if subset >> i & 1]
+            count = int(self.intersections[subset])
+            if self.language == "ru":
+                joined = " и ".join(langs) if len(langs) <= 2 else ", ".join(langs[:-1]) + " и " + langs[-1]
+                parts.append(f"{count} человек знают {joined}")
+            else:
+                joined = " and ".join(langs) if len(langs) <= 2 else ", ".join(langs[:-1]) + " and " + langs[-1]
+                parts.append(f"{count} people know {joined}")
+        self.desc = "; ".join(parts) + "."
         if self.language == "ru":
-            self.desc = (f"{self.only_a + self.both} человек знают английский, "
-                        f"{self.only_b + self.both} человек знают французский, "
-                        f"{self.both} человек знают оба языка.")
             self.question = "не знают ни одного из этих языков"
         else:
-            self.desc = (f"{self.only_a + self.both} people know English, "
-                        f"{self.only_b + self.both} people know French, "
-                        f"{self.both} people know both languages.")
-            self.question = "know neither language"
+            self.question = "know none of these languages" if k > 2 else "know neither language"
     
     def _create_problem_description(self) -> str:
         """Создаёт текст задачи."""
@@ -219,7 +250,14 @@ class SetLogicTask(BaseMathTask):
         
         elif self.task_type == "truth_table":
             template = templates.get("truth_table", {}).get(self.language, "")
-            return template.format(expression=self.expression)
+            names = VAR_NAMES[:self.num_vars]
+            return template.format(
+                expression=self.expression,
+                rows=1 << self.num_vars,
+                variables=", ".join(names),
+                order=names,
+                first=names[0],
+            )
         
         elif self.task_type == "venn_problem":
             template = templates.get("venn_problem", {}).get(self.language, "")
@@ -261,7 +299,7 @@ class SetLogicTask(BaseMathTask):
     
     def _solve_union(self, templates):
         """Объединение множеств."""
-        result = self.set_a.union(self.set_b)
+        result = self.set_a | self.set_b
         
         template = templates.get("union_result", {}).get(self.language, "")
         self.solution_steps.append(template.format(
@@ -273,7 +311,7 @@ class SetLogicTask(BaseMathTask):
     
     def _solve_intersection(self, templates):
         """Пересечение множеств."""
-        result = self.set_a.intersection(self.set_b)
+        result = self.set_a & self.set_b
         
         template = templates.get("intersection_result", {}).get(self.language, "")
         self.solution_steps.append(template.format(
@@ -285,7 +323,7 @@ class SetLogicTask(BaseMathTask):
     
     def _solve_difference(self, templates):
         """Разность множеств."""
-        result = self.set_a.difference(self.set_b)
+        result = self.set_a & ~self.set_b
         
         template = templates.get("difference_result", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, result=self._set_to_str(result)))
@@ -294,7 +332,7 @@ class SetLogicTask(BaseMathTask):
     
     def _solve_symmetric_difference(self, templates):
         """Симметрическая разность."""
-        result = self.set_a.symmetric_difference(self.set_b)
+        result = self.set_a ^ self.set_b
         
         template = templates.get("symmetric_diff_result", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, result=self._set_to_str(result)))
@@ -303,7 +341,7 @@ class SetLogicTask(BaseMathTask):
     
     def _solve_complement(self, templates):
         """Дополнение множества."""
-        result = self.universal.difference(self.set_a)
+        result = self.universal & ~self.set_a
         
         template = templates.get("complement_result", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, result=self._set_to_str(result)))
@@ -334,19 +372,19 @@ class SetLogicTask(BaseMathTask):
     def _solve_cartesian_product(self, templates):
         """Декартово произведение."""
         # Ограничиваем размер для читаемости
-        a_list = sorted(list(self.set_a))[:4]
-        b_list = sorted(list(self.set_b))[:4]
+        a_list = from_mask(self.set_a)
+        b_list = from_mask(self.set_b)
         
-        result = [(a, b) for a in a_list for b in b_list]
+        result = [(a, b) for a in a_list[:4] for b in b_list[:4]]
         result_str = "{" + ", ".join([f"({a}, {b})" for a, b in result]) + "}"
         
-        if len(self.set_a) > 4 or len(self.set_b) > 4:
+        if len(a_list) > 4 or len(b_list) > 4:
             result_str += " ..."
         
         template = templates.get("cartesian_pairs", {}).get(self.language, "")
         self.solution_steps.append(template.format(step=1, result=result_str))
         
-        self.final_answer = f"|A × B| = {len(self.set_a)} × {len(self.set_b)} = {len(self.set_a) * len(self.set_b)}"
+        self.final_answer = f"|A × B| = {len(a_list)} × {len(b_list)} = {len(a_list) * len(b_list)}"
     
     def _solve_boolean_simplify(self, templates):
         """Упрощение логического выражения."""
@@ -356,70 +394,63 @@ class SetLogicTask(BaseMathTask):
         self.final_answer = self.simplified
     
     def _solve_truth_table(self, templates):
-        """Построение таблицы истинности."""
-        if self.num_vars == 2:
-            if self.language == "ru":
-                header = "| A | B | Результат |"
-                separator = "|---|---|-----------|"
-                rows = [
-                    "| 0 | 0 |     {}    |",
-                    "| 0 | 1 |     {}    |",
-                    "| 1 | 0 |     {}    |",
-                    "| 1 | 1 |     {}    |",
-                ]
-            else:
-                header = "| A | B | Result |"
-                separator = "|---|---|--------|"
-                rows = [
-                    "| 0 | 0 |   {}   |",
-                    "| 0 | 1 |   {}   |",
-                    "| 1 | 0 |   {}   |",
-                    "| 1 | 1 |   {}   |",
-                ]
-            
-            # Вычисляем значения
-            def eval_expr(a, b):
-                if self.expression == "A ∧ B":
-                    return int(a and b)
-                elif self.expression == "A ∨ B":
-                    return int(a or b)
-                elif self.expression == "A → B":
-                    return int((not a) or b)
-                elif self.expression == "A ↔ B":
-                    return int(a == b)
-                elif self.expression == "¬A ∨ B":
-                    return int((not a) or b)
-                return 0
-            
-            values = [eval_expr(False, False), eval_expr(False, True),
-                     eval_expr(True, False), eval_expr(True, True)]
-            
-            table = header + "\n" + separator + "\n"
-            for row, val in zip(rows, values):
-                table += row.format(val) + "\n"
-            
-            self.solution_steps.append(table)
-        
-        self.final_answer = "Таблица истинности построена" if self.language == "ru" else "Truth table constructed"
+        """
+        Построение таблицы истинности. Ответ — столбец значений выражения
+        по наборам в стандартном порядке (A — старший бит).
+        """
+        k = self.num_vars
+        names = VAR_NAMES[:k]
+        column = vector_to_str(self.truth_values)
+        ones = int(self.truth_values.sum())
+        if self.language == "ru":
+            order = f"Перебираем {1 << k} наборов значений {', '.join(names)} в порядке возрастания двоичного числа {names}."
+            summary = f"Выражение истинно на {ones} наборах из {1 << k}. Столбец значений: {column}"
+            result = "Результат"
+        else:
+            order = f"Enumerate the {1 << k} assignments of {', '.join(names)} in increasing order of the binary number {names}."
+            summary = f"The expression is true on {ones} of {1 << k} assignments. Value column: {column}"
+            result = "Result"
+        self.solution_steps.append(order)
+        if k <= MAX_TABLE_VARS:
+            header = "| " + " | ".join(names) + f" | {result} |"
+            separator = "|" + "---|" * k + "-" * (len(result) + 2) + "|"
+            rows = [
+                "| " + " | ".join(bits) + f" | {value} |"
+                for bits, value in zip((format(r, f"0{k}b") for r in range(1 << k)), column)
+            ]
+            self.solution_steps.append("\n".join([header, separator] + rows))
+        self.solution_steps.append(summary)
+        
+        self.final_answer = column
     
     def _solve_venn_problem(self, templates):
-        """Задача на диаграмму Венна."""
+        """
+        Задача на диаграмму Венна: формула включений-исключений по всем
+        пересечениям; проверка — размер области «вне всех множеств».
+        """
         template = templates.get("venn_calculate", {}).get(self.language, "")
+        k = self.venn_sets
         
-        a_total = self.only_a + self.both
-        b_total = self.only_b + self.both
+        terms = []
+        for subset in range(1, 1 << k):
+            sign = "+" if bin(subset).count("1") % 2 else "-"
+            terms.append((sign, int(self.intersections[subset])))
+        union = sum(v if sign == "+" else -v for sign, v in terms)
+        expr = str(terms[0][1]) + "".join(f" {sign} {v}" for sign, v in terms[1:])
         
         if self.language == "ru":
-            calc = f"Всего = {self.total}, знают англ. = {a_total}, знают франц. = {b_total}, оба = {self.both}"
-            self.solution_steps.append(template.format(step=1, calculation=calc))
             self.solution_steps.append(template.format(
-                step=2, calculation=f"Ни одного = {self.total} - {a_total} - {b_total} + {self.both} = {self.neither}"
+                step=1, calculation=f"По формуле включений-исключений хотя бы один язык знают {expr} = {union}"
+            ))
+            self.solution_steps.append(template.format(
+                step=2, calculation=f"Ни одного = {self.total} - {union} = {self.neither}"
             ))
         else:
-            calc = f"Total = {self.total}, know English = {a_total}, know French = {b_total}, both = {self.both}"
-            self.solution_steps.append(template.format(step=1, calculation=calc))
             self.solution_steps.append(template.format(
-                step=2, calculation=f"Neither = {self.total} - {a_total} - {b_total} + {self.both} = {self.neither}"
+                step=1, calculation=f"By inclusion-exclusion, at least one language: {expr} = {union}"
+            ))
+            self.solution_steps.append(template.format(
+                step=2, calculation=f"None = {self.total} - {union} = {self.neither}"
             ))
         
         self.final_answer = str(self.neither)
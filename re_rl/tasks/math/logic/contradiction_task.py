@@ -1,7 +1,8 @@
 import random
 from re_rl.tasks.base_task import BaseTask
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
-from typing import Dict, Any, ClassVar
+from typing import Dict, Any, ClassVar, List, Optional
+from re_rl.tasks.math.logic.fact_bank import get_fact_bank
 
 class ContradictionTask(BaseTask):
     """
@@ -12,20 +13,26 @@ class ContradictionTask(BaseTask):
       - difficulty 3-4: 10-15 утверждений
       - difficulty 5-6: 15-20 утверждений
       - difficulty 7-8: 20-30 утверждений
-      - difficulty 9-10: 30-40 утверждений
+      - difficulty 9-10: 40-60 утверждений
+
+    Утверждения берутся из банка фактов (fact_bank.get_fact_bank) по
+    номерам. fact_difficulty ограничивает сложность фактов (1 — общеизвестные
+    и таблица умножения до 10, 2 — до 20 и простые до 1000, 3 — все).
+    С hard_distractors рядом с ложным фактом ставятся близкие к нему
+    истинные («100 градусов» рядом с «50 градусов»).
     """
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
-        1: {"num_statements": 5},
-        2: {"num_statements": 8},
-        3: {"num_statements": 10},
-        4: {"num_statements": 15},
-        5: {"num_statements": 18},
-        6: {"num_statements": 20},
-        7: {"num_statements": 25},
-        8: {"num_statements": 30},
-        9: {"num_statements": 35},
-        10: {"num_statements": 40},
+        1: {"num_statements": 5, "fact_difficulty": 1, "hard_distractors": False},
+        2: {"num_statements": 8, "fact_difficulty": 1, "hard_distractors": False},
+        3: {"num_statements": 10, "fact_difficulty": 1, "hard_distractors": False},
+        4: {"num_statements": 15, "fact_difficulty": 1, "hard_distractors": False},
+        5: {"num_statements": 18, "fact_difficulty": 2, "hard_distractors": True},
+        6: {"num_statements": 20, "fact_difficulty": 2, "hard_distractors": True},
+        7: {"num_statements": 25, "fact_difficulty": 2, "hard_distractors": True},
+        8: {"num_statements": 30, "fact_difficulty": 3, "hard_distractors": True},
+        9: {"num_statements": 40, "fact_difficulty": 3, "hard_distractors": True},
+        10: {"num_statements": 60, "fact_difficulty": 3, "hard_distractors": True},
     }
     
     def __init__(
@@ -33,19 +40,29 @@ class ContradictionTask(BaseTask):
         language: str = "en",
         num_statements: int = None,
         difficulty: int = None,
-        output_format: str = "text"
+        output_format: str = "text",
+        fact_difficulty: int = None,
+        hard_distractors: bool = None,
+        topics: Optional[List[str]] = None,
     ):
         """
         :param language: 'ru' или 'en'
         :param num_statements: сколько утверждений использовать
         :param difficulty: уровень сложности (1-10)
         :param output_format: формат вывода ('text' или 'latex')
+        :param fact_difficulty: максимальная сложность фактов (1-3, None — любые)
+        :param hard_distractors: ставить ли близкие истинные факты рядом с ложным
+        :param topics: темы фактов (None — все)
         """
         # Если указан difficulty, берём параметры из пресета
         if difficulty is not None:
             preset = self._interpolate_difficulty(difficulty)
             if num_statements is None:
                 num_statements = preset.get("num_statements", 25)
+            if fact_difficulty is None:
+                fact_difficulty = preset.get("fact_difficulty")
+            if hard_distractors is None:
+                hard_distractors = preset.get("hard_distractors", False)
         elif num_statements is None:
             num_statements = 25
         
@@ -53,30 +70,36 @@ class ContradictionTask(BaseTask):
         self.num_statements = num_statements
         self.difficulty = difficulty
         self._output_format = output_format
+        self.fact_difficulty = fact_difficulty
+        self.hard_distractors = bool(hard_distractors)
+        self.topics = topics
+        self.fact_ids = []
         self.statements = []
         self.false_statement_index = None
         description = self._create_problem_description()
         super().__init__(description, language=self.language)
 
     def _create_problem_description(self):
-        facts_true = PROMPT_TEMPLATES["contradiction_facts"].get(self.language, {}).get("true", [])
-        facts_false = PROMPT_TEMPLATES["contradiction_facts"].get(self.language, {}).get("false", [])
-        
-        # Проверяем, что у нас достаточно фактов
-        if len(facts_true) < self.num_statements or len(facts_false) < self.num_statements:
-            raise ValueError(f"База фактов должна содержать не менее чем {self.num_statements} истинных и {self.num_statements} ложных утверждений.")
+        bank = get_fact_bank(self.language)
+        # Ложный факт и, для сложного варианта, близкие к нему истинные
+        false_id = bank.sample(1, truth=False, max_difficulty=self.fact_difficulty, topics=self.topics)[0]
+        near = bank.near(false_id)[:self.num_statements - 1] if self.hard_distractors else []
+        true_ids = near + bank.sample(
+            self.num_statements - 1 - len(near),
+            truth=True,
+            max_difficulty=self.fact_difficulty,
+            topics=self.topics,
+            exclude=near,
+        )
+        random.shuffle(true_ids)
         
-        # Выбираем случайный набор из num_statements истинных утверждений без повторений
-        selected = random.sample(facts_true, self.num_statements)
-        
-        # Выбираем случайный индекс для замены
+        # Выбираем случайный индекс для ложного утверждения
         index = random.randint(0, self.num_statements - 1)
         self.false_statement_index = index
-        
-        # Выбираем ложное утверждение из базы (также случайное)
-        false_statement = random.choice(facts_false)
-        selected[index] = false_statement
-        self.statements = selected
+        true_ids.insert(index, false_id)
+        self.fact_ids = true_ids
+        self.statements = [bank.texts[i] for i in true_ids]
+        selected = self.statements
         
         # Формируем расширенный промпт с инструкциями
         problem_template = PROMPT_TEMPLATES["contradiction"]["problem"].get(self.language, PROMPT_TEMPLATES["contradiction"]["problem"]["en"])
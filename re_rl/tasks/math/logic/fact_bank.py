@@ -0,0 +1,265 @@
+# re_rl/tasks/math/logic/fact_bank.py
+
+"""
+Банк фактов для ContradictionTask.
+
+Факты хранятся в TSV-файле на язык (facts/<язык>.tsv), по строке на факт:
+метка T/F, тема, сложность, near и текст. Номер факта — номер строки без
+заголовка. near у ложного факта — номера близких к нему истинных фактов
+(«сложные отвлекающие»: «Вода закипает при 100 °C» рядом с «… при 50 °C»).
+
+После загрузки банк индексируется в массивы numpy: истинные и ложные
+факты отсортированы по сложности (отбор по сложности — префикс), для
+каждой темы — свой такой же индекс, near — в CSR-виде. Выборка идёт
+по номерам, без копирования списков, поэтому банк масштабируется до
+сотен тысяч фактов.
+
+Выборка стратифицирована: сначала равновероятно выбирается тема, затем
+факт внутри неё. Иначе тысячи процедурных фактов вытеснили бы ручные —
+почти все утверждения были бы про умножение и простые числа.
+
+Кроме ручных фактов, get_fact_bank дописывает процедурные: таблицу
+умножения с ложными «почти верными» произведениями и простые числа с
+составными, похожими на простые (не делятся на 2, 3 и 5).
+"""
+
+import os
+import random
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from re_rl.tasks.math.discrete.number_tables import get_tables
+
+FACTS_DIR = os.path.join(os.path.dirname(__file__), "facts")
+
+# Границы процедурных фактов: множители 2..PRODUCT_MAX, числа < PRIME_LIMIT
+PRODUCT_MAX = 99
+PRIME_LIMIT = 20000
+# Фиксированное зерно: номера процедурных фактов одинаковы между запусками
+GENERATED_SEED = 2024
+
+GENERATED_TEMPLATES = {
+    "product": {
+        "ru": "Произведение {a} и {b} равно {value}",
+        "en": "The product of {a} and {b} is {value}",
+    },
+    "prime": {
+        "ru": "Число {n} простое",
+        "en": "{n} is a prime number",
+    },
+}
+
+
+class FactBank:
+    """Факты одного языка с индексами по метке, сложности и теме."""
+
+    def __init__(self, language: str = "en"):
+        self.language = language
+        self.texts: List[str] = []
+        self.topic_names: List[str] = []
+        self._topic_codes: Dict[str, int] = {}
+        self._truth: List[bool] = []
+        self._topics: List[int] = []
+        self._difficulty: List[int] = []
+        self._near: List[Tuple[int, ...]] = []
+        self._indexed = False
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, truth: bool, topic: str, difficulty: int, text: str, near: Iterable[int] = ()) -> int:
+        """Добавляет факт и возвращает его номер."""
+        code = self._topic_codes.get(topic)
+        if code is None:
+            code = self._topic_codes[topic] = len(self.topic_names)
+            self.topic_names.append(topic)
+        self.texts.append(text)
+        self._truth.append(truth)
+        self._topics.append(code)
+        self._difficulty.append(difficulty)
+        self._near.append(tuple(near))
+        self._indexed = False
+        return len(self.texts) - 1
+
+    # ------------------------------------------------------------------
+    # Файл
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def load(cls, path: str, language: str = "en") -> "FactBank":
+        bank = cls(language)
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("#") or not line.strip():
+                    continue
+                label, topic, difficulty, near, text = line.rstrip("\n").split("\t", 4)
+                bank.add(
+                    label == "T",
+                    topic,
+                    int(difficulty),
+                    text,
+                    [int(i) for i in near.split(",")] if near else (),
+                )
+        return bank
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# label\ttopic\tdifficulty\tnear\ttext\n")
+            for i, text in enumerate(self.texts):
+                f.write("\t".join([
+                    "T" if self._truth[i] else "F",
+                    self.topic_names[self._topics[i]],
+                    str(self._difficulty[i]),
+                    ",".join(map(str, self._near[i])),
+                    text,
+                ]) + "\n")
+
+    # ------------------------------------------------------------------
+    # Индексы
+    # ------------------------------------------------------------------
+
+    def _index(self):
+        if self._indexed:
+            return
+        self.truth = np.array(self._truth, dtype=bool)
+        self.topics = np.array(self._topics, dtype=np.int32)
+        self.difficulty = np.array(self._difficulty, dtype=np.int16)
+        lengths = np.fromiter((len(n) for n in self._near), dtype=np.int64, count=len(self._near))
+        self.near_ptr = np.concatenate(([0], np.cumsum(lengths)))
+        self.near_ids = np.fromiter(
+            (i for near in self._near for i in near), dtype=np.int64, count=int(self.near_ptr[-1])
+        )
+        # (метка, тема или -1) -> (номера по возрастанию сложности, их сложности)
+        self._pools: Dict[Tuple[bool, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self._indexed = True
+
+    def _pool(self, truth: bool, topic: int) -> Tuple[np.ndarray, np.ndarray]:
+        key = (truth, topic)
+        pool = self._pools.get(key)
+        if pool is None:
+            mask = self.truth == truth
+            if topic >= 0:
+                mask &= self.topics == topic
+            ids = np.flatnonzero(mask)
+            ids = ids[np.argsort(self.difficulty[ids], kind="stable")]
+            pool = self._pools[key] = (ids, self.difficulty[ids])
+        return pool
+
+    def _pools_for(self, truth: bool, max_difficulty: Optional[int], topics: Optional[Sequence[str]]) -> List[np.ndarray]:
+        """Срезы (без копирования) индексов по темам, подходящих под фильтры."""
+        self._index()
+        codes = range(len(self.topic_names)) if not topics else [
+            self._topic_codes[t] for t in topics if t in self._topic_codes
+        ]
+        views = []
+        for code in codes:
+            ids, levels = self._pool(truth, code)
+            end = len(ids) if max_difficulty is None else int(np.searchsorted(levels, max_difficulty, side="right"))
+            if end:
+                views.append(ids[:end])
+        return views
+
+    def count(self, truth: bool = True, max_difficulty: Optional[int] = None, topics: Optional[Sequence[str]] = None) -> int:
+        return sum(len(v) for v in self._pools_for(truth, max_difficulty, topics))
+
+    def sample(
+        self,
+        k: int,
+        truth: bool = True,
+        max_difficulty: Optional[int] = None,
+        topics: Optional[Sequence[str]] = None,
+        exclude: Sequence[int] = (),
+        rng=random,
+    ) -> List[int]:
+        """
+        k различных номеров фактов с меткой truth, сложностью не выше
+        max_difficulty и темой из topics (None — любые), кроме exclude.
+        Каждый факт: равновероятная тема из ещё не исчерпанных, затем
+        равновероятный факт темы.
+        """
+        views = self._pools_for(truth, max_difficulty, topics)
+        excluded = set(exclude)
+        total = sum(len(v) for v in views)
+        available = total - sum(1 for view in views for fact in excluded if _contains(view, fact))
+        if available < k:
+            raise ValueError(f"В банке фактов нет {k} подходящих утверждений (есть {available}).")
+        # Для каждой темы — сколько её фактов уже занято
+        used = [sum(1 for fact in excluded if _contains(view, fact)) for view in views]
+        open_topics = [i for i, view in enumerate(views) if used[i] < len(view)]
+        result = []
+        taken = set(excluded)
+        while len(result) < k:
+            slot = rng.randrange(len(open_topics))
+            topic = open_topics[slot]
+            view = views[topic]
+            fact = int(view[rng.randrange(len(view))])
+            if fact in taken:
+                continue
+            taken.add(fact)
+            result.append(fact)
+            used[topic] += 1
+            if used[topic] == len(view):
+                open_topics.pop(slot)
+        return result
+
+    def near(self, fact: int) -> List[int]:
+        """Близкие истинные факты для ложного факта fact."""
+        self._index()
+        return self.near_ids[self.near_ptr[fact]:self.near_ptr[fact + 1]].tolist()
+
+
+def _contains(view: np.ndarray, fact: int) -> bool:
+    return bool(np.any(view == fact))
+
+
+def add_product_facts(bank: FactBank, max_factor: int = PRODUCT_MAX, rng=None):
+    """
+    Таблица умножения a·b (2 ≤ a ≤ b ≤ max_factor) и к каждому произведению
+    ложное «почти верное»: ошибка на 1, 2 или 10, либо соседнее произведение.
+    Сложность: 1 до 10, 2 до 20, дальше 3.
+    """
+    rng = rng or random.Random(GENERATED_SEED)
+    template = GENERATED_TEMPLATES["product"].get(bank.language, GENERATED_TEMPLATES["product"]["en"])
+    ids = {}
+    for a in range(2, max_factor + 1):
+        for b in range(a, max_factor + 1):
+            level = 1 if b <= 10 else 2 if b <= 20 else 3
+            ids[a, b] = bank.add(True, "arithmetic", level, template.format(a=a, b=b, value=a * b))
+    for (a, b), true_id in list(ids.items()):
+        value = a * b + rng.choice([d for d in (-10, -2, -1, 1, 2, 10, a, -a, b, -b) if a * b + d > 0])
+        near = [true_id] + [ids[key] for key in ((a, b + 1), (a + 1, b), (a, b - 1)) if key in ids]
+        level = bank._difficulty[true_id]
+        bank.add(False, "arithmetic", level, template.format(a=a, b=b, value=value), near)
+
+
+def add_prime_facts(bank: FactBank, limit: int = PRIME_LIMIT):
+    """
+    «n — простое» для простых n < limit и то же, ложное, для составных n,
+    не делящихся на 2, 3 и 5. near ложного — соседние простые.
+    Сложность: 2 до 1000, дальше 3.
+    """
+    template = GENERATED_TEMPLATES["prime"].get(bank.language, GENERATED_TEMPLATES["prime"]["en"])
+    tables = get_tables()
+    tables.ensure(limit)
+    primes = tables.primes_below(limit)
+    prime_ids = [bank.add(True, "primes", 2 if p < 1000 else 3, template.format(n=p)) for p in primes.tolist()]
+    # Составные, не делящиеся на 2, 3, 5: наименьший простой делитель ≥ 7
+    spf = tables.spf[:limit]
+    for n in np.flatnonzero((spf >= 7) & (spf != np.arange(limit))).tolist():
+        above = int(np.searchsorted(primes, n))
+        near = [prime_ids[i] for i in (above - 1, above) if 0 <= i < len(prime_ids)]
+        bank.add(False, "primes", 2 if n < 1000 else 3, template.format(n=n), near)
+
+
+@lru_cache(maxsize=None)
+def get_fact_bank(language: str = "en") -> FactBank:
+    """Банк языка: ручные факты из facts/<язык>.tsv и процедурные."""
+    path = os.path.join(FACTS_DIR, f"{language}.tsv")
+    if not os.path.exists(path):
+        language, path = "en", os.path.join(FACTS_DIR, "en.tsv")
+    bank = FactBank.load(path, language)
+    add_product_facts(bank)
+    add_prime_facts(bank)
+    return bank
@@ -0,0 +1,246 @@
+# re_rl/tasks/math/logic/futoshiki_solver.py
+
+"""
+Решатель Futoshiki без z3: распространение ограничений + перебор.
+
+Домен клетки — битовая маска кандидатов (бит v-1 — значение v). На каждом
+шаге поиска до неподвижной точки применяются:
+- исключение значения из строки и столбца назначенной клетки;
+- «единственное место» значения в строке или столбце;
+- дуговая согласованность неравенств a < b: значения a меньше максимума
+  домена b, значения b больше минимума домена a.
+Перебор идёт по клетке с наименьшим доменом (MRV) и останавливается,
+как только найдено limit решений — для проверки единственности хватает 2.
+
+generate_puzzle строит головоломку от ответа: случайный латинский квадрат
+(перебор со случайным порядком значений), неравенства между соседними
+клетками, согласованные с ним, и все числа как подсказки; затем числа в
+случайном порядке удаляются, пока решение остаётся единственным.
+"""
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+Grid = List[List[int]]
+# (r1, c1, r2, c2): значение в (r1, c1) меньше значения в (r2, c2)
+Inequality = Tuple[int, int, int, int]
+
+
+@lru_cache(maxsize=None)
+def _structure(n: int) -> Tuple[List[List[int]], List[List[int]]]:
+    """Строки и столбцы (units) и соседи каждой клетки (peers) для поля n×n."""
+    units = [[r * n + c for c in range(n)] for r in range(n)]
+    units += [[r * n + c for r in range(n)] for c in range(n)]
+    peers = [
+        [j for j in units[i // n] + units[n + i % n] if j != i]
+        for i in range(n * n)
+    ]
+    return units, peers
+
+
+class FutoshikiSolver:
+    """Решатель для фиксированных размера, неравенств и подсказок."""
+
+    def __init__(
+        self,
+        size: int,
+        inequalities: Sequence[Inequality],
+        givens: Optional[Grid] = None,
+        rng=None,
+    ):
+        self.size = size
+        # Случайный порядок значений при переборе (для генерации квадратов)
+        self.rng = rng
+        n = size
+        self.full = (1 << n) - 1
+        self.units, self.peers = _structure(n)
+        self.less = [(r1 * n + c1, r2 * n + c2) for r1, c1, r2, c2 in inequalities]
+        self.degree = [0] * (n * n)
+        for a, b in self.less:
+            self.degree[a] += 1
+            self.degree[b] += 1
+        self.domains: List[int] = [self.full] * (n * n)
+        if givens is not None:
+            for r, row in enumerate(givens):
+                for c, value in enumerate(row):
+                    if value:
+                        self.domains[r * n + c] &= 1 << (value - 1)
+        self.nodes = 0
+
+    def _propagate(self, dom: List[int], assigned: List[int]) -> bool:
+        """
+        Сужает домены на месте; assigned — клетки, ставшие назначенными
+        с прошлого вызова. False — противоречие.
+        """
+        peers, full = self.peers, self.full
+        while True:
+            # Назначенные клетки вычёркивают своё значение у соседей
+            while assigned:
+                i = assigned.pop()
+                mask = dom[i]
+                for j in peers[i]:
+                    d = dom[j]
+                    if d & mask:
+                        d &= ~mask
+                        if not d:
+                            return False
+                        dom[j] = d
+                        if not d & (d - 1):
+                            assigned.append(j)
+            # Единственное место для значения в строке/столбце
+            for unit in self.units:
+                seen_once = seen_twice = 0
+                for i in unit:
+                    seen_twice |= seen_once & dom[i]
+                    seen_once |= dom[i]
+                if seen_once != full:
+                    return False
+                singles = seen_once & ~seen_twice
+                if singles:
+                    for i in unit:
+                        only = dom[i] & singles
+                        if only and dom[i] != only:
+                            if only & (only - 1):
+                                return False
+                            dom[i] = only
+                            assigned.append(i)
+            # Дуговая согласованность неравенств
+            for a, b in self.less:
+                da, db = dom[a], dom[b]
+                na = da & ((1 << (db.bit_length() - 1)) - 1)
+                nb = db & -((da & -da) << 1)
+                if na != da:
+                    if not na:
+                        return False
+                    dom[a] = na
+                    if not na & (na - 1):
+                        assigned.append(a)
+                if nb != db:
+                    if not nb:
+                        return False
+                    dom[b] = nb
+                    if not nb & (nb - 1):
+                        assigned.append(b)
+            if not assigned:
+                return True
+
+    def _search(self, dom: List[int], assigned: List[int], found: List[List[int]], limit: int):
+        self.nodes += 1
+        if not self._propagate(dom, assigned):
+            return
+        # MRV; при равенстве — клетка с большим числом неравенств
+        best, best_key = -1, None
+        for i, mask in enumerate(dom):
+            count = mask.bit_count()
+            if count > 1:
+                key = (count, -self.degree[i])
+                if best_key is None or key < best_key:
+                    best, best_key = i, key
+        if best < 0:
+            found.append(dom)
+            return
+        mask = dom[best]
+        bits = []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            bits.append(bit)
+        if self.rng is not None:
+            self.rng.shuffle(bits)
+        for bit in bits:
+            if len(found) >= limit:
+                break
+            child = dom[:]
+            child[best] = bit
+            self._search(child, [best], found, limit)
+
+    def solutions(self, limit: int = 2) -> List[Grid]:
+        """До limit решений в виде матриц size×size."""
+        found: List[List[int]] = []
+        if all(self.domains):
+            assigned = [i for i, mask in enumerate(self.domains) if not mask & (mask - 1)]
+            self._search(self.domains[:], assigned, found, limit)
+        n = self.size
+        return [
+            [[dom[r * n + c].bit_length() for c in range(n)] for r in range(n)]
+            for dom in found
+        ]
+
+
+def solve_futoshiki(
+    size: int,
+    inequalities: Sequence[Inequality],
+    givens: Optional[Grid] = None,
+    limit: int = 2,
+) -> List[Grid]:
+    """До limit решений головоломки (пустой список — решений нет)."""
+    return FutoshikiSolver(size, inequalities, givens).solutions(limit)
+
+
+def count_solutions(
+    size: int,
+    inequalities: Sequence[Inequality],
+    givens: Optional[Grid] = None,
+    limit: int = 2,
+) -> int:
+    """Число решений, но не больше limit."""
+    return len(solve_futoshiki(size, inequalities, givens, limit))
+
+
+def random_latin_square(size: int, rng=random) -> Grid:
+    """Случайный латинский квадрат: перебор со случайным порядком значений."""
+    return FutoshikiSolver(size, [], rng=rng).solutions(limit=1)[0]
+
+
+def adjacent_inequalities(grid: Grid) -> List[Inequality]:
+    """Неравенства между всеми соседними по горизонтали и вертикали клетками."""
+    n = len(grid)
+    pairs = [(r, c, r, c + 1) for r in range(n) for c in range(n - 1)]
+    pairs += [(r, c, r + 1, c) for r in range(n - 1) for c in range(n)]
+    return [
+        (r1, c1, r2, c2) if grid[r1][c1] < grid[r2][c2] else (r2, c2, r1, c1)
+        for r1, c1, r2, c2 in pairs
+    ]
+
+
+@dataclass
+class FutoshikiPuzzle:
+    size: int
+    solution: Grid
+    givens: Grid                      # 0 — пустая клетка
+    inequalities: List[Inequality]
+
+
+def generate_puzzle(
+    size: int,
+    num_inequalities: int,
+    min_givens: int = 0,
+    rng=random,
+) -> FutoshikiPuzzle:
+    """
+    Головоломка с единственным решением: num_inequalities случайных
+    соседних неравенств, затем числа-подсказки удаляются жадно в случайном
+    порядке, пока решение единственно (но не меньше min_givens).
+
+    Пока на поле стоят все числа, любое подмножество неравенств не нарушает
+    единственности, поэтому проверка решателем нужна только для чисел.
+    """
+    solution = random_latin_square(size, rng)
+    candidates = adjacent_inequalities(solution)
+    inequalities = rng.sample(candidates, min(num_inequalities, len(candidates)))
+    givens = [row[:] for row in solution]
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+
+    n_givens = size * size
+    for r, c in cells:
+        if n_givens <= min_givens:
+            break
+        givens[r][c] = 0
+        if count_solutions(size, inequalities, givens) == 1:
+            n_givens -= 1
+        else:
+            givens[r][c] = solution[r][c]
+    return FutoshikiPuzzle(size, solution, givens, inequalities)
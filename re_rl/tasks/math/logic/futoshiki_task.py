@@ -2,9 +2,7 @@ import random
 from re_rl.tasks.base_task import BaseTask
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
 from typing import Dict, Any, ClassVar
-
-# Подключаем Z3
-from z3 import Solver, Int, And, Distinct, sat
+from re_rl.tasks.math.logic.futoshiki_solver import generate_puzzle
 
 class FutoshikiTask(BaseTask):
     """
@@ -14,21 +12,29 @@ class FutoshikiTask(BaseTask):
       - difficulty 1-2: поле 3x3
       - difficulty 3-4: поле 4x4
       - difficulty 5-6: поле 5x5
-      - difficulty 7-8: поле 6x6
-      - difficulty 9-10: поле 7x7
+      - difficulty 7: поле 6x6
+      - difficulty 8: поле 7x7
+      - difficulty 9: поле 8x8
+      - difficulty 10: поле 9x9
+    
+    Головоломка строится от ответа (futoshiki_solver.generate_puzzle):
+    случайный латинский квадрат, num_inequalities неравенств между соседними
+    клетками и жадное удаление чисел-подсказок, пока решение единственно
+    (но не меньше num_givens). Чем меньше неравенств и подсказок, тем
+    сложнее задача.
     """
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
-        1: {"size": 3, "num_inequalities_ratio": 0.5},
-        2: {"size": 3, "num_inequalities_ratio": 0.7},
-        3: {"size": 4, "num_inequalities_ratio": 0.5},
-        4: {"size": 4, "num_inequalities_ratio": 0.7},
-        5: {"size": 5, "num_inequalities_ratio": 0.5},
-        6: {"size": 5, "num_inequalities_ratio": 0.7},
-        7: {"size": 6, "num_inequalities_ratio": 0.5},
-        8: {"size": 6, "num_inequalities_ratio": 0.7},
-        9: {"size": 7, "num_inequalities_ratio": 0.5},
-        10: {"size": 7, "num_inequalities_ratio": 0.7},
+        1: {"size": 3, "num_inequalities_ratio": 0.5, "givens_ratio": 0.3},
+        2: {"size": 3, "num_inequalities_ratio": 0.4, "givens_ratio": 0.2},
+        3: {"size": 4, "num_inequalities_ratio": 0.5, "givens_ratio": 0.25},
+        4: {"size": 4, "num_inequalities_ratio": 0.4, "givens_ratio": 0.15},
+        5: {"size": 5, "num_inequalities_ratio": 0.45, "givens_ratio": 0.15},
+        6: {"size": 5, "num_inequalities_ratio": 0.35, "givens_ratio": 0.1},
+        7: {"size": 6, "num_inequalities_ratio": 0.35, "givens_ratio": 0.1},
+        8: {"size": 7, "num_inequalities_ratio": 0.3, "givens_ratio": 0.05},
+        9: {"size": 8, "num_inequalities_ratio": 0.3, "givens_ratio": 0.0},
+        10: {"size": 9, "num_inequalities_ratio": 0.25, "givens_ratio": 0.0},
     }
 
     def __init__(
@@ -38,24 +44,27 @@ class FutoshikiTask(BaseTask):
         size=None, 
         num_inequalities=None,
         difficulty: int = None,
-        output_format: str = "text"
+        output_format: str = "text",
+        num_givens=None,
     ):
         """
         :param language: 'ru' или 'en'
         :param detail_level: сколько шагов (chain-of-thought) выводить
         :param size: размер поля (None -> случайно 4..5)
-        :param num_inequalities: сколько неравенств генерировать (None -> случайно)
+        :param num_inequalities: сколько соседних неравенств дать (None -> случайно)
         :param difficulty: уровень сложности (1-10)
         :param output_format: формат вывода ('text' или 'latex')
+        :param num_givens: сколько чисел оставить как минимум (None -> 0)
         """
         # Если указан difficulty, берём параметры из пресета
         if difficulty is not None:
             preset = self._interpolate_difficulty(difficulty)
             if size is None:
                 size = preset.get("size", 4)
-            ratio = preset.get("num_inequalities_ratio", 0.6)
             if num_inequalities is None:
-                num_inequalities = int(size * size * ratio)
+                num_inequalities = int(2 * size * (size - 1) * preset.get("num_inequalities_ratio", 0.4))
+            if num_givens is None:
+                num_givens = int(size * size * preset.get("givens_ratio", 0.1))
         
         self.language = language.lower()
         self.detail_level = detail_level
@@ -69,10 +78,11 @@ class FutoshikiTask(BaseTask):
         if num_inequalities is None:
             num_inequalities = random.randint(size, size * 2)
         
-        self.inequalities = self._generate_random_inequalities(num_inequalities)
-        
-        # Теперь решаем паззл через Z3
-        self.solution = self._solve_with_z3()
+        # Головоломка от ответа: решение всегда есть и единственно
+        puzzle = generate_puzzle(size, num_inequalities, num_givens or 0)
+        self.solution = puzzle.solution
+        self.givens = puzzle.givens
+        self.inequalities = puzzle.inequalities
         
         # Формируем текст постановки задачи
         problem_template = PROMPT_TEMPLATES["futoshiki"]["problem"][self.language]
@@ -80,90 +90,23 @@ class FutoshikiTask(BaseTask):
         ineq_str = ""
         for (r1,c1, r2,c2) in self.inequalities:
             ineq_str += f"({r1},{c1}) < ({r2},{c2})\n"
+        givens_str = "\n".join(
+            " ".join(str(v) if v else "." for v in row) for row in self.givens
+        )
         
         problem_text = problem_template.format(
             size=self.size,
+            givens=givens_str,
             inequalities=ineq_str
         )
         
         super().__init__(problem_text, language=self.language)
 
-    def _generate_random_inequalities(self, num_ineq):
-        """
-        Генерируем список случайных неравенств вида (r1,c1) < (r2,c2).
-        Для Futoshiki обычно (r2,c2) — клетка, смежная с (r1,c1) 
-        (по вертикали или горизонтали). 
-        Но для простоты можно делать и не только смежные.
-        """
-        ineqs = set()
-        while len(ineqs) < num_ineq:
-            r1 = random.randint(0, self.size-1)
-            c1 = random.randint(0, self.size-1)
-            r2 = random.randint(0, self.size-1)
-            c2 = random.randint(0, self.size-1)
-            # Добавим условие, чтобы (r1,c1) != (r2,c2) 
-            # и не повторять зеркально
-            if (r1,c1) != (r2,c2) and (r2,c2, r1,c1) not in ineqs:
-                # (r1,c1) < (r2,c2)
-                ineqs.add((r1,c1, r2,c2))
-        return list(ineqs)
-
     def get_task_type(self):
         
         return "futoshiki"
 
 
-    def _solve_with_z3(self):
-        """
-        Строим модель Z3:
-          - Определяем переменные cell[r][c] (Int)
-          - Добавляем ограничения: 1 <= cell[r][c] <= size
-          - distinct по каждой строке и столбцу
-          - неравенства
-        Возвращаем решение в виде двумерного массива (size×size).
-        Если unsat, вернём None (или бросим исключение).
-        """
-        s = Solver()
-        
-        # Создадим матрицу Z3-переменных: cell[r][c]
-        self.cells = [
-            [Int(f"cell_{r}_{c}") for c in range(self.size)]
-            for r in range(self.size)
-        ]
-        
-        # Базовые ограничения: 1 <= cell[r][c] <= size
-        for r in range(self.size):
-            for c in range(self.size):
-                s.add(self.cells[r][c] >= 1, self.cells[r][c] <= self.size)
-        
-        # Уникальность в каждой строке
-        for r in range(self.size):
-            s.add(Distinct(*self.cells[r]))
-        
-        # Уникальность в каждом столбце
-        for c in range(self.size):
-            col_vars = [self.cells[r][c] for r in range(self.size)]
-            s.add(Distinct(*col_vars))
-        
-        # Неравенства
-        for (r1,c1, r2,c2) in self.inequalities:
-            s.add(self.cells[r1][c1] < self.cells[r2][c2])
-        
-        # Попытаемся найти решение
-        result = s.check()
-        if result != sat:
-            # Нет решения (или не единственное). 
-            # Для примера: пусть возвращает None
-            return None
-        
-        m = s.model()
-        # Формируем итоговую матрицу
-        solution_matrix = [[0]*self.size for _ in range(self.size)]
-        for r in range(self.size):
-            for c in range(self.size):
-                solution_matrix[r][c] = m[self.cells[r][c]].as_long()
-        return solution_matrix
-
     def solve(self):
         """
         Генерируем цепочку рассуждений (solution_steps). 
@@ -187,14 +130,10 @@ class FutoshikiTask(BaseTask):
             step_str = tpl.format(row=row, col=col, r1=r1, c1=c1, r2=r2, c2=c2)
             self.solution_steps.append(step_str)
         
-        # Формируем final_answer
-        if self.solution is None:
-            # unsat
-            self.final_answer = "No solution found" if self.language == "en" else "Нет решения"
-        else:
-            final_templ = PROMPT_TEMPLATES["futoshiki"]["final_answer"][self.language]
-            grid_repr = self._format_solution()
-            self.final_answer = final_templ.format(grid_repr=grid_repr)
+        # Формируем final_answer (решение по построению есть и единственно)
+        final_templ = PROMPT_TEMPLATES["futoshiki"]["final_answer"][self.language]
+        grid_repr = self._format_solution()
+        self.final_answer = final_templ.format(grid_repr=grid_repr)
 
     def _format_solution(self):
         if self.solution is None:
@@ -0,0 +1,153 @@
+# re_rl/tasks/math/logic/knights_knaves_solver.py
+
+"""
+Рыцари и лжецы через таблицу истинности.
+
+Распределение ролей — битовая маска (бит i = 1: i-й житель рыцарь). Каждое
+высказывание вычисляется сразу на всех 2^n масках векторно (numpy), а
+согласованность — условие «говорящий рыцарь ⇔ высказывание истинно».
+Маски, согласованные со всеми высказываниями, и есть решения.
+
+build_statements строит высказывания от скрытого ответа: каждое
+кандидатное высказывание подгоняется под роль говорящего, а из нескольких
+кандидатов берётся то, что отсекает больше всего оставшихся вариантов, —
+пока решение не станет единственным.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+FORMS = ["about_self", "about_other", "and", "or", "same", "different", "at_least_one", "exactly_one"]
+# Формы, которые говорят о двух других жителях
+PAIR_FORMS = {"and", "or", "same", "different"}
+# Формы без параметра role
+RELATION_FORMS = {"same", "different"}
+
+# Кандидатов на каждое новое высказывание
+CANDIDATES = 8
+# Высказываний сверх заданного числа и подряд бесполезных высказываний,
+# после которых распределение ролей признаётся неподходящим
+MAX_EXTRA = 64
+MAX_STALL = 12
+
+
+@dataclass
+class Statement:
+    speaker: int
+    form_key: str
+    y: Optional[int] = None
+    z: Optional[int] = None
+    role: Optional[str] = None          # knight / knave; None для same/different
+
+
+class TruthTable:
+    """Столбцы «i-й житель — рыцарь» для всех 2^n распределений ролей."""
+
+    def __init__(self, n: int):
+        self.n = n
+        masks = np.arange(1 << n, dtype=np.int64)
+        self.knight = [((masks >> i) & 1).astype(bool) for i in range(n)]
+        self.knights = sum(k.astype(np.int8) for k in self.knight)
+
+    def is_role(self, person: int, role: str) -> np.ndarray:
+        return self.knight[person] if role == "knight" else ~self.knight[person]
+
+    def truth(self, st: Statement) -> np.ndarray:
+        """Истинность высказывания на всех распределениях."""
+        form = st.form_key
+        if form == "about_self":
+            return self.is_role(st.speaker, st.role)
+        if form == "about_other":
+            return self.is_role(st.y, st.role)
+        if form == "and":
+            return self.is_role(st.y, st.role) & self.is_role(st.z, st.role)
+        if form == "or":
+            return self.is_role(st.y, st.role) | self.is_role(st.z, st.role)
+        if form == "same":
+            return self.knight[st.y] == self.knight[st.z]
+        if form == "different":
+            return self.knight[st.y] != self.knight[st.z]
+        # «из нас» — все жители острова
+        count = self.knights if st.role == "knight" else self.n - self.knights
+        if form == "at_least_one":
+            return count >= 1
+        return count == 1                                   # exactly_one
+
+    def consistent(self, st: Statement) -> np.ndarray:
+        """Рыцарь говорит правду, лжец — ложь."""
+        return self.knight[st.speaker] == self.truth(st)
+
+    def solve(self, statements: Sequence[Statement]) -> List[int]:
+        """Все распределения (маски), согласованные с высказываниями."""
+        ok = np.ones(1 << self.n, dtype=bool)
+        for st in statements:
+            ok &= self.consistent(st)
+        return [int(m) for m in np.flatnonzero(ok)]
+
+
+def roles_to_mask(roles: Sequence[str]) -> int:
+    return sum(1 << i for i, role in enumerate(roles) if role == "knight")
+
+
+def _candidate(n: int, hidden: int, table: TruthTable, rng) -> Statement:
+    """Случайное высказывание, согласованное со скрытым ответом."""
+    speaker = rng.randrange(n)
+    others = [i for i in range(n) if i != speaker]
+    forms = [f for f in FORMS if f not in PAIR_FORMS or len(others) >= 2]
+    form = rng.choice(forms)
+    y = z = None
+    if form in PAIR_FORMS:
+        y, z = rng.sample(others, 2)
+    elif form == "about_other":
+        y = rng.choice(others)
+    st = Statement(speaker, form, y, z, None if form in RELATION_FORMS else rng.choice(["knight", "knave"]))
+    if not table.consistent(st)[hidden]:
+        # Подгоняем под роль говорящего: меняем роль или отношение
+        if form in RELATION_FORMS:
+            st.form_key = "different" if form == "same" else "same"
+        else:
+            st.role = "knave" if st.role == "knight" else "knight"
+    return st
+
+
+def build_statements(
+    n: int,
+    num_statements: int,
+    hidden: int,
+    rng=random,
+    table: Optional[TruthTable] = None,
+) -> List[Statement]:
+    """
+    Не меньше num_statements высказываний с единственным решением hidden.
+    Бросает ValueError, если единственности добиться не удалось (например,
+    при двух рыцарях любое их высказывание согласуется и с двумя лжецами).
+    """
+    table = table or TruthTable(n)
+    ok = np.ones(1 << n, dtype=bool)
+    remaining = 1 << n
+    statements: List[Statement] = []
+    stall = 0
+    while len(statements) < num_statements + MAX_EXTRA and stall < MAX_STALL:
+        if len(statements) >= num_statements and remaining == 1:
+            return statements
+        candidates = []
+        for _ in range(CANDIDATES):
+            st = _candidate(n, hidden, table, rng)
+            # Кандидат может оказаться «не подгоняемым» (about_self для лжеца
+            # и т.п.) или повтором — такие отбрасываются
+            mask = table.consistent(st)
+            if mask[hidden] and st not in statements:
+                candidates.append((int((ok & mask).sum()), st, mask))
+        if not candidates:
+            stall += 1
+            continue
+        best = min(c[0] for c in candidates)
+        _, st, mask = rng.choice([c for c in candidates if c[0] == best])
+        statements.append(st)
+        ok &= mask
+        stall = stall + 1 if best == remaining and remaining > 1 else 0
+        remaining = best
+    raise ValueError("не удалось построить высказывания с единственным решением")
@@ -1,11 +1,23 @@
 # re_rl/tasks/knights_knaves_task.py
 
 import random
-import z3
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.logic.knights_knaves_solver import (
+    Statement,
+    TruthTable,
+    build_statements,
+    roles_to_mask,
+)
 from typing import Optional, Dict, Any, ClassVar
 
+# Названия ролей в тексте высказываний: (единственное, множественное)
+ROLE_WORDS = {
+    "ru": {"knight": ("рыцарь", "рыцари"), "knave": ("лжец", "лжецы")},
+    "en": {"knight": ("knight", "knight"), "knave": ("knave", "knave")},
+}
+
+
 class KnightsKnavesTask(BaseMathTask):
     """
     Генерирует задачу Knights & Knaves.
@@ -15,7 +27,11 @@ class KnightsKnavesTask(BaseMathTask):
       - difficulty 3-4: 3 персонажа
       - difficulty 5-6: 4 персонажа
       - difficulty 7-8: 5 персонажей
-      - difficulty 9-10: 6+ персонажей, сложные высказывания
+      - difficulty 9: 7 персонажей
+      - difficulty 10: 8 персонажей
+    
+    Высказывания строятся от скрытого распределения ролей и проверяются
+    таблицей истинности (knights_knaves_solver): у задачи ровно одно решение.
     """
     
     DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
@@ -27,8 +43,8 @@ class KnightsKnavesTask(BaseMathTask):
         6: {"complexity": 3},
         7: {"complexity": 4},
         8: {"complexity": 4},
-        9: {"complexity": 5},
-        10: {"complexity": 5},
+        9: {"complexity": 6},
+        10: {"complexity": 7},
     }
 
     def __init__(
@@ -62,16 +78,9 @@ class KnightsKnavesTask(BaseMathTask):
 
         # Определяем число персонажей / высказываний по уровню сложности
         self.num_persons, self.num_statements = self._compute_params_by_complexity(self.complexity)
+        self.table = TruthTable(self.num_persons)
 
-        # Берём пул имён из prompts
-        all_names = PROMPT_TEMPLATES["knights_knaves"]["names_pool"][self.language]
-        random.shuffle(all_names)
-        self.names = all_names[:self.num_persons]
-
-        # Генерируем случайные высказывания
-        self.statements = self._generate_random_statements(self.num_statements)
-
-        # Формируем текст задачи (problem)
+        # Формируем текст задачи (problem): имена, роли и высказывания
         description = self._create_problem_text()
         super().__init__(description, language, detail_level, output_format)
 
@@ -81,52 +90,36 @@ class KnightsKnavesTask(BaseMathTask):
           lvl=1 => 2 персонажа, 2 высказывания
           lvl=2 => 3 персонажа, 3 высказывания
           lvl=3 => 4 персонажа, 5 высказываний
-          ...
+          lvl=k => k+1 персонажей, 2k-1 высказываний
+        Высказываний может стать больше, если их не хватит для единственности.
         """
         if lvl <= 1:
             return (2, 2)
         elif lvl == 2:
             return (3, 3)
-        elif lvl == 3:
-            return (4, 5)
-        else:
-            # при больших значениях ещё увеличиваем
-            return (5, 7)
+        return (lvl + 1, 2 * lvl - 1)
 
     def _number_to_text(self, n: int, language: str) -> str:
         """Преобразует число в текстовый формат на нужном языке."""
-        if language == "ru":
-            if n == 2:
-                return "два"
-            elif n == 3:
-                return "три"
-            elif n == 4:
-                return "четыре"
-            elif n == 5:
-                return "пять"
-            else:
-                return str(n)
-        else:
-            if n == 2:
-                return "two"
-            elif n == 3:
-                return "three"
-            elif n == 4:
-                return "four"
-            elif n == 5:
-                return "five"
-            else:
-                return str(n)
+        words = {
+            "ru": {2: "два", 3: "три", 4: "четыре", 5: "пять", 6: "шесть", 7: "семь", 8: "восемь"},
+            "en": {2: "two", 3: "three", 4: "four", 5: "five", 6: "six", 7: "seven", 8: "eight"},
+        }
+        return words.get(language, words["en"]).get(n, str(n))
 
     def _create_problem_text(self):
         # Генерируем имена персонажей
         self.names = self._generate_names()
         
-        # Определяем роли персонажей
-        self.roles = self._generate_roles()
-        
-        # Генерируем высказывания
-        self.statements = self._generate_random_statements(self.num_statements)
+        # Роли и высказывания под них; распределения, для которых
+        # единственного решения не получается, отбрасываются
+        while True:
+            self.roles = self._generate_roles()
+            try:
+                self.statements = self._generate_random_statements(self.num_statements)
+                break
+            except ValueError:
+                continue
         
         # Формируем текст задачи с расширенными инструкциями
         templates = PROMPT_TEMPLATES["knights_knaves"]
@@ -139,7 +132,7 @@ class KnightsKnavesTask(BaseMathTask):
         problem_text += "\n\n" + templates["intro"][self.language].format(
             names=", ".join(self.names),
             plural=plural,
-            num_persons=self.num_persons
+            num_persons=self._number_to_text(self.num_persons, self.language)
         )
         
         # Добавляем высказывания персонажей
@@ -151,82 +144,49 @@ class KnightsKnavesTask(BaseMathTask):
 
     def _generate_random_statements(self, m: int):
         """
-        Генерирует m высказываний. Каждое - dict:
+        Генерирует не меньше m высказываний. Каждое - dict:
           {
             "speaker": int,
             "text": str,
             "form_key": str,
-            "y": int,
-            "z": int or None
+            "y": int or None,
+            "z": int or None,
+            "role": str or None,
+            "statement": Statement
           }
         """
-        forms_dict = PROMPT_TEMPLATES["knights_knaves"]["forms"][self.language]
-        possible_forms = ["about_self", "about_other", "and", "or", "same", "different", "at_least_one", "exactly_one"]
-
+        hidden = roles_to_mask(self.roles)
         statements = []
-        for _ in range(m):
-            speaker = random.randrange(self.num_persons)
-            form_key = random.choice(possible_forms)
-
-            # Выбираем y (и z) - разные от speaker
-            all_others = [i for i in range(self.num_persons) if i != speaker]
-            if not all_others:
-                # fallback (если всего 1 персонаж - хотя такого не бывает по логике complexity)
-                form_key = "about_self"
-                y_idx = speaker
-                z_idx = None
-            else:
-                y_idx = random.choice(all_others)
-                z_idx = None
-                # Если форма требует двух distinct, пробуем взять z
-                if form_key in ("and", "or", "same", "different"):
-                    if len(all_others) < 2:
-                        form_key = "about_other"
-                    else:
-                        remain = [x for x in all_others if x != y_idx]
-                        z_idx = random.choice(remain)
-
-            st_text = self._build_statement_text(form_key, speaker, y_idx, z_idx)
+        for st in build_statements(self.num_persons, m, hidden, table=self.table):
             statements.append({
-                "speaker": speaker,
-                "form_key": form_key,
-                "y": y_idx,
-                "z": z_idx,
-                "text": st_text
+                "speaker": st.speaker,
+                "form_key": st.form_key,
+                "y": st.y,
+                "z": st.z,
+                "role": st.role,
+                "text": self._build_statement_text(st),
+                "statement": st,
             })
         return statements
 
-    def _build_statement_text(self, form_key, speaker, y_idx, z_idx):
+    def _build_statement_text(self, st: Statement):
         """
         Берём шаблон 'forms'[form_key], подставляем параметры и оборачиваем в
         "{nameSpeaker} says: ..." (en) или "{nameSpeaker} говорит: ..." (ru)
         """
         kn_forms = PROMPT_TEMPLATES["knights_knaves"]["forms"][self.language]
-        form_template = kn_forms[form_key]
+        form_template = kn_forms[st.form_key]
 
-        name_speaker = self.names[speaker]
-        name_y = self.names[y_idx] if y_idx is not None else ""
-        name_z = self.names[z_idx] if z_idx is not None else ""
-
-        if form_key == "about_self":
-            core_text = form_template.format(role="knight" if random.random() < 0.5 else "knave")
-        elif form_key == "about_other":
-            core_text = form_template.format(name=name_y, role="knight" if random.random() < 0.5 else "knave")
-        elif form_key == "and":
-            core_text = form_template.format(name=name_y, other_name=name_z, role="knight" if random.random() < 0.5 else "knave")
-        elif form_key == "or":
-            core_text = form_template.format(name=name_y, other_name=name_z, role="knight" if random.random() < 0.5 else "knave")
-        elif form_key == "same":
-            core_text = form_template.format(name=name_y, other_name=name_z)
-        elif form_key == "different":
-            core_text = form_template.format(name=name_y, other_name=name_z)
-        elif form_key == "at_least_one":
-            core_text = form_template.format(role="knight" if random.random() < 0.5 else "knave")
-        else:  # exactly_one
-            core_text = form_template.format(role="knight" if random.random() < 0.5 else "knave")
+        name_y = self.names[st.y] if st.y is not None else ""
+        name_z = self.names[st.z] if st.z is not None else ""
+        role = ""
+        if st.role is not None:
+            single, plural = ROLE_WORDS.get(self.language, ROLE_WORDS["en"])[st.role]
+            role = plural if st.form_key == "and" else single
 
+        core_text = form_template.format(name=name_y, other_name=name_z, role=role)
         statement_template = kn_forms["statement"]
-        return statement_template.format(name=name_speaker, text=core_text)
+        return statement_template.format(name=self.names[st.speaker], text=core_text)
 
     def solve(self):
         steps = []
@@ -238,35 +198,34 @@ class KnightsKnavesTask(BaseMathTask):
         )
         steps.append(base_step)
         
-        # Анализ каждого персонажа
-        for i, name in enumerate(self.names):
+        # Анализ каждого высказывания при найденном распределении ролей
+        solution = roles_to_mask(self.roles)
+        for stmt in self.statements:
             if len(steps) >= self.detail_level:
                 break
+            true = bool(self.table.truth(stmt["statement"])[solution])
+            speaker = self.names[stmt["speaker"]]
+            speaker_role = self.roles[stmt["speaker"]]
             if self.language == "ru":
-                step = f"Анализ высказывания {name}:\n"
-                step += f"- {self.statements[i]}\n"
-                step += f"- Возможные роли: {', '.join(['рыцарь', 'лжец'])}\n"
-                step += f"- Логические следствия:"
+                step = f"Анализ высказывания {speaker}:\n"
+                step += f"- {stmt['text']}\n"
+                step += f"- Высказывание {'истинно' if true else 'ложно'}, "
+                step += f"значит {speaker} — {ROLE_WORDS['ru'][speaker_role][0]}"
             else:
-                step = f"Analysis of {name}'s statement:\n"
-                step += f"- {self.statements[i]}\n"
-                step += f"- Possible roles: {', '.join(['knight', 'knave'])}\n"
-                step += f"- Logical implications:"
+                step = f"Analysis of {speaker}'s statement:\n"
+                step += f"- {stmt['text']}\n"
+                step += f"- The statement is {'true' if true else 'false'}, so {speaker} is a {speaker_role}"
             steps.append(step)
         
-        # Анализ противоречий
+        # Перебор всех распределений ролей
         if len(steps) < self.detail_level:
-            contradictions = self._find_contradictions()
-            if contradictions:
-                if self.language == "ru":
-                    step = "Найденные противоречия:\n"
-                    for c in contradictions:
-                        step += f"- {c}\n"
-                else:
-                    step = "Found contradictions:\n"
-                    for c in contradictions:
-                        step += f"- {c}\n"
-                steps.append(step)
+            total = 1 << self.num_persons
+            consistent = self.table.solve([stmt["statement"] for stmt in self.statements])
+            if self.language == "ru":
+                step = f"Из {total} распределений ролей со всеми высказываниями согласовано: {len(consistent)}"
+            else:
+                step = f"Of {total} role assignments, consistent with all statements: {len(consistent)}"
+            steps.append(step)
         
         # Финальный вывод
         if len(steps) < self.detail_level:
@@ -304,21 +263,6 @@ class KnightsKnavesTask(BaseMathTask):
         
         self.final_answer = f"{final_answer.format(roles=', '.join(roles_list))}\n\n{explanation}"
 
-    def _find_contradictions(self):
-        """Находит противоречия в высказываниях персонажей"""
-        contradictions = []
-        for i, (name1, stmt1) in enumerate(zip(self.names, self.statements)):
-            for j, (name2, stmt2) in enumerate(zip(self.names, self.statements)):
-                if i < j:  # Проверяем только уникальные пары
-                    if self._are_statements_contradictory(stmt1, stmt2):
-                        contradictions.append(f"{name1} и {name2} противоречат друг другу")
-        return contradictions
-
-    def _are_statements_contradictory(self, stmt1, stmt2):
-        """Проверяет, противоречат ли два высказывания друг другу"""
-        # Здесь можно добавить более сложную логику проверки противоречий
-        return False  # Заглушка
-
     def get_result(self, detail_level: Optional[int] = None) -> Dict[str, Any]:
         """
         Возвращает результат решения с заданным уровнем детализации.
@@ -353,8 +297,7 @@ class KnightsKnavesTask(BaseMathTask):
         """
         # Берём пул имён из prompts
         all_names = PROMPT_TEMPLATES["knights_knaves"]["names_pool"][self.language]
-        random.shuffle(all_names)
-        return all_names[:self.num_persons]
+        return random.sample(all_names, self.num_persons)
 
     def _generate_roles(self):
         """
@@ -367,37 +310,3 @@ class KnightsKnavesTask(BaseMathTask):
         for _ in range(self.num_persons):
             roles.append("knight" if random.random() < 0.5 else "knave")
         return roles
-
-    def _generate_statements(self, names, roles):
-        """
-        Генерирует высказывания персонажей.
-        
-        Args:
-            names: Список имен персонажей
-            roles: Список ролей персонажей
-            
-        Returns:
-            List[str]: Список высказываний
-        """
-        statements = []
-        for i in range(self.num_statements):
-            speaker = random.randrange(self.num_persons)
-            form_key = random.choice(list(PROMPT_TEMPLATES["knights_knaves"]["forms"][self.language].keys()))
-            
-            # Выбираем y (и z) - разные от speaker
-            all_others = [j for j in range(self.num_persons) if j != speaker]
-            y_idx = random.choice(all_others)
-            z_idx = None
-            
-            # Если форма требует двух distinct, пробуем взять z
-            if form_key in ("y_and_z_both_honest", "y_and_z_both_liars", "y_eq_z", "y_neq_z"):
-                if len(all_others) >= 2:
-                    remain = [j for j in all_others if j != y_idx]
-                    z_idx = random.choice(remain)
-                else:
-                    form_key = "y_is_liar"
-            
-            statement = self._build_statement_text(form_key, speaker, y_idx, z_idx)
-            statements.append(statement)
-            
-        return statements
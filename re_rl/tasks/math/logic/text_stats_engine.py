@@ -0,0 +1,136 @@
+# re_rl/tasks/math/logic/text_stats_engine.py
+
+"""
+Подсчёт вхождений подстроки и пакетная генерация текстов для TextStatsTask.
+
+Подсчёт с пересечениями. Повторный str.find с позиции idx + 1 для
+паттерна вроде «aaa» в «aaaa…» сравнивает m символов на каждом шаге —
+O(n·m). Здесь используется период паттерна p = m − π(m), где π —
+префикс-функция КМП. Соседние вхождения не ближе p, и если после
+вхождения в i следующие p символов текста совпадают с хвостом паттерна,
+то i + p — тоже вхождение. Это проверяется сравнением среза длины p без
+повторного сравнения всего паттерна. Без совпадения поиск продолжается
+через str.find с i + p. Итог — O(n + m) сравнений, причём основная работа
+идёт в C (str.find и сравнение срезов). Если у паттерна нет собственной
+грани, вхождения не пересекаются, и хватает str.count.
+
+Генерация. Все случайные величины (индексы слов, символы, типы и длины
+кусков) тянутся одним вызовом numpy на документ; символы собираются
+из кодов через массив uint32 и decode('utf-32'), без посимвольного
+random.choices. Документ на 100k символов строится за миллисекунды.
+"""
+
+import random
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def prefix_function(pattern: str) -> List[int]:
+    """π[i] — длина наибольшей собственной грани pattern[:i + 1] (КМП)."""
+    pi = [0] * len(pattern)
+    k = 0
+    for i in range(1, len(pattern)):
+        while k and pattern[i] != pattern[k]:
+            k = pi[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        pi[i] = k
+    return pi
+
+
+def count_overlapping(text: str, pattern: str) -> int:
+    """Число вхождений pattern в text с учётом пересечений, за O(n + m)."""
+    m = len(pattern)
+    if not m:
+        return 0
+    border = prefix_function(pattern)[-1]
+    if not border:
+        # Без грани два вхождения не могут пересекаться
+        return text.count(pattern)
+    period = m - border
+    tail = pattern[m - period:]
+    count = 0
+    idx = text.find(pattern)
+    while idx != -1:
+        count += 1
+        # Продлеваем серию вхождений с шагом period
+        end = idx + m
+        while text.startswith(tail, end):
+            count += 1
+            end += period
+        idx = text.find(pattern, end - m + period)
+    return count
+
+
+def count_occurrences(text: str, pattern: str, overlapping: bool = False) -> int:
+    """Число вхождений pattern в text (с пересечениями или без)."""
+    if not pattern:
+        return 0
+    if overlapping:
+        return count_overlapping(text, pattern)
+    return text.count(pattern)
+
+
+def _rng(seed: Optional[int] = None) -> np.random.Generator:
+    # Зерно из random: генерация воспроизводится через random.seed
+    return np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+
+
+def _codes(alphabet: str) -> np.ndarray:
+    return np.frombuffer(alphabet.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _decode(codes: np.ndarray) -> str:
+    return codes.astype(np.uint32).tobytes().decode("utf-32-le")
+
+
+def random_letters(alphabet: str, length: int, rng: Optional[np.random.Generator] = None) -> str:
+    """Строка из length случайных символов alphabet."""
+    rng = rng or _rng()
+    codes = _codes(alphabet)
+    return _decode(codes[rng.integers(len(codes), size=length)])
+
+
+def random_words(vocab: Sequence[str], count: int, rng: Optional[np.random.Generator] = None) -> str:
+    """count случайных слов из vocab через пробел."""
+    rng = rng or _rng()
+    words = np.asarray(vocab, dtype=object)
+    return " ".join(words[rng.integers(len(words), size=count)])
+
+
+def random_mixed(
+    vocab: Sequence[str],
+    alphabet: str,
+    count: int,
+    mix_ratio: float = 0.5,
+    rng: Optional[np.random.Generator] = None,
+    min_chunk: int = 2,
+    max_chunk: int = 6,
+) -> str:
+    """
+    count кусков через пробел: с вероятностью mix_ratio слово из vocab,
+    иначе случайные символы длиной min_chunk..max_chunk. Символы всех
+    кусков берутся одной строкой и режутся по накопленным длинам.
+    """
+    rng = rng or _rng()
+    words = np.asarray(vocab, dtype=object)
+    is_word = rng.random(count) < mix_ratio
+    word_idx = rng.integers(len(words), size=count)
+    lengths = rng.integers(min_chunk, max_chunk + 1, size=count)
+    lengths[is_word] = 0
+    letters = random_letters(alphabet, int(lengths.sum()), rng)
+    ends = np.cumsum(lengths).tolist()
+    starts = [0] + ends[:-1]
+    chunks = [
+        words[w] if word else letters[s:e]
+        for word, w, s, e in zip(is_word.tolist(), word_idx.tolist(), starts, ends)
+    ]
+    return " ".join(chunks)
+
+
+def chunks_for_length(text_length: int, vocab: Sequence[str], mix_ratio: float = 1.0, min_chunk: int = 2, max_chunk: int = 6) -> int:
+    """Сколько кусков (с пробелами) нужно на текст примерно из text_length символов."""
+    mean_word = sum(len(w) for w in vocab) / len(vocab)
+    mean_chunk = mix_ratio * mean_word + (1 - mix_ratio) * (min_chunk + max_chunk) / 2
+    return max(1, round(text_length / (mean_chunk + 1)))
@@ -1,8 +1,16 @@
 # re_rl/tasks/text_stats_task.py
 
 import random
+from typing import Any, ClassVar, Dict
 from re_rl.tasks.base_task import BaseMathTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.logic.text_stats_engine import (
+    chunks_for_length,
+    count_occurrences,
+    random_letters,
+    random_mixed,
+    random_words,
+)
 
 class TextStatsTask(BaseMathTask):
     """
@@ -19,8 +27,26 @@ class TextStatsTask(BaseMathTask):
         - 'mixed': часть слов, часть символов
     :param mix_ratio: (float) при text_gen_mode='mixed' указывает,
                       какую долю вставлять из слов (например, 0.5 => 50% слов, 50% случайных букв)
+    :param text_length: примерная длина генерируемого текста в символах
+        (None — короткий текст, 6..15 кусков или 15..50 букв).
+    :param max_substring_length: наибольшая длина случайной подстроки.
+    :param difficulty: уровень сложности (1-10); на высоких уровнях
+        тексты в десятки тысяч символов для задач на длинный контекст.
     """
 
+    DIFFICULTY_PRESETS: ClassVar[Dict[int, Dict[str, Any]]] = {
+        1: {"text_length": 40, "max_substring_length": 1},
+        2: {"text_length": 80, "max_substring_length": 2},
+        3: {"text_length": 150, "max_substring_length": 2},
+        4: {"text_length": 300, "max_substring_length": 3},
+        5: {"text_length": 600, "max_substring_length": 3},
+        6: {"text_length": 1500, "max_substring_length": 3},
+        7: {"text_length": 4000, "max_substring_length": 3},
+        8: {"text_length": 10000, "max_substring_length": 4},
+        9: {"text_length": 30000, "max_substring_length": 4},
+        10: {"text_length": 100000, "max_substring_length": 5},
+    }
+
     def __init__(self,
                  language: str = "ru",
                  detail_level: int = 3,
@@ -29,7 +55,19 @@ class TextStatsTask(BaseMathTask):
                  allow_overlapping: bool = False,
                  text_gen_mode: str = "words",
                  mix_ratio: float = 0.5,
-                 output_format: OutputFormat = "text"):
+                 output_format: OutputFormat = "text",
+                 text_length: int = None,
+                 max_substring_length: int = None,
+                 difficulty: int = None):
+        if difficulty is not None:
+            preset = self._interpolate_difficulty(difficulty)
+            if text_length is None:
+                text_length = preset.get("text_length")
+            if max_substring_length is None:
+                max_substring_length = preset.get("max_substring_length")
+        self.difficulty = difficulty
+        self.text_length = text_length
+        self.max_substring_length = max_substring_length or 3
         self.language = language.lower()
         self.detail_level = detail_level
         self._output_format = output_format
@@ -70,42 +108,31 @@ class TextStatsTask(BaseMathTask):
             PROMPT_TEMPLATES["text_stats"]["alphabet"]["en"]
         )
 
-        length = random.randint(6, 15)  # количество «элементов» (слов или кусков)
-        chunks = []
+        if self.text_gen_mode == "letters":
+            # Одна строка полностью из случайных букв/цифр
+            total_chars = self.text_length or random.randint(15, 50)
+            return random_letters(alphabet_str, total_chars)
 
         if self.text_gen_mode == "words":
-            # Генерируем только «слова» из vocab_list
-            chunks = random.choices(vocab_list, k=length)
-            return " ".join(chunks)
-
-        elif self.text_gen_mode == "letters":
-            # Генерируем одну строку полностью из случайных букв/цифр
-            # (Можно разрезать на слова, но пусть будет как единый «текст».)
-            total_chars = random.randint(15, 50)
-            return "".join(random.choices(alphabet_str, k=total_chars))
-
+            # Только «слова» из vocab_list
+            ratio = 1.0
         else:
-            # mixed: часть слов, часть рандомных букв
-            # mix_ratio отвечает за долю слов, всё остальное — буквы.
-            # Например, если mix_ratio=0.7, ~70% chunks будут «словами».
-            for _ in range(length):
-                if random.random() < self.mix_ratio:
-                    # слово
-                    chunks.append(random.choice(vocab_list))
-                else:
-                    # случайная буквенная подстрока, длиной 2..6
-                    sub_len = random.randint(2, 6)
-                    rnd_sub = "".join(random.choices(alphabet_str, k=sub_len))
-                    chunks.append(rnd_sub)
-            # Склеим через пробел (или можно через рандомные пробелы и т.д.)
-            return " ".join(chunks)
+            # mixed: mix_ratio — доля слов, остальное — куски из 2..6 букв
+            ratio = self.mix_ratio
+        if self.text_length is None:
+            length = random.randint(6, 15)  # количество «элементов» (слов или кусков)
+        else:
+            length = chunks_for_length(self.text_length, vocab_list, ratio)
+        if ratio == 1.0:
+            return random_words(vocab_list, length)
+        return random_mixed(vocab_list, alphabet_str, length, ratio)
 
     def _choose_random_substring(self, text: str) -> str:
-        """Выбираем случайный кусок из текста, размером 1..3 символа."""
+        """Выбираем случайный кусок из текста, размером 1..max_substring_length символов."""
         if not text:
             return "a"
         start_idx = random.randint(0, len(text) - 1)
-        max_sub_len = min(3, len(text) - start_idx)
+        max_sub_len = min(self.max_substring_length, len(text) - start_idx)
         sub_len = random.randint(1, max_sub_len)
         return text[start_idx : start_idx + sub_len]
 
@@ -125,10 +152,7 @@ class TextStatsTask(BaseMathTask):
             self.solution_steps.append(step_str)
 
         # Подсчитаем вхождения
-        if self.allow_overlapping:
-            count_val = self._count_overlapping(self.text, self.substring)
-        else:
-            count_val = self.text.count(self.substring)
+        count_val = count_occurrences(self.text, self.substring, self.allow_overlapping)
 
         final_templ = PROMPT_TEMPLATES["text_stats"]["final_answer"].get(
             self.language,
@@ -140,17 +164,7 @@ class TextStatsTask(BaseMathTask):
         )
 
     def _count_overlapping(self, text: str, sub: str) -> int:
-        if not sub:
-            return 0
-        count = 0
-        start = 0
-        while True:
-            idx = text.find(sub, start)
-            if idx == -1:
-                break
-            count += 1
-            start = idx + 1
-        return count
+        return count_occurrences(text, sub, overlapping=True)
 
     def get_task_type(self) -> str:
         return "text_stats"
@@ -0,0 +1,132 @@
+# re_rl/tasks/math/logic/z3_session.py
+
+"""
+Общая сессия z3 на процесс (и поток).
+
+Создание Context, Solver и переменных стоит заметно дороже самой проверки
+маленькой головоломки, поэтому сессия переиспользует один Context и один
+Solver, а ограничения конкретного экземпляра добавляются внутри
+push/pop (scope). Переменные сетки и ограничения латинского квадрата
+кэшируются по размеру; для типичных размеров 3..9 создаются заранее.
+
+z3 — необязательная зависимость: задачи его не импортируют, сессия нужна
+для независимой проверки единственности и будущих CSP-задач.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import z3
+
+Grid = List[List[int]]
+
+# Размеры сеток, переменные для которых создаются при старте сессии
+COMMON_SIZES = range(3, 10)
+
+
+class Z3Session:
+    """Context + Solver с кэшем переменных; экземпляры живут в scope()."""
+
+    def __init__(self, sizes: Sequence[int] = COMMON_SIZES):
+        self.pid = os.getpid()
+        self.ctx = z3.Context()
+        self.solver = z3.Solver(ctx=self.ctx)
+        self._grids: Dict[Tuple[str, int, int], List[List[z3.ArithRef]]] = {}
+        self._latin: Dict[int, List[z3.BoolRef]] = {}
+        for n in sizes:
+            self.grid(n)
+
+    def grid(self, rows: int, cols: Optional[int] = None, prefix: str = "x") -> List[List[z3.ArithRef]]:
+        """Матрица целочисленных переменных rows×cols (из кэша)."""
+        cols = rows if cols is None else cols
+        key = (prefix, rows, cols)
+        cells = self._grids.get(key)
+        if cells is None:
+            cells = [
+                [z3.Int(f"{prefix}_{r}_{c}", self.ctx) for c in range(cols)]
+                for r in range(rows)
+            ]
+            self._grids[key] = cells
+        return cells
+
+    def latin_constraints(self, n: int) -> List[z3.BoolRef]:
+        """Значения 1..n и попарно различные строки и столбцы сетки n×n."""
+        constraints = self._latin.get(n)
+        if constraints is None:
+            cells = self.grid(n)
+            constraints = [z3.And(1 <= v, v <= n) for row in cells for v in row]
+            constraints += [z3.Distinct(*row) for row in cells]
+            constraints += [z3.Distinct(*col) for col in zip(*cells)]
+            self._latin[n] = constraints
+        return constraints
+
+    @contextmanager
+    def scope(self) -> Iterator[z3.Solver]:
+        """Ограничения, добавленные внутри, снимаются на выходе (push/pop)."""
+        self.solver.push()
+        try:
+            yield self.solver
+        finally:
+            self.solver.pop()
+
+    def models(
+        self,
+        constraints: Sequence[z3.BoolRef],
+        variables: Sequence[z3.ArithRef],
+        limit: int = 2,
+    ) -> List[List[int]]:
+        """
+        До limit различных наборов значений variables. Найденные модели
+        запрещаются блокирующими дизъюнкциями внутри того же scope, так что
+        решатель продолжает с накопленными леммами, а не с нуля.
+        """
+        found: List[List[int]] = []
+        with self.scope() as solver:
+            solver.add(*constraints)
+            while len(found) < limit and solver.check() == z3.sat:
+                model = solver.model()
+                values = [model.eval(v, model_completion=True) for v in variables]
+                found.append([v.as_long() for v in values])
+                solver.add(z3.Or([v != value for v, value in zip(variables, values)]))
+        return found
+
+
+_local = threading.local()
+
+
+def get_session() -> Z3Session:
+    """
+    Сессия текущего потока. Объекты z3 нельзя делить между потоками и
+    переносить через fork, поэтому после fork сессия создаётся заново.
+    """
+    session = getattr(_local, "session", None)
+    if session is None or session.pid != os.getpid():
+        session = _local.session = Z3Session()
+    return session
+
+
+def solve_futoshiki_z3(
+    size: int,
+    inequalities: Sequence[Tuple[int, int, int, int]],
+    givens: Optional[Grid] = None,
+    limit: int = 2,
+) -> List[Grid]:
+    """До limit решений Futoshiki через z3 (для сверки с futoshiki_solver)."""
+    session = get_session()
+    cells = session.grid(size)
+    constraints = list(session.latin_constraints(size))
+    constraints += [cells[r1][c1] < cells[r2][c2] for r1, c1, r2, c2 in inequalities]
+    if givens is not None:
+        constraints += [
+            cells[r][c] == value
+            for r, row in enumerate(givens)
+            for c, value in enumerate(row)
+            if value
+        ]
+    flat = [v for row in cells for v in row]
+    return [
+        [values[r * size:(r + 1) * size] for r in range(size)]
+        for values in session.models(constraints, flat, limit)
+    ]
@@ -1,8 +1,13 @@
 # re_rl/tasks/urn_probability_task.py
 import random
-import math
+from fractions import Fraction
 from re_rl.tasks.base_task import BaseTask, OutputFormat
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.discrete.exact_combinatorics import format_fraction, hypergeom_pmf_batch
+
+# Вид вопроса для каждого шаблона questions_pool (порядок шаблонов одинаков во всех языках)
+QUESTION_KINDS = ("all", "at_least_one", "exactly")
+
 
 class UrnProbabilityTask(BaseTask):
     def __init__(self, language="en", count_containers=None, draws=None, output_format: OutputFormat = "text"):
@@ -46,24 +51,23 @@ class UrnProbabilityTask(BaseTask):
         super().__init__(desc, language=self.language)
 
     def _choose_question(self):
+        """
+        Выбирает вопрос и запоминает его параметры (question_kind,
+        question_color, question_x) — по ним, а не по тексту, считается ответ.
+        """
         questions_list = PROMPT_TEMPLATES["urn_probability"]["questions_pool"][self.language]
-        chosen_template = random.choice(questions_list)
-        color_choice = random.choice(self.colors)
-        # Если шаблон требует x
-        if "{x}" in chosen_template:
-            x_val = random.randint(1, self.draws)  # "exactly x out of draws are color"
-            return chosen_template.format(
-                draws=self.draws,
-                item_syn=self.item_syn,
-                color=color_choice,
-                x=x_val
-            )
-        else:
-            return chosen_template.format(
-                draws=self.draws,
-                item_syn=self.item_syn,
-                color=color_choice
-            )
+        index = random.randrange(len(questions_list))
+        chosen_template = questions_list[index]
+        self.question_kind = QUESTION_KINDS[index]
+        self.question_color = random.choice(self.colors)
+        # "exactly x out of draws are color"
+        self.question_x = random.randint(1, self.draws) if self.question_kind == "exactly" else None
+        return chosen_template.format(
+            draws=self.draws,
+            item_syn=self.item_syn,
+            color=self.question_color,
+            x=self.question_x,
+        )
 
     def _create_problem_text(self):
         p = PROMPT_TEMPLATES["urn_probability"]["problem"][self.language]
@@ -112,83 +116,37 @@ class UrnProbabilityTask(BaseTask):
             steps_list.append(step_str)
         self.solution_steps = steps_list
 
-        event_prob = 0.0
-        for dist in self.containers:
-            p_container = 1.0 / self.count_containers
-            p_event_in_container = self._compute_event_prob(dist)
-            event_prob += p_container * p_event_in_container
+        # Точная вероятность: по строке (K, N, n, k) на контейнер, все — одним батчем
+        queries = [self._event_query(dist) for dist in self.containers]
+        probs = iter(hypergeom_pmf_batch(q[0] for q in queries if q is not None))
+        p_container = Fraction(1, self.count_containers)
+        event_prob = Fraction(0)
+        for query in queries:
+            if query is None:
+                continue
+            p = next(probs)
+            event_prob += p_container * (1 - p if query[1] else p)
+        self.probability = event_prob
 
         final_templ = PROMPT_TEMPLATES["urn_probability"]["final_answer"][self.language]
-        self.final_answer = final_templ.format(prob_value=f"{event_prob:.4f}")
+        self.final_answer = final_templ.format(prob_value=format_fraction(event_prob))
 
-    def _compute_event_prob(self, dist):
+    def _event_query(self, dist):
+        """
+        Событие в контейнере как (строка гипергеометрии (K, N, n, k), берётся
+        ли дополнение) или None, если вероятность нулевая.
+        """
         total_in_container = sum(c for _, c in dist)
         if total_in_container < self.draws:
-            return 0.0
-
-        # Определим, какой сценарий вопроса
-        # "all draws are color" / "at least one color" / "exactly x color" ...
-        txt = self.question_str
-        # Найдём color
-        color_found = None
-        for col in self.colors:
-            if col in txt:
-                color_found = col
-                break
-        if not color_found:
-            return 0.0
-
-        # Ищем число x
-        import re
-        x_val = None
-        match = re.search(r"exactly (\d+)", txt)
-        if match:
-            x_val = int(match.group(1))
-
-        if ("все" in txt or "all" in txt) and "drawn" in txt:
-            # all draws are color_found
-            color_count = 0
-            for (col, cnt) in dist:
-                if col == color_found:
-                    color_count = cnt
-                    break
-            return self._hypergeom(color_count, total_in_container, self.draws, self.draws)
-        elif ("хотя бы один" in txt or "at least one" in txt):
-            color_count = 0
-            for (col, cnt) in dist:
-                if col == color_found:
-                    color_count = cnt
-                    break
-            # P(>=1 color_found) = 1 - P(0 color_found)
-            p_none = self._hypergeom_zero(color_count, total_in_container, self.draws)
-            return 1.0 - p_none
-        elif ("exactly" in txt or "ровно" in txt) and x_val is not None:
-            color_count = 0
-            for (col, cnt) in dist:
-                if col == color_found:
-                    color_count = cnt
-                    break
-            return self._hypergeom(color_count, total_in_container, self.draws, x_val)
-        return 0.0
-
-    def _hypergeom(self, color_cnt, total_cnt, draws, success_needed):
-        if success_needed > color_cnt:
-            return 0.0
-        import math
-        top = math.comb(color_cnt, success_needed)
-        bottom = math.comb(total_cnt, draws)
-        if draws - success_needed > total_cnt - color_cnt:
-            return 0.0
-        return top * math.comb(total_cnt - color_cnt, draws - success_needed) / bottom
-
-    def _hypergeom_zero(self, color_cnt, total_cnt, draws):
-        # P(0 items are color_cnt)
-        import math
-        if draws > total_cnt - color_cnt:
-            return 0.0
-        top = math.comb(total_cnt - color_cnt, draws)
-        bottom = math.comb(total_cnt, draws)
-        return top / bottom
+            return None
+
+        color_count = dict(dist).get(self.question_color, 0)
+        if self.question_kind == "all":
+            return (color_count, total_in_container, self.draws, self.draws), False
+        if self.question_kind == "at_least_one":
+            # P(>=1) = 1 - P(0)
+            return (color_count, total_in_container, self.draws, 0), True
+        return (color_count, total_in_container, self.draws, self.question_x), False
 
     def get_task_type(self):
         return "urn_probability"
@@ -8,6 +8,7 @@
 
 from typing import Dict, Tuple, Optional
 import math
+import re
 
 
 # Таблицы конвертации в базовые единицы СИ
@@ -146,8 +147,108 @@ UNIT_CONVERSIONS: Dict[str, Dict[str, float]] = {
         "MHz": 1e6,
         "GHz": 1e9,
     },
+    # Сила тока -> амперы
+    "current": {
+        "A": 1.0,
+        "mA": 0.001,
+        "uA": 1e-6,
+        "kA": 1000.0,
+    },
+    # Объём -> м³
+    "volume": {
+        "m^3": 1.0,
+        "l": 0.001,
+        "ml": 1e-6,
+        "cm^3": 1e-6,
+    },
+    # Импульс -> кг·м/с
+    "momentum": {
+        "kg·m/s": 1.0,
+        "N·s": 1.0,
+    },
+    # Магнитный поток -> веберы
+    "magnetic_flux": {
+        "Wb": 1.0,
+        "mWb": 0.001,
+    },
+    # Магнитная индукция -> теслы
+    "magnetic_field": {
+        "T": 1.0,
+        "mT": 0.001,
+        "uT": 1e-6,
+    },
+    # Угловая скорость -> рад/с
+    "angular_velocity": {
+        "rad/s": 1.0,
+    },
+    # Атомная единица массы -> килограммы (отдельно от "mass", чтобы не менять find_unit_type)
+    "atomic_mass": {
+        "u": 1.66053906660e-27,
+        "amu": 1.66053906660e-27,
+    },
+    # Безразмерные доли
+    "ratio": {
+        "%": 0.01,
+    },
+}
+
+
+# Русские и альтернативные обозначения -> ключ из UNIT_CONVERSIONS
+UNIT_ALIASES: Dict[str, str] = {
+    # Длина, масса, время
+    "м": "m", "км": "km", "см": "cm", "мм": "mm", "мкм": "um", "нм": "nm",
+    "µm": "um", "μm": "um",
+    "кг": "kg", "г": "g", "мг": "mg", "т": "t",
+    "с": "s", "мс": "ms", "мкс": "us", "нс": "ns", "мин": "min", "ч": "h", "сут": "d",
+    # Кинематика
+    "м/с": "m/s", "км/ч": "km/h", "км/с": "km/s",
+    "м/с^2": "m/s^2", "м/с²": "m/s^2",
+    "рад/с": "rad/s", "рад": "rad", "°": "deg",
+    # Силы, энергия, мощность, давление
+    "Н": "N", "кН": "kN", "мН": "mN",
+    "Дж": "J", "кДж": "kJ", "МДж": "MJ",
+    "эВ": "eV", "кэВ": "keV", "МэВ": "MeV",
+    "кал": "cal", "ккал": "kcal", "кВт·ч": "kWh",
+    "Вт": "W", "кВт": "kW", "МВт": "MW",
+    "Па": "Pa", "кПа": "kPa", "МПа": "MPa", "атм": "atm", "бар": "bar", "ммрт.ст.": "mmHg",
+    # Температура
+    "К": "K", "°C": "C", "°С": "C", "℃": "C", "°F": "F",
+    # Электричество и магнетизм
+    "Кл": "C", "В": "V", "А": "A", "Ом": "Ω", "Ohm": "Ω", "Ф": "F",
+    "Вб": "Wb", "Тл": "T", "Гц": "Hz",
+    # Прочее
+    "л": "l", "мл": "ml", "м^3": "m^3", "м³": "m^3", "m³": "m^3",
+    "кг·м/с": "kg·m/s", "Н·с": "N·s", "а.е.м.": "u", "а.е.м": "u",
+}
+
+# Обозначения из нескольких слов: перед разбором ответа пробелы в них
+# убираются (normalize_multiword_units), иначе единица распадается на токены
+MULTIWORD_UNITS = re.compile(r"мм\s*рт\.\s*ст\.?|mm\s+Hg")
+_MULTIWORD_REPLACEMENTS = {"мм": "ммрт.ст.", "mm": "mmHg"}
+
+
+def normalize_multiword_units(text: str) -> str:
+    """«760 мм рт. ст.» -> «760 ммрт.ст.», «760 mm Hg» -> «760 mmHg»."""
+    return MULTIWORD_UNITS.sub(lambda m: _MULTIWORD_REPLACEMENTS[m.group(0)[:2]], text)
+
+
+# Десятичные приставки СИ (en и ru написания)
+SI_PREFIXES: Dict[str, float] = {
+    "p": 1e-12, "n": 1e-9, "u": 1e-6, "µ": 1e-6, "μ": 1e-6, "m": 1e-3, "c": 1e-2,
+    "k": 1e3, "M": 1e6, "G": 1e9,
+    "п": 1e-12, "н": 1e-9, "мк": 1e-6, "м": 1e-3, "с": 1e-2,
+    "к": 1e3, "М": 1e6, "Г": 1e9,
 }
 
+# Единицы, к которым допустимо приписывать приставки (иначе "m" + "in" даст "min")
+PREFIXABLE_UNITS = (
+    "m", "g", "s", "N", "J", "eV", "W", "Pa", "V", "A", "Ω", "F", "Hz", "Wb", "T", "l",
+    "м", "г", "с", "Н", "Дж", "эВ", "Вт", "Па", "Кл", "В", "А", "Ом", "Ф", "Гц", "Вб", "Тл", "л",
+)
+
+# Символы "C" и "F" без "°" в обратном индексе — кулон и фарад, а не температура
+_PREFERRED_UNIT_TYPE = {"C": "charge", "F": "capacitance"}
+
 
 # Названия единиц на русском и английском
 UNIT_NAMES: Dict[str, Dict[str, Tuple[str, str]]] = {
@@ -267,6 +368,50 @@ def _convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
         raise ValueError(f"Unknown temperature unit: {to_unit}")
 
 
+def build_reverse_unit_index() -> Dict[str, Tuple[str, float, float]]:
+    """
+    Строит обратный индекс: обозначение единицы (ru/en, с приставками) ->
+    (тип величины, множитель, сдвиг), так что значение_СИ = value * множитель + сдвиг.
+
+    Сдвиг ненулевой только для температур (°C, °F -> K).
+    """
+    index: Dict[str, Tuple[str, float, float]] = {}
+
+    def si_entry(unit: str, unit_type: Optional[str] = None) -> Optional[Tuple[str, float, float]]:
+        unit_type = unit_type or _PREFERRED_UNIT_TYPE.get(unit) or find_unit_type(unit)
+        if unit_type is None:
+            return None
+        if unit_type == "temperature":
+            offset = _convert_temperature(0.0, unit, "K")
+            return unit_type, _convert_temperature(1.0, unit, "K") - offset, offset
+        return unit_type, float(UNIT_CONVERSIONS[unit_type][unit]), 0.0
+
+    for unit_type, conversions in UNIT_CONVERSIONS.items():
+        for unit in conversions:
+            if unit not in index:
+                entry = si_entry(unit, _PREFERRED_UNIT_TYPE.get(unit, unit_type))
+                if entry is not None:
+                    index[unit] = entry
+    for alias, unit in UNIT_ALIASES.items():
+        entry = si_entry(unit, "temperature" if alias.startswith("°") and unit in ("C", "F") else None)
+        if entry is not None:
+            index[alias] = entry
+
+    # Приставки добавляются только там, где нет явной записи
+    for base in PREFIXABLE_UNITS:
+        if base not in index:
+            continue
+        unit_type, factor, offset = index[base]
+        if offset:
+            continue
+        is_ru = base[0] >= "А"
+        for prefix, multiplier in SI_PREFIXES.items():
+            if (prefix[0] >= "А") != is_ru:
+                continue
+            index.setdefault(prefix + base, (unit_type, factor * multiplier, 0.0))
+    return index
+
+
 def format_with_units(
     value: float, 
     unit: str, 
@@ -711,7 +711,7 @@ PROMPT_TEMPLATES = {
                 "  (Шаги работы алгоритма)\n"
                 "</reasoning>\n"
                 "<answer>\n"
-                "  (Итог: маршрут, дерево, диаметр)\n"
+                "  (Итог — одно число: длина пути, вес дерева, диаметр)\n"
                 "</answer>"
             ),
             "en": (
@@ -722,7 +722,7 @@ PROMPT_TEMPLATES = {
                 "  (Algorithm steps)\n"
                 "</reasoning>\n"
                 "<answer>\n"
-                "  (Final path, tree, diameter, etc.)\n"
+                "  (A single number: path length, tree weight, diameter, etc.)\n"
                 "</answer>"
             )
         },
@@ -735,8 +735,8 @@ PROMPT_TEMPLATES = {
             "en": "Step {iter}: Selected node {u} with distance {d}. Updates: {updates}."
         },
         "shortest_path_final": {
-            "ru": "Итоговый путь: {path}.",
-            "en": "Final path: {path}."
+            "ru": "Итоговый путь: {path}, его длина {d}.",
+            "en": "Final path: {path}, its length is {d}."
         },
         "mst_step": {
             "ru": "Шаг 2: Минимальное остовное дерево: {edges}.",
@@ -749,6 +749,40 @@ PROMPT_TEMPLATES = {
         "clustering_step": {
             "ru": "Шаг 2: Средний коэффициент кластеризации: {avg_coeff}.",
             "en": "Step 2: The average clustering coefficient is {avg_coeff}."
+        },
+        "task_descriptions": {
+            "shortest_path": {
+                "ru": "длину кратчайшего пути между узлами {start} и {end} (сумму весов рёбер пути)",
+                "en": "the length of the shortest path between nodes {start} and {end} (the sum of its edge weights)"
+            },
+            "minimum_spanning_tree": {
+                "ru": "суммарный вес минимального остовного дерева данного графа",
+                "en": "the total weight of the minimum spanning tree of the given graph"
+            },
+            "diameter": {
+                "ru": "диаметр данного графа",
+                "en": "the diameter of the given graph"
+            },
+            "clustering_coefficient": {
+                "ru": "средний коэффициент кластеризации данного графа",
+                "en": "the average clustering coefficient of the given graph"
+            }
+        },
+        "graph_edges": {
+            "ru": "Граф: {num_nodes} узлов (0..{last}), {num_edges} рёбер{weighted}:\n{edges}",
+            "en": "Graph: {num_nodes} nodes (0..{last}), {num_edges} edges{weighted}:\n{edges}"
+        },
+        "weighted_suffix": {
+            "ru": " (в скобках — вес)",
+            "en": " (weight in parentheses)"
+        },
+        "shortest_path_skipped": {
+            "ru": "… ещё {count} итераций до извлечения узла {end} (расстояние {d}).",
+            "en": "… {count} more iterations until node {end} is extracted (distance {d})."
+        },
+        "mst_weight": {
+            "ru": "Шаг 3: Суммарный вес дерева: {total}.",
+            "en": "Step 3: Total tree weight: {total}."
         }
     },
 
@@ -930,217 +964,6 @@ Analysis:
         }
     },
 
-    "contradiction_facts": {
-        "ru": {
-            "true": [
-                "Вода закипает при температуре 100 градусов Цельсия",
-                "Солнце восходит на востоке",
-                "Земля вращается вокруг своей оси",
-                "В году 365 дней",
-                "Кислород необходим для дыхания",
-                "Металлы проводят электричество",
-                "Растения производят кислород",
-                "Лед плавится при температуре 0 градусов Цельсия",
-                "Гравитация притягивает объекты к центру Земли",
-                "Свет распространяется быстрее звука",
-                "Вода состоит из водорода и кислорода",
-                "Человек имеет 206 костей",
-                "Солнце является звездой",
-                "Воздух состоит из смеси газов",
-                "Растения нуждаются в солнечном свете",
-                "Вода может существовать в трех состояниях",
-                "Земля имеет один естественный спутник",
-                "Кислород является газом",
-                "Металлы имеют высокую теплопроводность",
-                "Растения размножаются семенами",
-                "Вода является универсальным растворителем",
-                "Человек имеет пять основных чувств",
-                "Солнце является источником энергии",
-                "Воздух имеет массу",
-                "Растения поглощают углекислый газ",
-                "Вода имеет наибольшую плотность при 4°C",
-                "Земля имеет магнитное поле",
-                "Кислород поддерживает горение",
-                "Металлы имеют металлический блеск",
-                "Растения имеют корневую систему",
-                "Вода может испаряться при любой температуре",
-                "Человек имеет 32 зуба",
-                "Солнце находится в центре Солнечной системы",
-                "Воздух оказывает давление",
-                "Растения имеют листья",
-                "Вода может растворять соли",
-                "Земля имеет атмосферу",
-                "Кислород необходим для горения",
-                "Металлы могут быть жидкими",
-                "Растения имеют стебель",
-                "Вода может замерзать",
-                "Человек имеет сердце",
-                "Солнце излучает свет",
-                "Воздух содержит азот",
-                "Растения имеют цветы",
-                "Вода может течь",
-                "Земля имеет океаны",
-                "Кислород является элементом",
-                "Металлы могут ржаветь"
-            ],
-            "false": [
-                "Вода закипает при температуре 50 градусов Цельсия",
-                "Солнце восходит на западе",
-                "Земля плоская",
-                "В году 400 дней",
-                "Кислород не нужен для дыхания",
-                "Металлы не проводят электричество",
-                "Растения не производят кислород",
-                "Лед плавится при температуре 100 градусов Цельсия",
-                "Гравитация отталкивает объекты от Земли",
-                "Звук распространяется быстрее света",
-                "Вода состоит из углерода и азота",
-                "Человек имеет 100 костей",
-                "Солнце является планетой",
-                "Воздух состоит из одного газа",
-                "Растения не нуждаются в солнечном свете",
-                "Вода может существовать только в жидком состоянии",
-                "Земля имеет два естественных спутника",
-                "Кислород является жидкостью",
-                "Металлы не проводят тепло",
-                "Растения не размножаются",
-                "Вода не растворяет соли",
-                "Человек имеет три чувства",
-                "Солнце не излучает энергию",
-                "Воздух не имеет массы",
-                "Растения не поглощают углекислый газ",
-                "Вода имеет наибольшую плотность при 100°C",
-                "Земля не имеет магнитного поля",
-                "Кислород не поддерживает горение",
-                "Металлы не имеют блеска",
-                "Растения не имеют корней",
-                "Вода не может испаряться",
-                "Человек имеет 20 зубов",
-                "Солнце вращается вокруг Земли",
-                "Воздух не оказывает давления",
-                "Растения не имеют листьев",
-                "Вода не растворяет соли",
-                "Земля не имеет атмосферы",
-                "Кислород не нужен для горения",
-                "Металлы не могут быть жидкими",
-                "Растения не имеют стебля",
-                "Вода не может замерзать",
-                "Человек не имеет сердца",
-                "Солнце не излучает свет",
-                "Воздух не содержит азота",
-                "Растения не имеют цветов",
-                "Вода не может течь",
-                "Земля не имеет океанов",
-                "Кислород не является элементом",
-                "Металлы не могут ржаветь"
-            ]
-        },
-        "en": {
-            "true": [
-                "Water boils at 100 degrees Celsius",
-                "The sun rises in the east",
-                "Earth rotates on its axis",
-                "There are 365 days in a year",
-                "Oxygen is necessary for breathing",
-                "Metals conduct electricity",
-                "Plants produce oxygen",
-                "Ice melts at 0 degrees Celsius",
-                "Gravity pulls objects toward Earth's center",
-                "Light travels faster than sound",
-                "Water consists of hydrogen and oxygen",
-                "Humans have 206 bones",
-                "The sun is a star",
-                "Air is a mixture of gases",
-                "Plants need sunlight",
-                "Water can exist in three states",
-                "Earth has one natural satellite",
-                "Oxygen is a gas",
-                "Metals have high thermal conductivity",
-                "Plants reproduce through seeds",
-                "Water is a universal solvent",
-                "Humans have five main senses",
-                "The sun is a source of energy",
-                "Air has mass",
-                "Plants absorb carbon dioxide",
-                "Water has maximum density at 4°C",
-                "Earth has a magnetic field",
-                "Oxygen supports combustion",
-                "Metals have metallic luster",
-                "Plants have root systems",
-                "Water can evaporate at any temperature",
-                "Humans have 32 teeth",
-                "The sun is at the center of the solar system",
-                "Air exerts pressure",
-                "Plants have leaves",
-                "Water can dissolve salts",
-                "Earth has an atmosphere",
-                "Oxygen is necessary for burning",
-                "Metals can be liquid",
-                "Plants have stems",
-                "Water can freeze",
-                "Humans have a heart",
-                "The sun emits light",
-                "Air contains nitrogen",
-                "Plants have flowers",
-                "Water can flow",
-                "Earth has oceans",
-                "Oxygen is an element",
-                "Metals can rust"
-            ],
-            "false": [
-                "Water boils at 50 degrees Celsius",
-                "The sun rises in the west",
-                "Earth is flat",
-                "There are 400 days in a year",
-                "Oxygen is not needed for breathing",
-                "Metals do not conduct electricity",
-                "Plants do not produce oxygen",
-                "Ice melts at 100 degrees Celsius",
-                "Gravity pushes objects away from Earth",
-                "Sound travels faster than light",
-                "Water consists of carbon and nitrogen",
-                "Humans have 100 bones",
-                "The sun is a planet",
-                "Air is a single gas",
-                "Plants do not need sunlight",
-                "Water can only exist as a liquid",
-                "Earth has two natural satellites",
-                "Oxygen is a liquid",
-                "Metals do not conduct heat",
-                "Plants do not reproduce",
-                "Water does not dissolve salts",
-                "Humans have three senses",
-                "The sun does not emit energy",
-                "Air has no mass",
-                "Plants do not absorb carbon dioxide",
-                "Water has maximum density at 100°C",
-                "Earth has no magnetic field",
-                "Oxygen does not support combustion",
-                "Metals have no luster",
-                "Plants have no roots",
-                "Water cannot evaporate",
-                "Humans have 20 teeth",
-                "The sun orbits around Earth",
-                "Air does not exert pressure",
-                "Plants have no leaves",
-                "Water does not dissolve salts",
-                "Earth has no atmosphere",
-                "Oxygen is not needed for burning",
-                "Metals cannot be liquid",
-                "Plants have no stems",
-                "Water cannot freeze",
-                "Humans have no heart",
-                "The sun does not emit light",
-                "Air contains no nitrogen",
-                "Plants have no flowers",
-                "Water cannot flow",
-                "Earth has no oceans",
-                "Oxygen is not an element",
-                "Metals cannot rust"
-            ]
-        }
-    },
-
     #----------------------------------------------------------------------------
     # 11) FUTOSHIKI
     #----------------------------------------------------------------------------
@@ -1173,13 +996,17 @@ Analysis:
             "ru": (
                 "Задача Futoshiki на поле {size}×{size}. "
                 "В каждой строке и каждом столбце нужно расставить числа от 1 до {size} без повторений. "
-                "Также даны неравенства:\n"
+                "Заданные числа (точка — пустая клетка):\n"
+                "{givens}\n"
+                "Также даны неравенства (строка, столбец с нуля):\n"
                 "{inequalities}"
             ),
             "en": (
                 "Futoshiki puzzle on a {size}×{size} grid. "
                 "Each row and column must contain the numbers 1..{size} with no repeats. "
-                "Some inequalities are given:\n"
+                "Given numbers (a dot is an empty cell):\n"
+                "{givens}\n"
+                "Some inequalities are given (row, column from zero):\n"
                 "{inequalities}"
             )
         },
@@ -1218,7 +1045,7 @@ Analysis:
                 "  (Формула, суммирование вероятностей)\n"
                 "</reasoning>\n"
                 "<answer>\n"
-                "  0.3333\n"
+                "  1/3\n"
                 "</answer>"
             ),
             "en": (
@@ -1229,7 +1056,7 @@ Analysis:
                 "  (Derive formula, sum weighted probabilities)\n"
                 "</reasoning>\n"
                 "<answer>\n"
-                "  0.3333\n"
+                "  1/3\n"
                 "</answer>"
             )
         },
@@ -1320,8 +1147,8 @@ Analysis:
             )
         },
         "intro": {
-            "ru": "У нас есть три персонажей: {names}.",
-            "en": "We have three characters: {names}."
+            "ru": "У нас есть {num_persons} персонажей: {names}.",
+            "en": "We have {num_persons} characters: {names}."
         },
         "names_pool": {
             "ru": ["Алекс", "Борис", "Виктор", "Григорий", "Дмитрий", 
@@ -2357,6 +2184,10 @@ Analysis:
             "system_second_ineq": {
                 "ru": "Шаг 2: Из второго неравенства: x {sign} {value}",
                 "en": "Step 2: From second inequality: x {sign} {value}"
+            },
+            "system_nth_ineq": {
+                "ru": "Шаг {step}: Из неравенства {index}: x {sign} {value}",
+                "en": "Step {step}: From inequality {index}: x {sign} {value}"
             }
         },
         "instructions": {
@@ -2747,8 +2578,20 @@ Analysis:
                 "en": "Simplify the boolean expression: {expression}"
             },
             "truth_table": {
-                "ru": "Постройте таблицу истинности для выражения: {expression}",
-                "en": "Construct a truth table for the expression: {expression}"
+                "ru": (
+                    "Постройте таблицу истинности для выражения: {expression}\n"
+                    "Строки таблицы — все наборы значений {variables} (всего {rows}) в порядке возрастания "
+                    "двоичного числа {order} ({first} — старший бит): первая строка — все 0, последняя — все 1. "
+                    "В ответе укажите столбец значений выражения: строку длины {rows} из цифр 0/1 "
+                    "без пробелов, в порядке строк (например, для A → B ответ 1101)."
+                ),
+                "en": (
+                    "Construct a truth table for the expression: {expression}\n"
+                    "The rows are the {rows} assignments of {variables} in increasing order of the "
+                    "binary number {order} ({first} is the most significant bit): the first row is all 0, the last is all 1. "
+                    "Answer with the value column of the expression: {rows} digits 0/1 in row order, "
+                    "with no spaces (for example, for A → B the answer is 1101)."
+                )
             },
             "venn_problem": {
                 "ru": "В опросе участвовало {total} человек. {desc} Сколько человек {question}?",
@@ -0,0 +1,245 @@
+# re_rl/tasks/sympy_cache.py
+
+"""
+Кэш результатов дорогих операций sympy (integrate, limit, latex, pretty).
+
+Два уровня:
+- LRU в памяти процесса; ключ — (операция, аргументы, настройки), сами
+  выражения sympy хэшируемы, поэтому srepr на этом уровне не нужен;
+- необязательное хранилище на диске (sqlite в режиме WAL), общее для
+  нескольких процессов-генераторов. Ключ — sha256 от операции, версии sympy
+  и srepr аргументов, значение — pickle результата. При превышении
+  max_disk_bytes удаляются записи, к которым дольше всего не обращались.
+  Время обращения обновляется не чаще раза в ACCESS_TOUCH_INTERVAL секунд,
+  так что обычное чтение с диска не открывает транзакцию записи.
+
+Дисковый уровень включается переменной окружения RE_RL_SYMPY_CACHE
+(путь к файлу базы) или вызовом configure_cache(path=...).
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import sympy as sp
+
+
+DEFAULT_MEMORY_ITEMS = 8192
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+# Как часто (в записях) проверять размер базы на диске
+EVICTION_CHECK_EVERY = 256
+# После вытеснения база сжимается до этой доли лимита
+EVICTION_TARGET = 0.9
+# Время обращения к записи обновляется, только если оно старше этого (сек)
+ACCESS_TOUCH_INTERVAL = 3600.0
+
+
+class SympyCache:
+    """Двухуровневый кэш: LRU в памяти + sqlite на диске."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_memory_items: int = DEFAULT_MEMORY_ITEMS,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+    ):
+        self.path = path
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._writes = 0
+        self.stats: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    # ---------------------------------------------------------------- диск
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Соединение с базой; после fork каждый процесс открывает своё."""
+        if self.path is None:
+            return None
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)")
+            conn.commit()
+            self._conn, self._conn_pid = conn, pid
+        return self._conn
+
+    @staticmethod
+    def disk_key(op: str, args: Tuple, settings: Tuple) -> str:
+        """Контентный ключ: операция, версия sympy и srepr аргументов."""
+        payload = "|".join([op, sp.__version__, ";".join(sp.srepr(a) for a in args), repr(settings)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _disk_get(self, key: str) -> Tuple[bool, Any]:
+        conn = self._connection()
+        if conn is None:
+            return False, None
+        row = conn.execute("SELECT value, accessed FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        now = time.time()
+        if now - row[1] >= ACCESS_TOUCH_INTERVAL:
+            conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+        return True, pickle.loads(row[0])
+
+    def _disk_put(self, key: str, value: Any) -> None:
+        conn = self._connection()
+        if conn is None:
+            return
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+            (key, blob, len(blob), time.time()),
+        )
+        conn.commit()
+        self._writes += 1
+        if self._writes % EVICTION_CHECK_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Удаляет давно не использованные записи, пока база больше лимита."""
+        conn = self._connection()
+        if conn is None:
+            return 0
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return 0
+        excess = total - int(self.max_disk_bytes * EVICTION_TARGET)
+        freed = 0
+        keys = []
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed"):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM cache WHERE key = ?", keys)
+        conn.commit()
+        return len(keys)
+
+    # ------------------------------------------------------------- память
+
+    def get_or_compute(
+        self,
+        op: str,
+        args: Tuple,
+        compute: Callable[[], Any],
+        settings: Tuple = (),
+    ) -> Any:
+        """
+        Возвращает результат операции op над args, вычисляя его при промахе.
+
+        Args:
+            op: Имя операции ("latex", "integrate", ...)
+            args: Аргументы (выражения sympy, символы, числа, строки)
+            compute: Функция без аргументов, вычисляющая результат
+            settings: Дополнительные параметры, влияющие на результат
+        """
+        mem_key = (op, args, settings)
+        with self._lock:
+            if mem_key in self._memory:
+                self._memory.move_to_end(mem_key)
+                self.stats["memory_hits"] += 1
+                return self._memory[mem_key]
+
+        disk_key = self.disk_key(op, args, settings) if self.path is not None else None
+        found = False
+        if disk_key is not None:
+            with self._lock:
+                found, value = self._disk_get(disk_key)
+        if found:
+            self.stats["disk_hits"] += 1
+        else:
+            self.stats["misses"] += 1
+            value = compute()
+            if disk_key is not None:
+                with self._lock:
+                    self._disk_put(disk_key, value)
+
+        with self._lock:
+            self._memory[mem_key] = value
+            if len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Очищает оба уровня."""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM cache")
+                conn.commit()
+
+    def close(self) -> None:
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn, self._conn_pid = None, None
+
+
+_cache: Optional[SympyCache] = None
+
+
+def get_cache() -> SympyCache:
+    """Общий кэш процесса (дисковый уровень — из RE_RL_SYMPY_CACHE)."""
+    global _cache
+    if _cache is None:
+        _cache = SympyCache(path=os.environ.get("RE_RL_SYMPY_CACHE") or None)
+    return _cache
+
+
+def configure_cache(
+    path: Optional[str] = None,
+    max_memory_items: int = DEFAULT_MEMORY_ITEMS,
+    max_disk_bytes: int = DEFAULT_DISK_BYTES,
+) -> SympyCache:
+    """Заменяет общий кэш новым (path=None — только память)."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = SympyCache(path, max_memory_items, max_disk_bytes)
+    return _cache
+
+
+def _settings(kwargs: Dict[str, Any]) -> Tuple:
+    return tuple(sorted(kwargs.items()))
+
+
+def cached_latex(expr: Any, **kwargs) -> str:
+    """sp.latex с кэшированием."""
+    return get_cache().get_or_compute("latex", (expr,), lambda: sp.latex(expr, **kwargs), _settings(kwargs))
+
+
+def cached_pretty(expr: Any, **kwargs) -> str:
+    """sp.pretty с кэшированием."""
+    return get_cache().get_or_compute("pretty", (expr,), lambda: sp.pretty(expr, **kwargs), _settings(kwargs))
+
+
+def cached_integrate(expr: sp.Expr, *symbols) -> sp.Expr:
+    """sp.integrate с кэшированием."""
+    return get_cache().get_or_compute("integrate", (expr, *symbols), lambda: sp.integrate(expr, *symbols))
+
+
+def cached_limit(expr: sp.Expr, symbol: sp.Symbol, point: Any, direction: str = "+") -> sp.Expr:
+    """sp.limit с кэшированием."""
+    return get_cache().get_or_compute(
+        "limit", (expr, symbol, sp.sympify(point)), lambda: sp.limit(expr, symbol, point, direction),
+        (("dir", direction),),
+    )
@@ -11,6 +11,7 @@ setup(
     author='Tokarev Igor (Researchim AI)',
     author_email='your_email@example.com',
     packages=find_packages(),
+    package_data={'re_rl.tasks.math.logic': ['facts/*.tsv']},
     install_requires=read_requirements(),
     classifiers=[
          'Programming Language :: Python :: 3',
@@ -99,6 +99,14 @@ class TestLinearTask(unittest.TestCase):
         self.assertEqual(result["final_answer"], "2")
         self.assertTrue(result["prompt"].startswith("Task:"))
 
+    def test_linear_decimal_coefficients_are_exact(self):
+        from fractions import Fraction
+        from re_rl.tasks.math.algebra.polynomials import solve_linear
+        task = LinearTask(0.5, 1.1, 2.3, language="en", detail_level=3)
+        self.assertEqual(task.get_result()["final_answer"], "12/5")
+        self.assertEqual(solve_linear(0.1, -0.3), 3)
+        self.assertEqual(solve_linear(Fraction(1, 3), 1), -3)
+
 
 class TestQuadraticTask(unittest.TestCase):
     def test_quadratic(self):
@@ -168,6 +176,181 @@ class TestIntegralTask(unittest.TestCase):
         task.solve()
         self.assertIsNotNone(task.final_answer)
 
+    def test_constructed_types(self):
+        """Замена и интегрирование по частям строятся от известной первообразной."""
+        for task_type in ("substitution", "by_parts"):
+            for difficulty in (3, 8):
+                task = IntegralTask(task_type=task_type, difficulty=difficulty, language="ru", detail_level=5)
+                task.solve()
+                self.assertIn("+ C", task.final_answer)
+                c = task.construction
+                x = sp.Symbol("x")
+                self.assertEqual(sp.simplify(sp.diff(c.antiderivative, x) - c.integrand), 0)
+
+
+class TestLimitsTask(unittest.TestCase):
+    def test_all_types_have_known_value(self):
+        """Каждый тип предела строится с точным значением, совпадающим с sp.limit."""
+        for task_type in LimitsTask.TASK_TYPES:
+            task = LimitsTask(task_type=task_type, difficulty=7, language="ru", verify=True)
+            task.solve()
+            self.assertEqual(task.final_answer, str(task.construction.value))
+            self.assertGreater(len(task.solution_steps), 0)
+
+    def test_infinity_latex(self):
+        task = LimitsTask(task_type="infinity", difficulty=3, language="en", output_format="latex")
+        self.assertIn("\\infty", task.description)
+
+
+class TestDifferentialEquationTask(unittest.TestCase):
+    def test_all_types_verified_by_construction(self):
+        """Решение каждого типа подставляется в уравнение на сетке точек (без dsolve)."""
+        for task_type in DifferentialEquationTask.TASK_TYPES:
+            for difficulty in (2, 8):
+                task = DifferentialEquationTask(task_type=task_type, difficulty=difficulty, verify=True)
+                task.solve()
+                self.assertEqual(task.final_answer, task.construction.solution)
+
+    def test_root_kinds(self):
+        """Кратный и комплексные корни характеристического уравнения."""
+        task = DifferentialEquationTask("homogeneous_second_order", coefficients={"a": 2, "b": 5}, verify=True)
+        task.solve()
+        self.assertEqual(task.final_answer, "y = e^(-x)(C₁cos(2x) + C₂sin(2x))")
+        task = DifferentialEquationTask("homogeneous_second_order", coefficients={"a": -4, "b": 4}, verify=True)
+        task.solve()
+        self.assertEqual(task.final_answer, "y = (C₁ + C₂x)e^(2x)")
+
+    def test_wrong_solution_rejected(self):
+        from re_rl.tasks.math.analysis.ode_construction import construct_ode, verify_ode
+        construction = construct_ode("cauchy_problem", initial_conditions={"x0": 1, "y0": 3})
+        self.assertTrue(verify_ode(construction))
+        construction.terms_fn = lambda x, y, dy, d2y: [dy, -(construction.coefficients["a"] + 1) * y]
+        self.assertFalse(verify_ode(construction))
+
+    def test_solution_verified_by_default(self):
+        from unittest import mock
+        with mock.patch("re_rl.tasks.math.analysis.differential_equation_task.verify_ode", return_value=False):
+            with self.assertRaises(ValueError):
+                DifferentialEquationTask("separable", difficulty=5)
+            DifferentialEquationTask("separable", difficulty=5, verify=False)
+
+
+class TestSeriesTask(unittest.TestCase):
+    def test_exact_answers(self):
+        task = SeriesTask("geometric_sum", first_term=3, ratio=0.5, language="en")
+        task.solve()
+        self.assertEqual(task.final_answer, "S = 6")
+        task = SeriesTask("partial_sum", first_term=3, ratio=1/3, n_terms=4, language="en")
+        task.solve()
+        self.assertEqual(task.final_answer, "S_4 = 40/9")
+
+    def test_closed_forms_match_direct_summation(self):
+        """Замкнутые формулы совпадают с прямым сложением и с numpy."""
+        from fractions import Fraction
+        from re_rl.tasks.math.analysis.series_engine import (
+            Series, batch_partial_sums, partial_sum, exact_term, telescoping_sum,
+        )
+        series = [Series("geometric", {"a": 5, "r": Fraction(-2, 3)}), Series("telescoping", {"c": 6, "k": 4})]
+        for s in series:
+            direct = sum(exact_term(s, i) for i in range(1, 41))
+            self.assertEqual(partial_sum(s, 40), direct)
+        sums = batch_partial_sums(series, 40)
+        self.assertAlmostEqual(sums[1, -1], float(partial_sum(series[1], 40)))
+        self.assertEqual(telescoping_sum(6, 4), Fraction(25, 8))
+
+    def test_sizes_scale_with_difficulty(self):
+        import random
+        random.seed(7)
+        hard = [SeriesTask("partial_sum", language="en", difficulty=10) for _ in range(30)]
+        self.assertGreater(max(t.n_terms for t in hard), 20)
+        self.assertTrue(all(t.n_terms <= 100 for t in hard))
+        # Дробный знаменатель прогрессии ограничивает n: ответ остаётся коротким
+        for t in hard:
+            t.solve()
+            self.assertLessEqual(len(t.final_answer), 40, t.final_answer)
+        gaps = [SeriesTask("telescoping", language="en", difficulty=10).series.params["k"] for _ in range(50)]
+        self.assertGreater(max(gaps), 5)
+        self.assertTrue(all(1 <= k <= 10 for k in gaps))
+
+    def test_convergence_rules(self):
+        for series_type in ("p_series", "harmonic", "geometric", "ratio_test", "root_test", "comparison"):
+            task = SeriesTask("convergence_test", series_type=series_type, language="en")
+            task.solve()
+            self.assertIn(task.final_answer, ("converges", "diverges"))
+
+
+class TestOptimizationTask(unittest.TestCase):
+    def test_constructed_optimum_verified_on_grid(self):
+        """Построенные экстремумы подтверждаются поиском на сетке numpy."""
+        for task_type in ("find_extremum", "max_min_interval", "constrained"):
+            for difficulty in (1, 5, 9):
+                task = OptimizationTask(task_type=task_type, difficulty=difficulty, verify=True)
+                task.solve()
+                self.assertNotIn("численное", task.final_answer)
+
+    def test_given_coefficients(self):
+        task = OptimizationTask("find_extremum", coefficients=[1, 0, -3, 0], language="en", verify=True)
+        task.solve()
+        self.assertEqual(task.final_answer, "x = -1, f(x) = 2 (maximum); x = 1, f(x) = -2 (minimum)")
+        task = OptimizationTask("max_min_interval", coefficients=[1, 0, -2, 0, 0], interval=(-2, 3), language="en")
+        task.solve()
+        self.assertEqual(task.final_answer, "max: f(3) = 63, min: f(-1) = -1")
+
+    def test_second_derivative_is_exact(self):
+        # f = 3x⁴ - x³: f''(1/4) = 3/4, а не round(0.75) = 1
+        task = OptimizationTask("find_extremum", coefficients=[3, -1, 0, 0, 0], language="en", detail_level=10)
+        task.solve()
+        self.assertIn("Step 5: At x = 1/4: f''(1/4) = 3/4 → minimum", task.solution_steps)
+
+
+class TestInequalityTask(unittest.TestCase):
+    def test_interval_set_algebra(self):
+        from re_rl.tasks.math.algebra.interval_set import IntervalSet
+        left = IntervalSet.from_relation("<", 2)
+        right = IntervalSet.from_relation("≥", 3)
+        union = left | right
+        self.assertEqual(union.format(), "(-∞, 2) ∪ [3, +∞)")
+        self.assertEqual((~union).format(), "[2, 3)")
+        self.assertEqual((left & right).format(), "∅")
+        self.assertEqual((union | ~union).format(), "ℝ")
+        self.assertEqual(IntervalSet.parse("x < 2 or x ≥ 3"), union)
+        self.assertEqual(IntervalSet.parse("-1 < x ≤ 3").format(), "(-1, 3]")
+        self.assertEqual(IntervalSet.parse(r"\left(-\infty, 2\right) \cup \left[3, \infty\right)"), union)
+        self.assertEqual(IntervalSet.parse(r"-1 < x \leq 3").format(), "(-1, 3]")
+
+    def test_answers_match_sign_of_expression(self):
+        """Точки внутри ответа удовлетворяют неравенству, снаружи — нет."""
+        from fractions import Fraction
+        from re_rl.tasks.math.algebra.interval_set import IntervalSet
+        checks = {"<": lambda v: v < 0, ">": lambda v: v > 0, "≤": lambda v: v <= 0, "≥": lambda v: v >= 0}
+        for task_type in ("linear", "quadratic", "rational", "absolute"):
+            for difficulty in (1, 5, 10):
+                task = InequalityTask(task_type=task_type, difficulty=difficulty, detail_level=5)
+                task.solve()
+                answer = IntervalSet.parse(task.final_answer)
+                self.assertIsNotNone(answer, task.final_answer)
+                for k in range(-200, 201):
+                    x = Fraction(k, 8)
+                    if task_type == "linear":
+                        value = task.a * x + task.b - task.c
+                    elif task_type == "quadratic":
+                        value = task.a * x * x + task.b * x + task.c
+                    elif task_type == "rational":
+                        if task.c * x + task.d == 0:
+                            self.assertFalse(answer.contains(x))
+                            continue
+                        value = Fraction(task.a * x + task.b) / (task.c * x + task.d)
+                    else:
+                        value = abs(task.a * x + task.b) - task.value
+                    self.assertEqual(answer.contains(x), checks[task.sign](value), (task.description, x))
+
+    def test_system_is_intersection(self):
+        task = InequalityTask(task_type="system", difficulty=10, language="en", detail_level=10)
+        task.solve()
+        self.assertEqual(len(task.system), 4)
+        self.assertEqual(len(task.solution_steps), 5)
+        self.assertEqual(task.solution_steps[-1].split(": ")[-1], task.final_answer)
+
 
 class TestSystemLinearTask(unittest.TestCase):
     def test_system_linear(self):
@@ -181,6 +364,21 @@ class TestSystemLinearTask(unittest.TestCase):
         self.assertIn("x1 = 2.00", result["final_answer"])
         self.assertIn("x2 = 1.00", result["final_answer"])
 
+    def test_construct_from_solution(self):
+        """Система строится от решения: det задан, ответ точный, до 8x8."""
+        from re_rl.tasks.math.algebra.exact_linear import construct_system, gauss_solve
+        for n in (2, 5, 8):
+            A, x, b = construct_system(n, max_coef=10, det=-2)
+            det, solution = gauss_solve(A, b)
+            self.assertEqual(det, -2)
+            self.assertEqual(solution, x)
+        task = SystemLinearTask(size=6, language="en", detail_level=2)
+        self.assertEqual(task.get_result()["final_answer"].count("="), 6)
+
+    def test_fractional_solution_is_exact(self):
+        task = SystemLinearTask([[2, 1, 5], [1, 3, 4]], language="en")
+        self.assertEqual(task.get_result()["final_answer"], "x1 = 11/5, x2 = 3/5")
+
 
 class TestGraphTask(unittest.TestCase):
     def test_graph_ru(self):
@@ -190,6 +388,37 @@ class TestGraphTask(unittest.TestCase):
         self.assertNotEqual(result["final_answer"], PROMPT_TEMPLATES["default"]["no_solution"]["ru"])
 
 
+class TestSetLogicTask(unittest.TestCase):
+    def test_bitmask_set_operations(self):
+        from re_rl.tasks.math.discrete.set_algebra import from_mask
+        task = SetLogicTask(task_type="symmetric_difference", language="en", difficulty=10)
+        a, b = set(from_mask(task.set_a)), set(from_mask(task.set_b))
+        self.assertEqual(task.get_result()["final_answer"], "{" + ", ".join(map(str, sorted(a ^ b))) + "}")
+
+    def test_truth_table_column(self):
+        from re_rl.tasks.math.discrete.set_algebra import Expr, truth_vector, vector_to_str
+        a, b = Expr("var", var=0), Expr("var", var=1)
+        self.assertEqual(vector_to_str(truth_vector(Expr("→", (a, b)), 2)), "1101")
+        task = SetLogicTask(task_type="truth_table", language="ru", difficulty=10)
+        self.assertEqual(len(task.get_result()["final_answer"]), 2 ** 10)
+
+    def test_truth_table_prompt_states_format(self):
+        task = SetLogicTask(task_type="truth_table", language="en", difficulty=1)
+        names = "ABCDEFGHIJ"[:task.num_vars]
+        self.assertIn(f"{names} ({names[0]} is the most significant bit)", task.description)
+        self.assertIn(f"{2 ** task.num_vars} digits 0/1", task.description)
+        task = SetLogicTask(task_type="truth_table", language="ru", difficulty=3)
+        self.assertIn("— старший бит", task.description)
+        self.assertIn(f"строку длины {2 ** task.num_vars} из цифр 0/1", task.description)
+
+    def test_venn_regions_match_inclusion_exclusion(self):
+        task = SetLogicTask(task_type="venn_problem", language="ru", difficulty=10)
+        self.assertIn("английский", task.description)
+        self.assertEqual(int(task.regions.sum()), task.total)
+        union = bin(task.venn_masks[0] | task.venn_masks[1] | task.venn_masks[2] | task.venn_masks[3]).count("1")
+        self.assertEqual(task.get_result()["final_answer"], str(task.total - union))
+
+
 class TestGroupTheoryTask(unittest.TestCase):
     def test_specific_inverse(self):
         task = GroupTheoryTask(task_type="inverse_element", group_type="cyclic", modulus=11, element=3, language="ru", detail_level=3)
@@ -305,6 +534,20 @@ class TestSolutionStepsQuality(unittest.TestCase):
         task.solve()
         self.assertGreaterEqual(len(task.solution_steps), 3, "Энергия связи должна иметь минимум 3 шага")
 
+    def test_latex_solution_from_structured_steps(self):
+        """Формулы в LaTeX берутся из сегментов шага, текст не разбирается."""
+        from re_rl.tasks.formatting import Math, format_step, step_to_latex
+        x = sp.Symbol("x")
+        step = format_step("Шаг {n}: f'(x) = {d}", n=2, d=Math(3 * x**2, text="3x²"))
+        self.assertEqual(step, "Шаг 2: f'(x) = 3x²")
+        self.assertEqual(step_to_latex(step), r"\text{Шаг 2: f'(x) = } 3 x^{2}")
+        self.assertEqual(step_to_latex("50% of a_1 is $x_1$"), r"\text{50\% of a\_1 is } x_1")
+
+        task = CalculusTask("differentiation", function=x**3 - 2 * x, language="en")
+        task.solve()
+        latex = task.generate_latex_solution()
+        self.assertIn(r"\text{Step 2: f'(x) = } 3 x^{2} - 2", latex)
+
 
 class TestFactory(unittest.TestCase):
     def test_factory_math(self):
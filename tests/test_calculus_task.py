@@ -1,5 +1,7 @@
 import unittest
+import sympy as sp
 from re_rl.tasks.math.analysis.calculus_task import CalculusTask
+from re_rl.tasks.math.analysis.antiderivatives import construct_integral
 
 class TestCalculusTask(unittest.TestCase):
     def test_differentiation(self):
@@ -12,5 +14,44 @@ class TestCalculusTask(unittest.TestCase):
         result = task.get_result()
         self.assertNotEqual(result["final_answer"].strip(), "")
 
+    def test_integration_constructed(self):
+        x = sp.Symbol("x")
+        for depth in (1, 2, 3):
+            for _ in range(20):
+                c = construct_integral(depth=depth)
+                self.assertEqual(sp.simplify(sp.diff(c.antiderivative, x) - c.integrand), 0)
+                # Слагаемые не сокращаются до нуля или константы
+                self.assertTrue(sp.expand(c.integrand).has(x))
+        task = CalculusTask("integration", difficulty=8, language="en")
+        task.solve()
+        self.assertIsNotNone(task.antiderivative)
+        self.assertTrue(task.final_answer.endswith("+ C"))
+
+    def test_degenerate_integrands_are_resampled(self):
+        import random
+        x = sp.Symbol("x")
+        rng = random.Random(0)
+        # degree=1: многочленное слагаемое — c·x, его производная постоянна
+        for _ in range(50):
+            c = construct_integral(depth=1, degree=1, method="elementary", rng=rng)
+            self.assertTrue(c.integrand.has(x))
+
+    def test_text_answers_are_single_line_and_comparable(self):
+        import random
+        from re_rl.rewards import compare_answers
+        x = sp.Symbol("x")
+        random.seed(3)
+        for task_type in ("differentiation", "integration"):
+            for _ in range(10):
+                task = CalculusTask(task_type, difficulty=6, language="en")
+                task.solve()
+                self.assertNotIn("\n", task.final_answer)
+                if task_type == "differentiation":
+                    expected = sp.diff(task.function, x)
+                    answer = str(sp.factor(expected))
+                else:
+                    answer = str(sp.expand(task.antiderivative)) + " + C"
+                self.assertEqual(compare_answers("calculus", task.final_answer, answer), 1.0, (task.final_answer, answer))
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from re_rl.tasks.math.logic.contradiction_task import ContradictionTask
 from re_rl.tasks.prompts import PROMPT_TEMPLATES
+from re_rl.tasks.math.logic.fact_bank import FactBank, get_fact_bank
 
 class TestContradictionTask(unittest.TestCase):
     def test_contradiction_ru_large(self):
@@ -67,5 +68,58 @@ class TestContradictionTask(unittest.TestCase):
         self.assertIn("False statement:", result["final_answer"],
                       "Финальный ответ должен содержать фразу 'False statement:'")
 
+    def test_fact_bank_index(self):
+        bank = get_fact_bank("en")
+        # Отбор по сложности и теме
+        for fact in bank.sample(8, truth=True, max_difficulty=1, topics=["water", "metals"]):
+            self.assertTrue(bank.truth[fact])
+            self.assertEqual(bank.difficulty[fact], 1)
+            self.assertIn(bank.topic_names[bank.topics[fact]], ("water", "metals"))
+        # Повторяющееся ложное утверждение связано с обоими истинными
+        false_id = bank.texts.index("Water does not dissolve salts")
+        self.assertEqual(
+            [bank.texts[i] for i in bank.near(false_id)],
+            ["Water is a universal solvent", "Water can dissolve salts"],
+        )
+        with self.assertRaises(ValueError):
+            bank.sample(bank.count(True, 1) + 1, truth=True, max_difficulty=1)
+
+    def test_fact_bank_roundtrip(self):
+        import os
+        import tempfile
+        bank = FactBank("en")
+        true_id = bank.add(True, "misc", 1, "Two is even")
+        bank.add(False, "misc", 2, "Two is odd", [true_id])
+        path = os.path.join(tempfile.mkdtemp(), "bank.tsv")
+        bank.save(path)
+        loaded = FactBank.load(path)
+        self.assertEqual(loaded.texts, bank.texts)
+        self.assertEqual(loaded.near(1), [0])
+
+    def test_hard_distractors_and_large_instances(self):
+        task = ContradictionTask(language="ru", difficulty=10)
+        self.assertEqual(len(task.statements), 60)
+        self.assertEqual(len(set(task.statements)), 60)
+        bank = get_fact_bank("ru")
+        false_id = task.fact_ids[task.false_statement_index]
+        self.assertFalse(bank.truth[false_id])
+        # Близкие истинные факты стоят среди утверждений
+        self.assertTrue(set(bank.near(false_id)) <= set(task.fact_ids))
+        self.assertEqual(len(ContradictionTask(language="en", num_statements=200).statements), 200)
+
+    def test_fact_bank_sampling_is_stratified_by_topic(self):
+        import random
+        bank = get_fact_bank("en")
+        rng = random.Random(0)
+        facts = [f for _ in range(50) for f in bank.sample(20, truth=True, max_difficulty=3, rng=rng)]
+        topics = [bank.topic_names[bank.topics[f]] for f in facts]
+        # Процедурных фактов тысячи, но тем всего две из девяти
+        procedural = sum(t in ("arithmetic", "primes") for t in topics) / len(topics)
+        self.assertLess(procedural, 0.35)
+        self.assertEqual(set(topics), set(bank.topic_names))
+        # Исчерпанные темы выпадают, выборка остаётся без повторов
+        small = bank.sample(bank.count(True, 1, ["water", "metals"]), truth=True, max_difficulty=1, topics=["water", "metals"])
+        self.assertEqual(len(set(small)), len(small))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,145 @@
+import json
+
+from re_rl.eval import evaluate, main
+
+
+def _write_jsonl(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def test_evaluate_groups_and_join(tmp_path):
+    refs = tmp_path / "refs.jsonl"
+    outs = tmp_path / "outs.jsonl"
+    # Строки без id получают номер строки
+    _write_jsonl(refs, [
+        {"task_type": "linear", "difficulty": 1, "language": "ru", "final_answer": "2"},
+        {"task_type": "linear", "difficulty": 1, "language": "ru", "final_answer": "5"},
+        {"task_type": "quantum", "difficulty": 5, "language": "en", "final_answer": "2.14 эВ"},
+    ])
+    _write_jsonl(outs, [
+        {"id": 0, "completion": "<reasoning>a</reasoning><answer>2</answer>", "latency": 0.5},
+        {"id": 1, "completion": "<answer>4</answer>"},
+        {"id": 2, "completion": "<reasoning>a</reasoning><answer>2140 мэВ</answer>"},
+        {"id": 99, "completion": "<answer>1</answer>"},
+    ])
+
+    report = evaluate(str(refs), str(outs), workers=1, batch_size=2)
+
+    assert report["summary"]["count"] == 3
+    assert report["summary"]["unmatched"] == 1
+    groups = {(g["task_type"], g["difficulty"], g["language"]): g for g in report["groups"]}
+    linear = groups[("linear", 1, "ru")]
+    assert linear["count"] == 2
+    assert linear["accuracy"] == 0.5
+    assert linear["format_compliance"] == 0.5
+    assert linear["generation_latency_s"]["max"] == 0.5
+    assert groups[("quantum", 5, "en")]["accuracy"] == 1.0
+
+
+def test_eval_cli_writes_report(tmp_path):
+    refs = tmp_path / "refs.jsonl"
+    outs = tmp_path / "outs.jsonl"
+    report_path = tmp_path / "report.json"
+    _write_jsonl(refs, [{
+        "instruction": "Solve",
+        "input": "2x = 4",
+        "output": "Step 1\n\nAnswer: 2",
+        "metadata": {"task_type": "linear", "difficulty": 3, "language": "en"},
+    }])
+    _write_jsonl(outs, [{"id": 0, "completion": "<reasoning>a</reasoning><answer>2</answer>"}])
+
+    main(["--references", str(refs), "--completions", str(outs), "--output", str(report_path), "--workers", "2"])
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["summary"]["accuracy"] == 1.0
+    assert report["groups"][0]["difficulty"] == 3
+
+
+def test_evaluate_times_out_slow_items(tmp_path, monkeypatch):
+    import time
+
+    import re_rl.eval as eval_module
+
+    refs = tmp_path / "refs.jsonl"
+    outs = tmp_path / "outs.jsonl"
+    _write_jsonl(refs, [
+        {"task_type": "linear", "difficulty": 1, "language": "ru", "final_answer": "2"},
+        {"task_type": "linear", "difficulty": 1, "language": "ru", "final_answer": "3"},
+    ])
+    _write_jsonl(outs, [
+        {"id": 0, "completion": "<answer>2</answer>"},
+        {"id": 1, "completion": "<answer>3</answer>"},
+    ])
+
+    def slow_score(task_type, ref_answer, completion):
+        if ref_answer == "3":
+            time.sleep(5)
+        return 1.0
+
+    monkeypatch.setattr(eval_module, "compute_correctness_score", slow_score)
+    start = time.perf_counter()
+    report = evaluate(str(refs), str(outs), workers=1, item_timeout=0.2)
+
+    assert time.perf_counter() - start < 3
+    assert report["summary"]["count"] == 2
+    assert report["summary"]["accuracy"] == 0.5
+    assert report["summary"]["timeouts"] == 1
+
+
+def test_iter_eval_items_batches_lookups(tmp_path):
+    from re_rl.eval import build_reference_index, iter_eval_items
+
+    refs = tmp_path / "refs.jsonl"
+    outs = tmp_path / "outs.jsonl"
+    _write_jsonl(refs, [
+        {"task_type": "linear", "difficulty": 1, "language": "ru", "final_answer": str(i)} for i in range(5)
+    ])
+    # Порядок и повторы сохраняются, неизвестные id считаются
+    _write_jsonl(outs, [{"id": i, "completion": str(i)} for i in (3, 0, 7, 3, 4, 1)])
+    conn = build_reference_index(str(refs), str(tmp_path / "refs.sqlite"))
+    stats = {"unmatched": 0}
+
+    items = list(iter_eval_items(str(outs), conn, stats, chunk_size=4))
+    conn.close()
+
+    assert [(ref, completion) for _, _, ref, completion, _ in items] == [
+        ("3", "3"), ("0", "0"), ("3", "3"), ("4", "4"), ("1", "1"),
+    ]
+    assert stats["unmatched"] == 1
+
+
+def _hanging_score(task_type, ref_answer, completion):
+    import signal
+    import time
+
+    if ref_answer == "hang":
+        # Зависание, которое SIGALRM не прерывает (как долгий вызов в коде на C)
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(60)
+    return 1.0
+
+
+def test_evaluate_zeroes_only_the_hung_item(tmp_path, monkeypatch):
+    import time
+
+    import re_rl.eval as eval_module
+
+    refs = tmp_path / "refs.jsonl"
+    outs = tmp_path / "outs.jsonl"
+    answers = ["hang" if i == 1 else str(i) for i in range(20)]
+    _write_jsonl(refs, [
+        {"task_type": "linear", "difficulty": 1, "language": "ru", "final_answer": a} for a in answers
+    ])
+    _write_jsonl(outs, [{"id": i, "completion": f"<answer>{a}</answer>"} for i, a in enumerate(answers)])
+
+    # Пул создаётся через fork и наследует подменённую функцию
+    monkeypatch.setattr(eval_module, "compute_correctness_score", _hanging_score)
+    start = time.perf_counter()
+    report = evaluate(str(refs), str(outs), workers=2, item_timeout=0.3)
+
+    assert time.perf_counter() - start < 20
+    assert report["summary"]["count"] == 20
+    assert report["summary"]["timeouts"] == 1
+    assert report["summary"]["accuracy"] == 19 / 20
@@ -0,0 +1,55 @@
+import math
+from fractions import Fraction
+
+from re_rl.tasks.math.discrete.combinatorics_task import CombinatoricsTask
+from re_rl.tasks.math.discrete.exact_combinatorics import (
+    TABLE_LIMIT,
+    binomial,
+    derangements,
+    factorial,
+    hypergeom_pmf,
+    hypergeom_pmf_batch,
+    hypergeom_sf,
+    multinomial,
+    multinomial_pmf,
+    multivariate_hypergeom_pmf,
+    permutations,
+)
+
+
+def test_tables_match_math():
+    for n in (0, 1, 7, 50, TABLE_LIMIT, TABLE_LIMIT + 5):
+        assert factorial(n) == math.factorial(n)
+        for k in (0, 1, n // 3, n):
+            assert binomial(n, k) == math.comb(n, k)
+            assert permutations(n, k) == math.perm(n, k)
+    assert binomial(5, 7) == binomial(5, -1) == 0
+    assert multinomial([2, 3, 4]) == math.factorial(9) // (2 * 6 * 24)
+    assert [derangements(n) for n in range(7)] == [1, 0, 1, 2, 9, 44, 265]
+    # Рекуррентность продолжается и за таблицей
+    n = TABLE_LIMIT + 3
+    assert derangements(n) == (n - 1) * (derangements(n - 1) + derangements(n - 2))
+
+
+def test_exact_probabilities():
+    # 5 красных из 12, берём 4
+    pmf = [hypergeom_pmf(5, 12, 4, k) for k in range(5)]
+    assert sum(pmf) == 1
+    assert pmf[2] == Fraction(math.comb(5, 2) * math.comb(7, 2), math.comb(12, 4))
+    assert hypergeom_sf(5, 12, 4, 1) == 1 - pmf[0]
+    assert hypergeom_sf(5, 12, 4, 3) == pmf[3] + pmf[4]
+    assert multivariate_hypergeom_pmf([5, 7], [2, 2]) == pmf[2]
+    assert multinomial_pmf([1, 1], [Fraction(1, 2), Fraction(1, 2)]) == Fraction(1, 2)
+    assert multinomial_pmf([2, 1, 0], ["1/3", "1/3", "1/3"]) == Fraction(1, 9)
+    rows = [(5, 12, 4, k) for k in range(5)] + [(3, 2000, 10, 1), (1, 3, 5, 0)]
+    batch = hypergeom_pmf_batch(rows)
+    assert batch[:5] == pmf
+    assert batch[5] == hypergeom_pmf(3, 2000, 10, 1)
+    assert batch[6] == 0
+
+
+def test_combinatorics_task_large_n():
+    task = CombinatoricsTask(task_type="derangements", n=400, language="en")
+    assert task.get_result()["final_answer"] == str(derangements(400))
+    task = CombinatoricsTask(task_type="multinomial", language="en", difficulty=10)
+    assert task.get_result()["final_answer"] == str(multinomial(task.groups))
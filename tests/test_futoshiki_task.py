@@ -1,6 +1,7 @@
 # tests/test_futoshiki_task.py
 import unittest
 from re_rl.tasks.math.logic.futoshiki_task import FutoshikiTask
+from re_rl.tasks.math.logic.futoshiki_solver import count_solutions, solve_futoshiki
 
 class TestFutoshikiTask(unittest.TestCase):
     def test_futoshiki_ru(self):
@@ -18,6 +19,34 @@ class TestFutoshikiTask(unittest.TestCase):
         self.assertIn("Futoshiki puzzle", result["problem"])
         self.assertTrue(result["solution_steps"])
         self.assertTrue(result["final_answer"])
+    def test_solver_counts_up_to_limit(self):
+        # Без неравенств у 3x3 двенадцать латинских квадратов
+        self.assertEqual(count_solutions(3, [], limit=20), 12)
+        self.assertEqual(count_solutions(3, [], limit=2), 2)
+        # Цикл неравенств несовместен
+        self.assertEqual(solve_futoshiki(3, [(0, 0, 0, 1), (0, 1, 0, 2), (0, 2, 0, 0)]), [])
+        # Цепочка по строке задаёт её полностью
+        (grid,) = solve_futoshiki(2, [(0, 0, 0, 1)])
+        self.assertEqual(grid, [[1, 2], [2, 1]])
+
+    def test_generated_puzzle_is_unique(self):
+        for difficulty in (1, 5, 10):
+            task = FutoshikiTask(language="en", difficulty=difficulty)
+            n = task.size
+            self.assertEqual(count_solutions(n, task.inequalities, task.givens), 1)
+            for r1, c1, r2, c2 in task.inequalities:
+                self.assertEqual(abs(r1 - r2) + abs(c1 - c2), 1)
+                self.assertLess(task.solution[r1][c1], task.solution[r2][c2])
+            for r in range(n):
+                for c in range(n):
+                    self.assertIn(task.givens[r][c], (0, task.solution[r][c]))
+        self.assertEqual(task.size, 9)
+
+    def test_random_latin_square(self):
+        from re_rl.tasks.math.logic.futoshiki_solver import random_latin_square
+        grid = random_latin_square(8)
+        for line in grid + [list(col) for col in zip(*grid)]:
+            self.assertEqual(sorted(line), list(range(1, 9)))
 
 if __name__ == '__main__':
     unittest.main()
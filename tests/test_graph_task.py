@@ -1,5 +1,19 @@
+import random
 import unittest
+
+import networkx as nx
+import numpy as np
+
 from re_rl.tasks.math.discrete.graph_task import GraphTask
+from re_rl.tasks.math.discrete.graph_engine import (
+    average_clustering,
+    components,
+    diameter,
+    dijkstra,
+    kruskal,
+    largest_component,
+    random_gnp,
+)
 
 class TestGraphTask(unittest.TestCase):
     def test_graph(self):
@@ -8,5 +22,46 @@ class TestGraphTask(unittest.TestCase):
         self.assertIn("Найди", result["problem"])
         self.assertNotEqual(result["final_answer"], "Нет решения")
 
+    def test_engine_matches_networkx(self):
+        rng = np.random.default_rng(0)
+        sizes = random.Random(1)
+        for _ in range(30):
+            g = random_gnp(sizes.randint(5, 40), 0.15, rng, (1, 10))
+            nxg = nx.Graph()
+            nxg.add_nodes_from(range(g.n))
+            for u, v, w in zip(*g.edges()):
+                nxg.add_edge(int(u), int(v), weight=int(w))
+            self.assertEqual(len(components(g)), nx.number_connected_components(nxg))
+            lengths = nx.single_source_dijkstra_path_length(nxg, 0)
+            trace = dijkstra(g, 0)
+            for v in range(g.n):
+                self.assertEqual(trace.dist[v], lengths.get(v, np.inf))
+            self.assertEqual(
+                sum(w for *_, w in kruskal(g)),
+                nx.minimum_spanning_tree(nxg).size(weight="weight"),
+            )
+            self.assertAlmostEqual(average_clustering(g), nx.average_clustering(nxg))
+            h = largest_component(g)
+            self.assertEqual(diameter(h), nx.diameter(nxg.subgraph(max(nx.connected_components(nxg), key=len))))
+
+    def test_hundreds_of_nodes(self):
+        task = GraphTask(task_type="shortest_path", difficulty=10, language="en")
+        result = task.get_result()
+        self.assertGreaterEqual(task.graph.n, 250)
+        trace = dijkstra(task.graph, task.start)
+        self.assertEqual(result["final_answer"], str(int(trace.dist[task.end])))
+        path = trace.path(task.end)
+        self.assertEqual((path[0], path[-1]), (task.start, task.end))
+        self.assertIn("length of the shortest path", result["problem"])
+
+    def test_mst_answer_is_total_weight(self):
+        task = GraphTask(task_type="minimum_spanning_tree", difficulty=6, language="ru")
+        result = task.get_result()
+        nxg = nx.Graph()
+        for u, v, w in zip(*task.graph.edges()):
+            nxg.add_edge(int(u), int(v), weight=int(w))
+        self.assertEqual(result["final_answer"], str(int(nx.minimum_spanning_tree(nxg).size(weight="weight"))))
+        self.assertIn("суммарный вес", result["problem"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from re_rl.tasks.math.logic.knights_knaves_task import KnightsKnavesTask
+from re_rl.tasks.math.logic.knights_knaves_solver import Statement, TruthTable, roles_to_mask
 
 class TestKnightsKnavesTask(unittest.TestCase):
     def test_knights_knaves_ru(self):
@@ -53,6 +54,24 @@ class TestKnightsKnavesTask(unittest.TestCase):
         # Проверяем, что есть ровно 3 шага (по detail_level=3)
         self.assertEqual(len(result["solution_steps"]), 3, 
                          "Число шагов должно соответствовать detail_level=3")
+    def test_truth_table(self):
+        table = TruthTable(2)
+        # A: "B — лжец", B: "Мы оба рыцари" — единственное решение: A рыцарь, B лжец
+        statements = [
+            Statement(0, "about_other", y=1, role="knave"),
+            Statement(1, "and", y=0, z=1, role="knight"),
+        ]
+        self.assertEqual(table.solve(statements), [roles_to_mask(["knight", "knave"])])
+        # "Я рыцарь" согласуется с любым распределением
+        self.assertEqual(len(table.solve([Statement(0, "about_self", role="knight")])), 4)
+
+    def test_unique_solution_beyond_five_persons(self):
+        for complexity in (1, 4, 7):
+            task = KnightsKnavesTask(language="en", complexity=complexity)
+            self.assertEqual(task.num_persons, max(2, complexity + 1))
+            statements = [stmt["statement"] for stmt in task.statements]
+            self.assertGreaterEqual(len(statements), task.num_statements)
+            self.assertEqual(task.table.solve(statements), [roles_to_mask(task.roles)])
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 import sympy as sp
 from re_rl.tasks.math.algebra.linear_task import LinearTask
@@ -5,6 +6,10 @@ from re_rl.tasks.math.algebra.quadratic_task import QuadraticTask
 from re_rl.tasks.math.algebra.cubic_task import CubicTask
 from re_rl.tasks.math.algebra.exponential_task import ExponentialTask
 from re_rl.tasks.math.algebra.logarithmic_task import LogarithmicTask
+from re_rl.tasks.math.algebra.polynomials import (
+    ROOT_KINDS, expand_roots, format_polynomial, format_root, normalize, sample_root,
+    solve_cubic, solve_quadratic, verify_roots,
+)
 
 class TestLinearTask(unittest.TestCase):
     def test_linear_ru(self):
@@ -35,6 +40,28 @@ class TestCubicTask(unittest.TestCase):
         for r in [1, 2, 3]:
             self.assertIn(str(r), result["final_answer"])
 
+class TestRootFirstConstruction(unittest.TestCase):
+    def test_expanded_roots_are_recovered(self):
+        """Корни, из которых построен многочлен, совпадают с sp.solve."""
+        rng = random.Random(0)
+        for kind in ROOT_KINDS:
+            for _ in range(10):
+                root = sample_root(rng, kind, 6)
+                extra = [sample_root(rng, "integer", 6)] + ([sample_root(rng, kind, 6)] if root.is_rational else [])
+                coeffs = normalize(expand_roots([root] + extra))
+                self.assertTrue(verify_roots(coeffs, solve_cubic(*coeffs)))
+
+    def test_printers(self):
+        self.assertEqual(format_polynomial([1, -6, 11, -6]), "x³ - 6x² + 11x - 6")
+        self.assertEqual(format_polynomial([-1, 0, 3], "latex"), "-x^{2} + 3")
+        self.assertEqual([format_root(r) for r in solve_quadratic(1, 2, 5)], ["-1 - 2*I", "-1 + 2*I"])
+        self.assertEqual([format_root(r) for r in solve_quadratic(4, -4, -1)], ["1/2 - sqrt(2)/2", "1/2 + sqrt(2)/2"])
+
+    def test_generated_tasks(self):
+        for difficulty in (1, 6, 10):
+            self.assertNotEqual(QuadraticTask(difficulty=difficulty).get_result()["final_answer"], "")
+            self.assertTrue(CubicTask(difficulty=difficulty).get_result()["final_answer"].startswith("["))
+
 class TestExponentialTask(unittest.TestCase):
     def test_exponential(self):
         task = ExponentialTask(2, 1, 1, 5, language="ru")
@@ -0,0 +1,39 @@
+import random
+
+from sympy import factorint, totient as sympy_totient
+
+from re_rl.tasks.math.discrete.number_tables import NumberTables, get_tables
+from re_rl.tasks.math.discrete.number_theory_task import NumberTheoryTask
+
+
+def test_tables_match_sympy():
+    tables = NumberTables()
+    rng = random.Random(3)
+    for n in list(range(1, 300)) + [rng.randrange(2, 500000) for _ in range(200)]:
+        assert tables.factorize(n) == factorint(n)
+        assert tables.totient(n) == sympy_totient(n)
+        assert tables.is_prime(n) == (factorint(n) == {n: 1})
+    # За пределами таблицы — пробное деление
+    big = 10000019 * 9999991
+    assert tables.factorize(big) == {9999991: 1, 10000019: 1}
+    assert tables.totient(big) == 10000018 * 9999990
+    assert tables.first_primes(7) == [2, 3, 5, 7, 11, 13, 17]
+    assert tables.random_prime(5, 20, rng) in (5, 7, 11, 13, 17, 19)
+
+
+def test_tables_roundtrip(tmp_path):
+    tables = NumberTables()
+    tables.ensure(1000)
+    tables.save(str(tmp_path))
+    loaded = NumberTables(str(tmp_path))
+    assert loaded.limit == tables.limit
+    assert loaded.totient(997) == 996
+    assert loaded.primes.tolist() == tables.primes.tolist()
+
+
+def test_number_theory_task_uses_tables():
+    task = NumberTheoryTask(task_type="prime_factorization", n=360, language="en")
+    result = task.get_result()
+    assert result["final_answer"] == "2^3 × 3^2 × 5"
+    task = NumberTheoryTask(task_type="euler_totient", difficulty=10, n=45360, language="en")
+    assert task.get_result()["final_answer"] == str(get_tables().totient(45360)) == "10368"
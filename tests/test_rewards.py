@@ -1,4 +1,5 @@
 import pytest
+from fractions import Fraction
 from re_rl.rewards import (
     extract_reasoning_and_answer,
     check_format_compliance,
@@ -75,6 +76,32 @@ def test_parse_urn_probability_answer():
     assert parse_urn_probability_answer("Probability = 1.0") == 1.0
     assert parse_urn_probability_answer("P = 1.5") is None  # > 1
     assert parse_urn_probability_answer("P = -0.1") is None  # < 0
+    assert parse_urn_probability_answer("P = 7/30 ≈ 0.2333") == Fraction(7, 30)
+
+
+def test_compare_series_sums():
+    assert compare_answers("series", "S_4 = 40/9", "S_4 = 40/9") == 1.0
+    assert compare_answers("series", "S_4 = 40/9", "80/18") == 1.0
+    assert compare_answers("series", "S_4 = 40/9", "S = 4.4444") == 1.0
+    assert compare_answers("series", "S_4 = 40/9", "4.45") == 0.0
+    assert compare_answers("series", "S_4 = 40/9", "41/9") == 0.0
+    assert compare_answers("series", "S = 6", "6") == 1.0
+    assert compare_answers("series", "converges", "Converges") == 1.0
+    assert compare_answers("series", "converges", "diverges") == 0.0
+
+
+def test_compare_urn_probability_exact():
+    ref = "The final probability of the event is: 7/30 ≈ 0.2333"
+    assert compare_answers("urn_probability", ref, "7/30") == 1.0
+    assert compare_answers("urn_probability", ref, "14/60") == 1.0
+    assert compare_answers("urn_probability", ref, "0.2333") == 1.0
+    # Дробь сравнивается точно, без допуска
+    assert compare_answers("urn_probability", ref, "233/1000") == 0.0
+    # Дробь предпочтительнее соседних чисел, способ сравнения — по разобранной записи
+    assert compare_answers("urn_probability", ref, "0.2333 (=7/30)") == 1.0
+    assert compare_answers("urn_probability", ref, "P(X≥1) = 7/30") == 1.0
+    assert compare_answers("urn_probability", ref, "P(X≥1) = 0.2333") == 1.0
+    assert compare_answers("urn_probability", ref, "P(X≥1) = 0.2 (=1/5)") == 0.0
 
 def test_parse_knights_knaves_answer():
     assert parse_knights_knaves_answer("Alice: knight, Bob: liar") == {
@@ -155,4 +182,211 @@ def test_compare_answers():
     assert compare_answers("linear", 42.0, 42.0) == 1.0
     ref = "<reasoning>Analyzing statements</reasoning><answer>alice: knight</answer>"
     pred = "<reasoning>Analyzing statements</reasoning><answer>alice: knight</answer>"
-    assert compare_answers("knights_knaves", ref, pred) == 1.0 
\ No newline at end of file
+    assert compare_answers("knights_knaves", ref, pred) == 1.0 
+
+def test_check_symbolic_equivalence():
+    from re_rl.rewards import check_symbolic_equivalence
+
+    # Выражения, записанные по-разному
+    assert check_symbolic_equivalence("x^2/2 + C", "0.5*x**2 + C")
+    assert check_symbolic_equivalence("y = 1 + Ce^(-5x)", "C*exp(-5*x) + 1")
+    assert check_symbolic_equivalence("y = C₁e^(0x) + C₂e^(-1x)", "C1 + C2*exp(-x)")
+    assert check_symbolic_equivalence("y² = 2x² + C", "y^2 = 2x^2 + C")
+    assert check_symbolic_equivalence("45/29", "1.5517")
+    assert not check_symbolic_equivalence("x + 1", "x + 2")
+    assert not check_symbolic_equivalence("oo", "-oo")
+
+    # Интервалы и неравенства
+    assert check_symbolic_equivalence("(-∞, 2)", "x < 2")
+    assert check_symbolic_equivalence("(-∞, -1.5916) ∪ (0.4488, +∞)", "x < -1.5916 or x > 0.4488")
+    assert check_symbolic_equivalence("(-1.0606, 6.0000)", "-1.0606 < x < 6")
+    assert not check_symbolic_equivalence("[1.6957, +∞)", "x > 1.6957")
+
+    # Неразбираемый ответ не считается верным
+    assert not check_symbolic_equivalence("x + 1", "garbage ))")
+
+
+def test_compare_answers_symbolic():
+    assert compare_answers("integral", "x^2/2 + C", "0.5*x**2 + C") == 1.0
+    assert compare_answers("inequality", "(-∞, 2)", "x < 2") == 1.0
+    assert compare_answers("limits", "2/3", "0.7") == 0.0
+
+
+def test_reward_inequality_interval_sets():
+    from re_rl.rewards import reward_inequality
+
+    assert reward_inequality("(-∞, -2) ∪ [1/2, +∞)", "x < -2 or x ≥ 0.5") == 1.0
+    assert reward_inequality("(-∞, -2) ∪ [1/2, +∞)", "(-∞, -2) ∪ (1/2, +∞)") == 0.0
+    assert reward_inequality("x = 3/2", "{1.5}") == 1.0
+    assert reward_inequality("∅", "ℝ") == 0.0
+    # Рациональные концы — точно: близкое число не засчитывается
+    assert reward_inequality("(-∞, 2)", "(-∞, 2.001)") == 0.0
+    assert reward_inequality("x < 150", "x < 150.1") == 0.0
+    assert reward_inequality("(-∞, 1/3)", "x < 0.3333") == 0.0
+    # Иррациональный конец в эталоне записан приближённо — с допуском
+    assert reward_inequality("(-1.4142, 1.4142)", "-1.41421 < x < 1.41421") == 1.0
+
+
+def test_parse_physics_answer():
+    from re_rl.rewards import parse_physics_answer
+
+    (quantity,) = parse_physics_answer("2140 мэВ")
+    assert quantity[0] == "energy"
+    assert quantity[1] == pytest.approx(2.14 * 1.602176634e-19)
+
+    # Пояснение в скобках отбрасывается
+    assert len(parse_physics_answer("r = 1.8081e+08 м (180806.53 км)")) == 1
+    assert [q[0] for q in parse_physics_answer("T = 1.9008 с, ω = 3.3056 рад/с")] == ["time", "angular_velocity"]
+
+
+def test_reward_physics():
+    from re_rl.rewards import reward_physics, reward_physics_batch
+
+    assert reward_physics("2.14 эВ", "2140 мэВ") == 1.0
+    assert reward_physics("2.14 эВ", "3.43e-19 J") == 1.0
+    assert reward_physics("2.14 эВ", "3,43·10⁻¹⁹ Дж") == 1.0
+    assert reward_physics("2.14 эВ", "2.14 V") == 0.0
+    assert reward_physics("44.3102 °C", "317.46 K") == 1.0
+    assert reward_physics("43.82%", "0.4382") == 1.0
+    assert reward_physics("T = 1.9008 с, ω = 3.3056 рад/с", "T = 1.9 s") == 0.5
+    assert reward_physics("760 мм рт. ст.", "101325 Pa") == 1.0
+    assert reward_physics("760 mm Hg", "760 мм рт.ст.") == 1.0
+    # Одна величина ответа не засчитывается двум величинам эталона,
+    # а перечисление лишних значений не награждается
+    assert reward_physics("2 м, 2 м", "2 м") == 0.5
+    assert reward_physics("2 м", "1 м, 2 м, 3 м") == 0.0
+    assert reward_physics("5 Н", "1 2 3 4 5") == 0.0
+    assert compare_answers("quantum", "2.14 эВ", "2140 мэВ") == 1.0
+
+    assert reward_physics_batch(["1 м", "2 кг", "5 Н"], ["100 см", "3 кг", "no answer"]) == [1.0, 0.0, 0.0]
+
+
+def test_score_group_deduplicates():
+    from re_rl import rewards
+
+    answers = [
+        "<reasoning>r</reasoning><answer>42</answer>",
+        "<reasoning>r</reasoning><answer>41</answer>",
+        "<reasoning>r</reasoning><answer>42</answer>",
+    ]
+    calls = []
+    original = rewards.score_prepared_answer
+
+    def counting(task_type, prepared_ref, pred_answer):
+        calls.append(pred_answer)
+        return original(task_type, prepared_ref, pred_answer)
+
+    rewards.score_prepared_answer = counting
+    try:
+        scores = rewards.score_group("linear", "<answer>42</answer>", answers)
+    finally:
+        rewards.score_prepared_answer = original
+
+    assert scores == [1.0, 0.0, 1.0]
+    assert len(calls) == 2
+
+
+def test_reward_correctness_matches_single_scoring():
+    from re_rl.rewards import reward_correctness
+
+    ref = "<reasoning>r</reasoning><answer>alice: knight, bob: liar</answer>"
+    prompts = [[
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "q", "metadata": {"task_type": "knights_knaves", "ref_final_answer": ref}},
+    ]]
+    outputs = [
+        "<reasoning>r</reasoning><answer>alice: knight, bob: liar</answer>",
+        "<reasoning>r</reasoning><answer>alice: knight, bob: knight</answer>",
+        "<reasoning>r</reasoning><answer>alice: knight, bob: liar</answer>",
+    ]
+    completions = [[{"content": o} for o in outputs]]
+    scores = reward_correctness(prompts, completions, [[ref] * 3])
+    assert scores == [compute_correctness_score("knights_knaves", ref, o) for o in outputs]
+    assert scores == [1.0, 0.5, 1.0]
+
+
+def test_streaming_answer_detector():
+    from re_rl.rewards import StreamingAnswerDetector
+
+    text = "<reasoning>think</reasoning>\n<answer>42</answer> trailing junk </answer>"
+    end = text.index("</answer>") + len("</answer>")
+
+    # Теги разрезаны по границам кусков
+    for size in (1, 3, 7, len(text)):
+        detector = StreamingAnswerDetector()
+        done = False
+        for i in range(0, len(text), size):
+            done = detector.feed(text[i:i + size])
+            if done:
+                break
+        assert done
+        assert detector.stop_offset == end
+        assert detector.reasoning_text == "think"
+        assert detector.answer_text == "42"
+        assert check_format_compliance(text[:detector.stop_offset]) == 0.2
+
+    detector = StreamingAnswerDetector()
+    assert not detector.feed("<reasoning>abc</reasoning><answ")
+    assert not detector.done
+    assert detector.stop_offset is None
+
+
+def test_symbolic_parser_rejects_code(tmp_path):
+    from re_rl.rewards import parse_symbolic_answer
+
+    marker = tmp_path / "injected"
+    payloads = [
+        f"__import__('os').system('touch {marker}')",
+        "(1).__class__",
+        "x.func",
+        "lambda: 1",
+    ]
+    for payload in payloads:
+        assert parse_symbolic_answer(payload) is None
+    assert not marker.exists()
+
+
+def test_symbolic_budget_and_huge_numbers():
+    import time
+    from re_rl.rewards import _call_with_time_budget, check_symbolic_equivalence
+
+    start = time.monotonic()
+    for bomb in ("10**10**9", "9^9^9", "(10^7)!", "x^(10^10^9)", "x + " * 300 + "x"):
+        assert not check_symbolic_equivalence("x", bomb)
+    assert time.monotonic() - start < 5
+
+    # Вложенный бюджет не сбрасывает внешний
+    def busy():
+        assert _call_with_time_budget(lambda: 1, 5.0) == 1
+        while True:
+            pass
+
+    start = time.monotonic()
+    assert _call_with_time_budget(busy, 0.2) is None
+    assert time.monotonic() - start < 2
+
+
+def test_prepare_reference_parses_once():
+    from re_rl import rewards
+
+    prepared = rewards.prepare_reference("urn_probability", "<answer>P = 1/4</answer>")
+    assert prepared.value == Fraction(1, 4)
+    prepared = rewards.prepare_reference("energy", "<answer>2.14 эВ</answer>")
+    assert prepared.value[0][0] == "energy"
+
+    calls = []
+    original = rewards.parse_symbolic_answer
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    rewards.parse_symbolic_answer = counting
+    try:
+        answers = [f"<answer>x^2/2 + {c}</answer>" for c in ("C", "C1", "K", "C")]
+        scores = rewards.score_group("integral", "<answer>x^2/2 + C</answer>", answers)
+    finally:
+        rewards.parse_symbolic_answer = original
+    assert scores[0] == scores[3] == 1.0
+    # Эталон разобран один раз, ответы — по одному разу (кроме совпавшего с эталоном)
+    assert calls.count("x^2/2 + C") == 1
@@ -0,0 +1,92 @@
+import os
+from multiprocessing import Pool
+
+import sympy as sp
+
+from re_rl.tasks.sympy_cache import SympyCache
+
+
+x = sp.Symbol("x")
+
+
+def test_memory_hit_skips_compute():
+    cache = SympyCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return sp.integrate(x * sp.exp(x), x)
+
+    first = cache.get_or_compute("integrate", (x * sp.exp(x), x), compute)
+    second = cache.get_or_compute("integrate", (x * sp.exp(x), x), compute)
+    assert first == second
+    assert len(calls) == 1
+    assert cache.stats["memory_hits"] == 1
+
+
+def test_memory_lru_bound():
+    cache = SympyCache(max_memory_items=2)
+    for k in range(5):
+        cache.get_or_compute("latex", (x ** k,), lambda: sp.latex(x ** k))
+    assert len(cache._memory) == 2
+
+
+def test_disk_tier_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    expr = sp.sin(x) ** 2
+    SympyCache(path).get_or_compute("integrate", (expr, x), lambda: sp.integrate(expr, x))
+
+    other = SympyCache(path)
+    result = other.get_or_compute("integrate", (expr, x), lambda: None)
+    assert result == sp.integrate(expr, x)
+    assert other.stats["disk_hits"] == 1
+
+
+def test_disk_key_depends_on_operation_and_args():
+    assert SympyCache.disk_key("latex", (x,), ()) != SympyCache.disk_key("pretty", (x,), ())
+    assert SympyCache.disk_key("latex", (x,), ()) != SympyCache.disk_key("latex", (x + 1,), ())
+
+
+def test_eviction_keeps_disk_under_limit(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SympyCache(path, max_disk_bytes=2000)
+    for k in range(40):
+        cache.get_or_compute("latex", (x ** k,), lambda: "z" * 200)
+    cache.evict()
+    conn = cache._connection()
+    total = conn.execute("SELECT SUM(size) FROM cache").fetchone()[0]
+    assert total <= 2000
+
+
+def _worker(args):
+    path, k = args
+    cache = SympyCache(path)
+    return cache.get_or_compute("latex", (x ** (k % 5),), lambda: sp.latex(x ** (k % 5)))
+
+
+def test_concurrent_workers(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with Pool(4) as pool:
+        results = pool.map(_worker, [(path, k) for k in range(40)])
+    assert results[:5] == [sp.latex(x ** k) for k in range(5)]
+    assert os.path.exists(path)
+
+
+def test_disk_hit_touches_only_stale_entries(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    writer = SympyCache(path)
+    writer.get_or_compute("latex", (x,), lambda: sp.latex(x))
+    key = SympyCache.disk_key("latex", (x,), ())
+    conn = writer._connection()
+
+    def accessed():
+        return conn.execute("SELECT accessed FROM cache WHERE key = ?", (key,)).fetchone()[0]
+
+    fresh = accessed()
+    SympyCache(path).get_or_compute("latex", (x,), lambda: None)
+    assert accessed() == fresh
+
+    conn.execute("UPDATE cache SET accessed = 0 WHERE key = ?", (key,))
+    conn.commit()
+    SympyCache(path).get_or_compute("latex", (x,), lambda: None)
+    assert accessed() >= fresh
@@ -1,7 +1,9 @@
 # tests/test_text_stats_generation.py
 
+import random
 import unittest
 from re_rl.tasks.math.logic.text_stats_task import TextStatsTask
+from re_rl.tasks.math.logic.text_stats_engine import count_occurrences, prefix_function
 
 class TestTextStatsGeneration(unittest.TestCase):
 
@@ -54,6 +56,25 @@ class TestTextStatsGeneration(unittest.TestCase):
         # без пересечений: "aaaaa" -> "aa" + "aa" + "a" => 2 вхождения
         self.assertIn("2", result["final_answer"])
 
+    def test_overlapping_counter_matches_naive(self):
+        self.assertEqual(prefix_function("abab"), [0, 0, 1, 2])
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = "".join(rng.choices("ab", k=rng.randint(0, 40)))
+            sub = "".join(rng.choices("ab", k=rng.randint(1, 5)))
+            naive = sum(text.startswith(sub, i) for i in range(len(text)))
+            self.assertEqual(count_occurrences(text, sub, overlapping=True), naive)
+        self.assertEqual(count_occurrences("a" * 100000, "a" * 50, overlapping=True), 100000 - 49)
+
+    def test_long_text_difficulty(self):
+        for mode in ("words", "letters", "mixed"):
+            task = TextStatsTask(language="ru", text_gen_mode=mode, difficulty=10)
+            self.assertGreater(len(task.text), 80000)
+            self.assertLessEqual(len(task.substring), 5)
+            task.solve()
+            count = count_occurrences(task.text, task.substring, task.allow_overlapping)
+            self.assertIn(f" {count} ", task.final_answer)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
 # tests/test_urn_probability_task.py
 
+import random
 import unittest
+from fractions import Fraction
 from re_rl.tasks.math.probability.urn_probability_task import UrnProbabilityTask
 
 class TestUrnProbabilityTask(unittest.TestCase):
@@ -17,6 +19,39 @@ class TestUrnProbabilityTask(unittest.TestCase):
         self.assertIn("У нас есть 3", res["problem"])
         self.assertTrue(len(res["solution_steps"]) > 0)
         self.assertIn("Итоговая вероятность события:", res["final_answer"])
+    def test_urn_prob_exact_fraction(self):
+        random.seed(5)
+        task = UrnProbabilityTask(language="en", count_containers=3, draws=2)
+        res = task.get_result()
+        self.assertIsInstance(task.probability, Fraction)
+        self.assertTrue(0 <= task.probability <= 1)
+        if task.probability.denominator > 1:
+            self.assertIn(f"{task.probability.numerator}/{task.probability.denominator}", res["final_answer"])
+
+    def test_russian_questions_use_stored_parameters(self):
+        from math import comb
+        random.seed(11)
+        kinds = set()
+        for _ in range(60):
+            task = UrnProbabilityTask(language="ru", count_containers=2, draws=2)
+            task.get_result()
+            kinds.add(task.question_kind)
+            expected = Fraction(0)
+            for dist in task.containers:
+                total = sum(c for _, c in dist)
+                if total < task.draws:
+                    continue
+                red = dict(dist).get(task.question_color, 0)
+                exact = lambda k: Fraction(comb(red, k) * comb(total - red, task.draws - k), comb(total, task.draws))
+                if task.question_kind == "all":
+                    p = exact(task.draws)
+                elif task.question_kind == "at_least_one":
+                    p = 1 - exact(0)
+                else:
+                    p = exact(task.question_x)
+                expected += p / 2
+            self.assertEqual(task.probability, expected)
+        self.assertEqual(kinds, {"all", "at_least_one", "exactly"})
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,23 @@
+import random
+
+from re_rl.tasks.math.logic.futoshiki_solver import generate_puzzle
+from re_rl.tasks.math.logic.z3_session import get_session, solve_futoshiki_z3
+
+
+def test_session_is_reused_and_scopes_are_popped():
+    session = get_session()
+    assert get_session() is session
+    assert session.grid(5) is session.grid(5)
+    solve_futoshiki_z3(3, [(0, 0, 0, 1)], limit=3)
+    assert session.solver.num_scopes() == 0
+    assert len(session.solver.assertions()) == 0
+
+
+def test_matches_native_solver():
+    # 12 латинских квадратов 3x3; цикл неравенств несовместен
+    assert len(solve_futoshiki_z3(3, [], limit=20)) == 12
+    assert solve_futoshiki_z3(3, [(0, 0, 0, 1), (0, 1, 0, 2), (0, 2, 0, 0)]) == []
+    rng = random.Random(7)
+    for size in (4, 5, 6):
+        puzzle = generate_puzzle(size, size * 2, rng=rng)
+        assert solve_futoshiki_z3(size, puzzle.inequalities, puzzle.givens) == [puzzle.solution]